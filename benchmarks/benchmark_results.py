@@ -0,0 +1,136 @@
+"""Shared reporting for the benchmark scripts in this directory.
+
+Results are written as JSON along with metadata about the machine they were
+measured on, and can be compared against a stored baseline:
+
+    {
+        "metadata": {"python": "3.8.5", "machine": "x86_64", ...},
+        "results": {"world_update/uniform/1000": {"seconds": 0.0012}, ...}
+    }
+
+Every result has a ``seconds`` value, lower is better, which comparisons use.
+Other values in a result are informational.
+"""
+
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'baselines')
+
+
+def get_metadata():
+    """Returns details of the machine and code being benchmarked."""
+    try:
+        import pyglet
+        pyglet_version = pyglet.version
+    except ImportError:
+        pyglet_version = None
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'pyglet': pyglet_version,
+    }
+
+
+def write_results(path, results):
+    """Writes results to a JSON file along with the machine's metadata.
+
+    Args:
+        path (str): Path to write the results to.
+        results (dict of str to dict): The results by benchmark name.
+    """
+    with open(path, 'w') as json_file:
+        json.dump({'metadata': get_metadata(), 'results': results},
+                  json_file, indent=2, sort_keys=True)
+        json_file.write('\n')
+
+
+def read_results(path):
+    """Reads a JSON file written by :fn:`write_results`.
+
+    Returns:
+        A tuple of the (metadata, results) dicts.
+    """
+    with open(path) as json_file:
+        data = json.load(json_file)
+
+    return (data['metadata'], data['results'])
+
+
+def compare_results(baseline_path, results, threshold):
+    """Prints the change from a baseline, and returns any regressions.
+
+    Benchmarks are only compared if they are in both the baseline and the
+    results. Benchmarks missing from the baseline are listed as such, since
+    they can't regress. Baselines measured on other machines are still
+    compared, with a warning, since their timings are not directly
+    comparable.
+
+    Args:
+        baseline_path (str): Path to the baseline results.
+        results (dict of str to dict): The results by benchmark name.
+        threshold (float): Fraction a benchmark may slow down by before it
+            is a regression, such as 0.1 for 10%.
+
+    Returns:
+        The sorted names of the benchmarks which regressed.
+    """
+    baseline_metadata, baseline = read_results(baseline_path)
+    metadata = get_metadata()
+
+    for key in ('machine', 'processor', 'python', 'implementation'):
+        if baseline_metadata.get(key) != metadata[key]:
+            print('warning: baseline {0} {1!r} differs from {2!r}'.format(
+                key, baseline_metadata.get(key), metadata[key]))
+
+    regressions = []
+    print('{0:<44}{1:>12}{2:>12}{3:>9}'.format(
+        'benchmark', 'baseline', 'current', 'change'))
+
+    for name in sorted(results.keys() & baseline.keys()):
+        before = baseline[name]['seconds']
+        after = results[name]['seconds']
+        change = after / before - 1 if before else 0
+
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+
+        print('{0:<44}{1:>12}{2:>12}{3:>+8.1%}{4}'.format(
+            name, format_seconds(before), format_seconds(after), change,
+            ' REGRESSED' if regressed else ''))
+
+    for name in sorted(results.keys() - baseline.keys()):
+        print('{0:<44}{1:>12}{2:>12}'.format(
+            name, 'none', format_seconds(results[name]['seconds'])))
+
+    return regressions
+
+
+def format_seconds(seconds):
+    """Formats a duration with a unit suited to its size."""
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if seconds >= 1 / scale:
+            return '{0:.2f}{1}'.format(seconds * scale, unit)
+
+    return '{0:.1f}ns'.format(seconds * 1e9)
@@ -0,0 +1,84 @@
+"""Measures the time to import each engine subpackage in a fresh interpreter.
+
+Run from the repository root:
+
+    python benchmarks/import_time.py [--repeat 5] [--json results.json]
+
+Each subpackage is imported in a new process, since imports are cached for
+the lifetime of an interpreter. Both importing the subpackage and accessing
+all of its exports are timed, so deferred imports are measured as well.
+"""
+
+from statistics import median
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SUBPACKAGES = (
+    'audio', 'camera', 'collision', 'disk', 'easing', 'event_dispatcher',
+    'factory', 'game_object', 'geometry', 'graphics', 'key_handler',
+    'physics', 'profiler', 'room', 'save_game', 'tiled_editor', 'util',
+    'world')
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints the milliseconds to import the package and to access its exports
+TIMING_SCRIPT = '''
+from importlib import import_module
+from time import perf_counter
+start = perf_counter()
+package = import_module({package!r})
+imported = perf_counter()
+for name in getattr(package, '__all__', ()):
+    getattr(package, name)
+accessed = perf_counter()
+print((imported - start) * 1000, (accessed - start) * 1000)
+'''
+
+
+def time_import(package, repeat):
+    """Returns the median (import, full) milliseconds to import a package."""
+    env = dict(os.environ, PYGLET_SHADOW_WINDOW='False', PYGLET_AUDIO='silent')
+    samples = []
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', TIMING_SCRIPT.format(package=package)],
+            cwd=ROOT_DIR, env=env, check=True, stdout=subprocess.PIPE,
+            universal_newlines=True).stdout
+
+        samples.append(tuple(map(float, output.split())))
+
+    return (median(sample[0] for sample in samples),
+            median(sample[1] for sample in samples))
+
+
+def main():
+    """Times and reports the import of the engine and each subpackage."""
+    parser = argparse.ArgumentParser(
+        description='Measures the import time of each engine subpackage.')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='imports to take the median of per subpackage')
+    parser.add_argument('--json', help='path to write results to as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    print('{0:<24}{1:>12}{2:>12}'.format('package', 'import ms', 'all ms'))
+
+    for package in ('engine',) + tuple(
+            'engine.' + name for name in SUBPACKAGES):
+        import_ms, full_ms = time_import(package, args.repeat)
+        results[package] = {'import_ms': import_ms, 'full_ms': full_ms}
+
+        print('{0:<24}{1:>12.2f}{2:>12.2f}'.format(
+            package, import_ms, full_ms))
+
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump(results, json_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""Measures loading generated TMX maps through TmxLoader, stage by stage.
+
+Run from the repository root:
+
+    python benchmarks/room_loading.py [--sizes 100x50,400x200]
+        [--encodings csv,base64-zlib] [--layers 3] [--object-density 0.01]
+        [--tilesets 2] [--skip-sprites] [--json out.json]
+        [--baseline benchmarks/baselines/room_loading.json]
+
+Maps are written by ``tmx_generator.py`` to a temporary resource directory,
+then each stage of loading them is timed on its own:
+
+* parse: Reading and parsing the TMX file.
+* decode_tiles: Decoding the tile data of every tile layer.
+* decode_objects: Decoding every object layer.
+* decode_images: Decoding the tileset images.
+* preload: All of the above, as ``TmxLoader.preload`` does on a worker.
+* create_sprites: Uploading textures and creating sprites and objects from
+    a preload, as the main thread does.
+* load: Loading the map without a preload, as the game does.
+
+Every stage reports the fastest of several repeats, along with the time of
+the first repeat. Tileset textures stay cached after the first ``load``, as
+they do when rooms share tilesets. Peak memory allocated by Python during
+``preload`` and ``load`` is measured in a separate pass, since tracing
+allocations slows everything down.
+
+Creating sprites needs an OpenGL context, which is created with a hidden
+window. Pass ``--skip-sprites`` on machines without a display. The stored
+baseline was measured with ``--skip-sprites``, so it has no sprite stages
+and the ``create_sprites`` and ``load`` stages are never compared.
+"""
+
+from benchmark_results import (
+    BASELINE_DIR, ROOT_DIR, compare_results, format_seconds, write_results)
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tmx_generator import write_tmx_map
+import argparse
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault('PYGLET_SHADOW_WINDOW', 'False')
+os.environ.setdefault('PYGLET_AUDIO', 'silent')
+sys.path.insert(0, ROOT_DIR)
+
+from engine.disk import DiskLoader  # noqa: E402
+from engine.factory import GenericFactory  # noqa: E402
+from engine.game_object import ImmovableGameObject  # noqa: E402
+from engine.tiled_editor import TmxLoader  # noqa: E402
+from engine.tiled_editor.tmx_object_layer import (  # noqa: E402
+    load_tmx_object_layer)
+from engine.tiled_editor.tmx_preload import load_tmx_preload  # noqa: E402
+from engine.tiled_editor.tmx_tile_layer import (  # noqa: E402
+    load_tmx_tile_layer)
+from engine.tiled_editor.tmx_tileset import (  # noqa: E402
+    get_tmx_tileset_image_path)
+
+DEFAULT_SIZES = '18x9,100x50,400x200'
+DEFAULT_ENCODINGS = 'csv,base64-zlib'
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, 'room_loading.json')
+
+
+def create_factory():
+    """Returns a factory creating floors, like the game's."""
+    factory = GenericFactory()
+    factory.add_recipe('floor', lambda **kwargs: ImmovableGameObject(
+        *(kwargs[key] for key in ('x', 'y', 'width', 'height'))))
+
+    return factory
+
+
+def time_stage(run, repeat, setup=None):
+    """Times a stage of loading, returning its result.
+
+    Args:
+        run (fn): Runs the stage. Called with the result of ``setup`` if it
+            is given, otherwise without arguments.
+        repeat (int): Number of times to run the stage.
+
+    Kwargs:
+        setup (fn, optional): Prepares each run of the stage, untimed.
+            Defaults to None.
+
+    Returns:
+        A dict of the fastest seconds and the seconds of the first run.
+    """
+    times = []
+
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+
+        start = perf_counter()
+        run(*args)
+        times.append(perf_counter() - start)
+
+    return {'seconds': min(times), 'first_seconds': times[0]}
+
+
+def measure_peak_memory(run):
+    """Returns the peak bytes allocated by Python while running a stage."""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_map(map_path, repeat, sprites):
+    """Times each stage of loading a map.
+
+    Args:
+        map_path (str): Path of the map, relative to the resource path.
+        repeat (int): Number of times to run each stage.
+        sprites (bool): Whether to time stages which need OpenGL.
+
+    Returns:
+        A dict of the result of each stage, by stage name.
+    """
+    factory = create_factory()
+
+    def parse():
+        DiskLoader.release(DiskLoader.load_xml(map_path))
+
+    def preload():
+        DiskLoader.release(load_tmx_preload(map_path).map_node)
+
+    results = {'parse': time_stage(parse, repeat)}
+
+    map_node = DiskLoader.load_xml(map_path)
+    tile_size = int(map_node.attrib['tilewidth'])
+    width_px = (int(map_node.attrib['width']) - 1) * tile_size
+    height_px = (int(map_node.attrib['height']) - 1) * tile_size
+
+    tile_layers = map_node.findall('layer')
+    object_layers = map_node.findall('objectgroup')
+    image_paths = {get_tmx_tileset_image_path(map_path, node)
+                   for node in map_node.findall('tileset')}
+
+    results['decode_tiles'] = time_stage(lambda: [
+        list(load_tmx_tile_layer(node)) for node in tile_layers], repeat)
+    results['decode_objects'] = time_stage(lambda: [
+        list(load_tmx_object_layer(width_px, height_px, node, {}))
+        for node in object_layers], repeat)
+    results['decode_images'] = time_stage(lambda: [
+        DiskLoader.decode_image(path) for path in image_paths], repeat)
+
+    DiskLoader.release(map_node)
+
+    results['preload'] = time_stage(preload, repeat)
+    results['preload']['peak_bytes'] = measure_peak_memory(preload)
+
+    if sprites:
+        results['create_sprites'] = time_stage(
+            lambda preloaded: TmxLoader(map_path, factory, preloaded),
+            repeat, setup=lambda: load_tmx_preload(map_path))
+
+        results['load'] = time_stage(
+            lambda: TmxLoader(map_path, factory), repeat)
+        results['load']['peak_bytes'] = measure_peak_memory(
+            lambda: TmxLoader(map_path, factory))
+
+    return results
+
+
+def parse_encoding(encoding):
+    """Returns the (encoding, compression) of an encoding argument."""
+    encoding, _, compression = encoding.partition('-')
+    return (encoding, compression or None)
+
+
+def main():
+    """Generates maps, times loading them, and writes and compares results."""
+    parser = argparse.ArgumentParser(
+        description='Measures loading generated TMX maps by stage.')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help='comma separated map sizes in tiles, as WxH')
+    parser.add_argument('--encodings', default=DEFAULT_ENCODINGS,
+                        help='comma separated tile data encodings, such as '
+                             'csv, base64, base64-zlib, or base64-gzip')
+    parser.add_argument('--layers', type=int, default=3,
+                        help='number of tile layers per map')
+    parser.add_argument('--object-density', type=float, default=0.01,
+                        help='objects per tile')
+    parser.add_argument('--tilesets', type=int, default=2,
+                        help='number of tilesets per map')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs to take the fastest of per stage')
+    parser.add_argument('--skip-sprites', action='store_true',
+                        help="skip stages which need OpenGL, for machines "
+                             "without a display")
+    parser.add_argument('--json', help='path to write results to as JSON')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE,
+                        help='results to compare against, defaulting to '
+                             'the stored baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='slowdown from the baseline which fails, as a '
+                             'fraction')
+    args = parser.parse_args()
+
+    if not args.skip_sprites:
+        import pyglet.window
+        window = pyglet.window.Window(visible=False)  # noqa: F841
+
+    results = {}
+    print('{0:<52}{1:>12}{2:>12}{3:>14}'.format(
+        'stage', 'fastest', 'first', 'peak memory'))
+
+    with TemporaryDirectory() as directory:
+        DiskLoader.set_resource_paths([directory])
+
+        # Evict released maps, so every load reads and parses from disk
+        DiskLoader.cache.budget = 0
+
+        for size in args.sizes.split(','):
+            width, height = map(int, size.split('x'))
+
+            for encoding in args.encodings.split(','):
+                tile_encoding, compression = parse_encoding(encoding)
+                name = '{0}x{1}x{2}/{3}/{4}-tilesets'.format(
+                    width, height, args.layers, encoding, args.tilesets)
+
+                map_path = write_tmx_map(
+                    directory, name.replace('/', '-'), width, height,
+                    layers=args.layers, encoding=tile_encoding,
+                    compression=compression,
+                    object_density=args.object_density,
+                    tilesets=args.tilesets)
+                DiskLoader.set_resource_paths([directory])
+
+                for stage, result in measure_map(
+                        map_path, args.repeat, not args.skip_sprites).items():
+                    results['{0}/{1}'.format(name, stage)] = result
+
+                    peak_bytes = result.get('peak_bytes')
+                    print('{0:<52}{1:>12}{2:>12}{3:>14}'.format(
+                        '{0}/{1}'.format(name, stage),
+                        format_seconds(result['seconds']),
+                        format_seconds(result['first_seconds']),
+                        '{0:.1f}MiB'.format(peak_bytes / 2 ** 20)
+                        if peak_bytes is not None else ''))
+
+    if args.json:
+        write_results(args.json, results)
+
+    if args.baseline:
+        print()
+        if compare_results(args.baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
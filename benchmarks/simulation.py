@@ -0,0 +1,329 @@
+"""Microbenchmarks of the engine's simulation, runnable without a window.
+
+Run from the repository root:
+
+    python benchmarks/simulation.py [--filter world_update] [--json out.json]
+        [--baseline benchmarks/baselines/simulation.json] [--threshold 0.25]
+
+Each benchmark is timed with :mod:`timeit`, calling it enough times to take
+at least 0.2 seconds, repeated several times. The fastest repeat is reported
+per call, since noise from the rest of the machine only ever adds time.
+
+World updates are measured over worlds of 10 to 10,000 objects by default.
+Pass ``--sizes 10,100,1000,10000,100000`` to include 100,000 objects, which
+takes several minutes per layout. Worlds are laid out as:
+
+* uniform: Objects scattered evenly, with occasional overlaps.
+* clustered: Objects in tight groups of eight, which all overlap.
+* row: A floor of adjacent tiles with a box resting on every tenth tile,
+    like the rooms of the game.
+
+Worlds are updated repeatedly, so overlapping colliders are pushed apart by
+the first updates and the rest measure the world at rest.
+
+Pass ``--baseline`` to compare against stored results, exiting with status 1
+if any benchmark slowed down by more than the threshold. Store new baselines
+by passing ``--json benchmarks/baselines/simulation.json``.
+"""
+
+from benchmark_results import (
+    BASELINE_DIR, ROOT_DIR, compare_results, format_seconds, write_results)
+from random import Random
+import argparse
+import os
+import sys
+import timeit
+
+os.environ.setdefault('PYGLET_SHADOW_WINDOW', 'False')
+os.environ.setdefault('PYGLET_AUDIO', 'silent')
+sys.path.insert(0, ROOT_DIR)
+
+from engine.collision import (  # noqa: E402
+    CollisionCache, PositionalCollisionCache, resolve_physical_collision)
+from engine.easing import LinearCurve, LinearInterpolation  # noqa: E402
+from engine.event_dispatcher import EventDispatcher  # noqa: E402
+from engine.game_object import (  # noqa: E402
+    GameObject, ImmovableGameObject, PhysicalGameObject)
+from engine.geometry import Point2d  # noqa: E402
+from engine.world import World2d  # noqa: E402
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, 'simulation.json')
+
+# Width and height of every object in the benchmark worlds
+OBJECT_SIZE = 8
+
+
+def create_uniform_world(size, random):
+    """Scatters objects evenly, with roughly one in ten overlapping."""
+    world = World2d()
+    extent = int((size * OBJECT_SIZE ** 2 * 16) ** 0.5)
+
+    for index in range(size):
+        x, y = random.randrange(extent), random.randrange(extent)
+        add_object(world, index, x, y)
+
+    return world
+
+
+def create_clustered_world(size, random):
+    """Groups objects in clusters of eight which overlap each other."""
+    world = World2d()
+    columns = int((size / 8) ** 0.5) + 1
+
+    for index in range(size):
+        cluster = index // 8
+        x = cluster % columns * OBJECT_SIZE * 8 + random.randrange(16)
+        y = cluster // columns * OBJECT_SIZE * 8 + random.randrange(16)
+        add_object(world, index, x, y)
+
+    return world
+
+
+def create_row_world(size, random):
+    """Lays a floor of tiles with boxes resting on every tenth tile.
+
+    One object in every eleven is a box, so a floor of ten tiles holds one.
+    """
+    world = World2d()
+    tiles = size - size // 11
+
+    for column in range(tiles):
+        world.add_collider(ImmovableGameObject(
+            column * OBJECT_SIZE, 0, OBJECT_SIZE, OBJECT_SIZE))
+
+    for column in range(0, tiles, 10)[:size - tiles]:
+        world.add_collider(PhysicalGameObject(
+            column * OBJECT_SIZE, OBJECT_SIZE, OBJECT_SIZE, OBJECT_SIZE))
+
+    return world
+
+
+def add_object(world, index, x, y):
+    """Adds a trigger for every tenth object, and colliders otherwise."""
+    if index % 10 == 0:
+        world.add_trigger(GameObject(x, y, OBJECT_SIZE, OBJECT_SIZE))
+    else:
+        world.add_collider(
+            PhysicalGameObject(x, y, OBJECT_SIZE, OBJECT_SIZE))
+
+
+WORLD_LAYOUTS = {
+    'uniform': create_uniform_world,
+    'clustered': create_clustered_world,
+    'row': create_row_world,
+}
+
+
+def setup_world_update(layout, size):
+    """Returns a function updating a world of objects."""
+    world = WORLD_LAYOUTS[layout](size, Random(size))
+    world.update(16)
+
+    return lambda: world.update(16)
+
+
+def setup_resolve_physical_collision():
+    """Returns a function resolving a falling box landing on a tile."""
+    box = PhysicalGameObject(0, 4, OBJECT_SIZE, OBJECT_SIZE)
+    tile = ImmovableGameObject(2, 0, OBJECT_SIZE, OBJECT_SIZE)
+    box.velocity = Point2d(2, -6)
+
+    def resolve():
+        box.set_position((0, 4))
+        resolve_physical_collision(box, tile)
+
+    return resolve
+
+
+def setup_run_simulation():
+    """Returns a function simulating an accelerating object."""
+    obj = PhysicalGameObject(0, 0, OBJECT_SIZE, OBJECT_SIZE, friction=50)
+    obj.acceleration = Point2d(3, 0)
+
+    return lambda: obj.run_simulation(16)
+
+
+def setup_point_2d(operation):
+    """Returns a function performing arithmetic on points."""
+    first, second = Point2d(3, 4), Point2d(-1, 7)
+
+    if operation == 'add':
+        return lambda: first + second
+    if operation == 'multiply':
+        return lambda: first * 3
+
+    def add_in_place():
+        point = Point2d(0, 0)
+        point += second
+
+    return add_in_place
+
+
+def setup_collision_cache_update(positional, size):
+    """Returns a function caching collisions for a frame then updating.
+
+    Half of the collisions are the same each frame and half are new, so the
+    cache both keeps and replaces entries.
+    """
+    cache = PositionalCollisionCache() if positional else CollisionCache()
+    objects = [GameObject(0, 0, 1, 1) for _ in range(size * 2)]
+    frame = [0]
+
+    def update():
+        offset = frame[0] % 2 * size // 2
+        pairs = zip(objects[:size // 2] + objects[size + offset:][:size // 2],
+                    objects[size // 2:size] + objects[offset:][:size // 2])
+
+        for first, second in pairs:
+            if positional:
+                cache.add_collision(first, second, (0, 1))
+            else:
+                cache.add_collision(first, second)
+
+        cache.update(16)
+        frame[0] += 1
+
+    return update
+
+
+class _Emitter(EventDispatcher):
+    """Dispatcher of a single benchmark event."""
+
+
+_Emitter.register_event_type('on_benchmark')
+
+
+def setup_event_dispatch(listeners):
+    """Returns a function dispatching an event to listeners."""
+    emitter = _Emitter()
+
+    for _ in range(listeners):
+        emitter.add_listeners(on_benchmark=lambda value: None)
+
+    return lambda: emitter.dispatch_event('on_benchmark', 1)
+
+
+def setup_easing(curve_type):
+    """Returns a function updating an easing curve and reading its value."""
+    if curve_type == 'linear_curve':
+        curve = LinearCurve(1000, 0, 1000)
+    else:
+        curve = LinearInterpolation(0.08, 0, 1000)
+
+    def update():
+        curve.update(16)
+        curve.value
+
+        if curve.is_done():
+            curve.reset(0, 1000)
+
+    return update
+
+
+def get_benchmarks(sizes):
+    """Returns the (name, setup) of every benchmark.
+
+    Args:
+        sizes (list of int): Numbers of objects to update worlds of.
+    """
+    benchmarks = [
+        ('world_update/{0}/{1}'.format(layout, size),
+         lambda layout=layout, size=size: setup_world_update(layout, size))
+        for layout in WORLD_LAYOUTS for size in sizes]
+
+    benchmarks += [
+        ('resolve_physical_collision', setup_resolve_physical_collision),
+        ('physics_run_simulation', setup_run_simulation),
+    ]
+
+    benchmarks += [
+        ('point_2d/' + operation, lambda operation=operation: setup_point_2d(
+            operation)) for operation in ('add', 'multiply', 'add_in_place')]
+
+    benchmarks += [
+        ('{0}/update/{1}'.format(cache, size),
+         lambda cache=cache, size=size: setup_collision_cache_update(
+             cache == 'positional_collision_cache', size))
+        for cache in ('collision_cache', 'positional_collision_cache')
+        for size in (10, 1000)]
+
+    benchmarks += [
+        ('event_dispatch/{0}'.format(listeners),
+         lambda listeners=listeners: setup_event_dispatch(listeners))
+        for listeners in (1, 10)]
+
+    benchmarks += [
+        ('easing/' + curve_type,
+         lambda curve_type=curve_type: setup_easing(curve_type))
+        for curve_type in ('linear_curve', 'linear_interpolation')]
+
+    return benchmarks
+
+
+def run_benchmark(setup, repeat):
+    """Times a benchmark, returning its result.
+
+    Args:
+        setup (fn): Returns the function to time.
+        repeat (int): Number of times to repeat the timing.
+
+    Returns:
+        A dict of the fastest and median seconds per call, and the number of
+        calls per repeat.
+    """
+    timer = timeit.Timer(setup())
+    number, _ = timer.autorange()
+    times = sorted(seconds / number for seconds in timer.repeat(
+        repeat, number))
+
+    return {
+        'seconds': times[0],
+        'median_seconds': times[len(times) // 2],
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def main():
+    """Runs the benchmarks, then writes and compares their results."""
+    parser = argparse.ArgumentParser(
+        description='Measures the speed of the engine simulation.')
+    parser.add_argument('--filter', default='',
+                        help='only run benchmarks with names containing this')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma separated numbers of world objects')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='timings to take the fastest of per benchmark')
+    parser.add_argument('--json', help='path to write results to as JSON')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE,
+                        help='results to compare against, defaulting to '
+                             'the stored baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='slowdown from the baseline which fails, as a '
+                             'fraction')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = {}
+    print('{0:<44}{1:>12}'.format('benchmark', 'per call'))
+
+    for name, setup in get_benchmarks(sizes):
+        if args.filter not in name:
+            continue
+
+        results[name] = run_benchmark(setup, args.repeat)
+        print('{0:<44}{1:>12}'.format(
+            name, format_seconds(results[name]['seconds'])))
+
+    if args.json:
+        write_results(args.json, results)
+
+    if args.baseline:
+        print()
+        if compare_results(args.baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+"""Generates synthetic TMX maps for measuring how room loading scales.
+
+Run from the repository root:
+
+    python benchmarks/tmx_generator.py OUTPUT_DIR [--width 400] [--height 200]
+        [--layers 3] [--encoding base64] [--compression zlib]
+        [--object-density 0.02] [--tilesets 2] [--seed 0]
+
+Maps are written to ``rooms/`` in the output directory, with their tileset
+images in ``tiles/``, matching the layout of ``resources/``. Add the output
+directory to the resource paths to load the maps with ``TmxLoader``.
+
+The first tile layer is filled, like a background, and every other layer has
+tiles in roughly a third of its cells. Objects are floors, one per tile at
+the given density, in a "collisions" object layer.
+"""
+
+from random import Random
+from xml.etree import ElementTree
+import argparse
+import base64
+import gzip
+import os
+import struct
+import zlib
+
+# Tileset images are a grid of tiles, like resources/tiles/tiles.png
+TILESET_COLUMNS = 8
+TILESET_ROWS = 4
+TILE_SIZE = 16
+
+ENCODINGS = ('csv', 'base64')
+COMPRESSIONS = {
+    None: bytes,
+    'zlib': zlib.compress,
+    'gzip': gzip.compress,
+}
+
+
+def write_tmx_map(directory, name, width, height, layers=2, encoding='csv',
+                  compression=None, object_density=0.01, tilesets=1,
+                  seed=0):
+    """Writes a TMX map and its tileset images.
+
+    Args:
+        directory (str): Path to the resource directory to write to.
+        name (str): Name of the map, without the extension.
+        width (int): Width of the map in tiles.
+        height (int): Height of the map in tiles.
+
+    Kwargs:
+        layers (int, optional): Number of tile layers. Defaults to 2.
+        encoding (str, optional): Tile data encoding, "csv" or "base64".
+            Defaults to "csv".
+        compression (str, optional): Compression of base64 tile data, "zlib"
+            or "gzip", or None for uncompressed. Defaults to None.
+        object_density (float, optional): Objects per tile of the map.
+            Defaults to 0.01.
+        tilesets (int, optional): Number of tilesets, each with its own
+            image. Defaults to 1.
+        seed (int, optional): Seed for placing tiles and objects, so the
+            same arguments always write the same map. Defaults to 0.
+
+    Returns:
+        The path of the map relative to the directory, such as
+        "rooms/name.tmx".
+
+    Raises:
+        ValueError: If the encoding or compression is not supported.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError('Unsupported encoding {0}'.format(encoding))
+
+    if compression not in COMPRESSIONS or (
+            compression is not None and encoding != 'base64'):
+        raise ValueError('Unsupported compression {0}'.format(compression))
+
+    random = Random(seed)
+    tiles_per_set = TILESET_COLUMNS * TILESET_ROWS
+    tile_count = tilesets * tiles_per_set
+
+    map_node = ElementTree.Element('map', {
+        'version': '1.2', 'tiledversion': '1.2.1',
+        'orientation': 'orthogonal', 'renderorder': 'right-down',
+        'width': str(width), 'height': str(height),
+        'tilewidth': str(TILE_SIZE), 'tileheight': str(TILE_SIZE),
+        'infinite': '0', 'nextlayerid': str(layers + 2),
+        'nextobjectid': '1'})
+
+    for index in range(tilesets):
+        image_name = 'generated-{0}.png'.format(index)
+        write_tileset_image(
+            os.path.join(directory, 'tiles', image_name), index)
+
+        tileset_node = ElementTree.SubElement(map_node, 'tileset', {
+            'firstgid': str(1 + index * tiles_per_set),
+            'name': 'generated-{0}'.format(index),
+            'tilewidth': str(TILE_SIZE), 'tileheight': str(TILE_SIZE),
+            'tilecount': str(tiles_per_set),
+            'columns': str(TILESET_COLUMNS)})
+        ElementTree.SubElement(tileset_node, 'image', {
+            'source': '../tiles/' + image_name,
+            'width': str(TILESET_COLUMNS * TILE_SIZE),
+            'height': str(TILESET_ROWS * TILE_SIZE)})
+
+    for index in range(layers):
+        # The first layer is a filled background
+        fill = 1 if index == 0 else 1 / 3
+        tiles = [random.randint(1, tile_count) if random.random() < fill
+                 else 0 for _ in range(width * height)]
+
+        layer_node = ElementTree.SubElement(map_node, 'layer', {
+            'id': str(index + 1), 'name': 'layer-{0}'.format(index),
+            'width': str(width), 'height': str(height)})
+        data_node = ElementTree.SubElement(
+            layer_node, 'data', {'encoding': encoding})
+        data_node.text = encode_tiles(tiles, width, encoding, compression)
+
+        if compression is not None:
+            data_node.attrib['compression'] = compression
+
+    object_group = ElementTree.SubElement(map_node, 'objectgroup', {
+        'id': str(layers + 1), 'name': 'collisions'})
+
+    object_count = int(width * height * object_density)
+    for object_id in range(1, object_count + 1):
+        ElementTree.SubElement(object_group, 'object', {
+            'id': str(object_id), 'type': 'floor',
+            'x': str(random.randrange(width) * TILE_SIZE),
+            'y': str(random.randrange(height) * TILE_SIZE),
+            'width': str(TILE_SIZE * random.randint(1, 4)),
+            'height': str(TILE_SIZE)})
+
+    map_node.attrib['nextobjectid'] = str(object_count + 1)
+
+    map_path = 'rooms/{0}.tmx'.format(name)
+    os.makedirs(os.path.join(directory, 'rooms'), exist_ok=True)
+    ElementTree.ElementTree(map_node).write(
+        os.path.join(directory, map_path), encoding='UTF-8',
+        xml_declaration=True)
+
+    return map_path
+
+
+def encode_tiles(tiles, width, encoding, compression):
+    """Encodes a layer's tileset indices as TMX tile data text."""
+    if encoding == 'base64':
+        data = struct.pack('<{0}I'.format(len(tiles)), *tiles)
+        return base64.b64encode(
+            COMPRESSIONS[compression](data)).decode('ascii')
+
+    rows = [','.join(map(str, tiles[start:start + width]))
+            for start in range(0, len(tiles), width)]
+    return '\n' + ',\n'.join(rows) + '\n'
+
+
+def write_tileset_image(path, index):
+    """Writes a tileset image with a distinct color for each tile."""
+    width = TILESET_COLUMNS * TILE_SIZE
+    height = TILESET_ROWS * TILE_SIZE
+    rows = []
+
+    for y in range(height):
+        row = bytearray()
+        for x in range(width):
+            tile = y // TILE_SIZE * TILESET_COLUMNS + x // TILE_SIZE
+            row += bytes((tile * 8 % 256, index * 40 % 256, 255 - tile, 255))
+
+        rows.append(bytes(row))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as png_file:
+        png_file.write(encode_png(width, height, rows))
+
+
+def encode_png(width, height, rows):
+    """Encodes rows of 8-bit RGBA pixels, top row first, as a PNG."""
+    def chunk(chunk_type, data):
+        return (struct.pack('>I', len(data)) + chunk_type + data +
+                struct.pack('>I', zlib.crc32(chunk_type + data)))
+
+    # Every row is prefixed with filter type 0, no filtering
+    pixels = b''.join(b'\x00' + row for row in rows)
+
+    return (b'\x89PNG\r\n\x1a\n' +
+            chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0,
+                                       0, 0)) +
+            chunk(b'IDAT', zlib.compress(pixels)) +
+            chunk(b'IEND', b''))
+
+
+def main():
+    """Writes a map from the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Generates a synthetic TMX map and tileset images.')
+    parser.add_argument('directory', help='resource directory to write to')
+    parser.add_argument('--name', default='generated',
+                        help='name of the map file, without extension')
+    parser.add_argument('--width', type=int, default=400,
+                        help='width of the map in tiles')
+    parser.add_argument('--height', type=int, default=200,
+                        help='height of the map in tiles')
+    parser.add_argument('--layers', type=int, default=3,
+                        help='number of tile layers')
+    parser.add_argument('--encoding', choices=ENCODINGS, default='csv',
+                        help='tile data encoding')
+    parser.add_argument('--compression', choices=('zlib', 'gzip'),
+                        help='compression of base64 tile data')
+    parser.add_argument('--object-density', type=float, default=0.01,
+                        help='objects per tile')
+    parser.add_argument('--tilesets', type=int, default=1,
+                        help='number of tilesets')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed for placing tiles and objects')
+    args = parser.parse_args()
+
+    map_path = write_tmx_map(
+        args.directory, args.name, args.width, args.height,
+        layers=args.layers, encoding=args.encoding,
+        compression=args.compression, object_density=args.object_density,
+        tilesets=args.tilesets, seed=args.seed)
+
+    print('Wrote {0}'.format(os.path.join(args.directory, map_path)))
+
+
+if __name__ == '__main__':
+    main()
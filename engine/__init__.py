@@ -0,0 +1,11 @@
+from engine.util.lazy_import import lazy_import
+
+# Subpackages are imported on first use, so tools which only need part of
+# the engine don't pay for importing pyglet's graphics and audio modules
+__getattr__, __dir__ = lazy_import(__name__, {
+    name: '.' + name for name in (
+        'audio', 'camera', 'collision', 'disk', 'easing', 'event_dispatcher',
+        'factory', 'game_object', 'geometry', 'graphics', 'key_handler',
+        'physics', 'profiler', 'room', 'save_game', 'tiled_editor', 'util',
+        'world')
+})
@@ -1,3 +1,15 @@
-from .audio_director import AudioDirector
+from engine.util.lazy_import import lazy_import
 
-__all__ = ['AudioDirector']
+__all__ = [
+    'AudioDirector',
+    'PrebufferedSource',
+    'SoftwareMixer',
+    'VoicePool',
+]
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'AudioDirector': '.audio_director',
+    'PrebufferedSource': '.prebuffered_source',
+    'SoftwareMixer': '.software_mixer',
+    'VoicePool': '.voice_pool',
+})
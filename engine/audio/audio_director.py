@@ -1,4 +1,6 @@
 from .audio_source import AudioSource
+from .prebuffered_source import PrebufferedSource
+from .voice_pool import VoicePool
 from engine import disk
 import pyglet.media
 
@@ -7,6 +9,22 @@ class AudioDirector(object):
     """Director for loading audio and controlling playback.
 
     Attributes:
+        audible_gain (float or None): The gain as heard by the listener
+            below which playing audio becomes a virtual voice, which is not
+            mixed and frees its hardware source. Virtual voices become real
+            again once their gain reaches it. The gain is each player's volume
+            attenuated by its distance, see
+            :fn:`engine.audio.audio_player.AudioPlayer.get_gain`. See
+            :fn:`update`. None to never use virtual voices.
+        virtual_voices (int): The number of virtual voices as of the last
+            :fn:`update`.
+        mixer (:obj:`audio.SoftwareMixer` or None): The mixer which plays
+            one-shot effects for :fn:`play_effect`, or None to play effects
+            on their own players.
+        prebuffer (float or None): Seconds of streaming audio to decode ahead
+            of playback on a worker thread, for newly loaded streaming audio.
+            None to decode streaming audio on demand. See
+            :cls:`engine.audio.PrebufferedSource`.
         attenuation_distance (int): The default attenuation distance for newly
             loaded audio. Existing audio will retain its attenuation distance,
             see :fn:`set_attenuation_distance` for setting distance on existing
@@ -18,6 +36,9 @@ class AudioDirector(object):
         position (tuple of int): The location of the audio listener in
             two-dimensional space. Listeners close to this position will be
             louder than those further away.
+        voice_pool (:obj:`audio.VoicePool`): The pool of players shared by
+            all audio loaded by this director, which caps how many sounds
+            play at once.
     """
 
     def __init__(self, master_volume=1, position=(0, 0)):
@@ -35,16 +56,31 @@ class AudioDirector(object):
         super(AudioDirector, self).__init__()
 
         self.attenuation_distance = 1
+        self.audible_gain = None
+        self.virtual_voices = 0
+        self.prebuffer = None
+        self.mixer = None
         self.master_volume = master_volume
         self.position = position
+        self.voice_pool = VoicePool()
 
         # Cache of loaded resources from disk
         self._disk_cache = {}
 
-        # Groupings for audio sources
+        # Groupings for audio sources, and their sources indexed by state
         self._groups = {
             'all': set()
         }
+        self._group_states = {
+            'all': {}
+        }
+
+        # Sources played by play_effect, whose frames end on each update
+        self._effect_sources = set()
+
+        # Groups and last known state of each grouped source
+        self._source_groups = {}
+        self._source_states = {}
 
     def load(self, filepath, streaming=True):
         """Loads and audio file from disk.
@@ -68,7 +104,13 @@ class AudioDirector(object):
         # Load the file from disk and cache it if necessary
         if filepath not in self._disk_cache:
             disk_file = disk.DiskLoader.load_audio(filepath, streaming)
-            new_source = AudioSource(disk_file, streaming)
+
+            if streaming and self.prebuffer is not None:
+                disk_file = PrebufferedSource(
+                    disk_file, prebuffer=self.prebuffer)
+
+            new_source = AudioSource(
+                disk_file, streaming, voice_pool=self.voice_pool)
 
             # Cache the new source
             self._disk_cache[filepath] = new_source
@@ -81,6 +123,47 @@ class AudioDirector(object):
 
         return self._disk_cache[filepath]
 
+    def unload(self, filepath):
+        """Stops and removes an audio file loaded with :fn:`load`.
+
+        The audio source is removed from all groups, and the audio file is
+        released so it can be evicted from the disk cache.
+
+        Args:
+            filepath (str): Path to audio, relative to the resource directory.
+        """
+        audio_source = self._disk_cache.pop(filepath, None)
+        if audio_source is None:
+            return
+
+        audio_source.stop()
+        self.voice_pool.discard(audio_source)
+        self._effect_sources.discard(audio_source)
+
+        state = self._source_states.pop(audio_source, None)
+
+        for group in self._source_groups.pop(audio_source, ()):
+            self._groups[group].discard(audio_source)
+            self._group_states[group][state].discard(audio_source)
+
+        # Prebuffered sources have a worker thread to stop
+        if isinstance(audio_source.source, PrebufferedSource):
+            audio_source.source.delete()
+        else:
+            disk.DiskLoader.release(audio_source.source)
+
+    @property
+    def underruns(self):
+        """Total underruns of loaded prebuffered audio. Read-only.
+
+        Each underrun is a time playback needed streaming audio which had not
+        been decoded ahead yet. A rising count means the prebuffer is too
+        small for how busy the game is.
+        """
+        return sum(audio_source.source.underruns
+                   for audio_source in self._disk_cache.values()
+                   if isinstance(audio_source.source, PrebufferedSource))
+
     def add(self, audio_source, group='all'):
         """Adds an audio source to a group.
 
@@ -88,6 +171,11 @@ class AudioDirector(object):
         rather than an individual source instance. By default, the audio source
         is added to the 'all' group.
 
+        Sources in each group are indexed by their state, which is kept up to
+        date from the source's ``on_play``, ``on_pause``, and ``on_stop``
+        events. This lets group operations only visit the sources they apply
+        to, such as pausing only the playing sources.
+
         Args:
             audio_source (:obj:`audio.AudioSource`): The audio source to add.
 
@@ -95,36 +183,136 @@ class AudioDirector(object):
             group (str, optional): The group to add the audio to.
                 Defaults to 'all'.
         """
+        if audio_source not in self._source_groups:
+            self._source_groups[audio_source] = set()
+            self._source_states[audio_source] = audio_source.state
+
+            audio_source.add_listeners(
+                on_play=self._update_source_state,
+                on_pause=self._update_source_state,
+                on_stop=self._update_source_state)
+
+        state = self._source_states[audio_source]
+
+        self._source_groups[audio_source].add(group)
         self._groups.setdefault(group, set()).add(audio_source)
+        self._group_states.setdefault(group, {}).setdefault(
+            state, set()).add(audio_source)
+
+    def _update_source_state(self, audio_source):
+        """Moves a source to the index for its new state in all its groups."""
+        # Sources may dispatch events after being unloaded
+        if audio_source not in self._source_states:
+            return
+
+        old_state = self._source_states[audio_source]
+        new_state = audio_source.state
+
+        if old_state == new_state:
+            return
+
+        self._source_states[audio_source] = new_state
+
+        for group in self._source_groups[audio_source]:
+            group_states = self._group_states[group]
+            group_states[old_state].discard(audio_source)
+            group_states.setdefault(new_state, set()).add(audio_source)
+
+    def update(self, ms):
+        """Plays coalesced effects and updates virtual voices.
+
+        Effects played with :fn:`play_effect` end their frame, playing any
+        coalesced triggers and counting the elapsed time towards their
+        minimum interval.
+
+        Players of loaded audio which are heard by the listener at less than
+        the audible gain become virtual voices, and virtual voices heard at
+        the audible gain or more become real again. Virtual voices advance
+        their playback time by the elapsed time. This should be called every
+        frame.
+
+        Args:
+            ms (int): The time since the last update, in milliseconds.
+        """
+        for audio_source in self._effect_sources:
+            audio_source.end_frame(ms)
+
+        self.virtual_voices = 0
+
+        if self.audible_gain is None:
+            return
+
+        for audio_source in self._groups['all']:
+            for player in list(audio_source.instances):
+                if player.get_gain(self._position) < self.audible_gain:
+                    player.make_virtual()
+                    player.advance(ms / 1000)
+
+                    if player.virtual:
+                        self.virtual_voices += 1
+                else:
+                    player.make_real()
+
+    def play_effect(self, audio_source, volume=1):
+        """Triggers a one-shot effect, through the mixer if one is set.
+
+        The effect is subject to the audio source's rate limits and
+        coalescing, see :fn:`audio.AudioSource.trigger`. Coalesced effects
+        are played by the next :fn:`update`. Mixed effects are attenuated and
+        panned relative to the listener, but can't be controlled once played.
+
+        Args:
+            audio_source (:obj:`audio.AudioSource`): The audio source to play.
+                It must not be streaming.
+
+        Kwargs:
+            volume (float, optional): Volume of this effect relative to the
+                source's volume. Defaults to 1.
+        """
+        if self.mixer is not None:
+            self.mixer.listener_position = self._position
+
+        audio_source.trigger(volume=volume, mixer=self.mixer)
+        self._effect_sources.add(audio_source)
 
     def _filter_sources(self, group='all', states=None):
-        """Returns all sources in the group matching the given states.
+        """Returns all sources in the groups matching the given states.
+
+        Only the state indexes of the groups are visited, so sources in other
+        states are never looked at.
 
         Kwargs:
-            group (str, optional): Name of group to filter. Defaults to 'all'.
+            group (str or list of str, optional): Name of the group to filter,
+                or a list of group names. Defaults to 'all'.
             states (list of int, optional): List of :cls:`AudioSource` states
                 to filter on. If the list is not empty and a source's state is
                 not in the list, it will be excluded from the return value.
 
         Returns:
-            An iterator containing sources in the group matching the states.
+            A set of the sources in the groups matching the states. Changes to
+            the state of the sources do not affect the returned set.
         """
-        # If the group does not exist, return an empty iterator
-        if group not in self._groups:
-            return iter(())
+        groups = (group,) if isinstance(group, str) else group
+        sources = set()
+
+        for name in groups:
+            if not states:
+                sources.update(self._groups.get(name, ()))
+                continue
+
+            group_states = self._group_states.get(name, {})
 
-        # If there are no states to filter on, return all sources in the group
-        if not states:
-            return iter(self._groups[group])
+            for state in states:
+                sources.update(group_states.get(state, ()))
 
-        # Return sources in the group matching the states to filter on
-        return filter(lambda src: src.state in states, self._groups[group])
+        return sources
 
     def play(self, group='all'):
         """Plays all audio sources in a group.
 
         Kwargs:
-            group (str, optional): Name of group to play. Defaults to 'all'.
+            group (str or list of str, optional): Name of the group to
+                play, or a list of group names. Defaults to 'all'.
         """
         for audio_source in self._filter_sources(group=group):
             audio_source.play()
@@ -135,7 +323,8 @@ class AudioDirector(object):
         Audio sources which are not currently playing will be left alone.
 
         Kwargs:
-            group (str, optional): Name of group to pause. Defaults to 'all'.
+            group (str or list of str, optional): Name of the group to
+                pause, or a list of group names. Defaults to 'all'.
         """
         states = [AudioSource.PLAY]
         for audio_source in self._filter_sources(group=group, states=states):
@@ -145,7 +334,8 @@ class AudioDirector(object):
         """Stops all audio sources in a group.
 
         Kwargs:
-            group (str, optional): Name of group to stop. Defaults to 'all'.
+            group (str or list of str, optional): Name of the group to
+                stop, or a list of group names. Defaults to 'all'.
         """
         states = [AudioSource.PLAY, AudioSource.PAUSE]
         for audio_source in self._filter_sources(group=group, states=states):
@@ -157,7 +347,8 @@ class AudioDirector(object):
         Audio sources which are not currently paused will be left alone.
 
         Kwargs:
-            group (str, optional): Name of group to resume. Defaults to 'all'.
+            group (str or list of str, optional): Name of the group to
+                resume, or a list of group names. Defaults to 'all'.
         """
         states = [AudioSource.PAUSE]
         for audio_source in self._filter_sources(group=group, states=states):
@@ -170,7 +361,8 @@ class AudioDirector(object):
             volume (float): 0 for silence, 1 for nominal volume.
 
         Kwargs:
-            group (str, optional): Group to set volume of. Defaults to 'all'.
+            group (str or list of str, optional): Name of the group to set
+                volume of, or a list of group names. Defaults to 'all'.
         """
         for audio_source in self._filter_sources(group=group):
             audio_source.volume = level
@@ -184,7 +376,8 @@ class AudioDirector(object):
                 nominal. Outside this distance, the volume approaches zero.
 
         Kwargs:
-            group (str, optional): Group to set distance of. Defaults to 'all'.
+            group (str or list of str, optional): Name of the group to set
+                distance of, or a list of group names. Defaults to 'all'.
         """
         for audio_source in self._filter_sources(group=group):
             audio_source.attenuation_distance = distance
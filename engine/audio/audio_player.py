@@ -1,4 +1,5 @@
 from engine import event_dispatcher
+from math import hypot
 import pyglet.media
 
 
@@ -17,6 +18,9 @@ class AudioPlayer(event_dispatcher.EventDispatcher):
         volume (float): 0 for silence, 1 for nominal volume.
         state (int): The current state of the audio playback. Will be one of
             ``AudioPlayer.PLAY``, ``AudioPlayer.PAUSE``, ``AudioPlayer.STOP``.
+        virtual (bool, read only): Whether the player is a virtual voice,
+            which advances its playback time without producing any audio.
+            See :fn:`make_virtual`.
 
     Events:
         on_play: The audio player has begun playing.
@@ -50,17 +54,24 @@ class AudioPlayer(event_dispatcher.EventDispatcher):
         self._player = pyglet.media.Player()
         self._player.push_handlers(on_player_eos=self._playback_finished)
         self._player.queue(source)
+        self._source = source
 
         self.looping = False
         self.state = AudioPlayer.STOP
         self._position = position
 
+        # Playback time of the source in seconds while virtual
+        self._virtual = False
+        self._virtual_time = 0
+
     def play(self):
         """Plays audio from where it left off.
 
         Dispatches an ``on_play`` event with this player.
         """
-        self._player.play()
+        if not self._virtual:
+            self._play_source()
+
         self.state = AudioPlayer.PLAY
         self.dispatch_event('on_play', self)
 
@@ -76,14 +87,106 @@ class AudioPlayer(event_dispatcher.EventDispatcher):
     def stop(self):
         """Stops the audio source, resetting its timestamp to the beginning.
 
-        Dispatches an ``on_stop`` event with this player.
+        Dispatches an ``on_stop`` event with this player. Virtual players
+        become real again once stopped.
         """
         self._player.pause()
         self._player.seek(0)
+        self._virtual = False
+        self._virtual_time = 0
 
         self.state = AudioPlayer.STOP
         self.dispatch_event('on_stop', self)
 
+    def make_virtual(self):
+        """Turns the player into a virtual voice, stopping its real playback.
+
+        Virtual voices free their underlying audio player, so they are not
+        mixed and do not use a hardware source. Their playback time only
+        advances when :fn:`advance` is called. Use this for players which are
+        too far from the listener to be heard.
+        """
+        if self._virtual:
+            return
+
+        self._virtual_time = self._player.time
+        self._player.pause()
+        self._player.delete()
+        self._virtual = True
+
+    def make_real(self):
+        """Turns a virtual voice back into real playback.
+
+        Playback resumes from the time the virtual voice advanced to.
+        """
+        if not self._virtual:
+            return
+
+        self._virtual = False
+
+        if self._player.source is None:
+            self._player.queue(self._source)
+
+        self._player.seek(self._virtual_time)
+
+        if self.state is AudioPlayer.PLAY:
+            self._play_source()
+
+    def advance(self, seconds):
+        """Advances the playback time of a playing virtual voice.
+
+        Virtual voices which reach the end of their source loop or stop, as
+        a real player would. This does nothing for real players.
+
+        Args:
+            seconds (float): The time to advance playback by, in seconds.
+        """
+        if not self._virtual or self.state is not AudioPlayer.PLAY:
+            return
+
+        self._virtual_time += seconds
+        duration = self._source.duration
+
+        # Sources of unknown duration play indefinitely
+        if duration is None or self._virtual_time < duration:
+            return
+
+        if self.looping and duration > 0:
+            self._virtual_time %= duration
+        else:
+            self.stop()
+
+    def get_gain(self, listener_position):
+        """Returns the gain of the player as heard by a listener.
+
+        The gain is the player's volume attenuated by its distance from the
+        listener, see :fn:`get_attenuation`. The master volume is not applied.
+
+        Args:
+            listener_position (tuple of int): The position of the listener.
+
+        Returns:
+            The gain as a float, 0 for silence and 1 for nominal volume.
+        """
+        x, y = self._position
+        distance = hypot(x - listener_position[0], y - listener_position[1])
+
+        return self.volume * get_attenuation(
+            self.attenuation_distance, distance)
+
+    @property
+    def virtual(self):
+        """Whether the player is a virtual voice. Read-only."""
+        return self._virtual
+
+    def _play_source(self):
+        """Plays the source on the underlying player."""
+        # Finished sources are removed from the player, so queue it again
+        if self._player.source is None:
+            self._player.queue(self._source)
+
+        self._player.play()
+
     def _playback_finished(self):
         """Called when playback of the audio source has finished.
 
@@ -130,3 +233,24 @@ class AudioPlayer(event_dispatcher.EventDispatcher):
     def attenuation_distance(self, distance):
         """Sets the attenuation distance of the player."""
         self._player.min_distance = distance
+
+
+def get_attenuation(attenuation_distance, distance):
+    """Returns the gain of audio at a distance from the listener.
+
+    Matches OpenAL's default inverse distance clamped model with a rolloff
+    factor of 1, as pyglet plays audio with. Audio has nominal volume within
+    the attenuation distance, and falls off in inverse proportion to its
+    distance beyond it.
+
+    Args:
+        attenuation_distance (float): Distance before audio attenuates.
+        distance (float): Distance of the audio from the listener.
+
+    Returns:
+        The gain as a float from 0 to 1.
+    """
+    if distance <= attenuation_distance:
+        return 1
+
+    return attenuation_distance / distance
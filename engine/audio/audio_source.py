@@ -1,14 +1,21 @@
 from .audio_player import AudioPlayer
+from .voice_pool import VoicePool
+from engine import event_dispatcher
 
 
-class AudioSource(object):
+class AudioSource(event_dispatcher.EventDispatcher):
     """Configures playback parameters for an audio source.
 
-    Playing an :obj:`audio.AudioSource` creates a new :obj:`audio.AudioPlayer`
-    from its playback parameters, and provides control for all existing player
-    instances.
+    Playing an :obj:`audio.AudioSource` acquires an :obj:`audio.AudioPlayer`
+    from its :obj:`audio.VoicePool` and applies its playback parameters, and
+    provides control for all existing player instances.
+
+    See :cls:`engine.event_dispatcher.EventDispatcher` for usage information on
+    the event dispatcher.
 
     Attributes:
+        source (:obj:`pyglet.media.Source`, read only): The audio source
+            which is played back.
         streaming (bool, read only): True if the audio source is streaming from
             disk, False if the audio source is loaded into memory. Streaming
             audio sources only support one instance of an
@@ -23,9 +30,36 @@ class AudioSource(object):
             from the listener.
         looping (bool): Whether the audio source loops its playback.
         volume (float): 0 for silence, 1 for nominal volume.
+        instances (list of :obj:`audio.AudioPlayer`, read only): The players
+            of this source which have not stopped.
+        state (int, read only): ``AudioSource.PLAY`` if any instance is
+            playing, ``AudioSource.PAUSE`` if any instance is paused, or
+            ``AudioSource.STOP`` otherwise.
+        min_interval (float): Minimum time between plays from
+            :fn:`trigger`, in seconds. Triggers within this time of the last
+            triggered play are dropped. Time is counted from the frame times
+            passed to :fn:`end_frame`, so replays drop the same triggers.
+        max_triggers_per_frame (int or None): Maximum plays from
+            :fn:`trigger` in a single frame, or None for no limit.
+        coalesce (bool): Whether triggers in the same frame are coalesced
+            into a single play at their combined volume when the frame ends.
+            See :fn:`end_frame`.
+
+    Events:
+        on_play: The source began playing. The source will be passed to the
+            listener.
+        on_pause: The source was paused. The source will be passed to the
+            listener.
+        on_stop: The source stopped. The source will be passed to the
+            listener.
     """
 
-    def __init__(self, source, streaming=False, position=(0, 0)):
+    PLAY = AudioPlayer.PLAY
+    PAUSE = AudioPlayer.PAUSE
+    STOP = AudioPlayer.STOP
+
+    def __init__(self, source, streaming=False, position=(0, 0),
+                 voice_pool=None):
         """Creates an audio source with default playback parameters.
 
         Args:
@@ -37,28 +71,49 @@ class AudioSource(object):
                 Defaults to False.
             position (tuple of int, optional): The location of this audio
                 source in two-dimensional space. Defaults to (0, 0)
+            voice_pool (:obj:`audio.VoicePool`, optional): The pool to acquire
+                players from, which may be shared with other sources.
+                Defaults to a new pool for this source.
         """
         super(AudioSource, self).__init__()
 
+        self.register_event_type('on_play')
+        self.register_event_type('on_pause')
+        self.register_event_type('on_stop')
+
+        self._state = AudioSource.STOP
         self._instances = []
         self._streaming = streaming
         self._source = source
+        self._voice_pool = voice_pool if voice_pool is not None \
+            else VoicePool()
 
         self._attenuation_distance = 1
         self.position = position
         self.looping = False
         self._volume = 1
 
+        # Rate limits and coalescing for one-shot triggers
+        self.min_interval = 0
+        self.max_triggers_per_frame = None
+        self.coalesce = False
+        self._frame_time_ms = 0
+        self._last_trigger_ms = None
+        self._frame_triggers = 0
+        self._pending_volume = 0
+        self._pending_mixer = None
+
     def play(self):
         """Plays an audio source, tracking the player internally.
 
         When the player's ``on_stop`` event is dispatched, the source will
         discard its strong reference to the player.
 
-        If there are no instances playing, a new :obj:`audio.AudioPlayer`
-        will be initialized and played. Otherwise, the first existing instance
-        will be returned for streaming sources, and a new instance will be
-        created for non-streaming sources.
+        If there are no instances playing, an :obj:`audio.AudioPlayer` will be
+        acquired from the voice pool and played. Otherwise, the first existing
+        instance will be returned for streaming sources, and another instance
+        will be acquired for non-streaming sources. If the voice pool is full,
+        an existing instance may be stopped to make room.
 
         The returned instance will have the same properties as this source.
         The properties on the :obj:`audio.AudioPlayer` can be set directly to
@@ -76,6 +131,95 @@ class AudioSource(object):
 
         return player
 
+    def trigger(self, volume=1, mixer=None):
+        """Plays the source as a one-shot effect, subject to rate limits.
+
+        Use this rather than :fn:`play` for effects which may be triggered
+        many times at once, such as collision sounds. Triggers within the
+        minimum interval of the last triggered play, or beyond the maximum
+        triggers for the frame, are dropped.
+
+        When coalescing, triggers are not played right away. Instead, every
+        trigger in the frame is combined into one play when :fn:`end_frame`
+        is called. Identical sounds played together sum, so the play is at
+        the sum of their volumes, up to nominal volume. This avoids both
+        phasing between the copies and playing each on its own player.
+
+        Kwargs:
+            volume (float, optional): Volume of this trigger relative to the
+                source's volume. Defaults to 1.
+            mixer (:obj:`audio.SoftwareMixer`, optional): Mixer to play the
+                effect through rather than on a player. Defaults to None.
+
+        Returns:
+            The :obj:`audio.AudioPlayer` instance if the trigger was played
+            on a player right away, otherwise None.
+        """
+        if self.coalesce:
+            self._pending_volume += volume
+            self._pending_mixer = mixer
+            return None
+
+        if not self._accept_trigger():
+            return None
+
+        return self._play_trigger(volume, mixer)
+
+    def end_frame(self, ms=0):
+        """Plays coalesced triggers and starts counting a new frame.
+
+        This should be called once per frame for sources which are triggered.
+        :obj:`audio.AudioDirector` does this for effects played with
+        :fn:`audio.AudioDirector.play_effect`.
+
+        Kwargs:
+            ms (int, optional): Length of the frame in milliseconds, which
+                counts towards the minimum interval. Defaults to 0.
+
+        Returns:
+            The :obj:`audio.AudioPlayer` instance if coalesced triggers were
+            played on a player, otherwise None.
+        """
+        player = None
+
+        if self._pending_volume and self._accept_trigger():
+            player = self._play_trigger(
+                min(self._pending_volume, 1), self._pending_mixer)
+
+        self._frame_time_ms += ms
+        self._frame_triggers = 0
+        self._pending_volume = 0
+        self._pending_mixer = None
+
+        return player
+
+    def _accept_trigger(self):
+        """Returns true and counts the trigger if it is within the limits."""
+        now = self._frame_time_ms
+
+        if self._last_trigger_ms is not None and \
+                now - self._last_trigger_ms < self.min_interval * 1000:
+            return False
+
+        if self.max_triggers_per_frame is not None and \
+                self._frame_triggers >= self.max_triggers_per_frame:
+            return False
+
+        self._last_trigger_ms = now
+        self._frame_triggers += 1
+        return True
+
+    def _play_trigger(self, volume, mixer):
+        """Plays a trigger through the mixer, or on a player."""
+        if mixer is not None:
+            mixer.play(self, volume=volume)
+            return None
+
+        player = self.play()
+        player.volume = self._volume * volume
+
+        return player
+
     def pause(self):
         """Pauses all playback instances of this audio source."""
         for instance in self._instances:
@@ -92,9 +236,20 @@ class AudioSource(object):
 
         Stopped instances are no longer tracked by this class to free memory.
         """
-        for instance in self._instances:
+        # Stopping an instance removes it from the list of instances
+        for instance in list(self._instances):
             instance.stop()
 
+    @property
+    def source(self):
+        """The :obj:`pyglet.media.Source` for playback. Read-only."""
+        return self._source
+
+    @property
+    def instances(self):
+        """The players of this source which have not stopped. Read-only."""
+        return self._instances
+
     @property
     def streaming(self):
         """Whether the audio source is streaming. Read-only."""
@@ -104,12 +259,12 @@ class AudioSource(object):
         """Returns a player instance for playback and tracks it.
 
         If a new instance is created, a listener for its ``on_stop`` event will
-        be added to untrack it once it stops.
+        be added to untrack it and release it to the voice pool once it stops.
 
-        A new :obj:`audio.AudioPlayer` will always be returned if the source
-        is not streaming or if no instance already exists for a streaming
-        source. The existing instance will be returned if an instance already
-        exists for a streaming source.
+        A player is always acquired from the voice pool if the source is not
+        streaming or if no instance already exists for a streaming source.
+        The existing instance will be returned if an instance already exists
+        for a streaming source.
 
         Returns:
             A :obj:`audio.AudioPlayer` instance.
@@ -118,15 +273,43 @@ class AudioSource(object):
         if self._streaming and self._instances:
             player = self._instances[0]
         else:
-            player = AudioPlayer(self._source)
-            player.add_listeners(on_stop=self._remove_instance)
+            player = self._voice_pool.acquire(
+                self, on_play=self._update_state, on_pause=self._update_state,
+                on_stop=self._remove_instance)
             self._instances.append(player)
 
         return player
 
     def _remove_instance(self, instance):
-        """Removes tracking for the given player instance."""
-        self._instances.remove(instance)
+        """Removes tracking for the given player and releases it."""
+        if instance in self._instances:
+            self._instances.remove(instance)
+
+        self._voice_pool.release(instance)
+        self._update_state(instance)
+
+    def _update_state(self, instance):
+        """Updates the source state after an instance changed state.
+
+        Dispatches the event for the new state if the source state changed.
+        """
+        states = set(player.state for player in self._instances)
+
+        if AudioSource.PLAY in states:
+            state = AudioSource.PLAY
+        elif AudioSource.PAUSE in states:
+            state = AudioSource.PAUSE
+        else:
+            state = AudioSource.STOP
+
+        if state != self._state:
+            self._state = state
+            self.dispatch_event(_STATE_EVENTS[state], self)
+
+    @property
+    def state(self):
+        """The combined state of all instances of the source. Read-only."""
+        return self._state
 
     @property
     def volume(self):
@@ -153,3 +336,11 @@ class AudioSource(object):
 
         for instance in self._instances:
             instance.attenuation_distance = self._attenuation_distance
+
+
+# Event dispatched for each source state
+_STATE_EVENTS = {
+    AudioSource.PLAY: 'on_play',
+    AudioSource.PAUSE: 'on_pause',
+    AudioSource.STOP: 'on_stop',
+}
@@ -0,0 +1,197 @@
+from collections import deque
+from pyglet.media.codecs.base import AudioData, StreamingSource
+import threading
+import time
+
+
+class PrebufferedSource(StreamingSource):
+    """Streaming audio source which decodes ahead on a worker thread.
+
+    pyglet decodes streaming sources on demand, when its media thread needs
+    more audio for a player. Wrapping a streaming source decodes it ahead of
+    playback instead, keeping a prebuffer of decoded audio filled from a
+    worker thread. Playback then only reads already decoded audio, so it is
+    not held up by decoding.
+
+    When playback needs audio before the worker has decoded it, the buffer
+    has underrun. Playback waits for the worker and the underrun is counted,
+    which shows when the prebuffer is too small.
+
+    Attributes:
+        source (:obj:`pyglet.media.Source`): The wrapped streaming source.
+        prebuffer (float): Seconds of audio to decode ahead of playback.
+        underruns (int): The number of times playback needed audio which had
+            not been decoded yet.
+        underrun_time (float): The total time playback waited on the worker
+            during underruns, in seconds.
+    """
+
+    def __init__(self, source, prebuffer=2.0, block_size=16384,
+                 timeout=1.0):
+        """Starts decoding ahead from a streaming source.
+
+        Args:
+            source (:obj:`pyglet.media.Source`): The streaming source to
+                decode. Its audio is only read by the worker thread.
+
+        Kwargs:
+            prebuffer (float, optional): Seconds of audio to decode ahead of
+                playback. Defaults to 2.
+            block_size (int, optional): Bytes to decode at a time. Defaults
+                to 16384.
+            timeout (float, optional): Seconds to wait for the worker during
+                an underrun before giving up on the audio, which ends
+                playback early. Defaults to 1.
+        """
+        super(PrebufferedSource, self).__init__()
+        self.source = source.get_queue_source()
+        self.prebuffer = prebuffer
+        self.underruns = 0
+        self.underrun_time = 0
+
+        self.audio_format = self.source.audio_format
+        self.video_format = None
+        self.info = self.source.info
+        self._duration = self.source.duration
+
+        self._block_size = block_size
+        self._timeout = timeout
+
+        # Decoded (data, timestamp) blocks and the bytes they hold
+        self._buffer = deque()
+        self._buffered_bytes = 0
+
+        # Guards the buffer. Decoding and seeking the source hold the decode
+        # lock, and seeking starts a new generation of decoded blocks.
+        self._condition = threading.Condition()
+        self._decode_lock = threading.Lock()
+        self._generation = 0
+        self._finished = False
+        self._closed = False
+
+        self._worker = threading.Thread(
+            target=self._decode_ahead, name='PrebufferedSource', daemon=True)
+        self._worker.start()
+
+    @property
+    def buffered_time(self):
+        """Seconds of decoded audio waiting to be played. Read-only."""
+        if self.audio_format is None:
+            return 0
+
+        return self._buffered_bytes / self.audio_format.bytes_per_second
+
+    def get_audio_data(self, num_bytes, compensation_time=0.0):
+        """Returns the next decoded audio for playback.
+
+        Args:
+            num_bytes (int): The maximum number of bytes to return.
+
+        Kwargs:
+            compensation_time (float, optional): Unused.
+
+        Returns:
+            A :obj:`pyglet.media.codecs.AudioData`, or None once the source
+            has finished.
+        """
+        if self.audio_format is None:
+            return None
+
+        # Only whole samples are returned
+        num_bytes -= num_bytes % self.audio_format.bytes_per_sample
+
+        with self._condition:
+            if not self._buffer and not self._finished:
+                self._wait_for_worker()
+
+            if not self._buffer:
+                return None
+
+            data, timestamp = self._buffer[0]
+
+            if len(data) > num_bytes:
+                self._buffer[0] = (data[num_bytes:], timestamp + (
+                    num_bytes / self.audio_format.bytes_per_second))
+                data = data[:num_bytes]
+            else:
+                self._buffer.popleft()
+
+            self._buffered_bytes -= len(data)
+            self._condition.notify_all()
+
+        duration = len(data) / self.audio_format.bytes_per_second
+        return AudioData(data, len(data), timestamp, duration, [])
+
+    def seek(self, timestamp):
+        """Moves playback to a time, discarding the decoded audio.
+
+        Args:
+            timestamp (float): Time to seek to, in seconds.
+        """
+        with self._decode_lock:
+            self.source.seek(timestamp)
+
+            with self._condition:
+                self._generation += 1
+                self._buffer.clear()
+                self._buffered_bytes = 0
+                self._finished = False
+                self._condition.notify_all()
+
+    def delete(self):
+        """Stops the worker thread and releases the wrapped source."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._worker.join()
+
+        if isinstance(self.source, StreamingSource):
+            self.source.delete()
+
+    def _wait_for_worker(self):
+        """Waits for the worker to decode audio, counting an underrun."""
+        self.underruns += 1
+        start = time.perf_counter()
+
+        self._condition.wait_for(
+            lambda: self._buffer or self._finished or self._closed,
+            timeout=self._timeout)
+
+        self.underrun_time += time.perf_counter() - start
+
+    def _decode_ahead(self):
+        """Keeps the buffer filled until the source is deleted."""
+        if self.audio_format is None:
+            return
+
+        def needs_audio():
+            target_bytes = self.prebuffer * self.audio_format.bytes_per_second
+            return not self._finished and self._buffered_bytes < target_bytes
+
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or needs_audio())
+
+                if self._closed:
+                    return
+
+            with self._decode_lock:
+                # Seeks hold the decode lock, so this block follows the last
+                generation = self._generation
+                audio_data = self.source.get_audio_data(self._block_size)
+
+            with self._condition:
+                # Audio decoded before a seek is out of date
+                if generation != self._generation:
+                    continue
+
+                if audio_data is None:
+                    self._finished = True
+                else:
+                    data = audio_data.get_string_data()
+                    self._buffer.append((data, audio_data.timestamp))
+                    self._buffered_bytes += len(data)
+
+                self._condition.notify_all()
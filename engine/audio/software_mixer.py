@@ -0,0 +1,296 @@
+from .audio_player import get_attenuation
+from math import hypot, sqrt
+from pyglet.media.codecs.base import AudioData, AudioFormat, StreamingSource
+from weakref import WeakKeyDictionary
+import pyglet.media
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class SoftwareMixer(StreamingSource):
+    """Mixes one-shot sound effects in software into a single output.
+
+    Each :obj:`audio.AudioPlayer` uses its own hardware voice, and pyglet
+    services each of them separately. The mixer instead sums every effect
+    played through it into one stereo stream with NumPy, so dozens of
+    overlapping effects cost one voice, and one callback per block of audio.
+
+    The volume and attenuation of each effect is applied as an
+    :obj:`audio.AudioPlayer` would, from the audio source's volume, position,
+    and attenuation distance relative to the listener. Position also pans the
+    effect between the left and right channels. Effects can't be paused or
+    stopped once mixed, so use players for anything longer than a short
+    effect.
+
+    Audio drivers buffer about a second of a player's audio, and an effect
+    can only start after the audio mixed before it. The mixer stops mixing
+    once it is :attr:`latency` ahead of its player, so effects are heard
+    within that time of being played.
+
+    NumPy is an optional dependency, check :attr:`available` before creating
+    a mixer.
+
+    Attributes:
+        available (bool): Whether NumPy is installed, which the mixer needs.
+        block_size (int): The number of sample frames mixed at a time.
+        latency (float): Seconds of audio to mix ahead of playback.
+        max_voices (int): Maximum number of effects mixed at once. The oldest
+            effect is dropped to make room for a new one.
+        listener_position (tuple of int): The location of the listener in
+            two-dimensional space, which effects attenuate and pan from.
+    """
+
+    available = numpy is not None
+
+    def __init__(self, sample_rate=44100, block_size=1024, latency=0.1,
+                 max_voices=64):
+        """Creates a mixer which is not playing any effects.
+
+        Kwargs:
+            sample_rate (int, optional): Sample rate of the mixed output.
+                Effects at other rates are resampled once, when they are
+                first played. Defaults to 44100.
+            block_size (int, optional): The number of sample frames mixed at
+                a time. Defaults to 1024.
+            latency (float, optional): Seconds of audio to mix ahead of
+                playback. This must be longer than the audio driver takes to
+                refill its buffer, which is 0.05 seconds for OpenAL.
+                Defaults to 0.1.
+            max_voices (int, optional): Maximum number of effects mixed at
+                once. Defaults to 64.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if numpy is None:
+            raise ImportError('The software mixer requires NumPy')
+
+        super(SoftwareMixer, self).__init__()
+        self.audio_format = AudioFormat(2, 16, sample_rate)
+        self.video_format = None
+        self._duration = None
+
+        self.block_size = block_size
+        self.latency = latency
+        self.max_voices = max_voices
+        self._listener_position = (0, 0)
+
+        # Effects being mixed, which the media thread mixes from
+        self._voices = []
+        self._lock = threading.Lock()
+
+        # Mono float samples at the output rate, by decoded source
+        self._samples = WeakKeyDictionary()
+
+        self._player = None
+        self._timestamp = 0
+
+    def start(self):
+        """Starts playing the mixed output on its own player."""
+        if self._player is None:
+            self._player = pyglet.media.Player()
+            self._player.queue(self)
+
+            # Drivers which end the output when mixing stops restart it
+            self._player.loop = True
+            self._move_player()
+
+        self._player.play()
+
+    def stop(self):
+        """Stops the mixed output, dropping every effect being mixed."""
+        with self._lock:
+            self._voices.clear()
+
+        if self._player is not None:
+            self._player.pause()
+
+    def play(self, audio_source, volume=1):
+        """Mixes one playback of an audio source into the output.
+
+        Args:
+            audio_source (:obj:`audio.AudioSource`): The audio source to play.
+                It must not be streaming.
+
+        Kwargs:
+            volume (float, optional): Volume of this playback relative to the
+                source's volume. Defaults to 1.
+
+        Raises:
+            ValueError: If the audio source is streaming.
+        """
+        if audio_source.streaming:
+            raise ValueError('Streaming audio can not be mixed')
+
+        samples = self._get_samples(audio_source.source)
+        left, right = self._get_gains(audio_source)
+
+        with self._lock:
+            if len(self._voices) >= self.max_voices:
+                self._voices.pop(0)
+
+            self._voices.append(
+                _MixerVoice(samples, left * volume, right * volume))
+
+    @property
+    def active_voices(self):
+        """The number of effects being mixed. Read-only."""
+        return len(self._voices)
+
+    @property
+    def listener_position(self):
+        """The listener location in 2d space as a tuple-like type."""
+        return self._listener_position
+
+    @listener_position.setter
+    def listener_position(self, position):
+        """Sets the listener location that effects attenuate and pan from."""
+        self._listener_position = position
+        self._move_player()
+
+    def get_audio_data(self, num_bytes, compensation_time=0.0):
+        """Mixes the next block of audio for playback.
+
+        The mixer returns silence while no effects are being mixed. Once it is
+        :attr:`latency` ahead of its player it returns None, which the audio
+        driver retries on its next refill.
+
+        Args:
+            num_bytes (int): The maximum number of bytes to return.
+
+        Kwargs:
+            compensation_time (float, optional): Unused.
+
+        Returns:
+            A :obj:`pyglet.media.codecs.AudioData` of mixed audio, or None if
+            mixed far enough ahead of playback.
+        """
+        if self._player is not None and \
+                self._timestamp - self._player.time >= self.latency:
+            return None
+
+        frames = min(self.block_size,
+                     num_bytes // self.audio_format.bytes_per_sample)
+        data = self.mix(frames)
+
+        timestamp = self._timestamp
+        duration = frames / self.audio_format.sample_rate
+        self._timestamp += duration
+
+        return AudioData(data, len(data), timestamp, duration, [])
+
+    def mix(self, frames):
+        """Mixes the next frames of every effect, advancing their playback.
+
+        Args:
+            frames (int): The number of sample frames to mix.
+
+        Returns:
+            The mixed audio as interleaved signed 16-bit stereo bytes.
+        """
+        mixed = numpy.zeros((frames, 2), dtype=numpy.float32)
+
+        with self._lock:
+            for voice in self._voices:
+                samples = voice.samples[voice.offset:voice.offset + frames]
+                mixed[:len(samples), 0] += samples * voice.left
+                mixed[:len(samples), 1] += samples * voice.right
+                voice.offset += frames
+
+            self._voices = [voice for voice in self._voices
+                            if voice.offset < len(voice.samples)]
+
+        numpy.clip(mixed * 32767, -32768, 32767, out=mixed)
+        return mixed.astype('<i2').tobytes()
+
+    def seek(self, timestamp):
+        """Restarts the output's timestamps, since the mixed output is live.
+
+        Args:
+            timestamp (float): Time to seek to, in seconds.
+        """
+        self._timestamp = timestamp
+
+    def _get_samples(self, source):
+        """Returns the mono samples of a static source at the output rate."""
+        samples = self._samples.get(source)
+
+        if samples is None:
+            samples = _decode_samples(source, self.audio_format.sample_rate)
+            self._samples[source] = samples
+
+        return samples
+
+    def _get_gains(self, audio_source):
+        """Returns the (left, right) gains of an audio source."""
+        x = audio_source.position[0] - self._listener_position[0]
+        y = audio_source.position[1] - self._listener_position[1]
+        distance = hypot(x, y)
+
+        gain = audio_source.volume * get_attenuation(
+            audio_source.attenuation_distance, distance)
+
+        # Equal power panning by the horizontal direction to the source
+        pan = x / distance if distance else 0
+        return (gain * sqrt((1 - pan) / 2), gain * sqrt((1 + pan) / 2))
+
+    def _move_player(self):
+        """Keeps the output player at the listener, so it isn't attenuated."""
+        if self._player is not None:
+            x, y = self._listener_position
+            self._player.position = (x, y, 0)
+
+
+class _MixerVoice(object):
+    """An effect being mixed, with its playback offset and channel gains."""
+
+    def __init__(self, samples, left, right):
+        """Creates a voice mixing samples from the start."""
+        super(_MixerVoice, self).__init__()
+        self.samples = samples
+        self.offset = 0
+        self.left = left
+        self.right = right
+
+
+def _decode_samples(source, sample_rate):
+    """Decodes a static source into mono float samples at a sample rate."""
+    queue_source = source.get_queue_source()
+    if queue_source is None:
+        return numpy.zeros(0, dtype=numpy.float32)
+
+    audio_format = queue_source.audio_format
+    chunks = []
+
+    while True:
+        audio_data = queue_source.get_audio_data(1 << 20)
+        if not audio_data:
+            break
+
+        chunks.append(audio_data.get_string_data())
+
+    data = b''.join(chunks)
+
+    if audio_format.sample_size == 8:
+        samples = (numpy.frombuffer(data, dtype=numpy.uint8)
+                   .astype(numpy.float32) - 128) / 128
+    else:
+        samples = numpy.frombuffer(
+            data, dtype='<i2').astype(numpy.float32) / 32768
+
+    # Down mix to mono, since effects are panned by their position
+    if audio_format.channels > 1:
+        samples = samples.reshape(-1, audio_format.channels).mean(axis=1)
+
+    if audio_format.sample_rate != sample_rate:
+        duration = len(samples) / audio_format.sample_rate
+        times = numpy.arange(int(duration * sample_rate)) / sample_rate
+        samples = numpy.interp(
+            times, numpy.arange(len(samples)) / audio_format.sample_rate,
+            samples).astype(numpy.float32)
+
+    return samples
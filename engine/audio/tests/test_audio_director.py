@@ -1,5 +1,6 @@
 from ..audio_director import AudioDirector
-from unittest.mock import Mock, patch
+from ..prebuffered_source import PrebufferedSource
+from unittest.mock import call, Mock, patch
 import unittest
 
 
@@ -59,9 +60,10 @@ class TestAudioDirector(unittest.TestCase):
         MockLoader.load_audio.assert_called_once_with(
             'audio.wav', stream_mock)
 
-        # Audio source was initialized from disk object
+        # Audio source was initialized from disk object with shared voices
         MockSource.assert_called_once_with(
-            MockLoader.load_audio.return_value, stream_mock)
+            MockLoader.load_audio.return_value, stream_mock,
+            voice_pool=self.director.voice_pool)
 
         self.assertEqual(
             MockSource.return_value, loaded_source,
@@ -109,6 +111,104 @@ class TestAudioDirector(unittest.TestCase):
             1234, MockSource.return_value.attenuation_distance,
             'Attenuation distance not set on loaded audio')
 
+    @patch('engine.audio.audio_director.AudioSource')
+    @patch('engine.disk.DiskLoader')
+    def test_unload_releases_audio_source(self, MockLoader, MockSource):
+        """Unloaded audio files are stopped, ungrouped, and released."""
+        audio_source = self.director.load('audio.wav')
+        self.director.add(audio_source, group='sfx')
+
+        self.director.unload('audio.wav')
+
+        audio_source.stop.assert_called_once()
+        MockLoader.release.assert_called_once_with(audio_source.source)
+
+        # Audio source was removed from all groups
+        audio_source.reset_mock()
+        self.director.play()
+        self.director.play(group='sfx')
+        audio_source.play.assert_not_called()
+
+        # Loading the audio again reads it from disk
+        self.director.load('audio.wav')
+        self.assertEqual(2, MockLoader.load_audio.call_count)
+
+    @patch('engine.audio.audio_director.PrebufferedSource')
+    @patch('engine.audio.audio_director.AudioSource')
+    @patch('engine.disk.DiskLoader')
+    def test_load_prebuffers_streaming_audio(self, MockLoader, MockSource,
+                                             MockPrebuffered):
+        """Streaming audio is decoded ahead once a prebuffer is set."""
+        self.director.load('effect.wav', streaming=False)
+        MockPrebuffered.assert_not_called()
+
+        self.director.prebuffer = 3
+        self.director.load('music.ogg')
+
+        MockPrebuffered.assert_called_once_with(
+            MockLoader.load_audio.return_value, prebuffer=3)
+        MockSource.assert_called_with(
+            MockPrebuffered.return_value, True,
+            voice_pool=self.director.voice_pool)
+
+    @patch('engine.audio.audio_director.AudioSource')
+    @patch('engine.disk.DiskLoader')
+    def test_unload_deletes_prebuffered_audio(self, MockLoader, MockSource):
+        """Unloading prebuffered audio stops its worker thread."""
+        audio_source = self.director.load('music.ogg')
+        audio_source.source = Mock(spec=PrebufferedSource)
+
+        self.director.unload('music.ogg')
+
+        audio_source.source.delete.assert_called_once_with()
+        MockLoader.release.assert_not_called()
+
+    def test_underruns_sums_prebuffered_audio(self):
+        """Underruns are totalled over loaded prebuffered audio."""
+        self.director._disk_cache = {
+            'a.ogg': Mock(source=Mock(spec=PrebufferedSource, underruns=2)),
+            'b.ogg': Mock(source=Mock(spec=PrebufferedSource, underruns=3)),
+            'c.wav': Mock(),
+        }
+
+        self.assertEqual(5, self.director.underruns)
+
+    def test_play_effect_without_mixer(self):
+        """Effects are triggered on their own players without a mixer."""
+        audio_source = Mock()
+
+        self.director.play_effect(audio_source, volume=0.5)
+
+        audio_source.trigger.assert_called_once_with(volume=0.5, mixer=None)
+
+    def test_play_effect_with_mixer(self):
+        """Effects are mixed relative to the listener with a mixer."""
+        audio_source = Mock()
+        self.director.mixer = Mock()
+        self.director._position = (1, 2)
+
+        self.director.play_effect(audio_source)
+
+        audio_source.trigger.assert_called_once_with(
+            volume=1, mixer=self.director.mixer)
+        self.assertEqual((1, 2), self.director.mixer.listener_position)
+
+    def test_update_ends_frame_of_effects(self):
+        """Updates end the frame of each effect with the elapsed time."""
+        audio_source = Mock()
+        self.director.play_effect(audio_source)
+        self.director.play_effect(audio_source)
+
+        self.director.update(16)
+        self.director.update(20)
+
+        self.assertEqual([call(16), call(20)],
+                         audio_source.end_frame.call_args_list)
+
+    def test_unload_ignores_unknown_audio(self):
+        """Unloading audio which was not loaded does nothing."""
+        self.director.unload('audio.wav')
+
     def test_add_defaults_to_all_group(self):
         """Adding an audio source defaults to the 'all' group."""
         # Adding a source without a group should default to 'all' group
@@ -636,3 +736,120 @@ class TestAudioDirector(unittest.TestCase):
             0.5, self.director.master_volume, 'Director volume was not set')
         self.assertEqual(
             0.5, mock_listener.volume, 'Listener volume not set')
+
+    def create_mock_player(self, gains):
+        """Returns a mock player with gains by listener position."""
+        mock_player = Mock(virtual=False)
+        mock_player.get_gain.side_effect = lambda position: gains[position]
+        mock_player.make_virtual.side_effect = lambda: setattr(
+            mock_player, 'virtual', True)
+        mock_player.make_real.side_effect = lambda: setattr(
+            mock_player, 'virtual', False)
+
+        return mock_player
+
+    def test_update_virtualizes_inaudible_players(self):
+        """Players heard below the audible gain become virtual voices."""
+        near_player = self.create_mock_player({(0, 0): 0.5, (9, 12): 0.01})
+        far_player = self.create_mock_player({(0, 0): 0.01, (9, 12): 0.05})
+        self.director.add(Mock(instances=[near_player, far_player]))
+        self.director._position = (0, 0)
+        self.director.audible_gain = 0.05
+
+        self.director.update(500)
+
+        near_player.make_real.assert_called_once_with()
+        near_player.make_virtual.assert_not_called()
+        far_player.make_virtual.assert_called_once_with()
+        far_player.advance.assert_called_once_with(0.5)
+        self.assertEqual(1, self.director.virtual_voices)
+
+        # Moving the listener promotes the far player and demotes the near one
+        self.director._position = (9, 12)
+        self.director.update(500)
+
+        far_player.make_real.assert_called_once_with()
+        near_player.make_virtual.assert_called_once_with()
+        self.assertEqual(1, self.director.virtual_voices)
+
+    def test_update_without_audible_gain(self):
+        """Players are never virtualized without an audible gain."""
+        player = self.create_mock_player({(0, 0): 0})
+        self.director.add(Mock(instances=[player]))
+
+        self.director.update(500)
+
+        player.make_virtual.assert_not_called()
+        self.assertEqual(0, self.director.virtual_voices)
+
+    @patch('engine.audio.audio_director.AudioSource')
+    def test_state_index_follows_source_events(self, MockSource):
+        """Group operations use the latest state dispatched by sources."""
+        mock_source = Mock(state=MockSource.STOP)
+        self.director.add(mock_source)
+        self.director.add(mock_source, group='test')
+
+        # The director listens for state changes of the source once
+        mock_source.add_listeners.assert_called_once_with(
+            on_play=self.director._update_source_state,
+            on_pause=self.director._update_source_state,
+            on_stop=self.director._update_source_state)
+
+        self.director.pause(group='test')
+        mock_source.pause.assert_not_called()
+
+        # Playing sources are moved to the playing index of every group
+        mock_source.state = MockSource.PLAY
+        self.director._update_source_state(mock_source)
+
+        self.director.pause()
+        self.director.pause(group='test')
+        self.assertEqual(2, mock_source.pause.call_count)
+
+        # Stopped sources are removed from the playing index
+        mock_source.state = MockSource.STOP
+        self.director._update_source_state(mock_source)
+
+        self.director.stop(group='test')
+        mock_source.stop.assert_not_called()
+
+    @patch('engine.audio.audio_director.AudioSource')
+    def test_operations_on_several_groups(self, MockSource):
+        """Operations apply once to each source in any of several groups."""
+        mock_music = Mock(state=MockSource.PLAY)
+        mock_sfx = Mock(state=MockSource.PLAY)
+        mock_ui = Mock(state=MockSource.PLAY)
+
+        self.director.add(mock_music, group='music')
+        self.director.add(mock_sfx, group='sfx')
+        self.director.add(mock_sfx, group='room')
+        self.director.add(mock_ui, group='ui')
+
+        self.director.pause(group=['music', 'sfx', 'room', 'empty'])
+
+        mock_music.pause.assert_called_once()
+        mock_sfx.pause.assert_called_once()
+        mock_ui.pause.assert_not_called()
+
+        self.director.set_volume(0.5, group=('music', 'ui'))
+
+        self.assertEqual(0.5, mock_music.volume)
+        self.assertEqual(0.5, mock_ui.volume)
+        self.assertNotEqual(0.5, mock_sfx.volume)
+
+    @patch('engine.audio.audio_director.AudioSource')
+    @patch('engine.disk.DiskLoader')
+    def test_unload_removes_source_from_state_index(self, MockLoader,
+                                                    MockSource):
+        """Unloaded sources are no longer indexed by their state."""
+        audio_source = self.director.load('audio.wav')
+        audio_source.state = MockSource.PLAY
+        self.director._update_source_state(audio_source)
+
+        self.director.unload('audio.wav')
+        audio_source.reset_mock()
+
+        # Events dispatched after unloading are ignored
+        self.director._update_source_state(audio_source)
+        self.director.pause()
+        audio_source.pause.assert_not_called()
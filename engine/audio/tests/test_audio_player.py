@@ -1,4 +1,4 @@
-from ..audio_player import AudioPlayer
+from ..audio_player import AudioPlayer, get_attenuation
 from unittest.mock import Mock, patch
 import unittest
 import gc
@@ -45,6 +45,99 @@ class TestAudioPlayer(unittest.TestCase):
 
         self.mock_player.play.assert_called_once()
 
+    def test_playing_finished_audio_queues_source(self):
+        """Audio which finished playing is queued again to replay it."""
+        self.mock_player.source = None
+
+        self.player.play()
+
+        self.assertEqual(2, self.mock_player.queue.call_count)
+        self.mock_player.queue.assert_called_with(self.mock_source)
+        self.mock_player.play.assert_called_once()
+
+    def test_make_virtual_frees_player(self):
+        """Virtual voices stop real playback and remember the time."""
+        self.mock_player.time = 1.5
+        self.player.play()
+
+        self.player.make_virtual()
+
+        self.assertTrue(self.player.virtual)
+        self.mock_player.pause.assert_called_once()
+        self.mock_player.delete.assert_called_once()
+
+        # Playing a virtual voice does not play the real player
+        self.player.play()
+        self.mock_player.play.assert_called_once()
+        self.assertEqual(AudioPlayer.PLAY, self.player.state)
+
+    def test_make_real_resumes_from_virtual_time(self):
+        """Real playback resumes from where the virtual voice advanced to."""
+        self.mock_source.duration = 10
+        self.mock_player.time = 1.5
+        self.player.play()
+        self.player.make_virtual()
+        self.player.advance(2)
+
+        self.player.make_real()
+
+        self.assertFalse(self.player.virtual)
+        self.mock_player.seek.assert_called_once_with(3.5)
+        self.assertEqual(2, self.mock_player.play.call_count)
+
+    def test_make_real_while_paused(self):
+        """Paused virtual voices become real without playing."""
+        self.player.make_virtual()
+        self.player.pause()
+
+        self.player.make_real()
+
+        self.mock_player.play.assert_not_called()
+
+    def test_advance_stops_finished_virtual_voice(self):
+        """Virtual voices stop once they reach the end of their source."""
+        mock_listener = Mock()
+        self.player.add_listeners(on_stop=mock_listener)
+        self.mock_source.duration = 1
+        self.mock_player.time = 0
+        self.player.play()
+        self.player.make_virtual()
+
+        self.player.advance(0.5)
+        mock_listener.assert_not_called()
+
+        self.player.advance(0.5)
+        mock_listener.assert_called_once_with(self.player)
+        self.assertEqual(AudioPlayer.STOP, self.player.state)
+        self.assertFalse(self.player.virtual)
+
+    def test_advance_loops_virtual_voice(self):
+        """Looping virtual voices wrap around to the start of the source."""
+        self.mock_source.duration = 1
+        self.mock_player.time = 0
+        self.player.looping = True
+        self.player.play()
+        self.player.make_virtual()
+
+        self.player.advance(2.25)
+        self.player.make_real()
+
+        self.assertEqual(AudioPlayer.PLAY, self.player.state)
+        self.mock_player.seek.assert_called_once_with(0.25)
+
+    def test_advance_ignores_real_and_paused_voices(self):
+        """Only playing virtual voices advance."""
+        self.mock_source.duration = 1
+        self.mock_player.time = 0
+        self.player.play()
+        self.player.advance(5)
+        self.assertEqual(AudioPlayer.PLAY, self.player.state)
+
+        self.player.make_virtual()
+        self.player.pause()
+        self.player.advance(5)
+        self.assertEqual(AudioPlayer.PAUSE, self.player.state)
+
     def test_playing_audio_sets_state(self):
         """Playing an audio player sets its state to 'play'."""
         self.player.play()
@@ -242,3 +335,29 @@ class TestAudioPlayer(unittest.TestCase):
         self.assertEqual(
             added_refs, removed_refs,
             'Audio player destruction did not free refs to source object')
+
+    def test_get_gain_attenuates_by_distance(self):
+        """Gain is the volume, attenuated beyond the attenuation distance."""
+        self.mock_player.volume = 0.5
+        self.mock_player.min_distance = 40
+        self.player.position = (30, 40)
+
+        # Within the attenuation distance the volume is nominal
+        self.assertEqual(0.5, self.player.get_gain((10, 40)))
+
+        # 160 units away is a quarter of the volume
+        self.assertAlmostEqual(0.125, self.player.get_gain((30, -120)))
+
+
+class TestGetAttenuation(unittest.TestCase):
+    """Test the inverse distance clamped attenuation model."""
+
+    def test_nominal_within_attenuation_distance(self):
+        """Audio within the attenuation distance is not attenuated."""
+        self.assertEqual(1, get_attenuation(40, 0))
+        self.assertEqual(1, get_attenuation(40, 40))
+
+    def test_inverse_distance_beyond_attenuation_distance(self):
+        """Audio beyond the attenuation distance falls off inversely."""
+        self.assertEqual(0.5, get_attenuation(40, 80))
+        self.assertEqual(0.25, get_attenuation(40, 160))
@@ -27,8 +27,11 @@ class TestAudioSource(unittest.TestCase):
         self.assertEqual(
             mock_position, audio_source.position,
             'Position property was not set by constructor')
+        self.assertEqual(
+            self.mock_source, audio_source.source,
+            'Source property was not set by constructor')
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_playing_source_sets_properties(self, MockPlayer):
         """Playing an audio source sets its properties on the player."""
         mock_player_instance = MockPlayer.return_value
@@ -60,16 +63,18 @@ class TestAudioSource(unittest.TestCase):
             mock_volume, mock_player_instance.volume,
             'Player was not initialized with source volume')
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_playing_source_sets_on_stop_listener(self, MockPlayer):
         """Playing an audio source sets an on_stop listener to remove it."""
         audio_source = AudioSource(self.mock_source)
         audio_source.play()
 
         MockPlayer.return_value.add_listeners.assert_called_once_with(
+            on_play=audio_source._update_state,
+            on_pause=audio_source._update_state,
             on_stop=audio_source._remove_instance)
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_first_play_of_streaming_source(self, MockPlayer):
         """The first play of a streaming source creates a new player."""
         audio_source = AudioSource(self.mock_source, streaming=True)
@@ -79,7 +84,7 @@ class TestAudioSource(unittest.TestCase):
         MockPlayer.assert_called_once_with(self.mock_source)
         MockPlayer.return_value.play.assert_called_once()
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_second_play_of_streaming_source(self, MockPlayer):
         """The second play of a streaming source returns existing player."""
         # Return a different mock on each instantiation of AudioPlayer
@@ -101,7 +106,7 @@ class TestAudioSource(unittest.TestCase):
             2, instance_1.play.call_count,
             'Calling play on source did not call play on player each time')
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_first_play_of_non_streaming_source(self, MockPlayer):
         """The first play of a non-streaming source creates a new player."""
         audio_source = AudioSource(self.mock_source, streaming=False)
@@ -111,7 +116,7 @@ class TestAudioSource(unittest.TestCase):
         MockPlayer.assert_called_once_with(self.mock_source)
         MockPlayer.return_value.play.assert_called_once()
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_second_play_of_non_streaming_source(self, MockPlayer):
         """Each play of a streaming source creates a new player."""
         # Return a different mock on each instantiation of AudioPlayer
@@ -134,7 +139,157 @@ class TestAudioSource(unittest.TestCase):
         instance_1.play.assert_called_once()
         instance_2.play.assert_called_once()
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
+    def test_stopped_players_are_reused(self, MockPlayer):
+        """Players which stopped are reused by the next play."""
+        audio_source = AudioSource(self.mock_source, streaming=False)
+
+        player_1 = audio_source.play()
+        audio_source._remove_instance(player_1)
+        player_2 = audio_source.play()
+
+        self.assertEqual(player_1, player_2)
+        MockPlayer.assert_called_once_with(self.mock_source)
+
+    @patch('engine.audio.voice_pool.AudioPlayer')
+    def test_play_uses_shared_voice_pool(self, MockPlayer):
+        """Sources acquire players from the voice pool they were given."""
+        mock_pool = Mock()
+        audio_source = AudioSource(self.mock_source, voice_pool=mock_pool)
+
+        player = audio_source.play()
+
+        mock_pool.acquire.assert_called_once_with(
+            audio_source, on_play=audio_source._update_state,
+            on_pause=audio_source._update_state,
+            on_stop=audio_source._remove_instance)
+        self.assertEqual(mock_pool.acquire.return_value, player)
+
+        audio_source._remove_instance(player)
+        mock_pool.release.assert_called_once_with(player)
+
+    @patch('engine.audio.voice_pool.AudioPlayer')
+    def test_trigger_plays_at_relative_volume(self, MockPlayer):
+        """Triggers play right away, relative to the source volume."""
+        MockPlayer.side_effect = lambda source: Mock()
+        audio_source = AudioSource(self.mock_source)
+        audio_source.volume = 0.5
+
+        player = audio_source.trigger(volume=0.5)
+
+        player.play.assert_called_once_with()
+        self.assertEqual(0.25, player.volume)
+
+    def test_trigger_through_mixer(self):
+        """Triggers are played through a mixer when one is given."""
+        audio_source = AudioSource(self.mock_source)
+        mock_mixer = Mock()
+
+        self.assertIsNone(audio_source.trigger(volume=0.5, mixer=mock_mixer))
+        mock_mixer.play.assert_called_once_with(audio_source, volume=0.5)
+
+    def test_trigger_min_interval(self):
+        """Triggers within the minimum interval of the last are dropped."""
+        audio_source = AudioSource(self.mock_source)
+        audio_source.min_interval = 0.1
+        mock_mixer = Mock()
+
+        # Triggers at 0, 50, 100, and 150 ms of frame time
+        for _ in range(4):
+            audio_source.trigger(mixer=mock_mixer)
+            audio_source.end_frame(50)
+
+        self.assertEqual(2, mock_mixer.play.call_count)
+
+    def test_frames_without_time_keep_min_interval(self):
+        """Only frame time counts towards the minimum interval."""
+        audio_source = AudioSource(self.mock_source)
+        audio_source.min_interval = 0.1
+        mock_mixer = Mock()
+
+        for _ in range(3):
+            audio_source.trigger(mixer=mock_mixer)
+            audio_source.end_frame()
+
+        mock_mixer.play.assert_called_once()
+
+    def test_trigger_max_per_frame(self):
+        """Triggers beyond the maximum for the frame are dropped."""
+        audio_source = AudioSource(self.mock_source)
+        audio_source.max_triggers_per_frame = 2
+        mock_mixer = Mock()
+
+        for _ in range(3):
+            audio_source.trigger(mixer=mock_mixer)
+
+        self.assertEqual(2, mock_mixer.play.call_count)
+
+        # Ending the frame resets the count
+        audio_source.end_frame()
+        audio_source.trigger(mixer=mock_mixer)
+        self.assertEqual(3, mock_mixer.play.call_count)
+
+    def test_coalesces_triggers_in_frame(self):
+        """Coalesced triggers play once at their combined volume."""
+        audio_source = AudioSource(self.mock_source)
+        audio_source.coalesce = True
+        mock_mixer = Mock()
+
+        audio_source.trigger(volume=0.25, mixer=mock_mixer)
+        audio_source.trigger(volume=0.25, mixer=mock_mixer)
+        mock_mixer.play.assert_not_called()
+
+        audio_source.end_frame()
+        mock_mixer.play.assert_called_once_with(audio_source, volume=0.5)
+
+        # The combined volume is capped at nominal volume
+        for _ in range(5):
+            audio_source.trigger(volume=0.5, mixer=mock_mixer)
+
+        audio_source.end_frame()
+        mock_mixer.play.assert_called_with(audio_source, volume=1)
+
+        # Frames without triggers play nothing
+        audio_source.end_frame()
+        self.assertEqual(2, mock_mixer.play.call_count)
+
+    @patch('engine.audio.voice_pool.AudioPlayer')
+    def test_state_follows_instances(self, MockPlayer):
+        """The source state combines its instance states and is dispatched."""
+        instance_1, instance_2 = Mock(), Mock()
+        MockPlayer.side_effect = [instance_1, instance_2]
+
+        audio_source = AudioSource(self.mock_source)
+        mock_listener = Mock()
+        audio_source.add_listeners(
+            on_play=mock_listener.on_play, on_pause=mock_listener.on_pause,
+            on_stop=mock_listener.on_stop)
+        self.assertEqual(AudioSource.STOP, audio_source.state)
+
+        audio_source.play()
+        audio_source.play()
+
+        # Any playing instance means the source is playing
+        instance_1.state = AudioSource.PLAY
+        instance_2.state = AudioSource.PAUSE
+        audio_source._update_state(instance_1)
+        self.assertEqual(AudioSource.PLAY, audio_source.state)
+        mock_listener.on_play.assert_called_once_with(audio_source)
+
+        # Unchanged states are not dispatched again
+        audio_source._update_state(instance_2)
+        mock_listener.on_play.assert_called_once_with(audio_source)
+
+        # Paused instances pause the source once none are playing
+        audio_source._remove_instance(instance_1)
+        self.assertEqual(AudioSource.PAUSE, audio_source.state)
+        mock_listener.on_pause.assert_called_once_with(audio_source)
+
+        audio_source._remove_instance(instance_2)
+        self.assertEqual(AudioSource.STOP, audio_source.state)
+        mock_listener.on_stop.assert_called_once_with(audio_source)
+
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_pausing_source_pauses_all_instances(self, MockPlayer):
         """Pausing a source pauses all instances."""
         # Return a different mock on each instantiation of AudioPlayer
@@ -150,7 +305,7 @@ class TestAudioSource(unittest.TestCase):
         instance_1.pause.assert_called_once()
         instance_2.pause.assert_called_once()
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_resuming_source_pauses_all_instances(self, MockPlayer):
         """Resuming a source resumes all paused instances."""
         # Return a different mock on each instantiation of AudioPlayer
@@ -184,7 +339,7 @@ class TestAudioSource(unittest.TestCase):
             2, instance_3.play.call_count,
             'Third player was not resumed despite being paused')
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_stopping_source_pauses_all_instances(self, MockPlayer):
         """Stopping a source stops all instances."""
         # Return a different mock on each instantiation of AudioPlayer
@@ -200,7 +355,7 @@ class TestAudioSource(unittest.TestCase):
         instance_1.stop.assert_called_once()
         instance_2.stop.assert_called_once()
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_setting_volume_updates_instances(self, MockPlayer):
         """Setting source volume sets volume on all instances."""
         # Return a different mock on each instantiation of AudioPlayer
@@ -217,7 +372,7 @@ class TestAudioSource(unittest.TestCase):
         self.assertEqual(0.5, instance_1.volume, 'Instance 1 volume not set')
         self.assertEqual(0.5, instance_2.volume, 'Instance 2 volume not set')
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_setting_attenuation_distance_updates_instances(self, MockPlayer):
         """Setting attenuation distance sets distance on all instances."""
         # Return a different mock on each instantiation of AudioPlayer
@@ -237,7 +392,7 @@ class TestAudioSource(unittest.TestCase):
         self.assertEqual(
             50, instance_2.attenuation_distance, 'Instance 2 distance not set')
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_removes_reference_to_stopped_players(self, MockPlayer):
         """The on_stop listener set on each player frees its reference."""
         # Initial references to the player object, held by mock framework
@@ -273,7 +428,7 @@ class TestAudioSource(unittest.TestCase):
             added_refs, removed_refs,
             'Player on_stop event did not free refs held by audio source')
 
-    @patch('engine.audio.audio_source.AudioPlayer')
+    @patch('engine.audio.voice_pool.AudioPlayer')
     def test_removes_player_references_on_destruction(self, MockPlayer):
         """Destroying an audio source frees its player references."""
         # Initial references to the player object, held by mock framework
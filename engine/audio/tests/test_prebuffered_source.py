@@ -0,0 +1,139 @@
+from ..prebuffered_source import PrebufferedSource
+from pyglet.media.codecs.base import AudioData, AudioFormat
+from pyglet.media.synthesis import Sine
+from unittest.mock import Mock
+import threading
+import unittest
+
+
+class TestPrebufferedSource(unittest.TestCase):
+    """Test decoding streaming audio ahead of playback on a worker thread."""
+
+    def create_source(self, source, **kwargs):
+        """Returns a prebuffered source which is deleted after the test."""
+        prebuffered = PrebufferedSource(source, **kwargs)
+        self.addCleanup(prebuffered.delete)
+
+        return prebuffered
+
+    def read_samples(self, source, num_bytes=1000):
+        """Returns all of the samples from a queued source."""
+        samples = b''
+
+        while True:
+            audio_data = source.get_audio_data(num_bytes)
+            if not audio_data:
+                return samples
+
+            samples += audio_data.get_string_data()
+
+    def test_reads_wrapped_source(self):
+        """The wrapped source's audio is played in order."""
+        sine = Sine(0.5, sample_rate=8000)
+        source = self.create_source(sine, block_size=3000)
+
+        self.assertEqual(sine.audio_format, source.audio_format)
+        self.assertEqual(sine.duration, source.duration)
+        # Synthesized audio depends on the block size it is read with
+        expected = Sine(0.5, sample_rate=8000).get_queue_source()
+        self.assertEqual(self.read_samples(expected, num_bytes=3000),
+                         self.read_samples(source))
+
+    def test_decodes_ahead_to_prebuffer(self):
+        """The worker decodes audio until the prebuffer is full."""
+        source = self.create_source(
+            Sine(10, sample_rate=8000), prebuffer=0.5, block_size=1600)
+
+        with source._condition:
+            source._condition.wait_for(
+                lambda: source.buffered_time >= 0.5, timeout=5)
+
+        # The worker stops decoding once the prebuffer is full
+        self.assertAlmostEqual(0.5, source.buffered_time)
+
+        audio_data = source.get_audio_data(1600)
+        self.assertEqual(0, audio_data.timestamp)
+        self.assertAlmostEqual(0.1, audio_data.duration)
+        self.assertEqual(0, source.underruns)
+
+    def test_seek_discards_decoded_audio(self):
+        """Seeking restarts decoding from the new time."""
+        source = self.create_source(Sine(1, sample_rate=8000))
+        source.get_audio_data(1000)
+
+        source.seek(0.5)
+
+        self.assertAlmostEqual(0.5, source.get_audio_data(1000).timestamp)
+
+    def test_seek_while_worker_waits(self):
+        """Seeking while the worker waits to decode keeps its next block."""
+        position = [0]
+        decoding = threading.Event()
+        resume = threading.Event()
+        seeked = threading.Event()
+        wrapped = Mock(audio_format=AudioFormat(1, 8, 1000), duration=1)
+        wrapped.get_queue_source.return_value = wrapped
+
+        def get_audio_data(num_bytes):
+            decoding.set()
+            resume.wait()
+            timestamp = position[0]
+            position[0] += 0.01
+            return AudioData(b'\x00' * 10, 10, timestamp, 0.01, [])
+
+        wrapped.get_audio_data.side_effect = get_audio_data
+        wrapped.seek.side_effect = lambda timestamp: position.__setitem__(
+            0, timestamp)
+        source = self.create_source(wrapped, prebuffer=0.05)
+        decode_lock = source._decode_lock
+
+        class SeekingLock(object):
+            """Seeks when the worker waits for the decode lock."""
+
+            def __enter__(self):
+                if threading.current_thread() is source._worker and \
+                        not seeked.is_set():
+                    seeker = threading.Thread(target=source.seek, args=(0.5,))
+                    seeker.start()
+                    seeker.join()
+                    seeked.set()
+
+                decode_lock.acquire()
+
+            def __exit__(self, *args):
+                decode_lock.release()
+
+        decoding.wait(timeout=5)
+        source._decode_lock = SeekingLock()
+        resume.set()
+
+        self.assertTrue(seeked.wait(timeout=5))
+        self.assertEqual(0.5, source.get_audio_data(10).timestamp)
+
+    def test_counts_underruns(self):
+        """Playback waiting on the worker is counted as an underrun."""
+        decoded = threading.Event()
+        wrapped = Mock(audio_format=AudioFormat(1, 8, 1000), duration=1)
+        wrapped.get_queue_source.return_value = wrapped
+
+        def get_audio_data(num_bytes):
+            decoded.wait()
+            return AudioData(b'\x00' * 10, 10, 0, 0.01, [])
+
+        wrapped.get_audio_data.side_effect = get_audio_data
+        source = self.create_source(wrapped, timeout=0.01)
+
+        # Nothing is decoded before the timeout
+        self.assertIsNone(source.get_audio_data(10))
+        self.assertEqual(1, source.underruns)
+        self.assertGreater(source.underrun_time, 0)
+
+        decoded.set()
+        self.assertEqual(b'\x00' * 10, source.get_audio_data(10).data)
+
+    def test_delete_stops_worker(self):
+        """Deleting the source stops the worker thread."""
+        source = PrebufferedSource(Sine(10, sample_rate=8000))
+        source.delete()
+
+        self.assertFalse(source._worker.is_alive())
@@ -0,0 +1,171 @@
+from ..software_mixer import SoftwareMixer
+from pyglet.media.codecs.base import StaticSource
+from pyglet.media.synthesis import Sine
+from unittest.mock import Mock, patch
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestSoftwareMixer(unittest.TestCase):
+    """Test mixing one-shot effects into a single output stream."""
+
+    def setUp(self):
+        """Provides each test case with the following properties::
+
+            self.mixer: A mixer at 8000Hz with 100 frame blocks.
+            self.source: A mock audio source of a static 8000Hz sine wave.
+        """
+        self.mixer = SoftwareMixer(sample_rate=8000, block_size=100)
+        self.source = Mock(
+            source=StaticSource(Sine(0.05, sample_rate=8000)),
+            streaming=False, position=(0, 0), attenuation_distance=1,
+            volume=1)
+
+    def mix(self, frames=100):
+        """Returns the next mixed frames as a (frames, 2) array."""
+        data = self.mixer.mix(frames)
+        return numpy.frombuffer(data, dtype='<i2').reshape(-1, 2)
+
+    def test_mixes_silence_without_effects(self):
+        """The output is silent while nothing is being mixed."""
+        audio_data = self.mixer.get_audio_data(4096)
+
+        self.assertEqual(400, audio_data.length)
+        self.assertEqual(b'\x00' * 400, audio_data.data)
+        self.assertAlmostEqual(0.0125, audio_data.duration)
+
+    def test_effects_sum_until_finished(self):
+        """Effects are summed until the end of their samples."""
+        # Quiet enough that the sum is not clipped
+        self.source.volume = 0.25
+        self.mixer.play(self.source)
+        single = self.mix().astype(numpy.int32)
+        self.mixer.stop()
+
+        self.mixer.play(self.source)
+        self.mixer.play(self.source)
+        self.assertEqual(2, self.mixer.active_voices)
+
+        doubled = self.mix().astype(numpy.int32)
+        self.assertTrue(numpy.all(abs(doubled - single * 2) <= 2))
+
+        # The 400 frame effect finishes in the fourth block
+        self.mix()
+        self.mix()
+        self.assertEqual(2, self.mixer.active_voices)
+        self.mix()
+        self.assertEqual(0, self.mixer.active_voices)
+
+    def test_applies_volume_attenuation_and_pan(self):
+        """Effects are attenuated by distance and panned by direction."""
+        self.mixer.play(self.source)
+        centered = abs(self.mix()[:, 0].astype(numpy.int32)).max()
+        self.mixer.stop()
+
+        self.source.volume = 0.5
+        self.source.position = (-4, 0)
+        self.mixer.play(self.source)
+        panned = abs(self.mix().astype(numpy.int32)).max(axis=0)
+
+        # Centered effects are split equally between channels
+        self.assertAlmostEqual(
+            centered * 2 ** 0.5 * 0.5 / 4, panned[0], delta=2)
+        self.assertEqual(0, panned[1])
+
+    def test_listener_position(self):
+        """Effects attenuate from the listener position."""
+        self.source.position = (10, 0)
+        self.mixer.listener_position = (10, 0)
+
+        self.assertEqual(
+            (0.5 ** 0.5, 0.5 ** 0.5), self.mixer._get_gains(self.source))
+
+    def test_drops_oldest_voice(self):
+        """The oldest effect is dropped once the voice limit is reached."""
+        self.mixer.max_voices = 2
+
+        for volume in (1, 0.5, 0.25):
+            self.source.volume = volume
+            self.mixer.play(self.source)
+
+        self.assertEqual(2, self.mixer.active_voices)
+        self.assertAlmostEqual(0.5 * 0.5 ** 0.5, self.mixer._voices[0].left)
+
+    def test_decodes_each_source_once(self):
+        """Decoded samples are shared by every play of a source."""
+        self.mixer.play(self.source)
+        self.mixer.play(self.source)
+
+        first, second = self.mixer._voices
+        self.assertIs(first.samples, second.samples)
+
+    def test_resamples_sources(self):
+        """Sources at other sample rates are resampled to the output rate."""
+        self.source.source = StaticSource(Sine(0.05, sample_rate=4000))
+        self.mixer.play(self.source)
+
+        self.assertEqual(400, len(self.mixer._voices[0].samples))
+
+    def test_rejects_streaming_audio(self):
+        """Streaming audio sources can not be mixed."""
+        self.source.streaming = True
+
+        with self.assertRaises(ValueError):
+            self.mixer.play(self.source)
+
+    @patch('pyglet.media.Player')
+    def test_start_plays_output_at_listener(self, MockPlayer):
+        """The output plays on its own player, kept at the listener."""
+        self.mixer.start()
+
+        MockPlayer.return_value.queue.assert_called_once_with(self.mixer)
+        MockPlayer.return_value.play.assert_called_once_with()
+        self.assertTrue(MockPlayer.return_value.loop)
+
+        self.mixer.listener_position = (3, 4)
+        self.assertEqual((3, 4, 0), MockPlayer.return_value.position)
+
+    def refill(self, num_bytes):
+        """Returns the audio a driver buffers, reading as OpenAL does."""
+        data = b''
+
+        while len(data) < num_bytes:
+            audio_data = self.mixer.get_audio_data(num_bytes - len(data))
+            if audio_data is None:
+                break
+
+            data += audio_data.data
+
+        return numpy.frombuffer(data, dtype='<i2').reshape(-1, 2)
+
+    @patch('pyglet.media.Player')
+    def test_mixes_latency_ahead_of_playback(self, MockPlayer):
+        """Effects are heard within the latency of being played."""
+        self.mixer.latency = 0.05
+        self.mixer.start()
+        player = MockPlayer.return_value
+        player.time = 0
+
+        # Drivers ask for a second of audio, but only the latency is mixed
+        self.assertEqual(400, len(self.refill(32000)))
+
+        player.time = 0.03
+        self.mixer.play(self.source)
+        mixed = self.refill(32000)
+
+        # The effect starts right after the audio buffered before it
+        self.assertEqual(300, len(mixed))
+        self.assertTrue(mixed.any())
+        self.assertEqual(0, len(self.refill(32000)))
+
+    def test_seek_restarts_timestamps(self):
+        """Restarting the output restarts its timestamps."""
+        self.mixer.get_audio_data(400)
+        self.mixer.seek(0)
+
+        self.assertEqual(0, self.mixer.get_audio_data(400).timestamp)
@@ -0,0 +1,123 @@
+from ..voice_pool import VoicePool
+from unittest.mock import Mock, patch
+import unittest
+
+
+class TestVoicePool(unittest.TestCase):
+    """Test reusing and capping audio players shared between sources."""
+
+    def setUp(self):
+        """Provides each test case with the following properties::
+
+            self.MockPlayer: Patched player class, creating a new mock
+                player for each instance.
+            self.on_stop: Mock on_stop listener for new voices.
+        """
+        patcher = patch('engine.audio.voice_pool.AudioPlayer')
+        self.MockPlayer = patcher.start()
+        self.MockPlayer.side_effect = lambda source: Mock(volume=1)
+        self.addCleanup(patcher.stop)
+
+        self.on_stop = Mock()
+
+    def test_acquire_creates_voice(self):
+        """Voices are created for the source with the on_stop listener."""
+        pool = VoicePool()
+        audio_source = Mock()
+
+        player = pool.acquire(audio_source, on_stop=self.on_stop)
+
+        self.MockPlayer.assert_called_once_with(audio_source.source)
+        player.add_listeners.assert_called_once_with(on_stop=self.on_stop)
+        self.assertEqual(1, pool.active_voices)
+
+    def test_released_voices_are_reused(self):
+        """Stopped voices are reused by the next playback of their source."""
+        pool = VoicePool()
+        audio_source = Mock()
+
+        player = pool.acquire(audio_source, on_stop=self.on_stop)
+        pool.release(player)
+        self.assertEqual(0, pool.active_voices)
+
+        self.assertEqual(
+            player, pool.acquire(audio_source, on_stop=self.on_stop))
+        self.assertEqual(1, self.MockPlayer.call_count)
+
+        # Voices are only reused by the same source
+        self.assertNotEqual(
+            player, pool.acquire(Mock(), on_stop=self.on_stop))
+
+    def test_release_ignores_unknown_voices(self):
+        """Releasing a voice which was not acquired does nothing."""
+        pool = VoicePool()
+        player = pool.acquire(Mock(), on_stop=self.on_stop)
+
+        pool.release(player)
+        pool.release(player)
+        pool.release(Mock())
+
+        self.assertEqual(0, pool.active_voices)
+
+    def test_steals_oldest_voice_of_source(self):
+        """The oldest voice of a source is stolen at the per-source cap."""
+        pool = VoicePool(max_voices_per_source=2)
+        audio_source = Mock()
+
+        oldest = pool.acquire(audio_source, on_stop=self.on_stop)
+        newest = pool.acquire(audio_source, on_stop=self.on_stop)
+
+        # The stolen voice is stopped and reused
+        self.assertEqual(
+            oldest, pool.acquire(audio_source, on_stop=self.on_stop))
+        oldest.stop.assert_called_once_with()
+        newest.stop.assert_not_called()
+
+        self.assertEqual(2, pool.active_voices)
+        self.assertEqual(2, self.MockPlayer.call_count)
+
+    def test_steals_oldest_voice_of_pool(self):
+        """The oldest voice of any source is stolen at the pool's cap."""
+        pool = VoicePool(max_voices=2)
+
+        oldest = pool.acquire(Mock(), on_stop=self.on_stop)
+        newest = pool.acquire(Mock(), on_stop=self.on_stop)
+        pool.acquire(Mock(), on_stop=self.on_stop)
+
+        oldest.stop.assert_called_once_with()
+        newest.stop.assert_not_called()
+        self.assertEqual(2, pool.active_voices)
+
+    def test_steals_quietest_voice(self):
+        """The quietest voice can be stolen rather than the oldest."""
+        pool = VoicePool(max_voices=2, steal=VoicePool.QUIETEST)
+
+        loud = pool.acquire(Mock(), on_stop=self.on_stop)
+        quiet = pool.acquire(Mock(), on_stop=self.on_stop)
+        quiet.volume = 0.5
+
+        pool.acquire(Mock(), on_stop=self.on_stop)
+
+        quiet.stop.assert_called_once_with()
+        loud.stop.assert_not_called()
+
+    def test_discard_stops_voices_of_source(self):
+        """Discarding a source stops its voices and forgets them."""
+        pool = VoicePool()
+        audio_source = Mock()
+
+        idle = pool.acquire(audio_source, on_stop=self.on_stop)
+        pool.release(idle)
+        playing = pool.acquire(Mock(), on_stop=self.on_stop)
+        player = pool.acquire(audio_source, on_stop=self.on_stop)
+        player = pool.acquire(audio_source, on_stop=self.on_stop)
+
+        pool.discard(audio_source)
+
+        player.stop.assert_called_once_with()
+        playing.stop.assert_not_called()
+        self.assertEqual(1, pool.active_voices)
+
+        # Discarded voices are not reused
+        self.assertNotIn(
+            pool.acquire(audio_source, on_stop=self.on_stop), (idle, player))
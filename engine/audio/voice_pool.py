@@ -0,0 +1,132 @@
+from .audio_player import AudioPlayer
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+
+
+class VoicePool(object):
+    """Bounded pool of audio players shared between audio sources.
+
+    Each playing :obj:`engine.audio.AudioPlayer` is a voice. Stopped voices
+    are kept for their audio source and reused by its next playback, rather
+    than creating a new player each time the source is played. The number of
+    voices playing at once is capped for each source and for the pool as a
+    whole. Once a cap is reached, a playing voice is stolen by stopping it.
+
+    Attributes:
+        max_voices (int): Maximum number of voices playing at once.
+        max_voices_per_source (int): Maximum number of voices playing at once
+            for a single audio source.
+        steal (str): Which voice to steal when a cap is reached, either
+            ``VoicePool.OLDEST`` or ``VoicePool.QUIETEST``.
+    """
+
+    OLDEST = 'oldest'
+    QUIETEST = 'quietest'
+
+    def __init__(self, max_voices=32, max_voices_per_source=4, steal=OLDEST):
+        """Creates an empty voice pool.
+
+        Kwargs:
+            max_voices (int, optional): Maximum number of voices playing at
+                once. Defaults to 32.
+            max_voices_per_source (int, optional): Maximum number of voices
+                playing at once for a single audio source. Defaults to 4.
+            steal (str, optional): Which voice to steal when a cap is
+                reached, ``VoicePool.OLDEST`` or ``VoicePool.QUIETEST``.
+                Defaults to ``VoicePool.OLDEST``.
+        """
+        super(VoicePool, self).__init__()
+        self.max_voices = max_voices
+        self.max_voices_per_source = max_voices_per_source
+        self.steal = steal
+
+        # Voices in the order they were acquired, and the source of each
+        self._active = OrderedDict()
+
+        # Acquired and stopped voices for each source
+        self._active_by_source = WeakKeyDictionary()
+        self._idle_by_source = WeakKeyDictionary()
+
+    def acquire(self, audio_source, **listeners):
+        """Returns a stopped voice for an audio source to play.
+
+        A stopped voice of the source is reused if there is one, otherwise a
+        new voice is created. If the source or the pool has reached its cap,
+        a voice is stolen first. The voice remains acquired until it is given
+        back with :fn:`release`.
+
+        Args:
+            audio_source (:obj:`engine.audio.AudioSource`): The audio source
+                to acquire a voice for.
+
+        Kwargs:
+            listeners (dict of str to fn): Event listeners to add to new
+                voices. The ``on_stop`` listener should release the voice.
+                Reused voices already have these listeners.
+
+        Returns:
+            An :obj:`engine.audio.AudioPlayer` for the source.
+        """
+        source_voices = self._active_by_source.setdefault(audio_source, [])
+
+        if len(source_voices) >= self.max_voices_per_source:
+            self._steal_voice(source_voices)
+        elif len(self._active) >= self.max_voices:
+            self._steal_voice(list(self._active))
+
+        idle_voices = self._idle_by_source.get(audio_source)
+
+        if idle_voices:
+            player = idle_voices.pop()
+        else:
+            player = AudioPlayer(audio_source.source)
+            player.add_listeners(**listeners)
+
+        self._active[player] = audio_source
+        source_voices.append(player)
+
+        return player
+
+    def release(self, player):
+        """Gives back a stopped voice, allowing it to be reused.
+
+        Voices which are not acquired are ignored.
+
+        Args:
+            player (:obj:`engine.audio.AudioPlayer`): The voice to release.
+        """
+        audio_source = self._active.pop(player, None)
+        if audio_source is None:
+            return
+
+        self._active_by_source[audio_source].remove(player)
+        self._idle_by_source.setdefault(audio_source, []).append(player)
+
+    def discard(self, audio_source):
+        """Stops and removes all voices for an audio source.
+
+        Args:
+            audio_source (:obj:`engine.audio.AudioSource`): The audio source
+                to remove voices for.
+        """
+        for player in list(self._active_by_source.get(audio_source, ())):
+            player.stop()
+            self.release(player)
+
+        self._active_by_source.pop(audio_source, None)
+        self._idle_by_source.pop(audio_source, None)
+
+    @property
+    def active_voices(self):
+        """Returns the number of voices which are currently acquired."""
+        return len(self._active)
+
+    def _steal_voice(self, players):
+        """Stops and releases the oldest or quietest of the given voices."""
+        if self.steal == VoicePool.QUIETEST:
+            player = min(players, key=lambda voice: voice.volume)
+        else:
+            player = players[0]
+
+        player.stop()
+        self.release(player)
@@ -1,3 +1,7 @@
-from .camera import Camera
+from engine.util.lazy_import import lazy_import
 
 __all__ = ['Camera']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'Camera': '.camera',
+})
@@ -1,4 +1,5 @@
 from engine.geometry import Rectangle, Point2d, detect_overlap_1d
+from engine.profiler import get_profiler
 from pyglet import gl
 
 
@@ -77,6 +78,7 @@ class Camera(Rectangle):
         self.x = self._apply_boundary(x - self.width // 2, self._x_boundary)
         self.y = self._apply_boundary(y - self.height // 2, self._y_boundary)
 
+    @get_profiler().profile('camera.update')
     def update(self, ms):
         """Updates the camera's position when following a target.
 
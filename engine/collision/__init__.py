@@ -1,9 +1,15 @@
-from .collision_cache import CollisionCache
-from .collision_resolution_physical import resolve_physical_collision
-from .positional_collision_cache import PositionalCollisionCache
+from engine.util.lazy_import import lazy_import
 
 __all__ = [
     'resolve_physical_collision',
+    'resolve_physical_overlap',
     'CollisionCache',
     'PositionalCollisionCache',
 ]
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'CollisionCache': '.collision_cache',
+    'PositionalCollisionCache': '.positional_collision_cache',
+    'resolve_physical_collision': '.collision_resolution_physical',
+    'resolve_physical_overlap': '.collision_resolution_physical',
+})
@@ -46,6 +46,30 @@ class CollisionCache(object):
         """
         return self._removed_collisions
 
+    def get_state(self):
+        """Returns a copy of the cached collisions, for :fn:`set_state`.
+
+        Returns:
+            An opaque, immutable object holding the cache contents.
+        """
+        return (frozenset(self._collision_cache),
+                frozenset(self._current_collisions),
+                frozenset(self._removed_collisions),
+                frozenset(self._new_collisions))
+
+    def set_state(self, state):
+        """Restores the cached collisions returned by :fn:`get_state`.
+
+        Args:
+            state (object): The cache contents to restore.
+        """
+        collision_cache, current, removed, new = state
+
+        self._collision_cache = set(collision_cache)
+        self._current_collisions = set(current)
+        self._removed_collisions = set(removed)
+        self._new_collisions = set(new)
+
     def update(self, ms):
         """Removes cache entries for objects which no longer collide.
 
@@ -21,6 +21,24 @@ def resolve_physical_collision(first, second):
     if not geometry.detect_overlap_2d(first, second):
         return (0, 0)
 
+    return resolve_physical_overlap(first, second)
+
+
+def resolve_physical_overlap(first, second):
+    """Resolves an overlap between two physical objects by repositioning one.
+
+    Like :fn:`resolve_physical_collision`, but without checking that the
+    objects overlap, for callers which have already checked.
+
+    Args:
+        first (:obj:`engine.game_object.PhysicalGameObject`):
+            The first physical game object in the collision.
+        second (:obj:`engine.game_object.PhysicalGameObject`):
+            The second physical game object in the collision.
+
+    Returns:
+        A tuple of ints for the change in velocity along each axis.
+    """
     # Move the lighter object, leave the heavier object resting
     first_is_heavier = first.mass > second.mass
     moving, resting = (second, first) if first_is_heavier else (first, second)
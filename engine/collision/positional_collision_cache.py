@@ -43,6 +43,29 @@ class PositionalCollisionCache(CollisionCache):
         self._positional_collision_cache[key] = PositionalCacheEntry(
             first=key[0], second=key[1], velocity_delta=velocity_delta)
 
+    def get_state(self):
+        """Returns a copy of the cached collisions, for :fn:`set_state`.
+
+        Cache entries are never changed once added, so they are shared with
+        the copy rather than copied.
+
+        Returns:
+            An opaque, immutable object holding the cache contents.
+        """
+        return (super(PositionalCollisionCache, self).get_state(),
+                tuple(self._positional_collision_cache.items()))
+
+    def set_state(self, state):
+        """Restores the cached collisions returned by :fn:`get_state`.
+
+        Args:
+            state (object): The cache contents to restore.
+        """
+        collision_state, positional_entries = state
+
+        super(PositionalCollisionCache, self).set_state(collision_state)
+        self._positional_collision_cache = dict(positional_entries)
+
     def update(self, ms):
         """Removes cache entries for objects which moved and no longer collide.
 
@@ -153,3 +153,23 @@ class TestCollisionCache(unittest.TestCase):
         removed_collisions = self.cache.get_removed_collisions()
         self.assertEqual(1, len(removed_collisions))
         self.assertCountEqual((b, c), list(removed_collisions)[0])
+
+    def test_state_round_trips(self):
+        """Restoring saved state brings back the cached collisions."""
+        a = Rectangle(x=1, y=3, width=2, height=2)
+        b = Rectangle(x=2, y=2, width=2, height=2)
+
+        self.cache.add_collision(a, b)
+        self.cache.update(1)
+        state = self.cache.get_state()
+
+        self.cache.update(1)
+        self.assertTrue(self.cache.get_removed_collisions())
+
+        self.cache.set_state(state)
+        self.assertFalse(self.cache.get_removed_collisions())
+        self.assertEqual(1, len(self.cache.get_new_collisions()))
+
+        # The restored collision is removed again without being re-added
+        self.cache.update(1)
+        self.assertEqual(1, len(self.cache.get_removed_collisions()))
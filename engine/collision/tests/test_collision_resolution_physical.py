@@ -1,4 +1,5 @@
 from ..collision_resolution_physical import resolve_physical_collision
+from ..collision_resolution_physical import resolve_physical_overlap
 from ..collision_resolution_physical import resolve_game_object_x_collision
 from ..collision_resolution_physical import resolve_game_object_y_collision
 from unittest.mock import Mock, patch
@@ -27,6 +28,24 @@ class TestResolvePhysicalCollision(unittest.TestCase):
         first.set_position.assert_not_called()
         second.set_position.assert_not_called()
 
+    @patch(collision_2d_module + '.resolve_game_object_y_collision')
+    @patch(collision_2d_module + '.resolve_game_object_x_collision')
+    @patch('engine.geometry.detect_overlap_2d')
+    def test_overlap_is_resolved_without_detection(self, mock_2d_detect,
+                                                   mock_x_resolve,
+                                                   mock_y_resolve):
+        """Resolving a known overlap doesn't check for overlap again."""
+        first = Mock(mass=1)
+        second = Mock(mass=2)
+
+        mock_x_resolve.return_value = 1
+        mock_y_resolve.return_value = 2
+        self.assertEqual((1, 2), resolve_physical_overlap(first, second))
+
+        mock_2d_detect.assert_not_called()
+        mock_x_resolve.assert_called_once_with(first, second)
+        mock_y_resolve.assert_called_once_with(first, second)
+
     @patch(collision_2d_module + '.resolve_game_object_y_collision')
     @patch(collision_2d_module + '.resolve_game_object_x_collision')
     @patch('engine.geometry.detect_overlap_2d')
@@ -153,3 +153,24 @@ class TestPositionalCollisionCache(unittest.TestCase):
         new_collisions = self.cache.get_new_collisions()
         self.assertEqual(1, len(new_collisions))
         self.assertCountEqual((a, b), list(new_collisions)[0])
+
+    def test_state_round_trips(self):
+        """Restoring saved state brings back cached collision positions."""
+        a = Rectangle(x=1, y=3, width=2, height=2)
+        b = Rectangle(x=2, y=2, width=2, height=2)
+
+        self.cache.add_collision(a, b, (1, 1))
+        self.cache.update(1)
+        state = self.cache.get_state()
+
+        # Moving away removes the collision and its cached positions
+        a.x = 10
+        self.cache.update(1)
+        self.assertEqual(1, len(self.cache.get_removed_collisions()))
+
+        self.cache.set_state(state)
+        a.x = 1
+
+        # The restored collision is a repeat at its cached positions
+        self.cache.update(1)
+        self.assertFalse(self.cache.get_removed_collisions())
@@ -1,3 +1,25 @@
-from .disk_loader import DiskLoader
+from engine.util.lazy_import import lazy_import
 
-__all__ = ['DiskLoader']
+__all__ = [
+    'DiskLoader',
+    'ManifestLoader',
+    'MemoryViewFile',
+    'PcmCache',
+    'ResourceCache',
+    'ResourceInfo',
+    'ResourceManifest',
+    'ResourcePack',
+    'write_resource_pack',
+]
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'DiskLoader': '.disk_loader',
+    'ManifestLoader': '.manifest_loader',
+    'MemoryViewFile': '.resource_pack',
+    'PcmCache': '.pcm_cache',
+    'ResourceCache': '.resource_cache',
+    'ResourceInfo': '.resource_manifest',
+    'ResourceManifest': '.resource_manifest',
+    'ResourcePack': '.resource_pack',
+    'write_resource_pack': '.resource_pack',
+})
@@ -1,28 +1,142 @@
+from .manifest_loader import ManifestLoader
+from .resource_cache import ResourceCache
+from hashlib import sha1
 from json import load as json_load
 from defusedxml import ElementTree
-import pyglet.resource
 import pyglet.image
+import pyglet.media
 import csv
+import sys
 
 
 class DiskLoader(object):
-    """Singleton for loading resources stored on disk."""
+    """Singleton for loading resources stored on disk.
+
+    Loaded images, image grids, in-memory audio, CSVs, JSONs, and XMLs are
+    cached, so loading the same resource again returns the same object.
+    Cached resources should be treated as read-only. Each load acquires a
+    reference to the resource, and :fn:`release` gives it up once the
+    resource is no longer needed. Unreferenced resources are evicted from
+    the cache once it exceeds its budget.
+
+    Resources in the resource pack, if one has been set, are read from the
+    pack instead of the resource paths. In-memory audio is decoded through
+    the PCM cache, if one has been set.
+
+    Attributes:
+        cache (:obj:`engine.disk.ResourceCache`): Cache of loaded resources,
+            with hit, miss, and size counters. Set its ``budget`` to limit
+            the bytes used by unreferenced resources.
+        loader (:obj:`engine.disk.ManifestLoader`): Loader of resources from
+            the resource paths.
+        manifest (:obj:`engine.disk.ResourceManifest`): Information about
+            every indexed resource when the resource paths were indexed from
+            manifests, or an empty manifest otherwise.
+    """
+
+    cache = ResourceCache(budget=64 * 1024 * 1024)
+    loader = ManifestLoader([], use_manifests=False)
+    manifest = loader.manifest
+
+    # Texture atlas to pack images into
+    _texture_atlas = None
+
+    # Resource pack to read resources from before the resource paths
+    _resource_pack = None
+
+    # Cache of decoded in-memory audio
+    _pcm_cache = None
 
     @classmethod
-    def set_resource_paths(cls, resource_paths):
+    def set_resource_paths(cls, resource_paths, use_manifests=False):
         """Sets the paths to load resources from.
 
+        When using manifests, the resource index is built from the manifest
+        file in each resource path instead of walking the directories. If any
+        resource path is missing its manifest, or has files added, removed,
+        or resized since it was generated, the directories are walked. See
+        :obj:`engine.disk.ManifestLoader`.
+
         Args:
             resource_path (list of str):
                 Paths relative to __main__ to load resources from.
+
+        Kwargs:
+            use_manifests (bool, optional): Whether to index resources from
+                the manifest in each resource path. Defaults to False.
+        """
+        cls.loader.path = list(resource_paths)
+        cls.loader.use_manifests = use_manifests
+        cls.loader.reindex()  # Refresh the path index
+
+        cls.manifest = cls.loader.manifest
+
+    @classmethod
+    def set_resource_pack(cls, pack):
+        """Sets the resource pack to read resources from.
+
+        Resources which are not in the pack are still read from the resource
+        paths. Resources which were already loaded are not reloaded.
+
+        Args:
+            pack (:obj:`engine.disk.ResourcePack`): The pack to read resources
+                from, or None to only read from the resource paths.
+        """
+        cls._resource_pack = pack
+
+    @classmethod
+    def set_pcm_cache(cls, pcm_cache):
+        """Sets the cache to decode in-memory audio through.
+
+        Audio which was already loaded is not reloaded.
+
+        Args:
+            pcm_cache (:obj:`engine.disk.PcmCache`): The cache to read and
+                write decoded audio, or None to decode audio on every load.
+        """
+        cls._pcm_cache = pcm_cache
+
+    @classmethod
+    def open_file(cls, path, mode='rb'):
+        """Opens a resource as a read-only file object.
+
+        Args:
+            path (str): Path to the resource, relative to the resource path.
+
+        Kwargs:
+            mode (str, optional): 'rb' for a binary file or 'r' for a text
+                file. Defaults to 'rb'.
+
+        Returns:
+            A file object for the resource, from the resource pack if it is
+            packed, otherwise from the resource paths.
         """
-        pyglet.resource.path = resource_paths
-        pyglet.resource.reindex()  # Refresh the path index
+        if cls._resource_pack is not None and path in cls._resource_pack:
+            return cls._resource_pack.open(path, mode=mode)
+
+        return cls.loader.file(path, mode=mode)
+
+    @classmethod
+    def set_texture_atlas(cls, atlas):
+        """Sets the texture atlas to pack loaded images into.
+
+        Images which were already loaded are not moved into the new atlas,
+        and are released from the atlas they were packed into when evicted.
+
+        Args:
+            atlas (:obj:`engine.graphics.TextureAtlas`): The atlas to pack
+                images into, or None to use pyglet's resource atlases.
+        """
+        cls._texture_atlas = atlas
 
     @classmethod
     def load_image(cls, filename):
         """Loads an image file from disk.
 
+        Images packed into the texture atlas are released from it once they
+        are evicted from the cache, freeing their atlas texture once every
+        image packed into it has been evicted.
+
         Args:
             filename (str):
                 The name of the image file, relative to the resource path.
@@ -30,7 +144,86 @@ class DiskLoader(object):
         Returns:
             A :obj:`pyglet.image.Texture` for the loaded image.
         """
-        return pyglet.resource.image(filename)
+        atlas = cls._texture_atlas
+
+        return cls.cache.load(
+            ('image', filename), lambda: cls._upload_image(filename, atlas),
+            size=_get_image_size,
+            on_evict=atlas.release if atlas is not None else None)
+
+    @classmethod
+    def _upload_image(cls, filename, atlas):
+        """Loads an image file from disk into a texture or the atlas."""
+        if atlas is None:
+            if cls._resource_pack is not None and \
+                    filename in cls._resource_pack:
+                return cls.decode_image(filename).get_texture()
+
+            return cls.loader.image(filename)
+
+        return atlas.pack({filename: cls.decode_image(filename)})[filename]
+
+    @classmethod
+    def release(cls, resource):
+        """Gives up a reference to a loaded resource.
+
+        Unreferenced resources may be evicted from the cache, after which
+        loading them again reads them from disk.
+
+        Args:
+            resource (object): A resource returned by one of the load methods,
+                or by :fn:`pack_images`.
+        """
+        cls.cache.release(resource)
+
+    @classmethod
+    def pack_images(cls, images):
+        """Uploads decoded images, packing them into the texture atlas.
+
+        Packing several images at once packs them more tightly than loading
+        them one at a time. Packed images are cached like :fn:`load_image`,
+        and each returned texture acquires a reference to be released with
+        :fn:`release`. If no texture atlas has been set, each image is
+        uploaded as its own texture without caching. This must be called from
+        the main thread.
+
+        Args:
+            images (dict of str to :obj:`pyglet.image.ImageData`):
+                Decoded images by filename, see :fn:`decode_image`.
+
+        Returns:
+            A dict of the same filenames to a :obj:`pyglet.image.Texture` for
+            each image.
+        """
+        atlas = cls._texture_atlas
+
+        if atlas is None:
+            return {name: img.get_texture() for name, img in images.items()}
+
+        # Only pack images which aren't already cached
+        packed = atlas.pack({
+            name: image for name, image in images.items()
+            if ('image', name) not in cls.cache})
+
+        def upload(name):
+            # The image may have been evicted since it was found in the cache
+            if name not in packed:
+                packed.update(atlas.pack({name: images[name]}))
+
+            return packed[name]
+
+        textures = {
+            name: cls.cache.load(
+                ('image', name), lambda name=name: upload(name),
+                size=_get_image_size, on_evict=atlas.release)
+            for name in images}
+
+        # Images loaded by another thread in the meantime are used instead
+        for name, region in packed.items():
+            if textures[name] is not region:
+                atlas.release(region)
+
+        return textures
 
     @classmethod
     def load_image_grid(cls, filename, rows, columns, **kwargs):
@@ -55,8 +248,69 @@ class DiskLoader(object):
         Returns:
             A :obj:`pyglet.image.ImageGrid` for the loaded image grid.
         """
-        image = cls.load_image(filename)
-        return pyglet.image.ImageGrid(image, rows, columns, **kwargs)
+        key = ('image_grid', filename, rows, columns,
+               tuple(sorted(kwargs.items())))
+
+        def load():
+            image = cls.load_image(filename)
+            return pyglet.image.ImageGrid(image, rows, columns, **kwargs)
+
+        # The grid holds a reference to its image until it is evicted
+        return cls.cache.load(
+            key, load, on_evict=lambda grid: cls.release(grid.image))
+
+    @classmethod
+    def decode_image(cls, filename):
+        """Decodes an image file from disk without uploading it to the GPU.
+
+        No OpenGL calls are made, so this is safe to call from a worker thread.
+        See :fn:`create_image_grid` for uploading the decoded image.
+
+        Args:
+            filename (str):
+                The name of the image file, relative to the resource path.
+
+        Images with pre-decoded pixel data in the resource pack are copied
+        from the pack without decoding.
+
+        Returns:
+            A :obj:`pyglet.image.ImageData` for the decoded image.
+        """
+        if cls._resource_pack is not None:
+            pixels = cls._resource_pack.get_pixels(filename)
+
+            if pixels is not None:
+                width, height, data = pixels
+                return pyglet.image.ImageData(
+                    width, height, 'RGBA', data.tobytes())
+
+        with cls.open_file(filename, mode='rb') as image_file:
+            image_data = pyglet.image.load(filename, file=image_file)
+
+        return image_data
+
+    @classmethod
+    def create_image_grid(cls, image, rows, columns, **kwargs):
+        """Creates an image grid from an image, such as a sprite sheet.
+
+        Decoded images are uploaded as a single texture, so this must be called
+        from the main thread. Use :fn:`pack_images` to upload images into the
+        texture atlas beforehand.
+
+        Args:
+            image (:obj:`pyglet.image.AbstractImage`):
+                The image to divide into a grid.
+            rows (int): Number of rows in the image grid.
+            columns (int): Number of columns in the image grid.
+
+        Kwargs:
+            See :fn:`load_image_grid` for supported kwargs.
+
+        Returns:
+            A :obj:`pyglet.image.ImageGrid` for the image.
+        """
+        return pyglet.image.ImageGrid(
+            image.get_texture(), rows, columns, **kwargs)
 
     @classmethod
     def load_audio(cls, filename, streaming=True):
@@ -70,12 +324,42 @@ class DiskLoader(object):
             streaming (bool, optional): True to stream audio from disk rather
                 than loading the entire audio file into memory. Only one
                 instance of a streaming audio file can be played at once.
-                Use this for longer audio files.
+                Use this for longer audio files. Streaming audio is not
+                cached, since each source can only be played once at a time.
 
         Returns:
             A :obj:`pyglet.media.Source` for the loaded audio.
         """
-        return pyglet.resource.media(filename, streaming=streaming)
+        def open_source(streaming):
+            if cls._resource_pack is not None and \
+                    filename in cls._resource_pack:
+                return pyglet.media.load(
+                    filename, file=cls.open_file(filename),
+                    streaming=streaming)
+
+            return cls.loader.media(filename, streaming=streaming)
+
+        def load():
+            if cls._pcm_cache is None:
+                return open_source(streaming=False)
+
+            # The decoded samples are written straight to the cache entry
+            return cls._pcm_cache.load(
+                cls._get_pcm_key(filename),
+                lambda: open_source(streaming=True))
+
+        if streaming:
+            return open_source(streaming=True)
+
+        return cls.cache.load(('audio', filename), load, size=_get_audio_size)
+
+    @classmethod
+    def _get_pcm_key(cls, filename):
+        """Returns the PCM cache key for an audio file's contents."""
+        # The file is always hashed, as the manifest can't detect every edit.
+        # Hashing the encoded file is still much cheaper than decoding it.
+        with cls.open_file(filename) as audio_file:
+            return sha1(audio_file.read()).hexdigest()
 
     @classmethod
     def load_csv(cls, path):
@@ -87,10 +371,11 @@ class DiskLoader(object):
         Returns:
             A list of entry lists, one list per each line.
         """
-        with pyglet.resource.file(path, mode='r') as csv_file:
-            csv_data = list(csv.reader(csv_file))
+        def load():
+            with cls.open_file(path, mode='r') as csv_file:
+                return list(csv.reader(csv_file))
 
-        return csv_data
+        return cls.cache.load(('csv', path), load, size=_get_data_size)
 
     @classmethod
     def load_json(cls, path):
@@ -102,10 +387,11 @@ class DiskLoader(object):
         Returns:
             A dict representation of the JSON file.
         """
-        with pyglet.resource.file(path, mode='r') as json_file:
-            json_data = json_load(json_file)
+        def load():
+            with cls.open_file(path, mode='r') as json_file:
+                return json_load(json_file)
 
-        return json_data
+        return cls.cache.load(('json', path), load, size=_get_data_size)
 
     @classmethod
     def load_xml(cls, path):
@@ -117,7 +403,63 @@ class DiskLoader(object):
         Returns:
             The root :obj:`xml.etree.Element` of the XML tree.
         """
-        with pyglet.resource.file(path, mode='r') as xml_file:
-            xml_data = ElementTree.parse(xml_file)
+        def load():
+            with cls.open_file(path, mode='r') as xml_file:
+                return ElementTree.parse(xml_file).getroot()
+
+        return cls.cache.load(('xml', path), load, size=_get_xml_size)
+
+    @classmethod
+    def iterparse_xml(cls, path):
+        """Incrementally parses an XML from disk, yielding nodes as it goes.
+
+        Unlike :fn:`load_xml`, the whole tree does not need to be held in
+        memory. Nodes can be removed from their parent once their "end" event
+        has been handled to free them.
+
+        Args:
+            path (str): Path to the XML file, relative to the resource path.
+
+        Yields:
+            A tuple of (event, node) for each node, where the event is "start"
+            when its opening tag has been parsed and "end" once the node and
+            all of its children have been parsed. The node is an
+            :obj:`xml.etree.Element`.
+        """
+        with cls.open_file(path, mode='rb') as xml_file:
+            yield from ElementTree.iterparse(
+                xml_file, events=('start', 'end'))
+
+
+def _get_image_size(image):
+    """Estimates the bytes used by an image, as 4 bytes per pixel."""
+    return image.width * image.height * 4
+
+
+def _get_audio_size(source):
+    """Estimates the bytes used by an in-memory audio source."""
+    if source.audio_format is None:
+        return 0
+
+    return int(source.duration * source.audio_format.bytes_per_second)
+
+
+def _get_data_size(data):
+    """Estimates the bytes used by nested lists, dicts, and values."""
+    if isinstance(data, dict):
+        return sys.getsizeof(data) + sum(
+            _get_data_size(key) + _get_data_size(value)
+            for key, value in data.items())
+
+    if isinstance(data, list):
+        return sys.getsizeof(data) + sum(map(_get_data_size, data))
+
+    return sys.getsizeof(data)
+
 
-        return xml_data.getroot()
+def _get_xml_size(root):
+    """Estimates the bytes used by an XML tree."""
+    return sum(
+        sys.getsizeof(node) + _get_data_size(node.attrib) +
+        len(node.text or '') + len(node.tail or '')
+        for node in root.iter())
@@ -0,0 +1,135 @@
+from .resource_manifest import MANIFEST_FILENAME, ResourceManifest
+import pyglet.resource
+import os
+
+
+class ManifestLoader(pyglet.resource.Loader):
+    """Resource loader which indexes resource paths from their manifests.
+
+    Reindexing reads the manifest file in each resource path instead of
+    walking the directories. If any resource path is missing its manifest,
+    or its files were added, removed, or resized since the manifest was
+    generated, the directories are walked as with
+    :obj:`pyglet.resource.Loader`.
+
+    Freshness is checked against the names and sizes of the listed files
+    rather than modified times, which are reset by checkouts and copies.
+    Files edited in place to the same size are not detected, so regenerate
+    the manifest after changing resources.
+
+    Attributes:
+        manifest (:obj:`engine.disk.ResourceManifest`): Information about
+            every indexed resource when the resource paths were indexed from
+            manifests, or an empty manifest otherwise.
+        use_manifests (bool): Whether to index from manifests at all.
+    """
+
+    def __init__(self, path=None, script_home=None, use_manifests=True):
+        """Creates a loader for resource paths, which indexes on first use.
+
+        Kwargs:
+            path (list of str, optional): Paths to load resources from,
+                relative to the script home. Defaults to the script home.
+            script_home (str, optional): Base directory of relative paths.
+                Defaults to the directory of __main__.
+            use_manifests (bool, optional): Whether to index from manifests.
+                Defaults to True.
+        """
+        super(ManifestLoader, self).__init__(path, script_home)
+        self.manifest = ResourceManifest()
+        self.use_manifests = use_manifests
+
+        self._home = script_home or pyglet.resource.get_script_home()
+
+    def reindex(self):
+        """Refreshes the resource index from manifests, or by walking."""
+        self.manifest = ResourceManifest()
+        manifests = self._load_manifests() if self.use_manifests else None
+
+        if manifests is None:
+            super(ManifestLoader, self).reindex()
+            return
+
+        self._index = {}
+
+        for resource_dir, manifest in manifests:
+            location = pyglet.resource.FileLocation(resource_dir)
+
+            for name, info in manifest.resources.items():
+                # Earlier paths take precedence, as when walking
+                if name not in self.manifest:
+                    self._index_file(name, location)
+                    self.manifest.resources[name] = info
+
+    def _load_manifests(self):
+        """Returns (directory, manifest) pairs, or None if any are unusable."""
+        manifests = []
+
+        for resource_path in self.path:
+            # Relative paths are relative to __main__, as with pyglet
+            resource_dir = os.path.join(
+                self._home, resource_path).rstrip(os.sep)
+            manifest_path = os.path.join(resource_dir, MANIFEST_FILENAME)
+
+            try:
+                manifest = ResourceManifest.load(manifest_path)
+            except FileNotFoundError:
+                return None
+
+            if not _is_current(resource_dir, manifest):
+                return None
+
+            manifests.append((resource_dir, manifest))
+
+        return manifests
+
+
+def _is_current(resource_dir, manifest):
+    """Returns whether the files in a directory match its manifest.
+
+    Each directory with listed files is scanned once, comparing the names
+    and sizes of its files against the manifest without reading them.
+    """
+    directories = {'': {}}
+
+    for name, info in manifest.resources.items():
+        directory, _, filename = name.rpartition('/')
+        directories.setdefault(directory, {})[filename] = info.size
+
+        # Parents of listed directories are scanned for unlisted files too
+        while directory:
+            directory = directory.rpartition('/')[0]
+            directories.setdefault(directory, {})
+
+    for directory, sizes in directories.items():
+        path = os.path.join(resource_dir, *directory.split('/'))
+        files = {}
+
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        files[entry.name] = entry.stat().st_size
+                    elif _join(directory, entry.name) not in directories and \
+                            _has_files(entry.path):
+                        return False
+        except FileNotFoundError:
+            return False
+
+        if not directory:
+            files.pop(MANIFEST_FILENAME, None)
+
+        if files != sizes:
+            return False
+
+    return True
+
+
+def _join(directory, name):
+    """Returns a name within a manifest directory, using forward slashes."""
+    return directory + '/' + name if directory else name
+
+
+def _has_files(path):
+    """Returns whether a directory has any files, recursively."""
+    return any(filenames for _, _, filenames in os.walk(path))
@@ -0,0 +1,172 @@
+from .resource_pack import MemoryViewFile
+from pyglet.media.codecs.base import (
+    AudioFormat, StaticMemorySource, StaticSource, StreamingSource)
+import mmap
+import os
+import struct
+
+PCM_MAGIC = b'PFQPCM\x00\x00'
+PCM_VERSION = 1
+
+# Magic, version, channels, sample size, and sample rate
+_HEADER = struct.Struct('<8sIHHI')
+
+# Bytes requested from the decoder at a time when writing a cache entry
+_DECODE_BUFFER_SIZE = 1 << 20
+
+
+class PcmCache(object):
+    """Directory of decoded audio, read back through memory maps.
+
+    Each entry holds the raw PCM samples of one sound, written the first time
+    the sound is decoded. Later loads memory map the entry instead of decoding
+    the sound again. Since the maps are read-only views of the same file, the
+    operating system shares their pages between every process which loads the
+    sound.
+
+    Entries are named by a key which must change whenever the sound changes,
+    such as a hash of the encoded file, so stale entries are never read.
+
+    Attributes:
+        directory (str): Path to the directory holding the cache entries.
+    """
+
+    def __init__(self, directory):
+        """Creates a cache in a directory, creating it if it does not exist.
+
+        Args:
+            directory (str): Path to the directory to store entries in.
+        """
+        super(PcmCache, self).__init__()
+        self.directory = directory
+
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, key, decode):
+        """Loads a sound from the cache, decoding it on a miss.
+
+        Args:
+            key (str): Identifies the sound and its contents, see
+                :fn:`get_path`.
+            decode (fn): Called without arguments on a miss, returning a
+                :obj:`pyglet.media.Source` to decode the sound from. Streaming
+                sources are deleted once decoded, closing their file.
+
+        Returns:
+            A :obj:`pyglet.media.StaticSource` for the sound, backed by a
+            memory map of its cache entry if the sound has any audio.
+        """
+        path = self.get_path(key)
+
+        try:
+            return MappedStaticSource(path)
+        except (FileNotFoundError, ValueError):
+            pass
+
+        source = decode().get_queue_source()
+
+        try:
+            # Sources without audio are too cheap to be worth caching
+            if source.audio_format is None:
+                return StaticSource(source)
+
+            write_pcm(path, source)
+        finally:
+            # Streaming sources keep their file and decoder open until deleted
+            if isinstance(source, StreamingSource):
+                source.delete()
+
+        return MappedStaticSource(path)
+
+    def get_path(self, key):
+        """Returns the path of the cache entry for a key.
+
+        Args:
+            key (str): Identifies the sound and its contents. It must be
+                usable as a filename.
+
+        Returns:
+            The path to the cache entry, which may not exist.
+        """
+        return os.path.join(self.directory, key + '.pcm')
+
+
+class MappedStaticSource(StaticSource):
+    """Static audio source over a memory mapped PCM cache entry.
+
+    Like :obj:`pyglet.media.StaticSource`, the source can be queued on any
+    number of players at once. Queued sources read directly from the memory
+    map rather than keeping their own copy of the samples.
+    """
+
+    def __init__(self, path):
+        """Maps a PCM cache entry written by :fn:`write_pcm`.
+
+        Args:
+            path (str): Path to the cache entry.
+
+        Raises:
+            FileNotFoundError: If the entry does not exist.
+            ValueError: If the file is not a supported cache entry.
+        """
+        with open(path, 'rb') as pcm_file:
+            if os.fstat(pcm_file.fileno()).st_size < _HEADER.size:
+                raise ValueError('{0} is not a PCM cache entry'.format(path))
+
+            self._mmap = mmap.mmap(
+                pcm_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, channels, sample_size, sample_rate = \
+            _HEADER.unpack_from(self._mmap)
+
+        if magic != PCM_MAGIC or version != PCM_VERSION:
+            self._mmap.close()
+            raise ValueError('Unsupported PCM cache entry {0}'.format(path))
+
+        self.audio_format = AudioFormat(channels, sample_size, sample_rate)
+        self._data = memoryview(self._mmap)[_HEADER.size:]
+        self._duration = len(self._data) / self.audio_format.bytes_per_second
+
+    def get_queue_source(self):
+        """Returns a new source for a player to read the samples from."""
+        return _MappedMemorySource(self._data, self.audio_format)
+
+
+class _MappedMemorySource(StaticMemorySource):
+    """Queued source reading samples from a memory view, without a copy."""
+
+    def __init__(self, data, audio_format):
+        """Creates a source reading from the start of the samples."""
+        self._file = MemoryViewFile(data)
+        self._max_offset = len(data)
+        self.audio_format = audio_format
+        self._duration = len(data) / float(audio_format.bytes_per_second)
+
+
+def write_pcm(path, source):
+    """Decodes an audio source into a PCM cache entry.
+
+    The entry is written to a temporary file first, so other processes never
+    map a partially written entry.
+
+    Args:
+        path (str): Path to write the cache entry to.
+        source (:obj:`pyglet.media.Source`): Queue source to decode. It must
+            have an audio format.
+    """
+    audio_format = source.audio_format
+    temporary_path = '{0}.{1}.tmp'.format(path, os.getpid())
+
+    with open(temporary_path, 'wb') as pcm_file:
+        pcm_file.write(_HEADER.pack(
+            PCM_MAGIC, PCM_VERSION, audio_format.channels,
+            audio_format.sample_size, audio_format.sample_rate))
+
+        while True:
+            audio_data = source.get_audio_data(_DECODE_BUFFER_SIZE)
+            if not audio_data:
+                break
+
+            pcm_file.write(audio_data.get_string_data())
+
+    os.replace(temporary_path, path)
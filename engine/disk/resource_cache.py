@@ -0,0 +1,197 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class ResourceCache(object):
+    """Reference counted cache of loaded resources with a memory budget.
+
+    Each load of a resource acquires a reference to it, which is given up by
+    releasing the resource. Once the cached resources exceed the budget, the
+    least recently used resources without references are evicted until the
+    cache fits within its budget again. Referenced resources are never
+    evicted, even if they exceed the budget.
+
+    This cache is safe to use from multiple threads.
+
+    Attributes:
+        budget (int or None): The number of bytes to limit cached resources
+            to, or None for no limit.
+        hits (int): Number of loads which were served from the cache.
+        misses (int): Number of loads which were not in the cache.
+        evictions (int): Number of resources evicted from the cache.
+    """
+
+    def __init__(self, budget=None):
+        """Creates an empty resource cache.
+
+        Kwargs:
+            budget (int, optional): The number of bytes to limit cached
+                resources to, or None for no limit. Defaults to None.
+        """
+        super(ResourceCache, self).__init__()
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._size = 0
+        self._lock = Lock()
+
+        # Entries in least to most recently used order, and their keys by id
+        self._entries = OrderedDict()
+        self._keys = {}
+
+    def load(self, key, loader, size=None, on_evict=None):
+        """Returns the resource for the key, loading it if it isn't cached.
+
+        A reference to the resource is acquired, see :fn:`release`. The loader
+        is called without holding the cache lock, so a slow load on one thread
+        does not block other threads using the cache.
+
+        Args:
+            key (hashable): The key identifying the resource.
+            loader (fn): Called with no arguments to load the resource.
+
+        Kwargs:
+            size (fn, optional): Called with the loaded resource to estimate
+                its size in bytes. Resources have no size if None.
+            on_evict (fn, optional): Called with the resource once it has been
+                evicted from the cache. Defaults to None.
+
+        Returns:
+            The cached or newly loaded resource.
+        """
+        with self._lock:
+            entry = self._acquire(key)
+
+        if entry is not None:
+            return entry.resource
+
+        resource = loader()
+        entry = _CacheEntry(resource, size(resource) if size else 0, on_evict)
+
+        with self._lock:
+            # Another thread may have loaded the same resource in the meantime
+            cached_entry = self._acquire(key, count_hit=False)
+            if cached_entry is not None:
+                return cached_entry.resource
+
+            self.misses += 1
+            self._entries[key] = entry
+            self._keys[id(resource)] = key
+            self._size += entry.size
+
+            evicted = self._evict()
+
+        self._notify_evicted(evicted)
+
+        return resource
+
+    def release(self, resource):
+        """Gives up a reference to a resource, allowing it to be evicted.
+
+        Resources which are not in the cache are ignored.
+
+        Args:
+            resource (object): The resource returned by :fn:`load`.
+        """
+        with self._lock:
+            key = self._keys.get(id(resource))
+            if key is None:
+                return
+
+            entry = self._entries[key]
+            entry.references = max(0, entry.references - 1)
+
+            evicted = self._evict()
+
+        self._notify_evicted(evicted)
+
+    def clear(self):
+        """Removes all resources from the cache and resets its counters."""
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __contains__(self, key):
+        """Returns true if a resource is cached for the key."""
+        return key in self._entries
+
+    def __len__(self):
+        """Returns the number of cached resources."""
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """Returns the estimated size of all cached resources, in bytes."""
+        return self._size
+
+    def _acquire(self, key, count_hit=True):
+        """Acquires a reference to a cached entry, marking it as recent.
+
+        The cache lock must be held when calling this method.
+
+        Returns:
+            The :obj:`_CacheEntry` for the key, or None if it is not cached.
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            entry.references += 1
+            self._entries.move_to_end(key)
+
+            if count_hit:
+                self.hits += 1
+
+        return entry
+
+    def _evict(self):
+        """Evicts unreferenced entries until the cache is within its budget.
+
+        The cache lock must be held when calling this method.
+
+        Returns:
+            A list of the evicted :obj:`_CacheEntry` objects.
+        """
+        evicted = []
+
+        if self.budget is None or self._size <= self.budget:
+            return evicted
+
+        # Entries are ordered from least to most recently used
+        for key, entry in list(self._entries.items()):
+            if self._size <= self.budget:
+                break
+
+            if entry.references == 0:
+                del self._entries[key]
+                del self._keys[id(entry.resource)]
+                self._size -= entry.size
+                self.evictions += 1
+                evicted.append(entry)
+
+        return evicted
+
+    def _notify_evicted(self, evicted):
+        """Calls the eviction callbacks of evicted entries, without the lock.
+
+        Callbacks may release other resources, which requires the lock.
+        """
+        for entry in evicted:
+            if entry.on_evict is not None:
+                entry.on_evict(entry.resource)
+
+
+class _CacheEntry(object):
+    """Resource cache entry."""
+
+    def __init__(self, resource, size, on_evict):
+        """Creates a new resource cache entry with a single reference."""
+        self.resource = resource
+        self.size = size
+        self.on_evict = on_evict
+        self.references = 1
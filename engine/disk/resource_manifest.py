@@ -0,0 +1,245 @@
+from hashlib import sha1
+from json import dump as json_dump, load as json_load
+import os
+import struct
+
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = 'manifest.json'
+
+# Resource types by file extension, matching the DiskLoader load methods
+RESOURCE_TYPES = {
+    '.png': 'image',
+    '.wav': 'audio',
+    '.tmx': 'xml',
+    '.xml': 'xml',
+    '.json': 'json',
+    '.csv': 'csv',
+}
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+class ResourceInfo(object):
+    """Information about a resource file recorded in a manifest.
+
+    Attributes:
+        size (int): Size of the file in bytes.
+        hash (str): SHA-1 hex digest of the file contents.
+        type (str): Type of the resource, such as 'image' or 'audio'.
+        width (int or None): Width of an image resource in pixels.
+        height (int or None): Height of an image resource in pixels.
+    """
+
+    def __init__(self, size, hash, type, width=None, height=None):
+        """Creates information about a resource file.
+
+        Args:
+            size (int): Size of the file in bytes.
+            hash (str): SHA-1 hex digest of the file contents.
+            type (str): Type of the resource, such as 'image' or 'audio'.
+
+        Kwargs:
+            width (int, optional): Width of an image resource in pixels.
+                Defaults to None.
+            height (int, optional): Height of an image resource in pixels.
+                Defaults to None.
+        """
+        super(ResourceInfo, self).__init__()
+        self.size = size
+        self.hash = hash
+        self.type = type
+        self.width = width
+        self.height = height
+
+    def to_dict(self):
+        """Returns the information as a JSON serializable dict."""
+        info = {'size': self.size, 'hash': self.hash, 'type': self.type}
+
+        if self.width is not None:
+            info['width'] = self.width
+            info['height'] = self.height
+
+        return info
+
+    def __eq__(self, other):
+        """Returns true if both describe the same file contents."""
+        return isinstance(other, ResourceInfo) and \
+            self.to_dict() == other.to_dict()
+
+
+class ResourceManifest(object):
+    """Precomputed index of the files in a resource directory.
+
+    Loading a manifest takes a single read, which avoids walking and
+    statting every file in the resource directory at startup. The recorded
+    sizes and hashes can also be used to find resources to prefetch and to
+    check whether cached data derived from a resource is still valid.
+
+    Regenerate the manifest whenever resources are added or changed::
+
+        python generate-resource-manifest.py resources/
+
+    Attributes:
+        resources (dict of str to :obj:`ResourceInfo`): Information for each
+            file, by its path relative to the resource directory using
+            forward slashes.
+    """
+
+    def __init__(self, resources=None):
+        """Creates a manifest of resource files.
+
+        Kwargs:
+            resources (dict of str to :obj:`ResourceInfo`, optional):
+                Information for each file, by its path relative to the
+                resource directory. Defaults to an empty manifest.
+        """
+        super(ResourceManifest, self).__init__()
+        self.resources = resources if resources is not None else {}
+
+    @classmethod
+    def build(cls, resource_dir):
+        """Creates a manifest by reading every file in a resource directory.
+
+        Manifest files within the directory are not included.
+
+        Args:
+            resource_dir (str): Path to the resource directory.
+
+        Returns:
+            A :obj:`ResourceManifest` for the directory.
+        """
+        resources = {}
+
+        for path, name in walk_resource_files(resource_dir):
+            if name != MANIFEST_FILENAME:
+                resources[name] = read_resource_info(path)
+
+        return cls(resources)
+
+    @classmethod
+    def load(cls, manifest_path):
+        """Loads a manifest from a JSON file.
+
+        Args:
+            manifest_path (str): Path to the manifest file.
+
+        Returns:
+            The loaded :obj:`ResourceManifest`.
+
+        Raises:
+            ValueError: If the manifest version is not supported.
+        """
+        with open(manifest_path, 'r') as manifest_file:
+            data = json_load(manifest_file)
+
+        if data.get('version') != MANIFEST_VERSION:
+            raise ValueError('Unsupported resource manifest version {0}'
+                             .format(data.get('version')))
+
+        return cls({name: ResourceInfo(**info)
+                    for name, info in data['resources'].items()})
+
+    def save(self, manifest_path):
+        """Writes the manifest to a JSON file.
+
+        Args:
+            manifest_path (str): Path to write the manifest to.
+        """
+        data = {
+            'version': MANIFEST_VERSION,
+            'resources': {name: self.resources[name].to_dict()
+                          for name in sorted(self.resources)},
+        }
+
+        with open(manifest_path, 'w') as manifest_file:
+            json_dump(data, manifest_file, indent=2)
+            manifest_file.write('\n')
+
+    def get(self, name):
+        """Returns the :obj:`ResourceInfo` for a path, or None if missing."""
+        return self.resources.get(name)
+
+    def get_paths(self, resource_type=None):
+        """Returns the sorted resource paths, optionally of a single type.
+
+        This is useful for finding resources to prefetch.
+
+        Kwargs:
+            resource_type (str, optional): Type of resources to list, such as
+                'image' or 'audio'. Defaults to None for all resources.
+        """
+        return sorted(name for name, info in self.resources.items()
+                      if resource_type is None or info.type == resource_type)
+
+    def verify(self, resource_dir):
+        """Finds resources which differ from the manifest.
+
+        Args:
+            resource_dir (str): Path to the resource directory.
+
+        Returns:
+            A sorted list of paths which were added, removed, or changed
+            since the manifest was generated. An empty list means the
+            manifest is up to date.
+        """
+        current = ResourceManifest.build(resource_dir).resources
+        names = set(current) | set(self.resources)
+
+        return sorted(name for name in names
+                      if current.get(name) != self.resources.get(name))
+
+    def __contains__(self, name):
+        """Returns true if the manifest has information for the path."""
+        return name in self.resources
+
+    def __len__(self):
+        """Returns the number of resources in the manifest."""
+        return len(self.resources)
+
+
+def read_resource_info(path):
+    """Reads the size, hash, type, and image dimensions of a file.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        A :obj:`ResourceInfo` for the file.
+    """
+    with open(path, 'rb') as resource_file:
+        data = resource_file.read()
+
+    extension = os.path.splitext(path)[1].lower()
+    resource_type = RESOURCE_TYPES.get(extension, 'file')
+    width, height = _get_png_dimensions(data) or (None, None)
+
+    return ResourceInfo(len(data), sha1(data).hexdigest(), resource_type,
+                        width=width, height=height)
+
+
+def _get_png_dimensions(data):
+    """Returns the (width, height) of PNG data, or None if not a PNG."""
+    # The IHDR chunk with the dimensions always immediately follows the header
+    if len(data) < 24 or not data.startswith(_PNG_SIGNATURE):
+        return None
+
+    return struct.unpack('>II', data[16:24])
+
+
+def walk_resource_files(resource_dir):
+    """Yields (path, name) for each file in a directory, recursively.
+
+    Names are relative to the directory, using forward slashes like
+    :obj:`pyglet.resource` does.
+    """
+    resource_dir = resource_dir.rstrip(os.sep)
+
+    for dir_path, _, filenames in os.walk(resource_dir):
+        relative_dir = os.path.relpath(dir_path, resource_dir)
+
+        for filename in filenames:
+            name = filename
+            if relative_dir != os.curdir:
+                name = '/'.join(relative_dir.split(os.sep) + [filename])
+
+            yield os.path.join(dir_path, filename), name
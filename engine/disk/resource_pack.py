@@ -0,0 +1,242 @@
+from .resource_manifest import MANIFEST_FILENAME, walk_resource_files
+from json import dumps as json_dumps, loads as json_loads
+import io
+import mmap
+import os
+import pyglet.image
+import struct
+
+PACK_MAGIC = b'PFQPACK\x00'
+PACK_VERSION = 1
+
+# Magic, version, index offset, and index size
+_HEADER = struct.Struct('<8sIQQ')
+
+
+class ResourcePack(object):
+    """Indexed archive of resources, read through a memory map.
+
+    Packing resources into a single file avoids opening and reading many
+    small files when starting the game or loading a room. Resources are
+    handed out as zero-copy :obj:`memoryview` slices of the memory map, so
+    only the pages which are actually read are loaded from disk.
+
+    Packs can also store pre-decoded RGBA pixel data for images, which skips
+    decoding them when they are loaded. See :fn:`write_resource_pack`.
+
+    Memory views returned by the pack must be released before the pack is
+    closed.
+    """
+
+    def __init__(self, path):
+        """Opens a resource pack.
+
+        Args:
+            path (str): Path to the resource pack file.
+
+        Raises:
+            ValueError: If the file is not a supported resource pack.
+        """
+        super(ResourcePack, self).__init__()
+
+        with open(path, 'rb') as pack_file:
+            self._mmap = mmap.mmap(
+                pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise ValueError('{0} is not a resource pack'.format(path))
+
+        magic, version, index_offset, index_size = _HEADER.unpack_from(
+            self._mmap)
+
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self._mmap.close()
+            raise ValueError('Unsupported resource pack {0}'.format(path))
+
+        index = json_loads(
+            self._mmap[index_offset:index_offset + index_size].decode('utf-8'))
+
+        self._view = memoryview(self._mmap)
+        self._resources = index['resources']
+        self._pixels = index['pixels']
+
+    def get(self, name):
+        """Returns the raw contents of a resource.
+
+        Args:
+            name (str): Path to the resource, relative to the packed directory.
+
+        Returns:
+            A read-only :obj:`memoryview` of the resource's bytes.
+
+        Raises:
+            KeyError: If the resource is not in the pack.
+        """
+        offset, size = self._resources[name]
+        return self._view[offset:offset + size]
+
+    def get_pixels(self, name):
+        """Returns the pre-decoded pixel data of an image, if it was packed.
+
+        Args:
+            name (str): Path to the image, relative to the packed directory.
+
+        Returns:
+            A tuple of (width, height, pixels), where pixels is a read-only
+            :obj:`memoryview` of RGBA data with rows ordered bottom to top, or
+            None if the image has no pre-decoded pixel data.
+        """
+        if name not in self._pixels:
+            return None
+
+        offset, size, width, height = self._pixels[name]
+        return (width, height, self._view[offset:offset + size])
+
+    def open(self, name, mode='rb'):
+        """Opens a resource as a read-only file object.
+
+        Reads are copied directly out of the memory map, so the resource is
+        never read into memory as a whole.
+
+        Args:
+            name (str): Path to the resource, relative to the packed directory.
+
+        Kwargs:
+            mode (str, optional): 'rb' for a binary file or 'r' for a UTF-8
+                text file. Defaults to 'rb'.
+
+        Returns:
+            A file object for the resource.
+
+        Raises:
+            KeyError: If the resource is not in the pack.
+        """
+        resource_file = MemoryViewFile(self.get(name))
+
+        if 'b' in mode:
+            return resource_file
+
+        return io.TextIOWrapper(
+            io.BufferedReader(resource_file), encoding='utf-8')
+
+    def close(self):
+        """Closes the memory map of the pack."""
+        self._view.release()
+        self._mmap.close()
+
+    def __contains__(self, name):
+        """Returns true if the resource is in the pack."""
+        return name in self._resources
+
+    def __len__(self):
+        """Returns the number of resources in the pack."""
+        return len(self._resources)
+
+    def __enter__(self):
+        """Returns the pack for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Closes the pack when leaving the context."""
+        self.close()
+
+
+def write_resource_pack(pack_path, resource_dir, decode_images=False):
+    """Packs every file in a resource directory into a resource pack.
+
+    Manifest files within the directory are not included. The pack is
+    written to a temporary file first, so an existing pack is only replaced
+    once the new pack is complete.
+
+    Args:
+        pack_path (str): Path to write the resource pack to.
+        resource_dir (str): Path to the resource directory to pack.
+
+    Kwargs:
+        decode_images (bool, optional): Whether to also store decoded RGBA
+            pixel data for PNG images, which trades pack size for skipping
+            decoding when loading. Defaults to False.
+    """
+    resources = {}
+    pixels = {}
+    temporary_path = pack_path + '.tmp'
+
+    with open(temporary_path, 'wb') as pack_file:
+        # The header is rewritten with the index location once it's known
+        pack_file.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, 0))
+
+        for path, name in sorted(walk_resource_files(resource_dir),
+                                 key=lambda file: file[1]):
+            if name == MANIFEST_FILENAME:
+                continue
+
+            with open(path, 'rb') as resource_file:
+                data = resource_file.read()
+
+            resources[name] = [pack_file.tell(), len(data)]
+            pack_file.write(data)
+
+            if decode_images and name.lower().endswith('.png'):
+                image = pyglet.image.load(path).get_image_data()
+                rgba = image.get_data('RGBA', image.width * 4)
+
+                pixels[name] = [
+                    pack_file.tell(), len(rgba), image.width, image.height]
+                pack_file.write(rgba)
+
+        index = json_dumps(
+            {'resources': resources, 'pixels': pixels}).encode('utf-8')
+        index_offset = pack_file.tell()
+        pack_file.write(index)
+
+        pack_file.seek(0)
+        pack_file.write(_HEADER.pack(
+            PACK_MAGIC, PACK_VERSION, index_offset, len(index)))
+
+    os.replace(temporary_path, pack_path)
+
+
+class MemoryViewFile(io.RawIOBase):
+    """Read-only binary file object over a memory view."""
+
+    def __init__(self, view):
+        """Creates a file object reading from the start of a memory view."""
+        super(MemoryViewFile, self).__init__()
+        self._view = view
+        self._position = 0
+
+    def readable(self):
+        """Returns true, since the file can be read."""
+        return True
+
+    def seekable(self):
+        """Returns true, since the file supports random access."""
+        return True
+
+    def readinto(self, buffer):
+        """Reads bytes into a preallocated buffer, returning the count."""
+        start = min(self._position, len(self._view))
+        size = min(len(buffer), len(self._view) - start)
+
+        buffer[:size] = self._view[start:start + size]
+        self._position = start + size
+
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Moves to a position in the file, returning the new position."""
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+
+        if offset < 0:
+            raise ValueError('Negative seek position {0}'.format(offset))
+
+        self._position = offset
+        return self._position
+
+    def tell(self):
+        """Returns the current position in the file."""
+        return self._position
@@ -1,4 +1,5 @@
 from ..disk_loader import DiskLoader
+from ..resource_manifest import ResourceInfo, ResourceManifest
 from unittest.mock import Mock, patch
 import unittest
 import io
@@ -7,23 +8,141 @@ import io
 class TestDiskLoader(unittest.TestCase):
     """Test loading resources from disk."""
 
-    @patch('pyglet.resource')
-    def test_set_resource_paths(self, mock_resource):
-        """Sets paths and reindexes."""
-        test_paths = ['a', 'b', 'c']
-        DiskLoader.set_resource_paths(test_paths)
-        self.assertEqual(test_paths, mock_resource.path)
-        mock_resource.reindex.assert_called()
+    def setUp(self):
+        """Provides each test with an empty resource cache without a budget."""
+        budget = DiskLoader.cache.budget
+        DiskLoader.cache.budget = None
+        DiskLoader.cache.clear()
 
-    @patch('pyglet.resource.image')
+        self.addCleanup(setattr, DiskLoader.cache, 'budget', budget)
+        self.addCleanup(DiskLoader.cache.clear)
+
+    @patch.object(DiskLoader.loader, 'reindex')
+    def test_set_resource_paths(self, mock_reindex):
+        """Sets the loader's paths and reindexes."""
+        loader = DiskLoader.loader
+        self.addCleanup(setattr, loader, 'path', loader.path)
+        self.addCleanup(setattr, loader, 'use_manifests', False)
+        self.addCleanup(setattr, DiskLoader, 'manifest', DiskLoader.manifest)
+
+        manifest = ResourceManifest()
+        mock_reindex.side_effect = lambda: setattr(
+            loader, 'manifest', manifest)
+
+        DiskLoader.set_resource_paths(['a', 'b'], use_manifests=True)
+
+        self.assertEqual(['a', 'b'], loader.path)
+        self.assertTrue(loader.use_manifests)
+        mock_reindex.assert_called_once_with()
+        self.assertIs(manifest, DiskLoader.manifest)
+
+    @patch.object(DiskLoader.loader, 'image')
     def test_load_image(self, mock_image):
         """Loads an image resource from disk."""
         image = DiskLoader.load_image('abc.png')
         mock_image.assert_called_once_with('abc.png')
         self.assertEqual(mock_image.return_value, image)
 
+    @patch.object(DiskLoader, 'decode_image')
+    @patch.object(DiskLoader.loader, 'image')
+    def test_load_image_into_texture_atlas(self, mock_image,
+                                           mock_decode_image):
+        """Loaded images are packed into the texture atlas once."""
+        mock_region = Mock(width=1, height=1)
+        mock_atlas = Mock()
+        mock_atlas.pack.side_effect = lambda images: {
+            name: mock_region for name in images}
+
+        DiskLoader.set_texture_atlas(mock_atlas)
+        self.addCleanup(DiskLoader.set_texture_atlas, None)
+
+        image = DiskLoader.load_image('abc.png')
+        cached_image = DiskLoader.load_image('abc.png')
+
+        # Image was decoded and packed rather than loaded by pyglet
+        mock_image.assert_not_called()
+        mock_decode_image.assert_called_once_with('abc.png')
+        mock_atlas.pack.assert_called_once_with(
+            {'abc.png': mock_decode_image.return_value})
+
+        self.assertEqual(mock_region, image)
+        self.assertEqual(image, cached_image)
+
+    def test_pack_images_into_texture_atlas(self):
+        """Decoded images are packed together, skipping packed images."""
+        mock_atlas = Mock()
+        mock_atlas.pack.side_effect = lambda images: {
+            name: Mock(width=1, height=1, image=image)
+            for name, image in images.items()}
+
+        DiskLoader.set_texture_atlas(mock_atlas)
+        self.addCleanup(DiskLoader.set_texture_atlas, None)
+
+        first_regions = DiskLoader.pack_images({'a.png': 'a'})
+        regions = DiskLoader.pack_images({'a.png': 'a', 'b.png': 'b'})
+
+        # The already packed image was not packed again
+        mock_atlas.pack.assert_called_with({'b.png': 'b'})
+
+        self.assertEqual(first_regions['a.png'], regions['a.png'])
+        self.assertEqual('b', regions['b.png'].image)
+
+        # Packed images are cached, and shared with loaded images
+        self.assertEqual(
+            regions['b.png'], DiskLoader.load_image('b.png'))
+        mock_atlas.release.assert_not_called()
+
+    def test_evicted_images_are_released_from_texture_atlas(self):
+        """Images are released from the atlas once evicted from the cache."""
+        region = Mock(width=2, height=2)
+        mock_atlas = Mock()
+        mock_atlas.pack.return_value = {'a.png': region}
+
+        DiskLoader.set_texture_atlas(mock_atlas)
+        self.addCleanup(DiskLoader.set_texture_atlas, None)
+        DiskLoader.cache.budget = 0
+
+        DiskLoader.pack_images({'a.png': 'a'})
+        DiskLoader.load_image('a.png')
+
+        # The image is kept until both references are released
+        DiskLoader.release(region)
+        mock_atlas.release.assert_not_called()
+
+        DiskLoader.release(region)
+        mock_atlas.release.assert_called_once_with(region)
+        self.assertNotIn(('image', 'a.png'), DiskLoader.cache)
+
+    @patch.object(DiskLoader, 'decode_image')
+    def test_evicted_images_use_the_atlas_they_were_packed_into(
+            self, mock_decode_image):
+        """Images are released from their atlas after the atlas changes."""
+        region = Mock(width=2, height=2)
+        first_atlas, second_atlas = Mock(), Mock()
+        first_atlas.pack.return_value = {'a.png': region}
+
+        DiskLoader.set_texture_atlas(first_atlas)
+        self.addCleanup(DiskLoader.set_texture_atlas, None)
+        DiskLoader.cache.budget = 0
+
+        DiskLoader.load_image('a.png')
+        DiskLoader.set_texture_atlas(second_atlas)
+        DiskLoader.release(region)
+
+        first_atlas.release.assert_called_once_with(region)
+        second_atlas.release.assert_not_called()
+
+    def test_pack_images_without_texture_atlas(self):
+        """Decoded images are uploaded individually without an atlas."""
+        mock_image = Mock()
+
+        textures = DiskLoader.pack_images({'a.png': mock_image})
+
+        self.assertEqual(
+            {'a.png': mock_image.get_texture.return_value}, textures)
+
     @patch('pyglet.image.ImageGrid')
-    @patch('pyglet.resource.image')
+    @patch.object(DiskLoader.loader, 'image')
     def test_load_image_grid(self, mock_image, mock_image_grid):
         """Loads an image grid resource from disk."""
         image_grid = DiskLoader.load_image_grid('abc.png', 2, 8)
@@ -33,7 +152,7 @@ class TestDiskLoader(unittest.TestCase):
         self.assertEqual(mock_image_grid.return_value, image_grid)
 
     @patch('pyglet.image.ImageGrid')
-    @patch('pyglet.resource.image')
+    @patch.object(DiskLoader.loader, 'image')
     def test_load_image_grid_passes_kwargs(self, mock_image, mock_image_grid):
         """Image grid loading supports all kwargs."""
         mock_item_width = Mock()
@@ -50,21 +169,152 @@ class TestDiskLoader(unittest.TestCase):
             item_width=mock_item_width, item_height=mock_item_height,
             row_padding=mock_row_padding, column_padding=mock_column_padding)
 
-    @patch('pyglet.resource.media')
+    @patch('pyglet.image.load')
+    @patch.object(DiskLoader.loader, 'file')
+    def test_decode_image(self, mock_file, mock_load):
+        """Decodes an image file without creating a texture."""
+        image = DiskLoader.decode_image('abc.png')
+
+        # Image was opened in binary readonly mode and decoded
+        mock_file.assert_called_once_with('abc.png', mode='rb')
+        mock_load.assert_called_once_with(
+            'abc.png', file=mock_file.return_value.__enter__.return_value)
+
+        self.assertEqual(mock_load.return_value, image)
+
+    @patch('pyglet.image.ImageGrid')
+    def test_create_image_grid_uploads_texture(self, mock_image_grid):
+        """Creates an image grid from the texture of a decoded image."""
+        mock_image = Mock()
+        image_grid = DiskLoader.create_image_grid(mock_image, 2, 8)
+
+        mock_image_grid.assert_called_once_with(
+            mock_image.get_texture.return_value, 2, 8)
+        self.assertEqual(mock_image_grid.return_value, image_grid)
+
+    @patch.object(DiskLoader.loader, 'media')
     def test_load_audio_with_streaming(self, mock_audio):
         """Loads an audio resource from disk with streaming enabled."""
         audio = DiskLoader.load_audio('abc.wav', streaming=True)
         mock_audio.assert_called_once_with('abc.wav', streaming=True)
         self.assertEqual(mock_audio.return_value, audio)
 
-    @patch('pyglet.resource.media')
+    @patch.object(DiskLoader.loader, 'media')
     def test_load_audio_without_streaming(self, mock_audio):
         """Loads an audio resource from disk entirely into memory."""
         audio = DiskLoader.load_audio('abc.wav', streaming=False)
         mock_audio.assert_called_once_with('abc.wav', streaming=False)
         self.assertEqual(mock_audio.return_value, audio)
 
-    @patch('pyglet.resource.file')
+    def set_mock_resource_pack(self, names):
+        """Sets a mock resource pack containing the given resource names."""
+        mock_pack = Mock()
+        mock_pack.__contains__ = lambda pack, name: name in names
+        mock_pack.get_pixels.return_value = None
+
+        DiskLoader.set_resource_pack(mock_pack)
+        self.addCleanup(DiskLoader.set_resource_pack, None)
+
+        return mock_pack
+
+    @patch.object(DiskLoader.loader, 'file')
+    def test_open_file_from_resource_pack(self, mock_file):
+        """Packed resources are opened from the pack before the paths."""
+        mock_pack = self.set_mock_resource_pack(['a.json'])
+
+        self.assertEqual(mock_pack.open.return_value,
+                         DiskLoader.open_file('a.json', mode='r'))
+        mock_pack.open.assert_called_once_with('a.json', mode='r')
+
+        self.assertEqual(mock_file.return_value,
+                         DiskLoader.open_file('b.json'))
+        mock_file.assert_called_once_with('b.json', mode='rb')
+
+    @patch('pyglet.image.load')
+    def test_decode_image_from_resource_pack(self, mock_load):
+        """Images with pre-decoded pixels in the pack skip decoding."""
+        mock_pack = self.set_mock_resource_pack(['a.png'])
+        mock_pack.get_pixels.return_value = (1, 2, memoryview(bytes(8)))
+
+        image = DiskLoader.decode_image('a.png')
+
+        mock_load.assert_not_called()
+        mock_pack.get_pixels.assert_called_once_with('a.png')
+        self.assertEqual((1, 2), (image.width, image.height))
+        self.assertEqual(bytes(8), image.get_data('RGBA', 4))
+
+    @patch.object(DiskLoader.loader, 'image')
+    @patch.object(DiskLoader, 'decode_image')
+    def test_load_image_from_resource_pack(self, mock_decode_image,
+                                           mock_image):
+        """Packed images are decoded from the pack and uploaded."""
+        self.set_mock_resource_pack(['a.png'])
+        mock_texture = Mock(width=1, height=1)
+        mock_decode_image.return_value.get_texture.return_value = mock_texture
+
+        image = DiskLoader.load_image('a.png')
+
+        mock_image.assert_not_called()
+        mock_decode_image.assert_called_once_with('a.png')
+        self.assertEqual(mock_texture, image)
+
+    @patch.object(DiskLoader.loader, 'media')
+    @patch('pyglet.media.load')
+    def test_load_audio_from_resource_pack(self, mock_load, mock_media):
+        """Packed audio is decoded from a file in the pack."""
+        mock_pack = self.set_mock_resource_pack(['a.wav'])
+
+        audio = DiskLoader.load_audio('a.wav', streaming=True)
+
+        mock_media.assert_not_called()
+        mock_load.assert_called_once_with(
+            'a.wav', file=mock_pack.open.return_value, streaming=True)
+        self.assertEqual(mock_load.return_value, audio)
+
+    @patch.object(DiskLoader.loader, 'file')
+    @patch.object(DiskLoader.loader, 'media')
+    def test_load_audio_through_pcm_cache(self, mock_media, mock_file):
+        """In-memory audio is decoded through the PCM cache once it's set."""
+        mock_file.return_value.__enter__().read.return_value = b'abc'
+        mock_pcm_cache = Mock()
+        mock_pcm_cache.load.return_value = Mock(
+            duration=1, audio_format=Mock(bytes_per_second=2))
+        DiskLoader.set_pcm_cache(mock_pcm_cache)
+        self.addCleanup(DiskLoader.set_pcm_cache, None)
+
+        audio = DiskLoader.load_audio('a.wav', streaming=False)
+        self.assertEqual(mock_pcm_cache.load.return_value, audio)
+
+        # Cached audio is named by its hash and decoded from a stream
+        key, decode = mock_pcm_cache.load.call_args[0]
+        self.assertEqual('a9993e364706816aba3e25717850c26c9cd0d89d', key)
+        mock_media.assert_not_called()
+
+        self.assertEqual(mock_media.return_value, decode())
+        mock_media.assert_called_once_with('a.wav', streaming=True)
+
+    @patch.object(DiskLoader.loader, 'file')
+    def test_pcm_key(self, mock_file):
+        """Audio is keyed by hashing the file."""
+        mock_file.return_value.__enter__().read.return_value = b'abc'
+
+        self.assertEqual('a9993e364706816aba3e25717850c26c9cd0d89d',
+                         DiskLoader._get_pcm_key('a.wav'))
+        mock_file.assert_called_once_with('a.wav', mode='rb')
+
+    @patch.object(DiskLoader.loader, 'file')
+    def test_pcm_key_ignores_manifest(self, mock_file):
+        """Audio is hashed even if the manifest has a hash for it."""
+        mock_file.return_value.__enter__().read.return_value = b'abc'
+
+        DiskLoader.manifest.resources['a.wav'] = ResourceInfo(
+            3, 'stale', 'audio')
+        self.addCleanup(DiskLoader.manifest.resources.pop, 'a.wav')
+
+        self.assertEqual('a9993e364706816aba3e25717850c26c9cd0d89d',
+                         DiskLoader._get_pcm_key('a.wav'))
+
+    @patch.object(DiskLoader.loader, 'file')
     def test_load_csv(self, mock_file):
         """Loads a CSV file into a two dimensional list."""
         # Stub the file object for the CSV
@@ -82,7 +332,7 @@ class TestDiskLoader(unittest.TestCase):
             [['1', '2', '3'], ['4', '5', '6'], ['-1', '-1', '-1']],
             csv_contents)
 
-    @patch('pyglet.resource.file')
+    @patch.object(DiskLoader.loader, 'file')
     def test_load_json(self, mock_file):
         """Loads a JSON file into a dict."""
         # Stub the mock JSON data
@@ -97,7 +347,7 @@ class TestDiskLoader(unittest.TestCase):
         # Returned dict is as expected
         self.assertEqual({'a': 1, 'b': True, '3': 'c'}, json_contents)
 
-    @patch('pyglet.resource.file')
+    @patch.object(DiskLoader.loader, 'file')
     def test_load_xml(self, mock_file):
         """Loads an XML file into an ElementTree."""
         # Stub the mock XML file
@@ -133,3 +383,102 @@ class TestDiskLoader(unittest.TestCase):
 
         self.assertEqual('value', list(second_child)[0].tag)
         self.assertEqual('2', list(second_child)[0].text)
+
+    @patch.object(DiskLoader.loader, 'file')
+    def test_iterparse_xml(self, mock_file):
+        """Parses an XML file incrementally into start and end events."""
+        mock_xml = b'<?xml version="1.0" encoding="UTF-8"?>'
+        mock_xml += b'<data><element name="first"><value>1</value></element>'
+        mock_xml += b'</data>'
+        mock_file.return_value.__enter__.return_value = io.BytesIO(mock_xml)
+
+        events = list(DiskLoader.iterparse_xml('abc.xml'))
+
+        # XML was opened in binary readonly mode
+        mock_file.assert_called_once_with('abc.xml', mode='rb')
+
+        # Events are in document order
+        self.assertEqual([
+            ('start', 'data'),
+            ('start', 'element'),
+            ('start', 'value'),
+            ('end', 'value'),
+            ('end', 'element'),
+            ('end', 'data'),
+        ], [(event, node.tag) for event, node in events])
+
+        # Nodes are complete by their end event
+        self.assertEqual('1', events[3][1].text)
+        self.assertEqual('first', events[4][1].attrib['name'])
+
+    @patch.object(DiskLoader.loader, 'image')
+    def test_loaded_images_are_cached(self, mock_image):
+        """Loading an image again returns it from the cache."""
+        mock_image.return_value.width = 2
+        mock_image.return_value.height = 4
+
+        image = DiskLoader.load_image('abc.png')
+        cached_image = DiskLoader.load_image('abc.png')
+
+        mock_image.assert_called_once_with('abc.png')
+        self.assertEqual(image, cached_image)
+
+        # Image size is estimated as 4 bytes per pixel
+        self.assertEqual(1, DiskLoader.cache.hits)
+        self.assertEqual(1, DiskLoader.cache.misses)
+        self.assertEqual(32, DiskLoader.cache.size)
+
+    @patch.object(DiskLoader.loader, 'image')
+    def test_released_images_are_evicted(self, mock_image):
+        """Released images are evicted once the cache exceeds its budget."""
+        mock_image.side_effect = lambda filename: Mock(width=2, height=2)
+        DiskLoader.cache.budget = 16
+
+        first = DiskLoader.load_image('a.png')
+        DiskLoader.load_image('b.png')
+
+        # Referenced images are kept even when over budget
+        self.assertEqual(32, DiskLoader.cache.size)
+
+        DiskLoader.release(first)
+        self.assertEqual(16, DiskLoader.cache.size)
+        self.assertNotIn(('image', 'a.png'), DiskLoader.cache)
+        self.assertIn(('image', 'b.png'), DiskLoader.cache)
+
+    @patch('pyglet.image.ImageGrid')
+    @patch.object(DiskLoader.loader, 'image')
+    def test_evicted_image_grids_release_their_image(self, mock_image,
+                                                     mock_image_grid):
+        """Image grids release their image once they are evicted."""
+        mock_image.return_value.width = 2
+        mock_image.return_value.height = 2
+        mock_image_grid.return_value.image = mock_image.return_value
+        DiskLoader.cache.budget = 0
+
+        image_grid = DiskLoader.load_image_grid('abc.png', 1, 2)
+        DiskLoader.release(image_grid)
+
+        self.assertEqual(0, len(DiskLoader.cache))
+        self.assertEqual(2, DiskLoader.cache.evictions)
+
+    @patch.object(DiskLoader.loader, 'media')
+    def test_streaming_audio_is_not_cached(self, mock_audio):
+        """Streaming audio is loaded each time, as it can't be shared."""
+        DiskLoader.load_audio('abc.wav', streaming=True)
+        DiskLoader.load_audio('abc.wav', streaming=True)
+
+        self.assertEqual(2, mock_audio.call_count)
+        self.assertEqual(0, len(DiskLoader.cache))
+
+    @patch.object(DiskLoader.loader, 'media')
+    def test_in_memory_audio_is_cached(self, mock_audio):
+        """In-memory audio is cached with its decoded size."""
+        mock_audio.return_value.duration = 0.5
+        mock_audio.return_value.audio_format.bytes_per_second = 100
+
+        audio = DiskLoader.load_audio('abc.wav', streaming=False)
+        cached_audio = DiskLoader.load_audio('abc.wav', streaming=False)
+
+        mock_audio.assert_called_once_with('abc.wav', streaming=False)
+        self.assertEqual(audio, cached_audio)
+        self.assertEqual(50, DiskLoader.cache.size)
@@ -0,0 +1,138 @@
+from ..manifest_loader import ManifestLoader
+from ..resource_manifest import ResourceManifest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+import os
+import unittest
+
+
+class TestManifestLoader(unittest.TestCase):
+    """Test indexing resource paths from their manifests."""
+
+    def setUp(self):
+        """Provides each test with two resource directories.
+
+        * ``self.home``: Directory holding both resource directories.
+        * ``a``: Has ``tiles/tile.png`` and ``shared.txt``.
+        * ``b``: Has ``shared.txt`` and ``b.txt``.
+        """
+        temporary_directory = TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.home = temporary_directory.name
+
+        self.write_file('a/tiles/tile.png', b'png')
+        self.write_file('a/shared.txt', b'from a')
+        self.write_file('b/shared.txt', b'from b')
+        self.write_file('b/b.txt', b'b')
+
+    def write_file(self, name, data):
+        """Writes a file relative to the home directory."""
+        path = os.path.join(self.home, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'wb') as resource_file:
+            resource_file.write(data)
+
+    def write_manifest(self, resource_dir):
+        """Writes an up to date manifest of a resource directory."""
+        path = os.path.join(self.home, resource_dir)
+        ResourceManifest.build(path).save(
+            os.path.join(path, 'manifest.json'))
+
+    def read(self, loader, name):
+        """Reads a resource through the loader."""
+        with loader.file(name) as resource_file:
+            return resource_file.read()
+
+    def test_index_from_manifests(self):
+        """Resources are indexed from manifests without walking."""
+        self.write_manifest('a')
+        self.write_manifest('b')
+        loader = ManifestLoader(['a', 'b'], script_home=self.home)
+
+        with patch('os.walk') as mock_walk:
+            loader.reindex()
+
+        mock_walk.assert_not_called()
+        self.assertEqual(
+            ['b.txt', 'shared.txt', 'tiles/tile.png'],
+            loader.manifest.get_paths())
+
+        # Earlier paths take precedence
+        self.assertEqual(b'from a', self.read(loader, 'shared.txt'))
+        self.assertEqual(b'png', self.read(loader, 'tiles/tile.png'))
+        self.assertEqual(6, loader.manifest.get('shared.txt').size)
+
+    def test_missing_manifest_walks(self):
+        """Resource paths are walked if any is missing its manifest."""
+        self.write_manifest('a')
+        loader = ManifestLoader(['a', 'b'], script_home=self.home)
+        loader.reindex()
+
+        self.assertEqual(0, len(loader.manifest))
+        self.assertEqual(b'b', self.read(loader, 'b.txt'))
+
+    def test_manifest_older_than_directories(self):
+        """Manifests are used even if directories changed after them."""
+        self.write_manifest('a')
+
+        # Checkouts write directories after the manifest they contain
+        manifest_path = os.path.join(self.home, 'a', 'manifest.json')
+        os.utime(manifest_path, (0, 0))
+        os.makedirs(os.path.join(self.home, 'a', 'empty'))
+
+        loader = ManifestLoader(['a'], script_home=self.home)
+        loader.reindex()
+
+        self.assertEqual(['shared.txt', 'tiles/tile.png'],
+                         loader.manifest.get_paths())
+
+    def test_added_file_walks(self):
+        """Resource paths are walked if files were added after the manifest."""
+        self.write_manifest('a')
+        self.write_file('a/tiles/new.png', b'new')
+        loader = ManifestLoader(['a'], script_home=self.home)
+        loader.reindex()
+
+        self.assertEqual(0, len(loader.manifest))
+        self.assertEqual(b'new', self.read(loader, 'tiles/new.png'))
+
+    def test_added_directory_walks(self):
+        """Resource paths are walked if a directory of files was added."""
+        self.write_manifest('a')
+        self.write_file('a/sprites/new.png', b'new')
+        loader = ManifestLoader(['a'], script_home=self.home)
+        loader.reindex()
+
+        self.assertEqual(0, len(loader.manifest))
+        self.assertEqual(b'new', self.read(loader, 'sprites/new.png'))
+
+    def test_removed_file_walks(self):
+        """Resource paths are walked if files were removed."""
+        self.write_manifest('a')
+        os.remove(os.path.join(self.home, 'a', 'tiles', 'tile.png'))
+        loader = ManifestLoader(['a'], script_home=self.home)
+        loader.reindex()
+
+        self.assertEqual(0, len(loader.manifest))
+        self.assertEqual(b'from a', self.read(loader, 'shared.txt'))
+
+    def test_resized_file_walks(self):
+        """Resource paths are walked if a file changed size."""
+        self.write_manifest('a')
+        self.write_file('a/shared.txt', b'changed in a')
+        loader = ManifestLoader(['a'], script_home=self.home)
+        loader.reindex()
+
+        self.assertEqual(0, len(loader.manifest))
+        self.assertEqual(b'changed in a', self.read(loader, 'shared.txt'))
+
+    def test_without_manifests_walks(self):
+        """Resource paths are walked when not using manifests."""
+        self.write_manifest('a')
+        loader = ManifestLoader(
+            ['a'], script_home=self.home, use_manifests=False)
+        loader.reindex()
+
+        self.assertEqual(0, len(loader.manifest))
+        self.assertEqual(b'png', self.read(loader, 'tiles/tile.png'))
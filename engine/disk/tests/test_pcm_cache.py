@@ -0,0 +1,102 @@
+from ..pcm_cache import MappedStaticSource, PcmCache
+from pyglet.media.codecs.base import (
+    AudioFormat, StaticSource, StreamingSource)
+from pyglet.media.synthesis import Sine
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+import os
+import unittest
+
+
+class TestPcmCache(unittest.TestCase):
+    """Test caching decoded audio in memory mapped files."""
+
+    def setUp(self):
+        """Provides each test with a cache in a temporary directory."""
+        temporary_directory = TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+
+        self.cache = PcmCache(os.path.join(temporary_directory.name, 'pcm'))
+        self.decode = Mock(side_effect=lambda: Sine(0.25, sample_rate=8000))
+
+    def read_samples(self, source, num_bytes=1 << 20):
+        """Returns all of the samples a static source queues."""
+        queue_source = source.get_queue_source()
+        samples = b''
+
+        while True:
+            audio_data = queue_source.get_audio_data(num_bytes)
+            if not audio_data:
+                return samples
+
+            samples += audio_data.get_string_data()
+
+    def test_miss_decodes_and_writes_entry(self):
+        """Sounds are decoded into a new entry the first time they load."""
+        source = self.cache.load('abc', self.decode)
+
+        self.decode.assert_called_once_with()
+        self.assertTrue(os.path.isfile(self.cache.get_path('abc')))
+
+        expected = StaticSource(Sine(0.25, sample_rate=8000))
+        self.assertIsInstance(source, MappedStaticSource)
+        self.assertEqual(expected.audio_format, source.audio_format)
+        self.assertAlmostEqual(expected.duration, source.duration)
+        self.assertEqual(self.read_samples(expected),
+                         self.read_samples(source, num_bytes=1000))
+
+    def test_hit_maps_entry(self):
+        """Sounds which are already in the cache are not decoded again."""
+        samples = self.read_samples(self.cache.load('abc', self.decode))
+        self.decode.reset_mock()
+
+        source = self.cache.load('abc', self.decode)
+
+        self.decode.assert_not_called()
+        self.assertEqual(samples, self.read_samples(source))
+
+    def test_invalid_entry_is_replaced(self):
+        """Entries which are not valid are decoded and written again."""
+        with open(self.cache.get_path('abc'), 'wb') as pcm_file:
+            pcm_file.write(b'garbage')
+
+        source = self.cache.load('abc', self.decode)
+
+        self.decode.assert_called_once_with()
+        self.assertIsInstance(source, MappedStaticSource)
+
+    def test_queue_sources_seek(self):
+        """Queued sources seek independently within the mapped samples."""
+        source = self.cache.load('abc', self.decode)
+        bytes_per_second = source.audio_format.bytes_per_second
+
+        first = source.get_queue_source()
+        second = source.get_queue_source()
+        first.seek(0.125)
+
+        self.assertAlmostEqual(0.125, first.get_audio_data(100).timestamp)
+        self.assertEqual(0, second.get_audio_data(100).timestamp)
+        self.assertEqual(bytes_per_second // 8, first._file.tell() - 100)
+
+    def test_streaming_sources_are_deleted(self):
+        """Streaming sources are deleted once written to the cache."""
+        queue_source = Mock(spec=StreamingSource,
+                            audio_format=AudioFormat(1, 16, 8000))
+        queue_source.get_queue_source.return_value = queue_source
+        queue_source.get_audio_data.return_value = None
+
+        source = self.cache.load('abc', Mock(return_value=queue_source))
+
+        queue_source.delete.assert_called_once_with()
+        self.assertIsInstance(source, MappedStaticSource)
+
+    def test_silent_sources_are_not_cached(self):
+        """Sources without audio are not written to the cache."""
+        queue_source = Mock(audio_format=None, video_format=None)
+        queue_source.get_queue_source.return_value = queue_source
+
+        source = self.cache.load('abc', Mock(return_value=queue_source))
+
+        self.assertIsNone(source.audio_format)
+
+        self.assertFalse(os.path.isfile(self.cache.get_path('abc')))
@@ -0,0 +1,123 @@
+from ..resource_cache import ResourceCache
+from unittest.mock import Mock
+import unittest
+
+
+class TestResourceCache(unittest.TestCase):
+    """Test caching loaded resources."""
+
+    def test_load_calls_loader_on_miss(self):
+        """Resources are loaded when not in the cache."""
+        cache = ResourceCache()
+        resource = object()
+        loader = Mock(return_value=resource)
+
+        self.assertEqual(resource, cache.load('a', loader))
+        loader.assert_called_once_with()
+
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertIn('a', cache)
+
+    def test_load_returns_cached_resource_on_hit(self):
+        """Cached resources are returned without loading them again."""
+        cache = ResourceCache()
+        resource = object()
+        cache.load('a', lambda: resource)
+        loader = Mock()
+
+        self.assertEqual(resource, cache.load('a', loader))
+        loader.assert_not_called()
+
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_size_is_estimated(self):
+        """The size of the cache is the sum of resource size estimates."""
+        cache = ResourceCache()
+        cache.load('a', lambda: 'aa', size=len)
+        cache.load('b', lambda: 'bbb', size=len)
+
+        self.assertEqual(5, cache.size)
+
+    def test_referenced_resources_are_not_evicted(self):
+        """Resources with references remain cached when over budget."""
+        cache = ResourceCache(budget=1)
+        cache.load('a', lambda: 'aa', size=len)
+
+        self.assertIn('a', cache)
+        self.assertEqual(2, cache.size)
+
+    def test_released_resources_are_evicted_when_over_budget(self):
+        """Resources without references are evicted when over budget."""
+        cache = ResourceCache(budget=2)
+        resource = cache.load('a', lambda: 'aa', size=len)
+
+        cache.release(resource)
+        self.assertIn('a', cache)
+
+        cache.load('b', lambda: 'bb', size=len)
+        self.assertNotIn('a', cache)
+        self.assertIn('b', cache)
+        self.assertEqual(2, cache.size)
+        self.assertEqual(1, cache.evictions)
+
+    def test_least_recently_used_resources_are_evicted_first(self):
+        """Least recently used resources are evicted before recent ones."""
+        cache = ResourceCache(budget=4)
+        first = cache.load('a', lambda: 'aa', size=len)
+        second = cache.load('b', lambda: 'bb', size=len)
+
+        # Use the first resource again, making the second least recent
+        cache.load('a', lambda: 'aa', size=len)
+
+        cache.release(first)
+        cache.release(first)
+        cache.release(second)
+
+        cache.load('c', lambda: 'cc', size=len)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_resources_are_referenced_per_load(self):
+        """Each load must be released before a resource can be evicted."""
+        cache = ResourceCache(budget=0)
+        resource = cache.load('a', lambda: 'aa', size=len)
+        cache.load('a', lambda: 'aa', size=len)
+
+        cache.release(resource)
+        self.assertIn('a', cache)
+
+        cache.release(resource)
+        self.assertNotIn('a', cache)
+
+    def test_evicted_resources_are_passed_to_callback(self):
+        """The eviction callback is called with the evicted resource."""
+        cache = ResourceCache(budget=0)
+        on_evict = Mock()
+        resource = cache.load('a', lambda: 'aa', size=len, on_evict=on_evict)
+
+        on_evict.assert_not_called()
+
+        cache.release(resource)
+        on_evict.assert_called_once_with(resource)
+
+    def test_unknown_resources_are_ignored_on_release(self):
+        """Releasing a resource which isn't cached does nothing."""
+        cache = ResourceCache(budget=0)
+        cache.release(object())
+
+        self.assertEqual(0, cache.evictions)
+
+    def test_clear_removes_resources_and_counters(self):
+        """Clearing the cache removes all resources and resets counters."""
+        cache = ResourceCache()
+        cache.load('a', lambda: 'aa', size=len)
+        cache.load('a', lambda: 'aa', size=len)
+        cache.clear()
+
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.size)
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(0, cache.misses)
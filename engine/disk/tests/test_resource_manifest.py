@@ -0,0 +1,109 @@
+from ..resource_manifest import ResourceInfo, ResourceManifest
+from tempfile import TemporaryDirectory
+import json
+import os
+import struct
+import unittest
+
+# Minimal PNG header with a 3x2 IHDR chunk
+PNG_DATA = b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\x0dIHDR' + \
+    struct.pack('>II', 3, 2) + b'\x08\x06\x00\x00\x00'
+
+
+class TestResourceManifest(unittest.TestCase):
+    """Test generating and loading resource manifests."""
+
+    def setUp(self):
+        """Provides each test with a small resource directory."""
+        temporary_directory = TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.resource_dir = temporary_directory.name
+
+        self.write_file('tiles/tile.png', PNG_DATA)
+        self.write_file('rooms/room.tmx', b'<map/>')
+        self.write_file('notes.txt', b'abc')
+
+    def write_file(self, name, data):
+        """Writes a file to the resource directory."""
+        path = os.path.join(self.resource_dir, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'wb') as resource_file:
+            resource_file.write(data)
+
+    def test_build_records_every_file(self):
+        """Built manifests record the size, type, and hash of each file."""
+        manifest = ResourceManifest.build(self.resource_dir)
+
+        self.assertEqual(
+            ['notes.txt', 'rooms/room.tmx', 'tiles/tile.png'],
+            manifest.get_paths())
+
+        info = manifest.get('notes.txt')
+        self.assertEqual(3, info.size)
+        self.assertEqual('file', info.type)
+        self.assertEqual('a9993e364706816aba3e25717850c26c9cd0d89d', info.hash)
+        self.assertIsNone(info.width)
+        self.assertIsNone(info.height)
+
+        self.assertEqual('xml', manifest.get('rooms/room.tmx').type)
+
+    def test_build_records_image_dimensions(self):
+        """Built manifests record the dimensions of PNG images."""
+        info = ResourceManifest.build(self.resource_dir).get('tiles/tile.png')
+
+        self.assertEqual('image', info.type)
+        self.assertEqual(3, info.width)
+        self.assertEqual(2, info.height)
+
+    def test_save_and_load(self):
+        """Saved manifests load with the same information, minus itself."""
+        manifest_path = os.path.join(self.resource_dir, 'manifest.json')
+        manifest = ResourceManifest.build(self.resource_dir)
+        manifest.save(manifest_path)
+
+        loaded_manifest = ResourceManifest.load(manifest_path)
+
+        self.assertEqual(3, len(loaded_manifest))
+        self.assertEqual(manifest.resources, loaded_manifest.resources)
+
+        # Rebuilding does not include the manifest itself
+        self.assertNotIn(
+            'manifest.json', ResourceManifest.build(self.resource_dir))
+
+    def test_load_unsupported_version(self):
+        """Manifests of other versions are not loaded."""
+        manifest_path = os.path.join(self.resource_dir, 'manifest.json')
+        with open(manifest_path, 'w') as manifest_file:
+            json.dump({'version': 0, 'resources': {}}, manifest_file)
+
+        with self.assertRaises(ValueError):
+            ResourceManifest.load(manifest_path)
+
+    def test_get_paths_by_type(self):
+        """Paths can be listed for a single type of resource."""
+        manifest = ResourceManifest.build(self.resource_dir)
+
+        self.assertEqual(['tiles/tile.png'], manifest.get_paths('image'))
+        self.assertEqual([], manifest.get_paths('audio'))
+
+    def test_verify(self):
+        """Added, removed, and changed files are found when verifying."""
+        manifest = ResourceManifest.build(self.resource_dir)
+        self.assertEqual([], manifest.verify(self.resource_dir))
+
+        self.write_file('notes.txt', b'abd')
+        self.write_file('new.csv', b'1,2')
+        os.remove(os.path.join(self.resource_dir, 'rooms', 'room.tmx'))
+
+        self.assertEqual(
+            ['new.csv', 'notes.txt', 'rooms/room.tmx'],
+            manifest.verify(self.resource_dir))
+
+    def test_resource_info_equality(self):
+        """Resource information is equal when it describes the same file."""
+        self.assertEqual(ResourceInfo(1, 'a', 'file'),
+                         ResourceInfo(1, 'a', 'file'))
+        self.assertNotEqual(ResourceInfo(1, 'a', 'file'),
+                            ResourceInfo(1, 'b', 'file'))
+        self.assertNotEqual(ResourceInfo(1, 'a', 'file'), None)
@@ -0,0 +1,114 @@
+from ..resource_pack import ResourcePack, write_resource_pack
+from tempfile import TemporaryDirectory
+import io
+import os
+import pyglet.image
+import unittest
+
+
+class TestResourcePack(unittest.TestCase):
+    """Test packing resources into a single memory mapped file."""
+
+    def setUp(self):
+        """Provides each test with a small resource directory."""
+        temporary_directory = TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+
+        self.resource_dir = os.path.join(temporary_directory.name, 'res')
+        self.pack_path = os.path.join(temporary_directory.name, 'res.pack')
+
+        os.makedirs(os.path.join(self.resource_dir, 'rooms'))
+        self.write_file('data.csv', b'a,b\nc,d\n')
+        self.write_file('manifest.json', b'{}')
+        self.write_file('rooms/room.tmx', b'<map/>')
+
+        # Rows of pixels are ordered bottom to top
+        self.pixels = bytes(range(16))
+        image_path = os.path.join(self.resource_dir, 'tile.png')
+
+        with open(image_path, 'wb') as image_file:
+            pyglet.image.ImageData(2, 2, 'RGBA', self.pixels).save(
+                image_path, file=image_file)
+
+    def write_file(self, name, data):
+        """Writes a file to the resource directory."""
+        path = os.path.join(self.resource_dir, *name.split('/'))
+
+        with open(path, 'wb') as resource_file:
+            resource_file.write(data)
+
+    def open_pack(self, **kwargs):
+        """Writes and opens a pack of the resource directory."""
+        write_resource_pack(self.pack_path, self.resource_dir, **kwargs)
+
+        pack = ResourcePack(self.pack_path)
+        self.addCleanup(pack.close)
+
+        return pack
+
+    def test_get_resource(self):
+        """Packed resources are returned as memory views of their contents."""
+        pack = self.open_pack()
+
+        view = pack.get('rooms/room.tmx')
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(b'<map/>', view.tobytes())
+        view.release()
+
+        self.assertIn('data.csv', pack)
+        self.assertNotIn('manifest.json', pack)
+        self.assertEqual(3, len(pack))
+
+        with self.assertRaises(KeyError):
+            pack.get('missing.csv')
+
+    def test_open_binary_file(self):
+        """Packed resources can be read as seekable binary files."""
+        pack = self.open_pack()
+
+        with pack.open('data.csv') as data_file:
+            self.assertEqual(b'a,b', data_file.read(3))
+            self.assertEqual(3, data_file.tell())
+
+            data_file.seek(-2, io.SEEK_END)
+            self.assertEqual(b'd\n', data_file.read())
+
+            data_file.seek(0)
+            self.assertEqual(b'a,b\nc,d\n', data_file.read())
+            self.assertEqual(b'', data_file.read())
+
+    def test_open_text_file(self):
+        """Packed resources can be read as text files."""
+        pack = self.open_pack()
+
+        with pack.open('data.csv', mode='r') as data_file:
+            self.assertEqual(['a,b\n', 'c,d\n'], data_file.readlines())
+
+    def test_pixels_are_not_stored_by_default(self):
+        """Packs only store encoded images unless asked to decode them."""
+        pack = self.open_pack()
+
+        self.assertIsNone(pack.get_pixels('tile.png'))
+
+    def test_pre_decoded_pixels(self):
+        """Packs can store decoded RGBA pixel data for images."""
+        pack = self.open_pack(decode_images=True)
+
+        width, height, view = pack.get_pixels('tile.png')
+        self.assertEqual((2, 2), (width, height))
+        self.assertEqual(self.pixels, view.tobytes())
+        view.release()
+
+        # The encoded image is still available
+        self.assertIn('tile.png', pack)
+        self.assertIsNone(pack.get_pixels('data.csv'))
+
+    def test_invalid_pack(self):
+        """Files which are not resource packs are not opened."""
+        self.write_file('data.csv', b'PFQPACK\x00' + bytes(32))
+
+        with self.assertRaises(ValueError):
+            ResourcePack(os.path.join(self.resource_dir, 'data.csv'))
+
+        with self.assertRaises(ValueError):
+            ResourcePack(os.path.join(self.resource_dir, 'rooms', 'room.tmx'))
@@ -1,4 +1,8 @@
-from .linear_interpolation import LinearInterpolation
-from .linear_curve import LinearCurve
+from engine.util.lazy_import import lazy_import
 
 __all__ = ['LinearCurve', 'LinearInterpolation']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'LinearCurve': '.linear_curve',
+    'LinearInterpolation': '.linear_interpolation',
+})
@@ -1,3 +1,8 @@
-from .event_dispatcher import EventDispatcher, EventException
+from engine.util.lazy_import import lazy_import
 
 __all__ = ['EventDispatcher', 'EventException']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'EventDispatcher': '.event_dispatcher',
+    'EventException': '.event_dispatcher',
+})
@@ -1,3 +1,7 @@
-from .generic_factory import GenericFactory
+from engine.util.lazy_import import lazy_import
 
 __all__ = ['GenericFactory']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'GenericFactory': '.generic_factory',
+})
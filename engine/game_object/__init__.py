@@ -1,5 +1,9 @@
-from .game_object import GameObject
-from .physical_game_object import PhysicalGameObject
-from .immovable_game_object import ImmovableGameObject
+from engine.util.lazy_import import lazy_import
 
 __all__ = ['GameObject', 'ImmovableGameObject', 'PhysicalGameObject']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'GameObject': '.game_object',
+    'ImmovableGameObject': '.immovable_game_object',
+    'PhysicalGameObject': '.physical_game_object',
+})
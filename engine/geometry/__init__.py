@@ -1,7 +1,4 @@
-from .overlap_detection_1d import detect_overlap_1d
-from .overlap_detection_2d import detect_overlap_2d
-from .rectangle import Rectangle
-from .point_2d import Point2d
+from engine.util.lazy_import import lazy_import
 
 __all__ = [
     'detect_overlap_1d',
@@ -9,3 +6,10 @@ __all__ = [
     'Point2d',
     'Rectangle',
 ]
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'detect_overlap_1d': '.overlap_detection_1d',
+    'detect_overlap_2d': '.overlap_detection_2d',
+    'Point2d': '.point_2d',
+    'Rectangle': '.rectangle',
+})
@@ -1,6 +1,19 @@
-from .cross_box import CrossBox
-from .graphics_controller import GraphicsController
-from .graphics_object import GraphicsObject
-from .graphics_batch import GraphicsBatch
+from engine.util.lazy_import import lazy_import
 
-__all__ = ['CrossBox', 'GraphicsBatch', 'GraphicsController', 'GraphicsObject']
+__all__ = [
+    'CrossBox',
+    'CrossBoxBuffer',
+    'GraphicsBatch',
+    'GraphicsController',
+    'GraphicsObject',
+    'TextureAtlas',
+]
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'CrossBox': '.cross_box',
+    'CrossBoxBuffer': '.cross_box_buffer',
+    'GraphicsBatch': '.graphics_batch',
+    'GraphicsController': '.graphics_controller',
+    'GraphicsObject': '.graphics_object',
+    'TextureAtlas': '.texture_atlas',
+})
@@ -55,14 +55,29 @@ class CrossBox(object):
 
     def _get_vertices(self, rectangle):
         """Returns the vertices for a cross box around the rectangle."""
-        x, x2 = rectangle.x, rectangle.x + rectangle.width
-        y, y2 = rectangle.y, rectangle.y + rectangle.height
-
-        return (
-            x,  y,  x2, y,
-            x,  y,  x,  y2,
-            x2, y,  x,  y2,
-            x,  y2, x2, y2,
-            x2, y2, x,  y,
-            x2, y2, x2, y
-        )
+        return get_cross_box_vertices(
+            rectangle.x, rectangle.y, rectangle.width, rectangle.height)
+
+
+def get_cross_box_vertices(x, y, width, height):
+    """Returns the GL_LINES vertices for a cross box around a rectangle.
+
+    Args:
+        x (int): The x coordinate of the rectangle's lower left corner.
+        y (int): The y coordinate of the rectangle's lower left corner.
+        width (int): The width of the rectangle.
+        height (int): The height of the rectangle.
+
+    Returns:
+        A tuple of the x and y coordinates of all 12 vertices.
+    """
+    x2, y2 = x + width, y + height
+
+    return (
+        x,  y,  x2, y,
+        x,  y,  x,  y2,
+        x2, y,  x,  y2,
+        x,  y2, x2, y2,
+        x2, y2, x,  y,
+        x2, y2, x2, y
+    )
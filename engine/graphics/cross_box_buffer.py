@@ -0,0 +1,258 @@
+from .cross_box import CrossBox, get_cross_box_vertices
+from .graphics_batch import GraphicsBatch
+from array import array
+from pyglet.gl import glPushAttrib, glPopAttrib, glEnable, GL_ENABLE_BIT
+from pyglet.gl import glLineStipple, GL_LINE_STIPPLE, GL_LINES
+import pyglet.graphics
+
+# Number of ints per cross box, two for each vertex
+_SHAPE_SIZE = CrossBox.VERTEX_COUNT * 2
+
+# Cross boxes the vertex list has room for when it is first created
+_MIN_CAPACITY = 64
+
+
+class CrossBoxBuffer(object):
+    """Draws many cross boxes of one color from a single vertex list.
+
+    Every cross box has a fixed slot in a persistent, indexed vertex list, so
+    updating one uploads only its own vertices. Cross boxes are also indexed
+    by a grid of square cells, and only those in cells overlapping the view
+    are drawn. The indices of the visible cross boxes are only rebuilt when
+    the view reaches other cells, or cross boxes are added or change cells.
+
+    The vertex list is created on the first draw, so cross boxes can be added
+    before there is an OpenGL context.
+
+    Attributes:
+        color (tuple of 3 int): An rgb tuple of the color to draw with.
+        cell_size (int): Width and height of the grid cells in pixels.
+        style (int or None): A :obj:`engine.graphics.GraphicsBatch` style to
+            draw with, such as ``DASHED_LINES``, or None to draw normally.
+    """
+
+    def __init__(self, color=(0, 0, 0), cell_size=256, style=None):
+        """Creates a new, empty cross box buffer.
+
+        Kwargs:
+            color (tuple of 3 int, optional):
+                An rgb tuple of the color to draw with. Defaults to black.
+            cell_size (int, optional):
+                Width and height of the grid cells used to find cross boxes
+                within a view. Defaults to 256.
+            style (int, optional): A :obj:`engine.graphics.GraphicsBatch`
+                style to draw with. Defaults to None.
+        """
+        super(CrossBoxBuffer, self).__init__()
+        self.color = tuple(color)
+        self.cell_size = cell_size
+        self.style = style
+
+        # Vertices of every slot, uploaded to the vertex list once created
+        self._vertices = array('i')
+        self._vertex_list = None
+        self._capacity = 0
+        self._uploaded = 0
+
+        # Slot of each key, and the rectangle and cells of each slot
+        self._slots = {}
+        self._rectangles = []
+        self._slot_cells = []
+
+        # Slots of the cross boxes touching each (column, row) cell
+        self._cells = {}
+
+        # Changes whenever the cross boxes in any cell change
+        self._cells_version = 0
+
+        # Cell range and cells version the indices were last built for
+        self._indexed = None
+
+    def __len__(self):
+        """Returns the number of cross boxes in the buffer."""
+        return len(self._rectangles)
+
+    def __contains__(self, key):
+        """Returns whether a cross box has been added for the key."""
+        return key in self._slots
+
+    def add(self, key, rectangle):
+        """Adds a cross box around a rectangle.
+
+        Args:
+            key (object): Hashable key to update the cross box by later, such
+                as the object it is drawn for.
+            rectangle (:obj:`engine.geometry.Rectangle`):
+                Rectangular area to draw the cross box around.
+        """
+        slot = len(self._rectangles)
+        self._slots[key] = slot
+
+        bounds = self._get_bounds(rectangle)
+        self._rectangles.append(bounds)
+        self._vertices.extend(get_cross_box_vertices(*bounds))
+
+        cells = self._get_cells(*bounds)
+        self._slot_cells.append(cells)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(slot)
+
+        self._cells_version += 1
+
+    def update(self, key, rectangle):
+        """Moves or resizes the cross box for a key to match a rectangle.
+
+        Nothing is changed if the rectangle is where it was last updated.
+
+        Args:
+            key (object): The key the cross box was added with.
+            rectangle (:obj:`engine.geometry.Rectangle`):
+                Rectangular area to draw the cross box around.
+        """
+        slot = self._slots[key]
+        bounds = self._get_bounds(rectangle)
+
+        if bounds == self._rectangles[slot]:
+            return
+
+        self._rectangles[slot] = bounds
+
+        start = slot * _SHAPE_SIZE
+        self._vertices[start:start + _SHAPE_SIZE] = array(
+            'i', get_cross_box_vertices(*bounds))
+
+        # Cross boxes which haven't been uploaded yet are uploaded when drawn
+        if slot < self._uploaded:
+            self._write_slot(slot)
+
+        cells = self._get_cells(*bounds)
+        previous_cells = self._slot_cells[slot]
+
+        if cells != previous_cells:
+            for cell in previous_cells - cells:
+                self._cells[cell].discard(slot)
+            for cell in cells - previous_cells:
+                self._cells.setdefault(cell, set()).add(slot)
+
+            self._slot_cells[slot] = cells
+            self._cells_version += 1
+
+    def draw(self, view=None):
+        """Draws the cross boxes.
+
+        Kwargs:
+            view (:obj:`engine.geometry.Rectangle`, optional): Area being
+                drawn, such as a :obj:`engine.camera.Camera`. Cross boxes
+                outside of it are skipped. Defaults to None, drawing all.
+        """
+        if not self._rectangles:
+            return
+
+        self._upload()
+        self._update_indices(view)
+
+        if not self._vertex_list.index_count:
+            return
+
+        glPushAttrib(GL_ENABLE_BIT)
+
+        if self.style == GraphicsBatch.DASHED_LINES:
+            glLineStipple(1, 0x00FF)
+            glEnable(GL_LINE_STIPPLE)
+
+        self._vertex_list.draw(GL_LINES)
+
+        glPopAttrib()
+
+    def _upload(self):
+        """Uploads added cross boxes, growing the vertex list if needed."""
+        count = len(self._rectangles)
+
+        if count == self._uploaded:
+            return
+
+        if count > self._capacity:
+            self._capacity = max(count, self._capacity * 2, _MIN_CAPACITY)
+            vertex_count = self._capacity * CrossBox.VERTEX_COUNT
+
+            if self._vertex_list is None:
+                self._vertex_list = pyglet.graphics.vertex_list_indexed(
+                    vertex_count, [], 'v2i', 'c3B')
+            else:
+                self._vertex_list.resize(
+                    vertex_count, self._vertex_list.index_count)
+
+            self._vertex_list.colors[:] = self.color * vertex_count
+
+        start, end = self._uploaded * _SHAPE_SIZE, count * _SHAPE_SIZE
+        self._vertex_list.vertices[start:end] = self._vertices[start:end]
+        self._uploaded = count
+
+        # Growing the vertex list may have moved it
+        self._indexed = None
+
+    def _write_slot(self, slot):
+        """Uploads the vertices of one slot, leaving the rest untouched."""
+        vertex_list = self._vertex_list
+        attribute = vertex_list.domain.attribute_names['vertices']
+        region = attribute.get_region(
+            attribute.buffer,
+            vertex_list.start + slot * CrossBox.VERTEX_COUNT,
+            CrossBox.VERTEX_COUNT)
+
+        start = slot * _SHAPE_SIZE
+        region.array[:] = self._vertices[start:start + _SHAPE_SIZE]
+        region.invalidate()
+
+    def _update_indices(self, view):
+        """Indexes the cross boxes within a view, if they may have changed."""
+        if view is None:
+            cell_range = None
+        else:
+            cell_range = self._get_cell_range(*self._get_bounds(view))
+
+        if self._indexed == (cell_range, self._cells_version):
+            return
+
+        self._indexed = (cell_range, self._cells_version)
+
+        if cell_range is None:
+            slots = range(len(self._rectangles))
+        else:
+            columns, rows = cell_range
+            visible = set()
+
+            for column in range(*columns):
+                for row in range(*rows):
+                    visible.update(self._cells.get((column, row), ()))
+
+            slots = sorted(visible)
+
+        vertex_list = self._vertex_list
+        vertex_list.resize(
+            self._capacity * CrossBox.VERTEX_COUNT,
+            len(slots) * CrossBox.VERTEX_COUNT)
+
+        first = vertex_list.start
+        vertex_list.indices[:] = [
+            first + slot * CrossBox.VERTEX_COUNT + vertex
+            for slot in slots for vertex in range(CrossBox.VERTEX_COUNT)]
+
+    def _get_bounds(self, rectangle):
+        """Returns the x, y, width, and height of a rectangle as ints."""
+        return (int(rectangle.x), int(rectangle.y),
+                int(rectangle.width), int(rectangle.height))
+
+    def _get_cell_range(self, x, y, width, height):
+        """Returns the (start, stop) columns and rows a rectangle touches."""
+        size = self.cell_size
+
+        return ((x // size, (x + width) // size + 1),
+                (y // size, (y + height) // size + 1))
+
+    def _get_cells(self, x, y, width, height):
+        """Returns the set of (column, row) cells a rectangle touches."""
+        columns, rows = self._get_cell_range(x, y, width, height)
+
+        return {(column, row)
+                for column in range(*columns) for row in range(*rows)}
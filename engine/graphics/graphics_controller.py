@@ -1,4 +1,5 @@
 from engine import event_dispatcher
+import pyglet.app
 import pyglet.clock
 import pyglet.window
 
@@ -6,13 +7,29 @@ import pyglet.window
 class GraphicsController(event_dispatcher.EventDispatcher):
     """Controller for graphical output to a desktop window.
 
+    When run with :fn:`run`, the window is only drawn when the scene is
+    invalid. Anything changing what is on screen should call
+    :fn:`invalidate`. Input and window events such as resizing invalidate the
+    scene automatically.
+
+    Updates slow to the idle update rate while the window is unfocused or
+    hidden, and nothing is drawn while it is hidden. The simulation still
+    steps at the active rate, since each slow update is split into several
+    `on_update` events no longer than two active updates.
+
+    Attributes:
+        update_rate (int): Updates per second while the window is active.
+        idle_update_rate (int): Updates per second while the window is
+            unfocused or hidden.
+        invalid (bool): Whether the scene has changed since it was drawn.
+
     Events:
         on_update: Fires periodically with the number of milliseconds since the
             last update.
     """
 
     def __init__(self, width, height, title=None, resizable=False,
-                 update_rate=120):
+                 update_rate=120, idle_update_rate=10):
         """Creates a blank desktop window.
 
         Args:
@@ -25,25 +42,113 @@ class GraphicsController(event_dispatcher.EventDispatcher):
             update_rate (int, optional): Number of times to fire the
                 `on_update` event per second. Note that this is independent
                 from the frame rate. Defaults to 120.
+            idle_update_rate (int, optional): Number of times to fire the
+                `on_update` event per second while the window is unfocused
+                or hidden. Defaults to 10.
         """
         super(GraphicsController, self).__init__()
         self.register_event_type('on_update')
 
+        self.update_rate = update_rate
+        self.idle_update_rate = idle_update_rate
+        self.invalid = True
+
+        self._focused = True
+        self._visible = True
+        self._scheduled_rate = update_rate
+
         self._window = pyglet.window.Window(
                 width=width,
                 height=height,
                 caption=title,
                 resizable=resizable)
 
+        self._window.push_handlers(
+            on_activate=lambda: self._set_focused(True),
+            on_deactivate=lambda: self._set_focused(False),
+            on_show=lambda: self._set_visible(True),
+            on_hide=lambda: self._set_visible(False),
+            on_expose=self.invalidate,
+            on_resize=lambda width, height: self.invalidate(),
+            on_key_press=lambda symbol, modifiers: self.invalidate(),
+            on_key_release=lambda symbol, modifiers: self.invalidate())
+
         pyglet.clock.schedule_interval(self._dispatch_update, 1.0/update_rate)
 
+    def invalidate(self):
+        """Marks the scene as changed, so it is drawn again."""
+        self.invalid = True
+
+    def draw(self):
+        """Draws the window if the scene is invalid and the window visible.
+
+        The window's `on_draw` event is dispatched to draw the scene.
+
+        Returns:
+            True if the window was drawn, otherwise False.
+        """
+        if not (self.invalid and self._visible):
+            return False
+
+        self.invalid = False
+
+        self._window.switch_to()
+        self._window.dispatch_event('on_draw')
+        self._window.flip()
+
+        return True
+
+    def run(self):
+        """Runs the application, updating and drawing until it exits.
+
+        This replaces :fn:`pyglet.app.run`, which draws after every update.
+        """
+        # Closing the window and pyglet.app.exit stop the global event loop
+        pyglet.app.event_loop = _IdleAwareEventLoop(self)
+        pyglet.app.run()
+
+    def _set_focused(self, focused):
+        """Tracks the window's focus, and updates at the matching rate."""
+        self._focused = focused
+        self._schedule_updates()
+
+    def _set_visible(self, visible):
+        """Tracks the window's visibility, and updates at the matching rate."""
+        self._visible = visible
+        self._schedule_updates()
+
+        if visible:
+            self.invalidate()
+
+    def _schedule_updates(self):
+        """Schedules updates at the idle rate if the window is inactive."""
+        active = self._focused and self._visible
+        rate = self.update_rate if active else self.idle_update_rate
+
+        if rate != self._scheduled_rate:
+            self._scheduled_rate = rate
+
+            pyglet.clock.unschedule(self._dispatch_update)
+            pyglet.clock.schedule_interval(self._dispatch_update, 1.0/rate)
+
     def _dispatch_update(self, seconds):
         """Dispatches the `on_update` event with the time delta in ms.
 
+        Long deltas, such as while updating at the idle rate, are split into
+        equal steps so objects don't move far enough to pass through others.
+
         Args:
             seconds (float): The number of seconds elapsed since last update.
         """
-        self.dispatch_event('on_update', int(seconds * 1000))
+        ms = int(seconds * 1000)
+        max_step_ms = max(1, 2000 // self.update_rate)
+        steps = max(1, -(-ms // max_step_ms))
+        step_ms, remainder = divmod(ms, steps)
+
+        # The remainder is spread over the first steps
+        for step in range(steps):
+            self.dispatch_event(
+                'on_update', step_ms + 1 if step < remainder else step_ms)
 
     def add_key_handler(self, key_handler, on_press, on_release):
         """Adds a key handler to the window owned by the controller.
@@ -59,3 +164,29 @@ class GraphicsController(event_dispatcher.EventDispatcher):
         self._window.push_handlers(key_handler)
         self._window.push_handlers(
             on_key_press=on_press, on_key_release=on_release)
+
+
+class _IdleAwareEventLoop(pyglet.app.EventLoop):
+    """Event loop which lets a graphics controller decide when to draw."""
+
+    def __init__(self, controller):
+        """Creates an event loop drawing through a graphics controller.
+
+        Args:
+            controller (:obj:`GraphicsController`): The controller to draw.
+        """
+        super(_IdleAwareEventLoop, self).__init__()
+        self._controller = controller
+
+    def idle(self):
+        """Runs scheduled functions, then draws if the scene is invalid.
+
+        Returns:
+            The seconds until the next scheduled function is due.
+        """
+        dt = self.clock.update_time()
+        self.clock.call_scheduled_functions(dt)
+
+        self._controller.draw()
+
+        return self.clock.get_sleep_time(True)
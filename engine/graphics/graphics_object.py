@@ -76,6 +76,11 @@ class GraphicsObject(Rectangle):
 
         self._offset[index] = abs(scale) * sprite_dimension if scale < 0 else 0
 
+    @property
+    def frame_index(self):
+        """Returns the current frame of an animated graphic, otherwise 0."""
+        return self._sprite.frame_index
+
     @property
     def batch(self):
         """Returns the graphics batch for this graphics object."""
@@ -0,0 +1,238 @@
+from ..cross_box_buffer import CrossBoxBuffer
+from ..graphics_batch import GraphicsBatch
+from engine.geometry import Rectangle
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from pyglet.gl import GL_LINES
+import unittest
+
+
+class FakeVertexList(object):
+    """Stands in for a pyglet indexed vertex list, which needs a context.
+
+    Attributes:
+        regions (list of tuple): The (start, count) of each region of
+            vertices written to on its own.
+    """
+
+    def __init__(self, count, indices, *formats):
+        """Creates a fake vertex list of the given vertex count."""
+        self.start = 0
+        self.vertices = [0] * count * 2
+        self.colors = [0] * count * 3
+        self.indices = list(indices)
+        self.regions = []
+        self.draw = Mock()
+        self.domain = SimpleNamespace(attribute_names={
+            'vertices': SimpleNamespace(
+                buffer=None, get_region=self._get_region)})
+
+    @property
+    def index_count(self):
+        """Returns the number of indices."""
+        return len(self.indices)
+
+    def resize(self, count, index_count):
+        """Resizes the vertices and indices, keeping existing values."""
+        self.vertices += [0] * (count * 2 - len(self.vertices))
+        self.colors += [0] * (count * 3 - len(self.colors))
+        self.indices = (self.indices + [0] * index_count)[:index_count]
+
+    def get_drawn_vertices(self):
+        """Returns the (x, y) of each vertex drawn by the indices."""
+        return [tuple(self.vertices[index * 2:index * 2 + 2])
+                for index in self.indices]
+
+    def _get_region(self, buffer, start, count):
+        """Returns a region of vertices, written back on invalidating."""
+        region = SimpleNamespace(array=[0] * count * 2)
+
+        def invalidate():
+            self.vertices[start * 2:(start + count) * 2] = region.array
+            self.regions.append((start, count))
+
+        region.invalidate = invalidate
+        return region
+
+
+class TestCrossBoxBuffer(unittest.TestCase):
+    """Test rendering many cross boxes from a shared vertex list."""
+
+    def setUp(self):
+        """Provides the following to all tests:
+
+        * ``self.rectangle``: Rectangle to draw a cross box around.
+        * ``self.expected_vertices``: Expected vertices for the rectangle.
+        * ``self.buffer``: Buffer with a cross box around the rectangle.
+        * ``self.mock_vertex_list_indexed``: Patch creating
+            :cls:`FakeVertexList` objects.
+
+        OpenGL attribute calls are also patched for every test.
+        """
+        self.rectangle = Rectangle(1, 2, 3, 4)
+        self.expected_vertices = [
+            (1, 2), (4, 2),
+            (1, 2), (1, 6),
+            (4, 2), (1, 6),
+            (1, 6), (4, 6),
+            (4, 6), (1, 2),
+            (4, 6), (4, 2)]
+
+        self.buffer = CrossBoxBuffer((1, 2, 3), cell_size=16)
+        self.buffer.add('first', self.rectangle)
+
+        patcher = patch(
+            'engine.graphics.cross_box_buffer.pyglet.graphics.'
+            'vertex_list_indexed', side_effect=FakeVertexList)
+        self.mock_vertex_list_indexed = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Drawing pushes and pops OpenGL attributes, which needs a context
+        for name in ('glPushAttrib', 'glPopAttrib'):
+            patcher = patch('engine.graphics.cross_box_buffer.' + name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get_vertex_list(self):
+        """Returns the fake vertex list created by the buffer."""
+        return self.buffer._vertex_list
+
+    def test_draws_added_cross_boxes(self):
+        """Every cross box is drawn in the buffer's color."""
+        self.buffer.add('second', Rectangle(10, 20, 3, 4))
+
+        self.buffer.draw()
+
+        vertex_list = self.get_vertex_list()
+        vertex_list.draw.assert_called_once_with(GL_LINES)
+
+        drawn = vertex_list.get_drawn_vertices()
+        self.assertEqual(24, len(drawn))
+        self.assertEqual(self.expected_vertices, drawn[:12])
+        self.assertEqual([(10, 20), (13, 20)], drawn[12:14])
+        self.assertEqual(
+            [1, 2, 3] * (len(vertex_list.colors) // 3), vertex_list.colors)
+
+    def test_vertex_list_is_created_once(self):
+        """The vertex list persists between draws, and grows as needed."""
+        self.buffer.draw()
+
+        for index in range(100):
+            self.buffer.add(index, Rectangle(index, 0, 1, 1))
+
+        self.buffer.draw()
+        self.buffer.draw()
+
+        self.mock_vertex_list_indexed.assert_called_once()
+        self.assertEqual(101 * 12, len(self.get_vertex_list().indices))
+
+    def test_update_uploads_only_moved_cross_box(self):
+        """Updating a key rewrites only its cross box's vertices."""
+        self.buffer.add('second', Rectangle(10, 20, 3, 4))
+        self.buffer.draw()
+
+        self.rectangle.set_position((2, 4))
+        self.buffer.update('first', self.rectangle)
+        self.buffer.draw()
+
+        vertex_list = self.get_vertex_list()
+        self.assertEqual([(0, 12)], vertex_list.regions)
+
+        drawn = vertex_list.get_drawn_vertices()
+        self.assertEqual([
+            (2, 4), (5, 4),
+            (2, 4), (2, 8),
+            (5, 4), (2, 8),
+            (2, 8), (5, 8),
+            (5, 8), (2, 4),
+            (5, 8), (5, 4)], drawn[:12])
+        self.assertEqual([(10, 20), (13, 20)], drawn[12:14])
+
+    def test_update_before_drawing(self):
+        """Cross boxes updated before the first draw are uploaded then."""
+        self.rectangle.set_position((2, 4))
+        self.buffer.update('first', self.rectangle)
+        self.buffer.draw()
+
+        drawn = self.get_vertex_list().get_drawn_vertices()
+        self.assertEqual([(2, 4), (5, 4)], drawn[:2])
+
+    def test_view_culls_cross_boxes_outside(self):
+        """Cross boxes in cells outside of the view are not drawn."""
+        self.buffer.add('second', Rectangle(100, 100, 3, 4))
+
+        self.buffer.draw(Rectangle(90, 90, 20, 20))
+
+        drawn = self.get_vertex_list().get_drawn_vertices()
+        self.assertEqual(12, len(drawn))
+        self.assertEqual([(100, 100), (103, 100)], drawn[:2])
+
+    def test_indices_are_kept_within_the_same_cells(self):
+        """Indices are only rebuilt when the view reaches other cells."""
+        self.buffer.add('second', Rectangle(100, 100, 3, 4))
+        self.buffer.draw(Rectangle(90, 90, 20, 20))
+
+        vertex_list = self.get_vertex_list()
+        vertex_list.indices = ['kept'] * 12
+
+        # The view still covers the same cells
+        self.buffer.draw(Rectangle(92, 92, 16, 16))
+        self.assertEqual(['kept'] * 12, vertex_list.indices)
+
+        self.buffer.draw(Rectangle(0, 0, 20, 20))
+        self.assertEqual(self.expected_vertices,
+                         vertex_list.get_drawn_vertices())
+
+    def test_view_includes_cross_boxes_moved_into_it(self):
+        """Cross boxes moved into the view are drawn."""
+        self.buffer.add('second', Rectangle(100, 100, 3, 4))
+        self.buffer.draw(Rectangle(90, 90, 20, 20))
+
+        self.rectangle.set_position((95, 95))
+        self.buffer.update('first', self.rectangle)
+        self.buffer.draw(Rectangle(90, 90, 20, 20))
+
+        self.assertEqual(24, self.get_vertex_list().index_count)
+
+    def test_large_cross_boxes_span_cells(self):
+        """Cross boxes wider than a cell are drawn from any cell they touch."""
+        self.buffer.add('wide', Rectangle(0, 100, 200, 16))
+
+        self.buffer.draw(Rectangle(150, 100, 10, 10))
+
+        drawn = self.get_vertex_list().get_drawn_vertices()
+        self.assertEqual(12, len(drawn))
+        self.assertEqual([(0, 100), (200, 100)], drawn[:2])
+
+    def test_nothing_drawn_when_empty(self):
+        """Nothing is drawn when no cross boxes are in view."""
+        self.buffer.draw(Rectangle(500, 500, 10, 10))
+
+        self.get_vertex_list().draw.assert_not_called()
+
+    def test_nothing_created_without_cross_boxes(self):
+        """No vertex list is created for an empty buffer."""
+        CrossBoxBuffer().draw()
+
+        self.mock_vertex_list_indexed.assert_not_called()
+
+    @patch('engine.graphics.cross_box_buffer.glEnable')
+    @patch('engine.graphics.cross_box_buffer.glLineStipple')
+    @patch('engine.graphics.cross_box_buffer.glPopAttrib')
+    @patch('engine.graphics.cross_box_buffer.glPushAttrib')
+    def test_dashed_lines_style(self, mock_push, mock_pop, mock_stipple,
+                                mock_enable):
+        """Lines are stippled when drawn with the dashed lines style."""
+        self.buffer.style = GraphicsBatch.DASHED_LINES
+
+        self.buffer.draw()
+
+        mock_stipple.assert_called_once()
+        mock_push.assert_called_once()
+        mock_pop.assert_called_once()
+
+    def test_contains_and_len(self):
+        """The buffer reports the keys it has cross boxes for."""
+        self.assertIn('first', self.buffer)
+        self.assertNotIn('second', self.buffer)
+        self.assertEqual(1, len(self.buffer))
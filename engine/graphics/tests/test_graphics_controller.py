@@ -1,4 +1,4 @@
-from ..graphics_controller import GraphicsController
+from ..graphics_controller import GraphicsController, _IdleAwareEventLoop
 from unittest.mock import call, Mock, patch
 import unittest
 
@@ -17,15 +17,27 @@ class TestGraphicsController(unittest.TestCase):
                 Patch of pyglet.window.Window
             self.mock_schedule_interval:
                 Patch of pyglet.clock.schedule_interval
+            self.mock_unschedule:
+                Patch of pyglet.clock.unschedule
         """
         WindowPatch = patch('pyglet.window.Window')
         schedule_interval_patch = patch('pyglet.clock.schedule_interval')
+        unschedule_patch = patch('pyglet.clock.unschedule')
 
         self.MockPygletWindow = WindowPatch.start()
         self.mock_schedule_interval = schedule_interval_patch.start()
+        self.mock_unschedule = unschedule_patch.start()
 
         self.addCleanup(WindowPatch.stop)
         self.addCleanup(schedule_interval_patch.stop)
+        self.addCleanup(unschedule_patch.stop)
+
+    def get_window_handler(self, event):
+        """Returns the handler the controller pushed to its window."""
+        window_mock = self.MockPygletWindow.return_value
+        return [handler_call.kwargs[event] for handler_call
+                in window_mock.push_handlers.mock_calls
+                if event in handler_call.kwargs][0]
 
     def test_create_window_no_kwargs(self):
         """Default window caption and resizable arguments."""
@@ -78,8 +90,25 @@ class TestGraphicsController(unittest.TestCase):
         on_update_mock = Mock()
 
         controller.add_listeners(on_update=on_update_mock)
-        controller._dispatch_update(0.12345)
-        on_update_mock.assert_called_once_with(123)
+        controller._dispatch_update(0.01234)
+        on_update_mock.assert_called_once_with(12)
+
+    def test_long_updates_are_split(self):
+        """Updates longer than two active updates are split into steps."""
+        controller = GraphicsController(400, 300, update_rate=60)
+        on_update_mock = Mock()
+
+        controller.add_listeners(on_update=on_update_mock)
+        controller._dispatch_update(0.1)
+
+        # Steps are at most 33 ms at 60 updates per second
+        self.assertEqual([call(25)] * 4, on_update_mock.call_args_list)
+
+        on_update_mock.reset_mock()
+        controller._dispatch_update(0.07)
+
+        self.assertEqual([call(24), call(23), call(23)],
+                         on_update_mock.call_args_list)
 
     def test_key_handlers_are_added_to_window(self):
         """Key handlers are pushed to the controller's window."""
@@ -94,3 +123,75 @@ class TestGraphicsController(unittest.TestCase):
         window_mock.push_handlers.assert_has_calls([
             call(handler_mock),
             call(on_key_press=press_mock, on_key_release=release_mock)])
+
+    def test_draw_only_when_invalid(self):
+        """The window is only drawn when the scene has been invalidated."""
+        controller = GraphicsController(400, 300)
+        window_mock = self.MockPygletWindow.return_value
+
+        # The scene starts invalid, so the first frame is drawn
+        self.assertTrue(controller.draw())
+        self.assertFalse(controller.draw())
+
+        controller.invalidate()
+        self.assertTrue(controller.draw())
+
+        self.assertEqual(2, window_mock.flip.call_count)
+        window_mock.dispatch_event.assert_has_calls(
+            [call('on_draw'), call('on_draw')])
+
+    def test_window_events_invalidate(self):
+        """Input and window changes invalidate the scene."""
+        controller = GraphicsController(400, 300)
+
+        for event, args in (('on_expose', ()), ('on_resize', (10, 10)),
+                            ('on_key_press', (1, 0)),
+                            ('on_key_release', (1, 0))):
+            controller.draw()
+            self.get_window_handler(event)(*args)
+            self.assertTrue(controller.invalid, event)
+
+    def test_hidden_window_is_not_drawn(self):
+        """Nothing is drawn while the window is hidden."""
+        controller = GraphicsController(400, 300)
+
+        self.get_window_handler('on_hide')()
+        self.assertFalse(controller.draw())
+
+        self.get_window_handler('on_show')()
+        self.assertTrue(controller.draw())
+
+    def test_inactive_window_updates_at_idle_rate(self):
+        """Updates slow down while the window is unfocused or hidden."""
+        controller = GraphicsController(
+            400, 300, update_rate=60, idle_update_rate=5)
+        self.mock_schedule_interval.reset_mock()
+
+        self.get_window_handler('on_deactivate')()
+        self.mock_unschedule.assert_called_once_with(
+            controller._dispatch_update)
+        self.mock_schedule_interval.assert_called_once_with(
+            controller._dispatch_update, 1.0/5)
+
+        # Hiding an unfocused window keeps the idle rate
+        self.get_window_handler('on_hide')()
+        self.get_window_handler('on_activate')()
+        self.assertEqual(1, self.mock_schedule_interval.call_count)
+
+        self.get_window_handler('on_show')()
+        self.mock_schedule_interval.assert_called_with(
+            controller._dispatch_update, 1.0/60)
+
+    def test_event_loop_draws_through_controller(self):
+        """The event loop runs scheduled functions, then draws if invalid."""
+        controller = Mock()
+        event_loop = _IdleAwareEventLoop(controller)
+        event_loop.clock = Mock()
+
+        sleep_time = event_loop.idle()
+
+        event_loop.clock.call_scheduled_functions.assert_called_once_with(
+            event_loop.clock.update_time.return_value)
+        controller.draw.assert_called_once_with()
+        self.assertEqual(
+            event_loop.clock.get_sleep_time.return_value, sleep_time)
@@ -113,3 +113,11 @@ class TestGraphicsObject(unittest.TestCase):
         graphic.batch = mock_batch
 
         self.assertEqual(mock_batch, graphic.batch)
+
+    @patch('pyglet.sprite.Sprite')
+    def test_reading_frame_index(self, MockSprite):
+        """Frame index is read from internal Sprite object."""
+        MockSprite.return_value.frame_index = 3
+        graphic = GraphicsObject(None)
+
+        self.assertEqual(3, graphic.frame_index)
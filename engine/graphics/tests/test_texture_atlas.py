@@ -0,0 +1,114 @@
+from ..texture_atlas import TextureAtlas
+from unittest.mock import call, Mock, patch
+import unittest
+
+
+class TestTextureAtlas(unittest.TestCase):
+    """Test packing images into texture atlases."""
+
+    def setUp(self):
+        """Provides each test with the following patches::
+
+            self.MockTextureBin:
+                Patch of pyglet.image.atlas.TextureBin, 256x256 in size
+        """
+        texture_bin_patch = patch(
+            'engine.graphics.texture_atlas.TextureBin')
+
+        self.MockTextureBin = texture_bin_patch.start()
+        self.MockTextureBin.return_value.texture_width = 256
+        self.MockTextureBin.return_value.texture_height = 256
+
+        self.addCleanup(texture_bin_patch.stop)
+
+    def test_bin_is_created_when_packing(self):
+        """No texture is created until images are packed."""
+        atlas = TextureAtlas(width=256, height=128)
+
+        self.MockTextureBin.assert_not_called()
+        self.assertEqual([], atlas.textures)
+
+        atlas.pack({})
+        self.MockTextureBin.assert_called_once_with(256, 128)
+
+    def test_images_are_packed_tallest_first(self):
+        """Images are packed in order of descending height and width."""
+        short, wide, tall = Mock(), Mock(), Mock()
+        short.width, short.height = 16, 8
+        wide.width, wide.height = 32, 16
+        tall.width, tall.height = 16, 64
+
+        atlas = TextureAtlas(border=2)
+        regions = atlas.pack({'short': short, 'wide': wide, 'tall': tall})
+
+        mock_bin = self.MockTextureBin.return_value
+        self.assertEqual(
+            [call(tall, 2), call(wide, 2), call(short, 2)],
+            mock_bin.add.call_args_list)
+
+        self.assertEqual(
+            {'short': mock_bin.add.return_value,
+             'wide': mock_bin.add.return_value,
+             'tall': mock_bin.add.return_value},
+            regions)
+
+    def test_large_images_use_their_own_texture(self):
+        """Images too large for the atlas are uploaded separately."""
+        large = Mock()
+        large.width, large.height = 255, 16
+
+        atlas = TextureAtlas(border=1)
+        regions = atlas.pack({'large': large})
+
+        self.MockTextureBin.return_value.add.assert_not_called()
+        self.assertEqual({'large': large.get_texture.return_value}, regions)
+
+    def test_textures_are_listed(self):
+        """Textures which images were packed into are listed once."""
+        mock_bin = self.MockTextureBin.return_value
+        mock_bin.add.side_effect = [Mock(owner='first'), Mock(owner='first'),
+                                    Mock(owner='second')]
+
+        atlas = TextureAtlas()
+        atlas.pack({'a': Mock(width=1, height=3), 'b': Mock(width=1, height=2),
+                    'c': Mock(width=1, height=1)})
+
+        self.assertEqual(['first', 'second'], atlas.textures)
+
+    def test_released_textures_are_dropped(self):
+        """Textures are dropped from the bin once all regions are released."""
+        first_texture, second_texture = Mock(), Mock()
+        first_atlas = Mock(texture=first_texture)
+        second_atlas = Mock(texture=second_texture)
+
+        mock_bin = self.MockTextureBin.return_value
+        mock_bin.atlases = [first_atlas, second_atlas]
+        mock_bin.add.side_effect = [
+            Mock(owner=first_texture), Mock(owner=first_texture),
+            Mock(owner=second_texture)]
+
+        atlas = TextureAtlas()
+        regions = atlas.pack({
+            'a': Mock(width=1, height=3), 'b': Mock(width=1, height=2),
+            'c': Mock(width=1, height=1)})
+
+        # The first texture still holds an unreleased region
+        atlas.release(regions['a'])
+        self.assertEqual([first_texture, second_texture], atlas.textures)
+        self.assertEqual([first_atlas, second_atlas], mock_bin.atlases)
+
+        atlas.release(regions['b'])
+        self.assertEqual([second_texture], atlas.textures)
+        self.assertEqual([second_atlas], mock_bin.atlases)
+
+    def test_released_large_images_are_ignored(self):
+        """Releasing images with their own texture changes nothing."""
+        large = Mock(width=255, height=16)
+        small = Mock(width=1, height=1)
+        self.MockTextureBin.return_value.add.return_value = Mock(owner='page')
+
+        atlas = TextureAtlas(border=1)
+        regions = atlas.pack({'large': large, 'small': small})
+        atlas.release(regions['large'])
+
+        self.assertEqual(['page'], atlas.textures)
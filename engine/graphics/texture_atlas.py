@@ -0,0 +1,109 @@
+from pyglet.image.atlas import TextureBin
+
+
+class TextureAtlas(object):
+    """Packs images into a few large textures to reduce texture binds.
+
+    Sprites drawn from the same texture can be drawn together by a
+    :obj:`engine.graphics.GraphicsBatch`, so packing every tileset and sprite
+    sheet for a room into an atlas lets the room draw with very few binds.
+    The packed images are texture regions, which can be used anywhere a
+    texture can, such as for a :obj:`engine.graphics.GraphicsObject`.
+
+    Regions which are no longer used should be released. Once every region
+    packed into an atlas texture has been released, the texture is dropped
+    from the atlas, freeing it once nothing else refers to it, and new images
+    are packed into a new texture instead.
+
+    Attributes:
+        textures (list of :obj:`pyglet.image.Texture`):
+            The atlas textures which hold unreleased images. Read-only.
+    """
+
+    def __init__(self, width=2048, height=2048, border=1):
+        """Creates an empty texture atlas.
+
+        No textures are created until images are packed into the atlas.
+
+        Kwargs:
+            width (int, optional): Width of each atlas texture, limited to
+                the maximum texture size. Defaults to 2048.
+            height (int, optional): Height of each atlas texture, limited to
+                the maximum texture size. Defaults to 2048.
+            border (int, optional): Transparent pixels around each image to
+                prevent bleeding between neighboring images. Defaults to 1.
+        """
+        super(TextureAtlas, self).__init__()
+        self._width = width
+        self._height = height
+        self._border = border
+        self._bin = None
+
+        # Number of unreleased regions in each atlas texture
+        self._regions = {}
+
+    def pack(self, images):
+        """Packs decoded images into the atlas.
+
+        Images are packed tallest first, which lets the rows of the atlas fill
+        up with images of similar height. Images too large for the atlas are
+        uploaded as their own texture.
+
+        Args:
+            images (dict of object to :obj:`pyglet.image.ImageData`):
+                Decoded images to pack, by an arbitrary key.
+
+        Returns:
+            A dict of the same keys to a :obj:`pyglet.image.TextureRegion` for
+            each image.
+        """
+        # The bin queries the OpenGL context, so it's only created when needed
+        if self._bin is None:
+            self._bin = TextureBin(self._width, self._height)
+
+        packing_order = sorted(
+            images, reverse=True,
+            key=lambda key: (images[key].height, images[key].width))
+
+        return {key: self._add(images[key]) for key in packing_order}
+
+    def _add(self, image):
+        """Adds an image to the atlas, or its own texture if it's too large."""
+        padding = self._border * 2
+
+        if image.width + padding > self._bin.texture_width or \
+                image.height + padding > self._bin.texture_height:
+            return image.get_texture()
+
+        region = self._bin.add(image, self._border)
+        self._regions[region.owner] = self._regions.get(region.owner, 0) + 1
+
+        return region
+
+    def release(self, region):
+        """Releases an image packed into the atlas once it is no longer used.
+
+        Images which were uploaded as their own texture are ignored, since
+        they are freed once nothing refers to them.
+
+        Args:
+            region (:obj:`pyglet.image.TextureRegion`): A region returned by
+                :fn:`pack`. It should not be used after being released.
+        """
+        texture = getattr(region, 'owner', None)
+        if texture not in self._regions:
+            return
+
+        self._regions[texture] -= 1
+        if self._regions[texture]:
+            return
+
+        # Stop packing into the texture, so it's freed with its last region
+        del self._regions[texture]
+        self._bin.atlases = [atlas for atlas in self._bin.atlases
+                             if atlas.texture is not texture]
+
+    @property
+    def textures(self):
+        """Returns the textures of the atlas."""
+        return list(self._regions)
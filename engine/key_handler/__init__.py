@@ -1,3 +1,8 @@
-from .key_handler import KeyHandler
+from engine.util.lazy_import import lazy_import
 
-__all__ = ['KeyHandler']
+__all__ = ['InputRecording', 'KeyHandler']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'InputRecording': '.input_recording',
+    'KeyHandler': '.key_handler',
+})
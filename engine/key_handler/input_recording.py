@@ -0,0 +1,166 @@
+from engine.util.varint import (
+    read_varint, write_varint, zigzag_decode, zigzag_encode)
+import os
+
+RECORDING_MAGIC = b'PFQINPUT'
+RECORDING_VERSION = 1
+
+
+class InputRecording(object):
+    """Log of key presses and releases for each update of a key handler.
+
+    Each tick is one :fn:`engine.key_handler.KeyHandler.update`, holding the
+    elapsed time passed to the update and the key events which happened
+    before it. Replaying the ticks through a key handler reproduces the input
+    exactly, without a window. See :fn:`replay`.
+
+    Recordings are encoded compactly, since most ticks have no key events
+    and take the same time as the tick before them. Each tick is written as
+    varints of the change in elapsed time and the number of events, followed
+    by one varint per event for the key and whether it was released. A tick
+    without any key events and with the same elapsed time takes two bytes.
+
+    Attributes:
+        ticks (list of tuple): The (dt, events) of each tick in order, where
+            dt is the elapsed time in milliseconds and events is a list of
+            (key, pressed) tuples.
+    """
+
+    def __init__(self, ticks=None):
+        """Creates a recording.
+
+        Kwargs:
+            ticks (list of tuple, optional): The (dt, events) of each tick.
+                Defaults to an empty recording.
+        """
+        super(InputRecording, self).__init__()
+        self.ticks = ticks if ticks is not None else []
+        self._events = []
+
+    def record_event(self, key, pressed):
+        """Records a key event for the current tick.
+
+        Args:
+            key (int): The key which was pressed or released.
+            pressed (bool): True if the key was pressed, False if released.
+        """
+        self._events.append((key, pressed))
+
+    def record_tick(self, dt):
+        """Ends the current tick, recording its elapsed time.
+
+        Args:
+            dt (int): The elapsed time of the tick in milliseconds.
+        """
+        self.ticks.append((int(dt), self._events))
+        self._events = []
+
+    def replay(self, key_handler, update):
+        """Feeds the recorded input back through a key handler.
+
+        For each tick, the key events are pressed and released through the
+        key handler, then the update function is called with the tick's
+        elapsed time. The update function should update the key handler, as
+        the game does each frame. Ticks are replayed as fast as possible.
+
+        Args:
+            key_handler (:obj:`engine.key_handler.KeyHandler`): The key
+                handler to feed the input through.
+            update (fn): Called with the elapsed time in milliseconds after
+                each tick's key events.
+        """
+        for dt, events in self.ticks:
+            for key, pressed in events:
+                if pressed:
+                    key_handler.press(key)
+                else:
+                    key_handler.release(key)
+
+            update(dt)
+
+    def to_bytes(self):
+        """Returns the recording encoded as bytes."""
+        buffer = bytearray(RECORDING_MAGIC)
+        write_varint(buffer, RECORDING_VERSION)
+        previous_dt = 0
+
+        for dt, events in self.ticks:
+            write_varint(buffer, zigzag_encode(dt - previous_dt))
+            write_varint(buffer, len(events))
+            previous_dt = dt
+
+            for key, pressed in events:
+                write_varint(buffer, key << 1 | (not pressed))
+
+        return bytes(buffer)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decodes a recording from bytes returned by :fn:`to_bytes`.
+
+        Args:
+            data (bytes-like): The encoded recording.
+
+        Returns:
+            The decoded :obj:`InputRecording`.
+
+        Raises:
+            ValueError: If the data is not a supported input recording.
+        """
+        if data[:len(RECORDING_MAGIC)] != RECORDING_MAGIC:
+            raise ValueError('Not an input recording')
+
+        version, offset = read_varint(data, len(RECORDING_MAGIC))
+        if version != RECORDING_VERSION:
+            raise ValueError(
+                'Unsupported input recording version {0}'.format(version))
+
+        ticks = []
+        dt = 0
+
+        while offset < len(data):
+            dt_change, offset = read_varint(data, offset)
+            event_count, offset = read_varint(data, offset)
+            dt += zigzag_decode(dt_change)
+            events = []
+
+            for _ in range(event_count):
+                event, offset = read_varint(data, offset)
+                events.append((event >> 1, not event & 1))
+
+            ticks.append((dt, events))
+
+        return cls(ticks)
+
+    def save(self, path):
+        """Writes the recording to a file, replacing it atomically.
+
+        Args:
+            path (str): Path to write the recording to.
+        """
+        temporary_path = path + '.tmp'
+
+        with open(temporary_path, 'wb') as recording_file:
+            recording_file.write(self.to_bytes())
+
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a recording from a file written by :fn:`save`.
+
+        Args:
+            path (str): Path to the recording file.
+
+        Returns:
+            The loaded :obj:`InputRecording`.
+
+        Raises:
+            ValueError: If the file is not a supported input recording.
+        """
+        with open(path, 'rb') as recording_file:
+            return cls.from_bytes(recording_file.read())
+
+    def __len__(self):
+        """Returns the number of recorded ticks."""
+        return len(self.ticks)
@@ -1,28 +1,38 @@
+from .input_recording import InputRecording
 from pyglet import window
 
 
 class KeyHandler(object):
-    """Maps keypresses to an arbitrary number of callbacks."""
+    """Maps keypresses to an arbitrary number of callbacks.
 
-    def __init__(self, graphics_controller):
+    Input can be recorded into an :obj:`engine.key_handler.InputRecording`
+    and replayed later, which makes play sessions reproducible. Replaying
+    does not need a window, so key handlers can be created without one.
+    """
+
+    def __init__(self, graphics_controller=None):
         """Creates a new key handler attached to a graphics controller.
 
-        Args:
-            graphics_controller (:obj:`engine.graphics.GraphicsController`):
-                The graphics controller for the window to handle key events.
+        Kwargs:
+            graphics_controller (:obj:`engine.graphics.GraphicsController`,
+                optional): The graphics controller for the window to handle
+                key events. Defaults to None, for a key handler which only
+                receives keys through :fn:`press` and :fn:`release`.
         """
         super(KeyHandler, self).__init__()
         self._key_handler = window.key.KeyStateHandler()
         self._key_release_mappings = {}
         self._key_press_mappings = {}
         self._key_down_mappings = {}
+        self._recording = None
 
-        graphics_controller.add_key_handler(
-            self._key_handler,
-            on_press=lambda *args:
-                self._handle_key_event(*args, self._key_press_mappings),
-            on_release=lambda *args:
-                self._handle_key_event(*args, self._key_release_mappings))
+        if graphics_controller is not None:
+            graphics_controller.add_key_handler(
+                self._key_handler,
+                on_press=lambda key, modifiers: self._handle_key_event(
+                    key, modifiers, self._key_press_mappings),
+                on_release=lambda key, modifiers: self._handle_key_event(
+                    key, modifiers, self._key_release_mappings))
 
     def on_key_down(self, key, callback):
         """Registers a callback to call when the given key is held down.
@@ -60,12 +70,55 @@ class KeyHandler(object):
         """
         self._key_release_mappings.setdefault(key, []).append(callback)
 
+    def press(self, key):
+        """Presses a key as if it was pressed in the window.
+
+        Args:
+            key (int): The key to press.
+        """
+        self._key_handler[key] = True
+        self._handle_key_event(key, 0, self._key_press_mappings)
+
+    def release(self, key):
+        """Releases a key as if it was released in the window.
+
+        Args:
+            key (int): The key to release.
+        """
+        self._key_handler[key] = False
+        self._handle_key_event(key, 0, self._key_release_mappings)
+
+    def start_recording(self):
+        """Starts recording key events and updates.
+
+        Returns:
+            The :obj:`engine.key_handler.InputRecording` which is recorded
+            into until :fn:`stop_recording` is called.
+        """
+        self._recording = InputRecording()
+        return self._recording
+
+    def stop_recording(self):
+        """Stops recording input.
+
+        Returns:
+            The finished :obj:`engine.key_handler.InputRecording`, or None if
+            input was not being recorded.
+        """
+        recording = self._recording
+        self._recording = None
+
+        return recording
+
     def update(self, dt):
         """Updates the key handler, calling any callbacks as necessary.
 
         Args:
             dt (int): The elapsed time in milliseconds
         """
+        if self._recording is not None:
+            self._recording.record_tick(dt)
+
         for key, callbacks in self._key_down_mappings.items():
             if self._key_handler[key]:
                 for callback in callbacks:
@@ -79,6 +132,10 @@ class KeyHandler(object):
             modifiers (int): Any modifier keys for the event.
             mapping (dict of int to fn): A mapping of keys to their handlers.
         """
+        if self._recording is not None:
+            self._recording.record_event(
+                key, mapping is self._key_press_mappings)
+
         if key in mapping:
             for callback in mapping[key]:
                 callback()
@@ -0,0 +1,76 @@
+from ..input_recording import InputRecording
+from tempfile import TemporaryDirectory
+from unittest.mock import call, Mock
+import os
+import unittest
+
+
+class TestInputRecording(unittest.TestCase):
+    """Test recording, encoding, and replaying key handler input."""
+
+    def setUp(self):
+        """Provides each test with a recording of three ticks."""
+        self.recording = InputRecording()
+        self.recording.record_event(65361, True)
+        self.recording.record_tick(16)
+        self.recording.record_tick(16)
+        self.recording.record_event(65361, False)
+        self.recording.record_event(32, True)
+        self.recording.record_tick(17)
+
+    def test_records_events_per_tick(self):
+        """Events are recorded for the tick they happened before."""
+        self.assertEqual([
+            (16, [(65361, True)]),
+            (16, []),
+            (17, [(65361, False), (32, True)]),
+        ], self.recording.ticks)
+        self.assertEqual(3, len(self.recording))
+
+    def test_encoding_round_trips(self):
+        """Recordings are decoded back into the same ticks."""
+        decoded = InputRecording.from_bytes(self.recording.to_bytes())
+
+        self.assertEqual(self.recording.ticks, decoded.ticks)
+
+    def test_encoding_is_compact(self):
+        """Ticks without events or change in time take two bytes."""
+        recording = InputRecording([(16, [])] * 101)
+
+        # Magic and version, then two bytes per tick
+        self.assertEqual(8 + 1 + 2 * 101, len(recording.to_bytes()))
+
+    def test_decoding_rejects_other_data(self):
+        """Data which is not an input recording raises an error."""
+        with self.assertRaises(ValueError):
+            InputRecording.from_bytes(b'PFQPACK\x00\x01')
+
+        with self.assertRaises(ValueError):
+            InputRecording.from_bytes(b'PFQINPUT\x02')
+
+    def test_save_and_load(self):
+        """Recordings are saved to and loaded from files."""
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'session.input')
+            self.recording.save(path)
+
+            self.assertEqual(
+                self.recording.ticks, InputRecording.load(path).ticks)
+            self.assertEqual(['session.input'], os.listdir(directory))
+
+    def test_replay_feeds_key_handler(self):
+        """Replays press and release keys before updating each tick."""
+        mock_handler = Mock()
+        mock_update = Mock()
+        mock_handler.attach_mock(mock_update, 'update')
+
+        self.recording.replay(mock_handler, mock_update)
+
+        self.assertEqual([
+            call.press(65361),
+            call.update(16),
+            call.update(16),
+            call.release(65361),
+            call.press(32),
+            call.update(17),
+        ], mock_handler.mock_calls)
@@ -116,3 +116,41 @@ class TestKeyHandler(unittest.TestCase):
 
         callback_1_mock.assert_called_once()
         callback_2_mock.assert_called_once()
+
+    @patch('pyglet.window.key.KeyStateHandler', dict)
+    def test_press_and_release_without_window(self):
+        """Keys can be pressed and released without a graphics controller."""
+        handler = KeyHandler()
+        press_mock, down_mock, release_mock = Mock(), Mock(), Mock()
+        handler.on_key_press(1, press_mock)
+        handler.on_key_down(1, down_mock)
+        handler.on_key_release(1, release_mock)
+
+        handler.press(1)
+        handler.update(16)
+        handler.release(1)
+        handler.update(16)
+
+        press_mock.assert_called_once_with()
+        down_mock.assert_called_once_with(16)
+        release_mock.assert_called_once_with()
+
+    def test_records_key_events_and_updates(self):
+        """Key events and updates are recorded until recording stops."""
+        key_press_handler = \
+            self.graphics_mock.add_key_handler.call_args[1]['on_press']
+        key_release_handler = \
+            self.graphics_mock.add_key_handler.call_args[1]['on_release']
+
+        recording = self.handler.start_recording()
+        key_press_handler(1, 0)
+        self.handler.update(16)
+        key_release_handler(1, 0)
+        self.handler.update(17)
+
+        self.assertEqual(recording, self.handler.stop_recording())
+        self.handler.update(18)
+
+        self.assertEqual(
+            [(16, [(1, True)]), (17, [(1, False)])], recording.ticks)
+        self.assertIsNone(self.handler.stop_recording())
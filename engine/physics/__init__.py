@@ -1,3 +1,7 @@
-from .physics_2d import Physics2d
+from engine.util.lazy_import import lazy_import
 
 __all__ = ['Physics2d']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'Physics2d': '.physics_2d',
+})
@@ -61,6 +61,27 @@ class Physics2d(object):
         for axis in ('x', 'y'):
             self._update_velocity_on_axis(axis)
 
+    def get_physics_state(self):
+        """Returns the simulation state which changes as the object moves.
+
+        Returns:
+            A tuple of ints of the x and y velocity, the x and y acceleration,
+            and the x and y high resolution velocity used by the simulation.
+        """
+        return (self.velocity.x, self.velocity.y,
+                self.acceleration.x, self.acceleration.y,
+                self._velocity_1000.x, self._velocity_1000.y)
+
+    def set_physics_state(self, state):
+        """Restores simulation state returned by :fn:`get_physics_state`.
+
+        Args:
+            state (tuple of int): The state to restore.
+        """
+        (self.velocity.x, self.velocity.y,
+         self.acceleration.x, self.acceleration.y,
+         self._velocity_1000.x, self._velocity_1000.y) = state
+
     def _update_acceleration_on_axis(self, total_acceleration, axis):
         """Updates acceleration on the given axis.
 
@@ -139,3 +139,19 @@ class TestPhysics2d(unittest.TestCase):
         physics.acceleration.set((0, -10))
         physics.run_simulation(1000)
         self.assertPoint((0, -5), physics.velocity)
+
+    def test_physics_state_round_trips(self):
+        """Saved simulation state restores the high resolution velocity."""
+        physics = Physics2d(mass=1, gravity=(0, -10), friction=50)
+        physics.acceleration.set((3, 0))
+        physics.run_simulation(16)
+        state = physics.get_physics_state()
+
+        physics.run_simulation(16)
+        expected = physics.get_physics_state()
+
+        physics.set_physics_state(state)
+        physics.run_simulation(16)
+
+        self.assertEqual(6, len(state))
+        self.assertEqual(expected, physics.get_physics_state())
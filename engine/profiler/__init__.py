@@ -0,0 +1,17 @@
+from engine.util.lazy_import import lazy_import
+
+__all__ = [
+    'FRAME',
+    'FrameProfiler',
+    'ProfilerOverlay',
+    'SpanStats',
+    'get_profiler',
+]
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'FRAME': '.frame_profiler',
+    'FrameProfiler': '.frame_profiler',
+    'ProfilerOverlay': '.profiler_overlay',
+    'SpanStats': '.frame_profiler',
+    'get_profiler': '.frame_profiler',
+})
@@ -0,0 +1,275 @@
+from collections import deque
+from functools import wraps
+from math import ceil
+from time import perf_counter
+
+# Span recording the time between the ends of consecutive frames
+FRAME = 'frame'
+
+
+class FrameProfiler(object):
+    """Measures the time spent in each phase of a frame.
+
+    Code is timed in named spans, through :fn:`span` as a context manager or
+    :fn:`profile` as a decorator. Time in each span is totalled over a frame,
+    then :fn:`end_frame` adds the totals to a ring buffer of recent frames for
+    each span, which percentiles are calculated from. See :fn:`get_stats`.
+
+    Spans may be nested. Time spent in a nested span only counts toward the
+    innermost span, so the spans of a frame never overlap.
+
+    Spans cost almost nothing while the profiler is disabled, so the engine
+    times its own phases through :fn:`get_profiler` and leaves enabling the
+    profiler to the game.
+
+    Attributes:
+        enabled (bool): Whether spans are being timed.
+        history (int): The number of recent frames kept for each span.
+        slow_frame_ms (float): Frames taking longer than this many
+            milliseconds are kept in :attr:`slow_frame`.
+        slow_frame (dict of str to float): Milliseconds in each span during
+            the most recent slow frame, or None if there hasn't been one.
+    """
+
+    def __init__(self, enabled=False, history=240, slow_frame_ms=1000 / 60):
+        """Creates a profiler without any timed frames.
+
+        Kwargs:
+            enabled (bool, optional): Whether to start timing spans.
+                Defaults to False.
+            history (int, optional): The number of recent frames to keep for
+                each span. Defaults to 240.
+            slow_frame_ms (float, optional): Milliseconds a frame must take to
+                be kept as the most recent slow frame. Defaults to one frame
+                at 60 frames per second.
+        """
+        super(FrameProfiler, self).__init__()
+        self.enabled = enabled
+        self.history = history
+        self.slow_frame_ms = slow_frame_ms
+        self.slow_frame = None
+
+        # Seconds in each span this frame, and milliseconds in recent frames
+        self._frame_times = {}
+        self._recent_times = {}
+
+        # Open spans as [name, start, seconds in nested spans]
+        self._open_spans = []
+        self._frame_start = None
+
+    def span(self, name):
+        """Times the code within a with statement.
+
+        For example:
+
+            with profiler.span('world.broad_phase'):
+                ...
+
+        Args:
+            name (str): The name of the span to add the time to.
+
+        Returns:
+            A context manager which times its body.
+        """
+        if not self.enabled:
+            return _DISABLED_SPAN
+
+        return _Span(self, name)
+
+    def profile(self, name):
+        """Decorator which times each call to a function.
+
+        The profiler is checked on each call, so functions decorated while the
+        profiler is disabled are timed once it is enabled.
+
+        Args:
+            name (str): The name of the span to add the time to.
+
+        Returns:
+            A decorator for the function to time.
+        """
+        def decorator(function):
+            @wraps(function)
+            def profiled(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+
+                self._open_span(name)
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self._close_span()
+
+            return profiled
+
+        return decorator
+
+    def record(self, name, seconds):
+        """Adds time to a span in the current frame.
+
+        This is useful for timing code which runs many times a frame, by
+        totalling its time and recording it once. Time recorded within an
+        open span is not counted toward the open span, as with nested spans.
+
+        Args:
+            name (str): The name of the span.
+            seconds (float): The time to add, in seconds.
+        """
+        self._add_time(name, seconds)
+        if self._open_spans:
+            self._open_spans[-1][2] += seconds
+
+    def end_frame(self):
+        """Adds the time in each span this frame to its recent frames.
+
+        The time since the previous frame ended is recorded in the
+        :data:`FRAME` span. Spans which weren't entered this frame record no
+        time, so the recent frames of every span line up.
+        """
+        now = perf_counter()
+
+        if not self.enabled:
+            self._frame_times.clear()
+            self._frame_start = None
+            return
+
+        if self._frame_start is not None:
+            self.record(FRAME, now - self._frame_start)
+
+        self._frame_start = now
+
+        for name in self._frame_times.keys() - self._recent_times.keys():
+            self._recent_times[name] = deque(maxlen=self.history)
+
+        frame_ms = {name: self._frame_times.get(name, 0) * 1000
+                    for name in self._recent_times}
+
+        for name, ms in frame_ms.items():
+            self._recent_times[name].append(ms)
+
+        if frame_ms.get(FRAME, 0) > self.slow_frame_ms:
+            self.slow_frame = frame_ms
+
+        self._frame_times.clear()
+
+    def get_span_names(self):
+        """Returns the names of every span with recent frames, sorted."""
+        return sorted(self._recent_times)
+
+    def get_stats(self, name):
+        """Returns statistics of a span over its recent frames.
+
+        Args:
+            name (str): The name of the span.
+
+        Returns:
+            The :obj:`engine.profiler.SpanStats` of the span, or None if it
+            has no recent frames.
+        """
+        recent_times = self._recent_times.get(name)
+
+        if not recent_times:
+            return None
+
+        return SpanStats(recent_times)
+
+    def reset(self):
+        """Discards every recorded frame."""
+        self._frame_times.clear()
+        self._recent_times.clear()
+        self._frame_start = None
+        self.slow_frame = None
+
+    def _open_span(self, name):
+        """Starts timing a span, nested in any open span."""
+        self._open_spans.append([name, perf_counter(), 0])
+
+    def _close_span(self):
+        """Stops timing the innermost open span."""
+        name, start, nested_seconds = self._open_spans.pop()
+        seconds = perf_counter() - start
+
+        self._add_time(name, seconds - nested_seconds)
+        if self._open_spans:
+            self._open_spans[-1][2] += seconds
+
+    def _add_time(self, name, seconds):
+        """Adds time to a span in the current frame, ignoring open spans."""
+        self._frame_times[name] = self._frame_times.get(name, 0) + seconds
+
+
+class SpanStats(object):
+    """Statistics of a span's time over recent frames, in milliseconds.
+
+    Attributes:
+        frames (int): The number of frames the statistics are from.
+        last (float): Time in the most recent frame.
+        mean (float): Mean time per frame.
+        p50 (float): Median time per frame.
+        p95 (float): 95th percentile time per frame.
+        p99 (float): 99th percentile time per frame.
+        max (float): Longest time in a frame.
+    """
+
+    def __init__(self, times):
+        """Calculates statistics from the time in each frame.
+
+        Args:
+            times (sequence of float): Milliseconds in each frame, oldest
+                first. It must not be empty.
+        """
+        super(SpanStats, self).__init__()
+        ordered = sorted(times)
+
+        self.frames = len(ordered)
+        self.last = times[-1]
+        self.mean = sum(ordered) / self.frames
+        self.p50 = _percentile(ordered, 50)
+        self.p95 = _percentile(ordered, 95)
+        self.p99 = _percentile(ordered, 99)
+        self.max = ordered[-1]
+
+
+class _Span(object):
+    """Context manager timing its body in a profiler span."""
+
+    def __init__(self, profiler, name):
+        """Creates a span which starts timing when entered."""
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._profiler._open_span(self._name)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._profiler._close_span()
+
+
+class _DisabledSpan(object):
+    """Context manager which does nothing, for disabled profilers."""
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_DISABLED_SPAN = _DisabledSpan()
+
+# Profiler the engine's own spans are timed with
+_default_profiler = FrameProfiler()
+
+
+def get_profiler():
+    """Returns the profiler the engine times its phases with.
+
+    The profiler is disabled until the game enables it.
+    """
+    return _default_profiler
+
+
+def _percentile(ordered, percent):
+    """Returns the nearest-rank percentile of sorted values."""
+    rank = ceil(percent / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
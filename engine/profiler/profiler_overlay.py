@@ -0,0 +1,95 @@
+from .frame_profiler import FRAME
+from pyglet.text import Label
+
+
+class ProfilerOverlay(object):
+    """Draws the recent time spent in each span of a frame profiler.
+
+    Each span is listed with its 50th, 95th, and 99th percentile milliseconds
+    per frame, slowest first. The spans of the most recent slow frame are
+    listed below them, showing which phase caused it.
+
+    The text is only laid out again after an interval, since laying out text
+    every frame would add to the time being measured.
+
+    Attributes:
+        profiler (:obj:`engine.profiler.FrameProfiler`): The profiler to show
+            the spans of.
+        refresh_ms (int): Milliseconds between updates of the text.
+    """
+
+    def __init__(self, profiler, x=0, y=0, refresh_ms=250,
+                 color=(255, 255, 255, 255), font_name='Verdana',
+                 font_size=8):
+        """Creates an overlay of a profiler's spans.
+
+        Args:
+            profiler (:obj:`engine.profiler.FrameProfiler`): The profiler to
+                show the spans of.
+
+        Kwargs:
+            x (int, optional): Window x coordinate of the overlay's left
+                edge. Defaults to 0.
+            y (int, optional): Window y coordinate of the overlay's top edge.
+                Defaults to 0.
+            refresh_ms (int, optional): Milliseconds between updates of the
+                text. Defaults to 250.
+            color (tuple of 4 int, optional): RGBA color of the text.
+                Defaults to white.
+            font_name (str, optional): Font of the text. Defaults to Verdana.
+            font_size (int, optional): Font size of the text. Defaults to 8.
+        """
+        super(ProfilerOverlay, self).__init__()
+        self.profiler = profiler
+        self.refresh_ms = refresh_ms
+
+        self._label = Label(
+            '', x=x, y=y, width=400, multiline=True, anchor_y='top',
+            color=color, font_name=font_name, font_size=font_size)
+        self._elapsed_ms = refresh_ms
+
+    def update(self, ms):
+        """Updates the text once the refresh interval has passed.
+
+        Args:
+            ms (int): Milliseconds since the last update.
+
+        Returns:
+            True if the text was updated, otherwise False.
+        """
+        self._elapsed_ms += ms
+
+        if self._elapsed_ms < self.refresh_ms:
+            return False
+
+        self._elapsed_ms = 0
+        self._label.text = self.get_text()
+
+        return True
+
+    def draw(self):
+        """Draws the overlay."""
+        self._label.draw()
+
+    def get_text(self):
+        """Returns the text of the overlay for the profiler's spans."""
+        stats = {name: self.profiler.get_stats(name)
+                 for name in self.profiler.get_span_names()}
+        lines = ['{0:<22}{1:>7}{2:>7}{3:>7}'.format('ms', 'p50', 'p95', 'p99')]
+
+        # The frame goes first, followed by the slowest spans
+        for name in sorted(stats, key=lambda name: (
+                name != FRAME, -stats[name].p95)):
+            lines.append('{0:<22}{1.p50:>7.2f}{1.p95:>7.2f}{1.p99:>7.2f}'
+                         .format(name, stats[name]))
+
+        slow_frame = self.profiler.slow_frame
+        if slow_frame is not None:
+            lines.append('')
+            lines.append('last slow frame')
+
+            for name in sorted(slow_frame, key=lambda name: (
+                    name != FRAME, -slow_frame[name])):
+                lines.append('{0:<22}{1:>7.2f}'.format(name, slow_frame[name]))
+
+        return '\n'.join(lines)
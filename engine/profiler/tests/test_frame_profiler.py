@@ -0,0 +1,206 @@
+from ..frame_profiler import FRAME, FrameProfiler, SpanStats, get_profiler
+from unittest.mock import patch
+import unittest
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """Test timing spans of frames with the ``FrameProfiler`` class."""
+
+    def setUp(self):
+        """Creates an enabled profiler for each test."""
+        self.profiler = FrameProfiler(enabled=True)
+
+    @patch('engine.profiler.frame_profiler.perf_counter')
+    def test_span_records_time(self, mock_perf_counter):
+        """Time within a span is added to the span when the frame ends."""
+        mock_perf_counter.side_effect = [1, 1.002, 1.005]
+
+        with self.profiler.span('room.draw'):
+            pass
+
+        self.profiler.end_frame()
+
+        self.assertEqual(['room.draw'], self.profiler.get_span_names())
+        self.assertAlmostEqual(2, self.profiler.get_stats('room.draw').last)
+
+    @patch('engine.profiler.frame_profiler.perf_counter')
+    def test_span_totals_each_frame(self, mock_perf_counter):
+        """Spans entered several times in a frame record their total."""
+        mock_perf_counter.side_effect = [0, 0.001, 0.002, 0.004, 0.005]
+
+        for _ in range(2):
+            with self.profiler.span('physics.step'):
+                pass
+
+        self.profiler.end_frame()
+
+        self.assertAlmostEqual(3, self.profiler.get_stats('physics.step').last)
+
+    @patch('engine.profiler.frame_profiler.perf_counter')
+    def test_nested_spans_are_exclusive(self, mock_perf_counter):
+        """Time in a nested span only counts toward the nested span."""
+        mock_perf_counter.side_effect = [0, 0.001, 0.004, 0.010, 0.011]
+
+        with self.profiler.span('world.broad_phase'):
+            with self.profiler.span('world.narrow_phase'):
+                pass
+
+        self.profiler.end_frame()
+
+        self.assertAlmostEqual(
+            7, self.profiler.get_stats('world.broad_phase').last)
+        self.assertAlmostEqual(
+            3, self.profiler.get_stats('world.narrow_phase').last)
+
+    @patch('engine.profiler.frame_profiler.perf_counter')
+    def test_recorded_time_is_excluded_from_open_span(self, mock_perf_counter):
+        """Time recorded within a span only counts toward its own span."""
+        mock_perf_counter.side_effect = [0, 0.010, 0.011]
+
+        with self.profiler.span('world.broad_phase'):
+            self.profiler.record('world.narrow_phase', 0.003)
+
+        self.profiler.end_frame()
+
+        self.assertAlmostEqual(
+            7, self.profiler.get_stats('world.broad_phase').last)
+        self.assertAlmostEqual(
+            3, self.profiler.get_stats('world.narrow_phase').last)
+
+    @patch('engine.profiler.frame_profiler.perf_counter')
+    def test_profile_decorator(self, mock_perf_counter):
+        """Decorated functions are timed and return their result."""
+        mock_perf_counter.side_effect = [0, 0.001, 0.002]
+
+        @self.profiler.profile('camera.update')
+        def update(ms):
+            return ms * 2
+
+        self.assertEqual(10, update(5))
+        self.profiler.end_frame()
+
+        self.assertAlmostEqual(
+            1, self.profiler.get_stats('camera.update').last)
+
+    @patch('engine.profiler.frame_profiler.perf_counter')
+    def test_profile_decorator_records_exceptions(self, mock_perf_counter):
+        """Functions which raise are still timed."""
+        mock_perf_counter.side_effect = [0, 0.001, 0.002]
+
+        @self.profiler.profile('room.update')
+        def update():
+            raise RuntimeError()
+
+        with self.assertRaises(RuntimeError):
+            update()
+
+        self.profiler.end_frame()
+        self.assertAlmostEqual(1, self.profiler.get_stats('room.update').last)
+
+    @patch('engine.profiler.frame_profiler.perf_counter')
+    def test_disabled_profiler_records_nothing(self, mock_perf_counter):
+        """Disabled profilers don't time spans or functions."""
+        self.profiler.enabled = False
+
+        @self.profiler.profile('room.update')
+        def update():
+            return 1
+
+        with self.profiler.span('room.draw'):
+            self.assertEqual(1, update())
+
+        self.profiler.end_frame()
+
+        self.assertEqual([], self.profiler.get_span_names())
+        self.assertEqual(1, mock_perf_counter.call_count)
+
+    @patch('engine.profiler.frame_profiler.perf_counter')
+    def test_frame_span(self, mock_perf_counter):
+        """The time between the ends of frames is recorded."""
+        mock_perf_counter.side_effect = [1, 1.016, 1.040]
+
+        for _ in range(3):
+            self.profiler.end_frame()
+
+        stats = self.profiler.get_stats(FRAME)
+        self.assertEqual(2, stats.frames)
+        self.assertAlmostEqual(24, stats.last)
+
+    def test_missing_spans_record_no_time(self):
+        """Spans which aren't entered in a frame record zero for it."""
+        self.profiler.record('world.dispatch', 0.002)
+        self.profiler.end_frame()
+        self.profiler.end_frame()
+
+        stats = self.profiler.get_stats('world.dispatch')
+        self.assertEqual(2, stats.frames)
+        self.assertEqual(0, stats.last)
+
+    def test_history_is_limited(self):
+        """Only the most recent frames are kept."""
+        self.profiler.history = 3
+
+        for ms in range(5):
+            self.profiler.record('room.draw', ms / 1000)
+            self.profiler.end_frame()
+
+        stats = self.profiler.get_stats('room.draw')
+        self.assertEqual(3, stats.frames)
+        self.assertAlmostEqual(3, stats.p50)
+
+    @patch('engine.profiler.frame_profiler.perf_counter')
+    def test_slow_frame(self, mock_perf_counter):
+        """Frames slower than the threshold keep their span times."""
+        mock_perf_counter.side_effect = [0, 0.010, 0.040]
+        self.profiler.slow_frame_ms = 20
+
+        self.profiler.end_frame()
+        self.profiler.record('room.draw', 0.005)
+        self.profiler.end_frame()
+        self.assertIsNone(self.profiler.slow_frame)
+
+        self.profiler.record('room.draw', 0.025)
+        self.profiler.end_frame()
+
+        self.assertAlmostEqual(30, self.profiler.slow_frame[FRAME])
+        self.assertAlmostEqual(25, self.profiler.slow_frame['room.draw'])
+
+    def test_get_stats_unknown_span(self):
+        """Spans without recent frames have no stats."""
+        self.assertIsNone(self.profiler.get_stats('room.draw'))
+
+    def test_reset(self):
+        """Resetting discards every recorded frame."""
+        self.profiler.record('room.draw', 0.1)
+        self.profiler.end_frame()
+        self.profiler.reset()
+
+        self.assertEqual([], self.profiler.get_span_names())
+
+    def test_default_profiler_is_disabled(self):
+        """The engine's profiler is shared and starts disabled."""
+        self.assertIs(get_profiler(), get_profiler())
+        self.assertFalse(get_profiler().enabled)
+
+
+class TestSpanStats(unittest.TestCase):
+    """Test statistics of a span with the ``SpanStats`` class."""
+
+    def test_percentiles(self):
+        """Percentiles are the nearest rank of the times."""
+        stats = SpanStats([float(ms) for ms in range(100, 0, -1)])
+
+        self.assertEqual(100, stats.frames)
+        self.assertEqual(1, stats.last)
+        self.assertEqual(50.5, stats.mean)
+        self.assertEqual(50, stats.p50)
+        self.assertEqual(95, stats.p95)
+        self.assertEqual(99, stats.p99)
+        self.assertEqual(100, stats.max)
+
+    def test_single_frame(self):
+        """Every statistic of a single frame is its time."""
+        stats = SpanStats([4.0])
+
+        self.assertEqual(
+            [4] * 5, [stats.mean, stats.p50, stats.p95, stats.p99, stats.max])
@@ -0,0 +1,58 @@
+from ..frame_profiler import FRAME, FrameProfiler
+from ..profiler_overlay import ProfilerOverlay
+from unittest.mock import patch
+import unittest
+
+
+@patch('engine.profiler.profiler_overlay.Label')
+class TestProfilerOverlay(unittest.TestCase):
+    """Test drawing a profiler's spans with the ``ProfilerOverlay`` class."""
+
+    def setUp(self):
+        """Creates a profiler with a frame of spans for each test."""
+        self.profiler = FrameProfiler(enabled=True)
+        self.profiler.record(FRAME, 0.004)
+        self.profiler.record('room.draw', 0.001)
+        self.profiler.record('world.broad_phase', 0.002)
+        self.profiler.end_frame()
+
+    def test_text_lists_slowest_spans_first(self, MockLabel):
+        """Spans are listed after the frame, slowest first."""
+        lines = ProfilerOverlay(self.profiler).get_text().split('\n')
+
+        self.assertEqual(4, len(lines))
+        self.assertTrue(lines[1].startswith(FRAME))
+        self.assertTrue(lines[2].startswith('world.broad_phase'))
+        self.assertTrue(lines[3].startswith('room.draw'))
+        self.assertIn('2.00', lines[2])
+
+    def test_text_lists_slow_frame(self, MockLabel):
+        """The spans of the last slow frame are listed below the stats."""
+        self.profiler.slow_frame = {FRAME: 40.0, 'room.draw': 30.0}
+
+        lines = ProfilerOverlay(self.profiler).get_text().split('\n')
+
+        self.assertEqual('last slow frame', lines[-3])
+        self.assertEqual([FRAME, '40.00'], lines[-2].split())
+        self.assertEqual(['room.draw', '30.00'], lines[-1].split())
+
+    def test_update_refreshes_after_interval(self, MockLabel):
+        """The label text is only laid out again after the interval."""
+        overlay = ProfilerOverlay(self.profiler, refresh_ms=100)
+        label = MockLabel.return_value
+
+        self.assertTrue(overlay.update(16))
+        first_text = label.text
+
+        label.text = None
+        self.assertFalse(overlay.update(16))
+        self.assertIsNone(label.text)
+
+        self.assertTrue(overlay.update(84))
+        self.assertEqual(first_text, label.text)
+
+    def test_draw(self, MockLabel):
+        """Drawing the overlay draws its label."""
+        ProfilerOverlay(self.profiler).draw()
+
+        MockLabel.return_value.draw.assert_called_once_with()
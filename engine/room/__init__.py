@@ -1,5 +1,9 @@
-from .room_layer_collection import RoomLayerCollection
-from .room_layer import RoomLayer
-from .room import Room
+from engine.util.lazy_import import lazy_import
 
 __all__ = ['Room', 'RoomLayer', 'RoomLayerCollection']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'Room': '.room',
+    'RoomLayer': '.room_layer',
+    'RoomLayerCollection': '.room_layer_collection',
+})
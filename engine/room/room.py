@@ -1,3 +1,6 @@
+from engine.profiler import get_profiler
+
+
 class Room(object):
     """Collection of rendering layers and objects.
 
@@ -16,6 +19,7 @@ class Room(object):
         super(Room, self).__init__()
         self.layers = layers
 
+    @get_profiler().profile('room.update')
     def update(self, dt):
         """Updates all layers in the room.
 
@@ -24,6 +28,7 @@ class Room(object):
         """
         self.layers.update(dt)
 
+    @get_profiler().profile('room.draw')
     def draw(self):
         """Draws all layers in the room."""
         self.layers.draw()
@@ -0,0 +1,9 @@
+from engine.util.lazy_import import lazy_import
+
+__all__ = ['SaveGame', 'decode', 'encode']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'SaveGame': '.save_game',
+    'decode': '.binary_encoding',
+    'encode': '.binary_encoding',
+})
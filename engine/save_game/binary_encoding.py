@@ -0,0 +1,160 @@
+from engine.util.varint import (
+    read_varint, write_varint, zigzag_decode, zigzag_encode)
+import struct
+
+# Type tags preceding each encoded value
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_BYTES = 6
+_LIST = 7
+_DICT = 8
+
+_FLOAT_STRUCT = struct.Struct('<d')
+
+
+def encode(value):
+    """Encodes a value into a compact binary form.
+
+    Supported values are None, bools, ints, floats, strs, bytes, and lists,
+    tuples, and dicts of supported values. Each value is a one byte type tag
+    followed by its contents. Ints, lengths, and counts are varints, so small
+    numbers take a single byte. Tuples are decoded as lists.
+
+    Args:
+        value (object): The value to encode.
+
+    Returns:
+        The encoded bytes.
+
+    Raises:
+        TypeError: If the value or anything within it is not supported.
+    """
+    buffer = bytearray()
+    _encode_value(buffer, value)
+
+    return bytes(buffer)
+
+
+def decode(data):
+    """Decodes a value encoded by :fn:`encode`.
+
+    Args:
+        data (bytes-like): The encoded value.
+
+    Returns:
+        The decoded value.
+
+    Raises:
+        ValueError: If the data is not a single encoded value.
+    """
+    value, offset = _decode_value(data, 0)
+
+    if offset != len(data):
+        raise ValueError('Unexpected data after the encoded value')
+
+    return value
+
+
+def _encode_value(buffer, value):
+    """Appends the encoding of a value to a buffer."""
+    # Bools are ints, so they are checked first
+    if value is None:
+        buffer.append(_NONE)
+    elif value is True:
+        buffer.append(_TRUE)
+    elif value is False:
+        buffer.append(_FALSE)
+    elif isinstance(value, int):
+        buffer.append(_INT)
+        write_varint(buffer, zigzag_encode(value))
+    elif isinstance(value, float):
+        buffer.append(_FLOAT)
+        buffer += _FLOAT_STRUCT.pack(value)
+    elif isinstance(value, str):
+        _encode_bytes(buffer, _STR, value.encode('utf-8'))
+    elif isinstance(value, (bytes, bytearray)):
+        _encode_bytes(buffer, _BYTES, value)
+    elif isinstance(value, (list, tuple)):
+        buffer.append(_LIST)
+        write_varint(buffer, len(value))
+
+        for item in value:
+            _encode_value(buffer, item)
+    elif isinstance(value, dict):
+        buffer.append(_DICT)
+        write_varint(buffer, len(value))
+
+        for key, item in value.items():
+            _encode_value(buffer, key)
+            _encode_value(buffer, item)
+    else:
+        raise TypeError(
+            'Can not encode {0} values'.format(type(value).__name__))
+
+
+def _encode_bytes(buffer, tag, data):
+    """Appends a tag, a length, and bytes to a buffer."""
+    buffer.append(tag)
+    write_varint(buffer, len(data))
+    buffer += data
+
+
+def _decode_value(data, offset):
+    """Decodes the value at an offset, returning (value, next offset)."""
+    if offset >= len(data):
+        raise ValueError('Truncated value')
+
+    tag = data[offset]
+    offset += 1
+
+    if tag == _NONE:
+        return (None, offset)
+
+    if tag == _FALSE or tag == _TRUE:
+        return (tag == _TRUE, offset)
+
+    if tag == _INT:
+        value, offset = read_varint(data, offset)
+        return (zigzag_decode(value), offset)
+
+    if tag == _FLOAT:
+        if offset + _FLOAT_STRUCT.size > len(data):
+            raise ValueError('Truncated float')
+
+        return (_FLOAT_STRUCT.unpack_from(data, offset)[0],
+                offset + _FLOAT_STRUCT.size)
+
+    if tag == _STR or tag == _BYTES:
+        length, offset = read_varint(data, offset)
+        if offset + length > len(data):
+            raise ValueError('Truncated string')
+
+        value = bytes(data[offset:offset + length])
+        return (value.decode('utf-8') if tag == _STR else value,
+                offset + length)
+
+    if tag == _LIST:
+        count, offset = read_varint(data, offset)
+        items = []
+
+        for _ in range(count):
+            item, offset = _decode_value(data, offset)
+            items.append(item)
+
+        return (items, offset)
+
+    if tag == _DICT:
+        count, offset = read_varint(data, offset)
+        items = {}
+
+        for _ in range(count):
+            key, offset = _decode_value(data, offset)
+            items[key], offset = _decode_value(data, offset)
+
+        return (items, offset)
+
+    raise ValueError('Unknown type tag {0}'.format(tag))
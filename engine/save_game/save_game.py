@@ -0,0 +1,265 @@
+from .binary_encoding import decode, encode
+from engine.util.time_sliced_task import TimeSlicedTask
+from engine.util.varint import read_varint, write_varint
+from copy import deepcopy
+from hashlib import sha1
+import os
+
+SAVE_MAGIC = b'PFQSAVE\x00'
+SAVE_VERSION = 1
+HEADER_FILENAME = 'save.dat'
+
+
+class SaveGame(object):
+    """Game progress saved to a directory, one file per room.
+
+    Saves hold the player's state, the treasures they collected, and the
+    state of each room's objects. States are plain values, such as dicts of
+    ints and strs, which are encoded compactly in binary. See
+    :fn:`engine.save_game.encode` for the supported values.
+
+    Saving only rewrites rooms whose state changed since the last save. Each
+    save writes changed rooms to new files, then atomically replaces the
+    header file which lists the current file of every room. Files are flushed
+    to disk before they replace anything, so a save which is interrupted, even
+    by a crash or power loss, leaves the previous save intact.
+
+    Every file starts with the save format version. Saves from older
+    versions are upgraded as they are loaded, through migrations.
+
+    Attributes:
+        directory (str): Path to the directory the save is stored in.
+        player (dict): The player's state.
+        treasures (set of str): Identifiers of the collected treasures.
+        version (int): The save format version the game was saved with.
+    """
+
+    def __init__(self, directory):
+        """Creates an empty save which has not been written yet.
+
+        Args:
+            directory (str): Path to the directory to store the save in. It
+                is created when the game is first saved.
+        """
+        super(SaveGame, self).__init__()
+        self.directory = directory
+        self.player = {}
+        self.treasures = set()
+        self.version = SAVE_VERSION
+
+        # Loaded room states, and the file each saved room is stored in
+        self._rooms = {}
+        self._room_files = {}
+        self._dirty_rooms = set()
+
+        self._generation = 0
+        self._save_task = None
+        self._migrations = {}
+
+    @classmethod
+    def load(cls, directory, migrations=None):
+        """Loads a save from a directory.
+
+        Room states are read as they are first requested, rather than all at
+        once.
+
+        Args:
+            directory (str): Path to the directory the save is stored in.
+
+        Kwargs:
+            migrations (dict of int to fn, optional): Functions to upgrade
+                saved states from each older version to the next, by the
+                version they upgrade from. Each is called with a saved state
+                and the name of the room it belongs to, or None for the
+                header state, and returns the upgraded state. Defaults to no
+                migrations.
+
+        Returns:
+            The loaded :obj:`engine.save_game.SaveGame`.
+
+        Raises:
+            FileNotFoundError: If there is no save in the directory.
+            ValueError: If the save is corrupt, from a newer version, or from
+                an older version without migrations to upgrade it.
+        """
+        save_game = cls(directory)
+        save_game._migrations = migrations or {}
+
+        version, header = save_game._read_file(HEADER_FILENAME)
+        header = save_game._migrate(version, header)
+
+        save_game.version = version
+        save_game.player = header['player']
+        save_game.treasures = set(header['treasures'])
+        save_game._room_files = header['rooms']
+        save_game._generation = header['generation']
+
+        return save_game
+
+    def get_room_state(self, room):
+        """Returns the saved state of a room, or None if it was never saved.
+
+        Args:
+            room (str): The name of the room, such as its TMX file path.
+        """
+        if room not in self._rooms and room in self._room_files:
+            version, state = self._read_file(self._room_files[room])
+            self._rooms[room] = self._migrate(version, state, room)
+
+        return self._rooms.get(room)
+
+    def set_room_state(self, room, state):
+        """Sets the state of a room, to be written by the next save.
+
+        Args:
+            room (str): The name of the room, such as its TMX file path.
+            state (object): The state of the room's objects.
+        """
+        self._rooms[room] = state
+        self._dirty_rooms.add(room)
+
+    def save(self):
+        """Writes every change since the last save, finishing immediately."""
+        self.save_sliced().run()
+
+    def save_sliced(self):
+        """Starts a save which can be spread across several frames.
+
+        Each room is encoded and written in its own unit of work, so running
+        the returned task with a time budget each frame keeps saving within
+        the frame budget. The player, treasures, and changed rooms are copied
+        when the save starts, so the save is consistent even if they change
+        while it runs. Those changes are written by the next save. Starting a
+        save finishes any save which is still running first.
+
+        Returns:
+            A :obj:`engine.util.TimeSlicedTask` which writes the save.
+        """
+        if self._save_task is not None:
+            self._save_task.run()
+
+        # States may be changed in place, so the steps only see copies
+        rooms = [(room, deepcopy(self._rooms[room]))
+                 for room in sorted(self._dirty_rooms)]
+        player = deepcopy(self.player)
+        treasures = sorted(self.treasures)
+        self._dirty_rooms.clear()
+
+        self._save_task = TimeSlicedTask(
+            self._save_steps(rooms, player, treasures), total=len(rooms) + 2)
+        return self._save_task
+
+    def _save_steps(self, rooms, player, treasures):
+        """Writes changed rooms, then the header, yielding after each file."""
+        os.makedirs(self.directory, exist_ok=True)
+
+        generation = self._generation + 1
+        room_files = dict(self._room_files)
+        replaced_files = []
+
+        for room, state in rooms:
+            # New files never overwrite files of the current save
+            filename = '{0}.{1}.room'.format(
+                sha1(room.encode('utf-8')).hexdigest()[:16], generation)
+            self._write_file(filename, state)
+
+            if room in room_files:
+                replaced_files.append(room_files[room])
+
+            room_files[room] = filename
+            yield
+
+        # The new room files must be on disk before the header lists them
+        if rooms:
+            self._sync_directory()
+
+        # Replacing the header switches to the new room files atomically
+        self._write_file(HEADER_FILENAME, {
+            'generation': generation,
+            'player': player,
+            'treasures': treasures,
+            'rooms': room_files,
+        })
+        self._sync_directory()
+
+        self._generation = generation
+        self._room_files = room_files
+        self.version = SAVE_VERSION
+        yield
+
+        # Replaced files are only removed once the new header is on disk
+        for filename in replaced_files:
+            os.remove(os.path.join(self.directory, filename))
+
+        yield
+
+    def _write_file(self, filename, state):
+        """Atomically writes a state to a file in the save directory."""
+        path = os.path.join(self.directory, filename)
+        temporary_path = path + '.tmp'
+
+        data = bytearray(SAVE_MAGIC)
+        write_varint(data, SAVE_VERSION)
+        data += encode(state)
+
+        with open(temporary_path, 'wb') as save_file:
+            save_file.write(data)
+            save_file.flush()
+            os.fsync(save_file.fileno())
+
+        os.replace(temporary_path, path)
+
+    def _sync_directory(self):
+        """Flushes renames and new files in the save directory to disk."""
+        # Windows can't open directories, and flushes renames without this
+        if os.name == 'nt':
+            return
+
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def _read_file(self, filename):
+        """Reads a file in the save directory, returning (version, state)."""
+        with open(os.path.join(self.directory, filename), 'rb') as save_file:
+            data = save_file.read()
+
+        if data[:len(SAVE_MAGIC)] != SAVE_MAGIC:
+            raise ValueError('{0} is not a save file'.format(filename))
+
+        version, offset = read_varint(data, len(SAVE_MAGIC))
+
+        if version > SAVE_VERSION:
+            raise ValueError(
+                '{0} is from a newer version {1}'.format(filename, version))
+
+        return (version, decode(memoryview(data)[offset:]))
+
+    def _migrate(self, version, state, room=None):
+        """Upgrades a state from an older version to the current version.
+
+        Args:
+            version (int): The version the state was saved with.
+            state (object): The saved state.
+
+        Kwargs:
+            room (str, optional): The name of the room the state belongs to,
+                or None for the header state. Defaults to None.
+
+        Returns:
+            The upgraded state.
+
+        Raises:
+            ValueError: If a migration from a version is missing.
+        """
+        while version < SAVE_VERSION:
+            if version not in self._migrations:
+                raise ValueError(
+                    'No migration from save version {0}'.format(version))
+
+            state = self._migrations[version](state, room)
+            version += 1
+
+        return state
@@ -0,0 +1,52 @@
+from ..binary_encoding import decode, encode
+import unittest
+
+
+class TestBinaryEncoding(unittest.TestCase):
+    """Test compact binary encoding of save game values."""
+
+    def test_values_round_trip(self):
+        """Every supported value decodes to the value it was encoded from."""
+        value = {
+            'name': 'Pickle',
+            'position': [-120, 4096],
+            'health': 2.5,
+            'alive': True,
+            'key': None,
+            'flags': {1: False, 2: b'\x00\xff'},
+        }
+
+        self.assertEqual(value, decode(encode(value)))
+
+    def test_tuples_decode_as_lists(self):
+        """Tuples are encoded like lists."""
+        self.assertEqual([1, [2, 3]], decode(encode((1, (2, 3)))))
+
+    def test_small_ints_are_compact(self):
+        """Small ints take a tag byte and a single varint byte."""
+        self.assertEqual(2, len(encode(-64)))
+        self.assertEqual(2, len(encode(63)))
+        self.assertEqual(-2 ** 70, decode(encode(-2 ** 70)))
+
+    def test_unsupported_values_raise(self):
+        """Values without an encoding raise a TypeError."""
+        with self.assertRaises(TypeError):
+            encode({'treasures': {'gem'}})
+
+    def test_truncated_data_raises(self):
+        """Data which ends inside a value raises a ValueError."""
+        data = encode(['treasure', 1.5])
+
+        for length in range(len(data)):
+            with self.assertRaises(ValueError):
+                decode(data[:length])
+
+    def test_trailing_data_raises(self):
+        """Data after the encoded value raises a ValueError."""
+        with self.assertRaises(ValueError):
+            decode(encode(1) + b'\x00')
+
+    def test_unknown_tag_raises(self):
+        """Unknown type tags raise a ValueError."""
+        with self.assertRaises(ValueError):
+            decode(b'\xff')
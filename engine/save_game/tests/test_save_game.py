@@ -0,0 +1,219 @@
+from ..save_game import HEADER_FILENAME, SAVE_VERSION, SaveGame
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+import os
+import unittest
+
+
+class TestSaveGame(unittest.TestCase):
+    """Test saving and loading game progress."""
+
+    def setUp(self):
+        """Creates a temporary directory to save games in."""
+        self.temporary_directory = TemporaryDirectory()
+        self.directory = os.path.join(self.temporary_directory.name, 'save')
+
+    def tearDown(self):
+        """Removes the saved games."""
+        self.temporary_directory.cleanup()
+
+    def test_save_and_load(self):
+        """Saved progress and room states are loaded back."""
+        save_game = SaveGame(self.directory)
+        save_game.player = {'room': 'cave.tmx', 'x': 32, 'y': -8}
+        save_game.treasures = {'gem', 'crown'}
+        save_game.set_room_state('cave.tmx', {'boulder': [64, 128]})
+        save_game.set_room_state('forest.tmx', {'door': True})
+        save_game.save()
+
+        loaded = SaveGame.load(self.directory)
+
+        self.assertEqual({'room': 'cave.tmx', 'x': 32, 'y': -8},
+                         loaded.player)
+        self.assertEqual({'gem', 'crown'}, loaded.treasures)
+        self.assertEqual({'boulder': [64, 128]},
+                         loaded.get_room_state('cave.tmx'))
+        self.assertEqual({'door': True}, loaded.get_room_state('forest.tmx'))
+        self.assertIsNone(loaded.get_room_state('beach.tmx'))
+
+    def test_save_writes_changed_rooms(self):
+        """Only rooms changed since the last save are written again."""
+        save_game = SaveGame(self.directory)
+        save_game.set_room_state('cave.tmx', {'boulder': 1})
+        save_game.set_room_state('forest.tmx', {'door': False})
+        save_game.save()
+
+        save_game.set_room_state('forest.tmx', {'door': True})
+
+        with patch.object(SaveGame, '_write_file',
+                          autospec=True,
+                          side_effect=SaveGame._write_file) as write_file:
+            save_game.save()
+
+        written = [call[0][1] for call in write_file.call_args_list]
+        self.assertEqual(2, len(written))
+        self.assertTrue(written[0].endswith('.room'))
+        self.assertEqual(HEADER_FILENAME, written[1])
+
+        loaded = SaveGame.load(self.directory)
+        self.assertEqual({'boulder': 1}, loaded.get_room_state('cave.tmx'))
+        self.assertEqual({'door': True}, loaded.get_room_state('forest.tmx'))
+
+    def test_save_removes_replaced_room_files(self):
+        """Room files from earlier saves are removed once replaced."""
+        save_game = SaveGame(self.directory)
+
+        for opened in (False, True, False):
+            save_game.set_room_state('forest.tmx', {'door': opened})
+            save_game.save()
+
+        self.assertEqual(
+            [HEADER_FILENAME, save_game._room_files['forest.tmx']],
+            sorted(os.listdir(self.directory), key=lambda name: (
+                name != HEADER_FILENAME, name)))
+
+    def test_interrupted_save_keeps_previous_save(self):
+        """A save which does not finish leaves the previous save loadable."""
+        save_game = SaveGame(self.directory)
+        save_game.set_room_state('cave.tmx', {'boulder': 1})
+        save_game.save()
+
+        save_game.set_room_state('cave.tmx', {'boulder': 2})
+        save_game.set_room_state('forest.tmx', {'door': True})
+        task = save_game.save_sliced()
+
+        # Each step writes at most one file, so stop before the header
+        with patch('engine.util.time_sliced_task.perf_counter',
+                   side_effect=[0, 1]):
+            self.assertFalse(task.run(budget_ms=1))
+
+        loaded = SaveGame.load(self.directory)
+        self.assertEqual({'boulder': 1}, loaded.get_room_state('cave.tmx'))
+        self.assertIsNone(loaded.get_room_state('forest.tmx'))
+
+        self.assertTrue(task.run())
+        loaded = SaveGame.load(self.directory)
+        self.assertEqual({'boulder': 2}, loaded.get_room_state('cave.tmx'))
+        self.assertEqual({'door': True}, loaded.get_room_state('forest.tmx'))
+
+    def test_save_sliced_progress(self):
+        """Sliced saves have a unit of work per changed room."""
+        save_game = SaveGame(self.directory)
+        save_game.set_room_state('cave.tmx', {})
+        save_game.set_room_state('forest.tmx', {})
+
+        task = save_game.save_sliced()
+
+        self.assertEqual(4, task.total)
+        self.assertTrue(task.run())
+        self.assertEqual(4, task.completed)
+
+    def test_save_sliced_finishes_running_save(self):
+        """Starting a save finishes the save which is still running."""
+        save_game = SaveGame(self.directory)
+        save_game.set_room_state('cave.tmx', {'boulder': 1})
+        first_task = save_game.save_sliced()
+
+        save_game.set_room_state('forest.tmx', {'door': True})
+        save_game.save()
+
+        self.assertTrue(first_task.is_done())
+        loaded = SaveGame.load(self.directory)
+        self.assertEqual({'boulder': 1}, loaded.get_room_state('cave.tmx'))
+        self.assertEqual({'door': True}, loaded.get_room_state('forest.tmx'))
+
+    def test_save_sliced_copies_state_when_started(self):
+        """Changes made while a save runs are left to the next save."""
+        save_game = SaveGame(self.directory)
+        save_game.player = {'x': 1}
+        save_game.treasures = {'gem'}
+        save_game.set_room_state('cave.tmx', {'boulder': [1]})
+        task = save_game.save_sliced()
+
+        save_game.player['x'] = 2
+        save_game.treasures.add('crown')
+        save_game.get_room_state('cave.tmx')['boulder'].append(2)
+        task.run()
+
+        loaded = SaveGame.load(self.directory)
+        self.assertEqual({'x': 1}, loaded.player)
+        self.assertEqual({'gem'}, loaded.treasures)
+        self.assertEqual({'boulder': [1]}, loaded.get_room_state('cave.tmx'))
+
+    @unittest.skipIf(os.name == 'nt', 'Directories are not synced')
+    def test_save_syncs_before_replacing(self):
+        """Files and the directory are synced before old files go."""
+        save_game = SaveGame(self.directory)
+        save_game.set_room_state('cave.tmx', {'boulder': 1})
+        save_game.save()
+
+        save_game.set_room_state('cave.tmx', {'boulder': 2})
+        calls = []
+
+        with patch('os.fsync', side_effect=lambda fd: calls.append('fsync')), \
+                patch('os.replace', side_effect=lambda *args: calls.append(
+                    'replace') or os.rename(*args)), \
+                patch('os.remove', side_effect=lambda path: calls.append(
+                    'remove') or os.unlink(path)):
+            save_game.save()
+
+        # Room file, directory, header file, directory, then removal
+        self.assertEqual(
+            ['fsync', 'replace', 'fsync', 'fsync', 'replace', 'fsync',
+             'remove'], calls)
+
+    def test_load_missing_save(self):
+        """Loading a directory without a save raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            SaveGame.load(self.directory)
+
+    def test_load_rejects_other_files(self):
+        """Loading a file which is not a save raises ValueError."""
+        os.makedirs(self.directory)
+        with open(os.path.join(self.directory, HEADER_FILENAME), 'wb') as f:
+            f.write(b'not a save game')
+
+        with self.assertRaises(ValueError):
+            SaveGame.load(self.directory)
+
+    def test_load_rejects_newer_versions(self):
+        """Saves from a newer version raise ValueError."""
+        SaveGame(self.directory).save()
+
+        with patch('engine.save_game.save_game.SAVE_VERSION',
+                   SAVE_VERSION - 1):
+            with self.assertRaises(ValueError):
+                SaveGame.load(self.directory)
+
+    def test_load_migrates_older_versions(self):
+        """Saves from older versions are upgraded by migrations."""
+        with patch('engine.save_game.save_game.SAVE_VERSION',
+                   SAVE_VERSION - 1):
+            save_game = SaveGame(self.directory)
+            save_game.player = {'lives': 3}
+            save_game.set_room_state('cave.tmx', {'boulder': 1})
+            save_game.save()
+
+        def migrate(state, room):
+            if room is None:
+                state['player']['health'] = state['player'].pop('lives')
+                return state
+
+            return dict(state, room=room)
+
+        loaded = SaveGame.load(
+            self.directory, migrations={SAVE_VERSION - 1: migrate})
+
+        self.assertEqual(SAVE_VERSION - 1, loaded.version)
+        self.assertEqual({'health': 3}, loaded.player)
+        self.assertEqual({'boulder': 1, 'room': 'cave.tmx'},
+                         loaded.get_room_state('cave.tmx'))
+
+    def test_load_without_migration_raises(self):
+        """Saves from older versions without a migration raise ValueError."""
+        with patch('engine.save_game.save_game.SAVE_VERSION',
+                   SAVE_VERSION - 1):
+            SaveGame(self.directory).save()
+
+        with self.assertRaises(ValueError):
+            SaveGame.load(self.directory)
@@ -1,3 +1,8 @@
-from .tmx_loader import TmxLoader
+from engine.util.lazy_import import lazy_import
 
-__all__ = ['TmxLoader']
+__all__ = ['TmxLoader', 'TmxPreload']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'TmxLoader': '.tmx_loader',
+    'TmxPreload': '.tmx_preload',
+})
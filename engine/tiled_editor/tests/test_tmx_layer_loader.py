@@ -1,4 +1,4 @@
-from ..tmx_layer_loader import TmxLayerLoader
+from ..tmx_layer_loader import TmxLayerLoader, count_tmx_layer_steps
 from defusedxml import ElementTree
 from io import StringIO
 from unittest.mock import call, Mock, patch
@@ -49,6 +49,78 @@ class TestTmxLayer(unittest.TestCase):
         self.assertEqual('test', loader.name)
         self.assertEqual(MockLayer(), loader.layer)
 
+    @patch('engine.tiled_editor.tmx_layer_loader.load_tmx_tile_layer')
+    @patch('engine.tiled_editor.tmx_layer_loader.GraphicsObject')
+    @patch('engine.tiled_editor.tmx_layer_loader.RoomLayer')
+    def test_decoded_tiles_are_used_for_tile_layers(self, MockLayer,
+                                                    MockGraphics,
+                                                    mock_load_tile_layer):
+        """Already decoded tiles are not decoded again from the layer node."""
+        mock_xml = '<map width="6" height="3" tilewidth="2">\n'
+        mock_xml += '\t<layer name="test" width="6" height="3" />\n'
+        mock_xml += '</map>\n'
+        mock_map_node = ElementTree.parse(StringIO(mock_xml)).getroot()
+        mock_layer_node = mock_map_node.find('layer')
+
+        mock_tileset = {0: Mock()}
+
+        # Load the TMX layer with decoded tiles
+        TmxLayerLoader(
+            mock_layer_node, mock_map_node, mock_tileset, {}, None,
+            tiles=[(1, 2, 0)])
+
+        # Tile layer was not decoded again
+        mock_load_tile_layer.assert_not_called()
+
+        MockGraphics.assert_called_once_with(
+            mock_tileset[0], (2, 4), batch=MockLayer().batch)
+
+    @patch('engine.tiled_editor.tmx_layer_loader.GraphicsObject')
+    @patch('engine.tiled_editor.tmx_layer_loader.RoomLayer')
+    def test_incremental_layers_load_in_steps(self, MockLayer, MockGraphics):
+        """Incremental layers create one tile per step."""
+        mock_xml = '<map width="6" height="3" tilewidth="2">\n'
+        mock_xml += '\t<layer name="test" width="6" height="3" />\n'
+        mock_xml += '</map>\n'
+        mock_map_node = ElementTree.parse(StringIO(mock_xml)).getroot()
+        mock_layer_node = mock_map_node.find('layer')
+
+        mock_tileset = {0: Mock()}
+
+        loader = TmxLayerLoader(
+            mock_layer_node, mock_map_node, mock_tileset, {}, None,
+            tiles=[(1, 2, 0), (3, 4, 1), (5, 6, 0)], incremental=True)
+
+        # Nothing was created during construction
+        MockGraphics.assert_not_called()
+
+        # Tiles are created one step at a time, including missing tiles
+        next(loader.steps)
+        self.assertEqual(1, MockGraphics.call_count)
+        next(loader.steps)
+        self.assertEqual(1, MockGraphics.call_count)
+        next(loader.steps)
+        self.assertEqual(2, MockGraphics.call_count)
+
+        with self.assertRaises(StopIteration):
+            next(loader.steps)
+
+    def test_layer_steps_are_counted(self):
+        """Layer steps are counted from tiles and objects in the node."""
+        mock_xml = '<map>\n'
+        mock_xml += '\t<layer width="6" height="3" />\n'
+        mock_xml += '\t<objectgroup><object/><object/></objectgroup>\n'
+        mock_xml += '\t<imagelayer />\n'
+        mock_xml += '</map>\n'
+        mock_map_node = ElementTree.parse(StringIO(mock_xml)).getroot()
+
+        self.assertEqual(
+            18, count_tmx_layer_steps(mock_map_node.find('layer')))
+        self.assertEqual(
+            2, count_tmx_layer_steps(mock_map_node.find('objectgroup')))
+        self.assertEqual(
+            0, count_tmx_layer_steps(mock_map_node.find('imagelayer')))
+
     @patch('engine.tiled_editor.tmx_layer_loader.load_tmx_object_layer')
     @patch('engine.tiled_editor.tmx_layer_loader.GraphicsObject')
     @patch('engine.tiled_editor.tmx_layer_loader.RoomLayer')
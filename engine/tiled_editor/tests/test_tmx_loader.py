@@ -1,7 +1,8 @@
 from ..tmx_loader import TmxLoader
+from ..tmx_preload import TmxPreload
 from defusedxml import ElementTree
 from io import StringIO
-from unittest.mock import Mock, patch
+from unittest.mock import call, Mock, patch
 import unittest
 
 
@@ -52,7 +53,7 @@ class TestTmxLoader(unittest.TestCase):
         mock_xml = '<map version="1.2" orientation="orthogonal" infinite="0" '
         mock_xml += 'tilewidth="10" tileheight="10" width="1" height="2">\n'
         mock_xml += '\t<tileset/>\n'
-        mock_xml += '\t<layer/>\n'
+        mock_xml += '\t<layer width="1" height="2"/>\n'
         mock_xml += '</map>\n'
         mock_root_node = ElementTree.parse(StringIO(mock_xml)).getroot()
         mock_layer_node = mock_root_node.find('layer')
@@ -66,13 +67,14 @@ class TestTmxLoader(unittest.TestCase):
         # Layer loader creates a layer named 'test'
         MockLayerLoader.return_value.name = 'test'
         MockLayerLoader.return_value.layer = Mock()
+        MockLayerLoader.return_value.steps = []
 
         # Create a TMX loader with no object factory
         tmx_loader = TmxLoader('map.tmx', None)
 
         # Tileset node was loaded
         mock_load_tileset.assert_called_once_with(
-            'map.tmx', mock_root_node.find('tileset'))
+            'map.tmx', mock_root_node.find('tileset'), {}, [])
 
         # Tileset tile objects were loaded
         mock_load_tile_objects.assert_called_once_with(
@@ -84,7 +86,8 @@ class TestTmxLoader(unittest.TestCase):
             mock_root_node,
             {0: mock_image_0, 1: mock_image_1},
             {},
-            None)
+            None,
+            tiles=None, incremental=True)
 
         # Loaded layer was added to the collection
         self.assertEqual(
@@ -108,13 +111,15 @@ class TestTmxLoader(unittest.TestCase):
         # Layer loader creates a layer named 'test'
         MockLayerLoader.return_value.name = 'test'
         MockLayerLoader.return_value.layer = Mock()
+        MockLayerLoader.return_value.steps = []
 
         # Create a TMX loader with no object factory
         tmx_loader = TmxLoader('map.tmx', mock_factory)
 
         # Object layer node was loaded
         MockLayerLoader.assert_called_once_with(
-            mock_layer_node, mock_root_node, {}, {}, mock_factory)
+            mock_layer_node, mock_root_node, {}, {}, mock_factory,
+            tiles=None, incremental=True)
 
         # Loaded layer was added to the collection
         self.assertEqual(
@@ -152,7 +157,8 @@ class TestTmxLoader(unittest.TestCase):
         # Object layer node was loaded
         MockLayerLoader.assert_called_once_with(
             mock_layer_node, mock_root_node, {},
-            expected_tile_objects, mock_factory)
+            expected_tile_objects, mock_factory, tiles=None,
+            incremental=True)
 
     @patch('engine.tiled_editor.tmx_loader.load_tmx_tileset')
     @patch('engine.tiled_editor.tmx_loader.TmxLayerLoader')
@@ -164,7 +170,7 @@ class TestTmxLoader(unittest.TestCase):
         mock_xml = '<map version="1.2" orientation="orthogonal" infinite="0" '
         mock_xml += 'tilewidth="10" tileheight="10" width="1" height="2">\n'
         mock_xml += '\t<tileset/>\n'
-        mock_xml += '\t<layer/>\n'
+        mock_xml += '\t<layer width="1" height="2"/>\n'
         mock_xml += '</map>\n'
         mock_root_node = ElementTree.parse(StringIO(mock_xml)).getroot()
 
@@ -176,3 +182,173 @@ class TestTmxLoader(unittest.TestCase):
         # Layer collection has pixel dimensions of the map
         self.assertEqual(10, tmx_loader.layers.width)
         self.assertEqual(20, tmx_loader.layers.height)
+
+    @patch('engine.tiled_editor.tmx_loader.load_tmx_tileset')
+    @patch('engine.tiled_editor.tmx_loader.TmxLayerLoader')
+    @patch('engine.disk.DiskLoader')
+    def test_preloaded_maps_are_not_read_from_disk(self, MockDiskLoader,
+                                                   MockLayerLoader,
+                                                   mock_load_tileset):
+        """Preloaded map nodes, images, and tiles are used when given."""
+        mock_xml = '<map version="1.2" orientation="orthogonal" infinite="0" '
+        mock_xml += 'tilewidth="10" tileheight="10" width="1" height="2">\n'
+        mock_xml += '\t<tileset/>\n'
+        mock_xml += '\t<layer width="1" height="2"/>\n'
+        mock_xml += '</map>\n'
+        mock_root_node = ElementTree.parse(StringIO(mock_xml)).getroot()
+        mock_layer_node = mock_root_node.find('layer')
+
+        mock_images = {'tiles.png': Mock()}
+        mock_tiles = [(0, 0, 1)]
+        preload = TmxPreload(
+            'map.tmx', mock_root_node, mock_images,
+            {mock_layer_node: mock_tiles})
+
+        MockLayerLoader.return_value.name = 'test'
+        mock_load_tileset.return_value = []
+
+        TmxLoader('map.tmx', None, preload=preload)
+
+        # Nothing was read from disk
+        MockDiskLoader.load_xml.assert_not_called()
+
+        # Preloaded images were uploaded and used for the tileset
+        MockDiskLoader.pack_images.assert_called_once_with(mock_images)
+        mock_load_tileset.assert_called_once_with(
+            'map.tmx', mock_root_node.find('tileset'),
+            MockDiskLoader.pack_images.return_value, [])
+
+        # Preloaded tiles were used for the layer
+        MockLayerLoader.assert_called_once_with(
+            mock_layer_node, mock_root_node, {}, {}, None, tiles=mock_tiles,
+            incremental=True)
+
+    @patch('engine.tiled_editor.tmx_loader.load_tmx_tileset')
+    @patch('engine.tiled_editor.tmx_loader.TmxLayerLoader')
+    @patch('engine.disk.DiskLoader')
+    def test_release_gives_up_tileset_resources(self, MockDiskLoader,
+                                                MockLayerLoader,
+                                                mock_load_tileset):
+        """Releasing the map releases tileset grids and packed images."""
+        mock_xml = '<map version="1.2" orientation="orthogonal" infinite="0" '
+        mock_xml += 'tilewidth="10" tileheight="10" width="1" height="2">\n'
+        mock_xml += '\t<tileset/>\n'
+        mock_xml += '</map>\n'
+        mock_root_node = ElementTree.parse(StringIO(mock_xml)).getroot()
+        preload = TmxPreload('map.tmx', mock_root_node, {}, {})
+
+        mock_packed_image, mock_image_grid = Mock(), Mock()
+        MockDiskLoader.pack_images.return_value = {
+            'packed.png': mock_packed_image}
+
+        # The tileset image grid is loaded from disk
+        def load_tileset(tmx_path, tileset_node, images, resources):
+            resources.append(mock_image_grid)
+            return []
+
+        mock_load_tileset.side_effect = load_tileset
+
+        # The map node is released once loaded, but not the tilesets
+        tmx_loader = TmxLoader('map.tmx', None, preload=preload)
+        MockDiskLoader.release.assert_called_once_with(mock_root_node)
+        MockDiskLoader.release.reset_mock()
+
+        tmx_loader.release()
+        self.assertEqual(
+            [call(mock_image_grid), call(mock_packed_image)],
+            MockDiskLoader.release.call_args_list)
+
+        # Resources are only released once
+        tmx_loader.release()
+        self.assertEqual(2, MockDiskLoader.release.call_count)
+
+    @patch('engine.tiled_editor.tmx_loader.load_tmx_preload')
+    def test_preload_runs_on_worker_thread(self, mock_load_tmx_preload):
+        """Preloading returns a future for the preloaded map."""
+        future = TmxLoader.preload('map.tmx')
+
+        self.assertEqual(mock_load_tmx_preload.return_value, future.result())
+        mock_load_tmx_preload.assert_called_once_with('map.tmx')
+
+    @patch('engine.tiled_editor.tmx_loader.load_tmx_tileset')
+    @patch('engine.tiled_editor.tmx_loader.TmxLayerLoader')
+    @patch('engine.disk.DiskLoader')
+    def test_incremental_maps_load_in_steps(self, MockDiskLoader,
+                                            MockLayerLoader,
+                                            mock_load_tileset):
+        """Incremental maps are loaded one step at a time."""
+        mock_xml = '<map version="1.2" orientation="orthogonal" infinite="0" '
+        mock_xml += 'tilewidth="10" tileheight="10" width="1" height="2">\n'
+        mock_xml += '\t<tileset/>\n'
+        mock_xml += '\t<layer width="1" height="2"/>\n'
+        mock_xml += '\t<objectgroup><object/></objectgroup>\n'
+        mock_xml += '</map>\n'
+        mock_root_node = ElementTree.parse(StringIO(mock_xml)).getroot()
+
+        MockDiskLoader.load_xml.return_value = mock_root_node
+        mock_load_tileset.return_value = []
+
+        # Each layer takes one step per tile or object
+        MockLayerLoader.return_value.name = 'test'
+        MockLayerLoader.side_effect = [
+            Mock(steps=iter([None, None])), Mock(steps=iter([None]))]
+
+        tmx_loader = TmxLoader('map.tmx', None, incremental=True)
+
+        # Nothing was loaded during construction
+        mock_load_tileset.assert_not_called()
+        MockLayerLoader.assert_not_called()
+        self.assertFalse(tmx_loader.is_loaded())
+        self.assertEqual(0, tmx_loader.progress)
+
+        # Loading with no budget performs a single step
+        self.assertFalse(tmx_loader.load(budget_ms=0))
+        mock_load_tileset.assert_called_once()
+        self.assertEqual(0.25, tmx_loader.progress)
+
+        self.assertFalse(tmx_loader.load(budget_ms=0))
+        self.assertEqual(0.5, tmx_loader.progress)
+
+        # Loading without a budget finishes loading
+        self.assertTrue(tmx_loader.load())
+        self.assertTrue(tmx_loader.is_loaded())
+        self.assertEqual(1, tmx_loader.progress)
+        self.assertEqual(2, MockLayerLoader.call_count)
+
+    @patch('engine.tiled_editor.tmx_loader.load_tmx_tileset')
+    @patch('engine.tiled_editor.tmx_loader.TmxLayerLoader')
+    @patch('engine.disk.DiskLoader')
+    def test_streaming_maps_discard_loaded_nodes(self, MockDiskLoader,
+                                                 MockLayerLoader,
+                                                 mock_load_tileset):
+        """Streamed nodes are loaded in order and discarded afterwards."""
+        mock_xml = '<map version="1.2" orientation="orthogonal" infinite="0" '
+        mock_xml += 'tilewidth="10" tileheight="10" width="1" height="2">\n'
+        mock_xml += '\t<tileset/>\n'
+        mock_xml += '\t<layer name="a" width="1" height="2"/>\n'
+        mock_xml += '\t<objectgroup name="b"><object/></objectgroup>\n'
+        mock_xml += '</map>\n'
+        MockDiskLoader.iterparse_xml.return_value = ElementTree.iterparse(
+            StringIO(mock_xml), events=('start', 'end'))
+
+        mock_load_tileset.return_value = []
+
+        # Record the tags of the nodes given to the layer loader
+        loaded_nodes = []
+        MockLayerLoader.side_effect = lambda node, map_node, *args, **kwargs: \
+            loaded_nodes.append((node.tag, len(map_node))) or Mock(steps=[])
+
+        tmx_loader = TmxLoader('map.tmx', None, streaming=True)
+
+        # The map was parsed incrementally
+        MockDiskLoader.load_xml.assert_not_called()
+        MockDiskLoader.iterparse_xml.assert_called_once_with('map.tmx')
+
+        # Each layer was loaded after the previous nodes were discarded
+        # The small XML is parsed at once, so later siblings already exist
+        self.assertEqual([('layer', 2), ('objectgroup', 1)], loaded_nodes)
+        mock_load_tileset.assert_called_once()
+
+        self.assertTrue(tmx_loader.is_loaded())
+        self.assertEqual(10, tmx_loader.layers.width)
+        self.assertEqual(20, tmx_loader.layers.height)
@@ -0,0 +1,38 @@
+from ..tmx_preload import load_tmx_preload
+from defusedxml import ElementTree
+from io import StringIO
+from unittest.mock import patch
+import unittest
+
+
+class TestTmxPreload(unittest.TestCase):
+    """Test preloading TMX files."""
+
+    @patch('engine.disk.DiskLoader')
+    def test_map_images_and_tiles_are_decoded(self, MockDiskLoader):
+        """Map nodes, tileset images, and tile layers are decoded."""
+        mock_xml = '<map>\n'
+        mock_xml += '\t<tileset><image source="../tiles/a.png" /></tileset>\n'
+        mock_xml += '\t<tileset><image source="../tiles/a.png" /></tileset>\n'
+        mock_xml += '\t<layer width="2" height="1"><data>1,2</data></layer>\n'
+        mock_xml += '\t<objectgroup />\n'
+        mock_xml += '</map>\n'
+        mock_root_node = ElementTree.parse(StringIO(mock_xml)).getroot()
+        mock_layer_node = mock_root_node.find('layer')
+
+        MockDiskLoader.load_xml.return_value = mock_root_node
+
+        preload = load_tmx_preload('rooms/map.tmx')
+
+        self.assertEqual('rooms/map.tmx', preload.path)
+        self.assertEqual(mock_root_node, preload.map_node)
+
+        # Shared tileset images are only decoded once
+        MockDiskLoader.decode_image.assert_called_once_with('tiles/a.png')
+        self.assertEqual(
+            {'tiles/a.png': MockDiskLoader.decode_image.return_value},
+            preload.images)
+
+        # Only tile layers are decoded
+        self.assertEqual(
+            {mock_layer_node: [(0, 0, 1), (1, 0, 2)]}, preload.tiles)
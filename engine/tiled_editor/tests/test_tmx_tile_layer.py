@@ -1,7 +1,11 @@
 from ..tmx_tile_layer import load_tmx_tile_layer
+from base64 import b64encode
 from defusedxml import ElementTree
 from io import StringIO
+import gzip
+import struct
 import unittest
+import zlib
 
 
 class TestTmxTileLayer(unittest.TestCase):
@@ -27,3 +31,44 @@ class TestTmxTileLayer(unittest.TestCase):
         actual = list(load_tmx_tile_layer(tile_layer_node))
 
         self.assertEqual(expected, actual)
+
+    def create_base64_layer(self, compression=None, compress=bytes):
+        """Returns a 3x2 layer node with base64 tile data."""
+        data = compress(struct.pack('<6I', 1, 2, 3, 4, 5, 6))
+        compression_attribute = \
+            ' compression="{0}"'.format(compression) if compression else ''
+
+        mock_xml = '<layer width="3" height="2">'
+        mock_xml += '<data encoding="base64"{0}>\n{1}\n</data>'.format(
+            compression_attribute, b64encode(data).decode('ascii'))
+        mock_xml += '</layer>'
+
+        return ElementTree.parse(StringIO(mock_xml)).getroot()
+
+    def test_base64(self):
+        """Uncompressed base64 tile data is decoded."""
+        tiles = list(load_tmx_tile_layer(self.create_base64_layer()))
+
+        self.assertEqual([1, 2, 3, 4, 5, 6], [tile[2] for tile in tiles])
+        self.assertEqual((0, 1), tiles[0][:2])
+
+    def test_base64_zlib(self):
+        """Zlib compressed base64 tile data is decoded."""
+        layer = self.create_base64_layer('zlib', zlib.compress)
+
+        self.assertEqual([1, 2, 3, 4, 5, 6], [
+            tile[2] for tile in load_tmx_tile_layer(layer)])
+
+    def test_base64_gzip(self):
+        """Gzip compressed base64 tile data is decoded."""
+        layer = self.create_base64_layer('gzip', gzip.compress)
+
+        self.assertEqual([1, 2, 3, 4, 5, 6], [
+            tile[2] for tile in load_tmx_tile_layer(layer)])
+
+    def test_unsupported_compression_raises(self):
+        """Unsupported compression raises a NotImplementedError."""
+        layer = self.create_base64_layer('zstd')
+
+        with self.assertRaises(NotImplementedError):
+            list(load_tmx_tile_layer(layer))
@@ -1,7 +1,7 @@
 from ..tmx_tileset import load_tmx_tileset, load_tmx_tile_objects
 from defusedxml import ElementTree
 from io import StringIO
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 import unittest
 
 
@@ -24,6 +24,41 @@ class TestTmxTileset(unittest.TestCase):
         MockDiskLoader.load_image_grid.assert_called_once_with(
             'tiles/tiles.png', 4, 8)
 
+    @patch('engine.disk.DiskLoader')
+    def test_loaded_image_grids_are_listed(self, MockDiskLoader):
+        """Image grids loaded from disk are added to the resources list."""
+        mock_xml = '<tileset firstgid="1" name="a" tilecount="2" columns="2">'
+        mock_xml += '\n\t<image source="a.png" />'
+        mock_xml += '\n</tileset>'
+        tileset_node = ElementTree.parse(StringIO(mock_xml)).getroot()
+        resources = []
+
+        list(load_tmx_tileset('map.tmx', tileset_node, resources=resources))
+        list(load_tmx_tileset(
+            'map.tmx', tileset_node, {'a.png': Mock()}, resources=resources))
+
+        # Only the grid loaded from disk needs to be released
+        self.assertEqual(
+            [MockDiskLoader.load_image_grid.return_value], resources)
+
+    @patch('engine.disk.DiskLoader')
+    def test_decoded_images_are_not_loaded(self, MockDiskLoader):
+        """Tileset images which were already decoded are not loaded again."""
+        mock_xml = '<tileset firstgid="1" name="a" tilecount="32" columns="8">'
+        mock_xml += '\n\t<image source="../tiles/tiles.png" />'
+        mock_xml += '\n</tileset>'
+        tileset_node = ElementTree.parse(StringIO(mock_xml)).getroot()
+        mock_image = Mock()
+
+        # Load the tileset with a decoded image
+        list(load_tmx_tileset(
+            'rooms/map.tmx', tileset_node, {'tiles/tiles.png': mock_image}))
+
+        # Decoded image was used instead of loading from disk
+        MockDiskLoader.load_image_grid.assert_not_called()
+        MockDiskLoader.create_image_grid.assert_called_once_with(
+            mock_image, 4, 8)
+
     @patch('engine.disk.DiskLoader')
     def test_indexes_image_grid_correctly(self, MockDiskLoader):
         """Tilesets index into the image grid correctly."""
@@ -5,16 +5,37 @@ from engine.graphics import GraphicsBatch, GraphicsObject
 from engine.room import RoomLayer
 
 
+def count_tmx_layer_steps(layer_node):
+    """Returns the number of steps :obj:`TmxLayerLoader` takes for a layer.
+
+    Args:
+        layer_node (:obj:`xml.etree.Element`): TMX layer node.
+
+    Returns:
+        The int number of tiles or objects in the layer.
+    """
+    if layer_node.tag == 'layer':
+        return int(layer_node.attrib['width']) * int(
+            layer_node.attrib['height'])
+    elif layer_node.tag == 'objectgroup':
+        return len(layer_node.findall('object'))
+
+    return 0
+
+
 class TmxLayerLoader(object):
     """Creates a :obj:`engine.room.RoomLayer` from a TMX layer node.
 
     Attributes:
         layer (:obj:`engine.room.RoomLayer`): Layer created from the TMX node.
         name (str): Name of the layer from the TMX node.
+        steps (generator): Creates the layer's graphics and objects, yielding
+            after each tile or object. This is already exhausted unless the
+            layer is loaded incrementally.
     """
 
     def __init__(self, layer_node, map_node, tileset, tile_objects,
-                 object_factory):
+                 object_factory, tiles=None, incremental=False):
         """Loads a :obj:`engine.room.RoomLayer` from a TMX layer node.
 
         Supported TMX layer nodes are "layer" and "objectgroup".
@@ -28,6 +49,14 @@ class TmxLayerLoader(object):
                 Mapping of tileset indices to tile object types.
             object_factory (:obj:`engine.factory.GenericFactory`):
                 Factory to create objects from names in the TMX layer.
+
+        Kwargs:
+            tiles (list of tuple, optional): Decoded (x, y, tileset_index)
+                tuples for a tile layer, such as from a
+                :obj:`engine.tiled_editor.TmxPreload`. Decoded from the layer
+                node if not given. Defaults to None.
+            incremental (bool, optional): Defers creating graphics and objects
+                until :attr:`steps` is iterated. Defaults to False.
         """
         super(TmxLayerLoader, self).__init__()
 
@@ -38,6 +67,7 @@ class TmxLayerLoader(object):
         self._tileset = tileset
         self._tile_objects = tile_objects
         self._object_factory = object_factory
+        self._tiles = tiles
 
         # Get render order and dimensions of map
         map_attr = map_node.attrib
@@ -45,57 +75,70 @@ class TmxLayerLoader(object):
         self._map_width_px = (int(map_attr['width']) - 1) * self._tile_size
         self._map_height_px = (int(map_attr['height']) - 1) * self._tile_size
 
-        self._load()
+        self.steps = self._load()
+
+        if not incremental:
+            for _ in self.steps:
+                pass
 
     def _load(self):
-        """Loads the TMX map."""
+        """Loads the TMX layer, yielding after each tile or object."""
         if self._layer_node.tag == 'layer':
-            self._load_tile_layer()
+            yield from self._load_tile_layer()
         elif self._layer_node.tag == 'objectgroup':
-            self._load_object_layer()
+            yield from self._load_object_layer()
 
     def _load_tile_layer(self):
-        """Creates tile graphics and adds them to the layer."""
-        # Load the tiles from this layer
-        tiles = load_tmx_tile_layer(self._layer_node)
+        """Creates tile graphics and adds them to the layer.
+
+        Yields after each tile, including tiles not in the tileset.
+        """
+        # Load the tiles from this layer unless they were already decoded
+        tiles = self._tiles
+        if tiles is None:
+            tiles = load_tmx_tile_layer(self._layer_node)
 
-        # Filter out tiles not in the tileset
-        filtered_tiles = filter(
-            lambda tile_spec: tile_spec[-1] in self._tileset,
-            tiles)
+        for x, y, tileset_index in tiles:
+            # Skip tiles not in the tileset
+            if tileset_index in self._tileset:
+                self._create_graphic_on_layer(
+                    self._tileset[tileset_index],
+                    Point2d(x, y) * self._tile_size)
 
-        for tile_spec in filtered_tiles:
-            x, y, tileset_index = tile_spec
-            self._create_graphic_on_layer(
-                self._tileset[tileset_index], Point2d(x, y) * self._tile_size)
+            yield
 
     def _load_object_layer(self):
-        """Creates objects using the factory and adds them to the layer."""
+        """Creates objects using the factory and adds them to the layer.
+
+        Yields after each object, including objects not in the factory.
+        """
         # Load the objects from this layer
         objects = load_tmx_object_layer(
             self._map_width_px, self._map_height_px,
             self._layer_node, self._tile_objects)
 
-        # Filter out tiles not in the factory
-        filtered_objects = filter(
-            lambda obj: self._object_factory.can_create(obj['type']),
-            objects)
+        for obj in objects:
+            # Skip objects not in the factory
+            if self._object_factory.can_create(obj['type']):
+                self._create_object_on_layer(obj)
+
+            yield
 
-        # Create and add all supported objects to the layer
-        for obj in filtered_objects:
-            obj['name'] = obj['type']  # The factory expects a "name"
+    def _create_object_on_layer(self, obj):
+        """Creates an object using the factory and adds it to the layer."""
+        obj['name'] = obj['type']  # The factory expects a "name"
 
-            created_object = self._object_factory.create(
-                **obj, batch=self.layer.batch)
+        created_object = self._object_factory.create(
+            **obj, batch=self.layer.batch)
 
-            self.layer.add_object(created_object)
+        self.layer.add_object(created_object)
 
-            # Draw the tile for tile objects
-            if 'tile' in obj:  # Only tile objects have a "tile" property
-                graphic = self._create_graphic_on_layer(
-                    self._tileset[obj['tile']], Point2d(obj['x'], obj['y']))
+        # Draw the tile for tile objects
+        if 'tile' in obj:  # Only tile objects have a "tile" property
+            graphic = self._create_graphic_on_layer(
+                self._tileset[obj['tile']], Point2d(obj['x'], obj['y']))
 
-                created_object.attach(graphic, (0, 0))
+            created_object.attach(graphic, (0, 0))
 
     def _create_graphic_on_layer(self, texture, coordinates):
         """Creates a graphic and adds it to the layer before returning it."""
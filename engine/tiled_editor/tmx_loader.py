@@ -1,18 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
 from distutils.version import StrictVersion
-from .tmx_layer_loader import TmxLayerLoader
+from .tmx_layer_loader import TmxLayerLoader, count_tmx_layer_steps
+from .tmx_preload import load_tmx_preload
 from .tmx_tileset import load_tmx_tileset, load_tmx_tile_objects
 from engine import disk, room
+from engine.util.time_sliced_task import TimeSlicedTask
 
 
 class TmxLoader(object):
     """Loads a TMX file from disk into graphical objects and room layers.
 
+    Maps can be loaded incrementally to spread the creation of textures,
+    sprites, and objects across several frames. Loading runs as a pipeline of
+    generators, from parsed map nodes to tile specs to graphics and objects,
+    and :fn:`load` advances it within a time budget.
+
+        loader = TmxLoader('rooms/hall.tmx', factory, incremental=True)
+        ...
+        # Once per frame, behind a transition or loading screen
+        loader.load(budget_ms=4)
+        draw_progress_bar(loader.progress)
+
     Attributes:
         layers (:obj:`engine.room.RoomLayerCollection`):
-            Collection of layers from the map.
+            Collection of layers from the map. Layers are added as they begin
+            loading, and are partially populated until loading completes.
     """
 
-    def __init__(self, tmx_path, object_factory):
+    NODE_TAGS = ('tileset', 'layer', 'objectgroup')
+
+    PRELOAD_WORKERS = 2
+
+    _preload_executor = None
+
+    def __init__(self, tmx_path, object_factory, preload=None,
+                 incremental=False, streaming=False):
         """Loads a TMX file from disk to layers for a :obj:`engine.room.Room`.
 
         Args:
@@ -20,11 +42,42 @@ class TmxLoader(object):
                 :obj:`engine.disk.DiskLoader` resource path.
             object_factory (:obj:`engine.factory.GenericFactory`):
                 An factory to convert TMX object names into Python objects.
+
+        Kwargs:
+            preload (:obj:`engine.tiled_editor.TmxPreload`, optional):
+                Preloaded data for the TMX file, see :fn:`preload`. Only
+                textures and sprites will be created if given, without reading
+                from disk. Defaults to None.
+            incremental (bool, optional): Defers loading the map until
+                :fn:`load` is called. Defaults to False.
+            streaming (bool, optional): Parses the TMX file incrementally,
+                loading each tileset and layer as soon as it has been parsed
+                and discarding it afterwards. This limits peak memory for large
+                maps, but :attr:`progress` only accounts for the layers parsed
+                so far. Ignored if ``preload`` is given. Defaults to False.
         """
         super(TmxLoader, self).__init__()
 
+        self._images = {}
+        self._tiles = {}
+
+        # Tileset resources loaded from disk, released with the map
+        self._resources = []
+
         # Get the root map node from the TMX file
-        self._map_node = disk.DiskLoader.load_xml(tmx_path)
+        if preload is not None:
+            self._map_node = preload.map_node
+            self._tiles = preload.tiles
+
+            # Upload all tileset images at once to pack them tightly
+            self._images = disk.DiskLoader.pack_images(preload.images)
+        elif streaming:
+            # Only the opening map tag is parsed, its children are streamed
+            events = disk.DiskLoader.iterparse_xml(tmx_path)
+            event, self._map_node = next(events)
+        else:
+            self._map_node = disk.DiskLoader.load_xml(tmx_path)
+
         map_attr = self._map_node.attrib
 
         if StrictVersion(map_attr['version']) < StrictVersion('1.2'):
@@ -52,9 +105,135 @@ class TmxLoader(object):
         # Dict of tile object types to tileset index
         self._tile_objects = {}
 
-        # Parse each node in the TMX map
-        for node in self._map_node.iter():
-            self._parse_node(node)
+        # Parse each node in the TMX map, one tile or object at a time
+        if preload is None and streaming:
+            nodes = self._stream_nodes(events)
+            self._task = TimeSlicedTask(self._load(nodes))
+        else:
+            nodes = [node for node in self._map_node.iter()
+                     if node.tag in self.NODE_TAGS]
+            self._task = TimeSlicedTask(
+                self._load(nodes), total=self._count_steps(nodes))
+
+        if not incremental:
+            self.load()
+
+    def load(self, budget_ms=None):
+        """Continues loading the map until the time budget is spent.
+
+        Kwargs:
+            budget_ms (float, optional): Milliseconds to spend loading.
+                The map is loaded to completion if None. Defaults to None.
+
+        Returns:
+            True if the map has been loaded, False otherwise.
+        """
+        return self._task.run(budget_ms)
+
+    def is_loaded(self):
+        """Returns true if the map has been completely loaded."""
+        return self._task.is_done()
+
+    def release(self):
+        """Releases the map's tileset textures, such as when leaving a room.
+
+        The textures can then be evicted from the
+        :obj:`engine.disk.DiskLoader` cache, freeing their space in the
+        texture atlas. Graphics created from the map should be deleted first.
+        """
+        for resource in self._resources + list(self._images.values()):
+            disk.DiskLoader.release(resource)
+
+        self._resources = []
+        self._images = {}
+
+    @property
+    def progress(self):
+        """Returns the loaded fraction of the map as a float from 0 to 1."""
+        return self._task.progress
+
+    def _load(self, nodes):
+        """Parses each TMX node, yielding after each step.
+
+        Args:
+            nodes (iterable of :obj:`xml.etree.Element`): TMX nodes to parse.
+        """
+        for node in nodes:
+            yield from self._parse_node(node)
+
+        # The map can be evicted from the disk cache once it has been loaded
+        disk.DiskLoader.release(self._map_node)
+
+    def _stream_nodes(self, events):
+        """Yields TMX nodes as they are parsed, discarding them afterwards.
+
+        Args:
+            events (iterator of tuple): The remaining (event, node) tuples from
+                :fn:`engine.disk.DiskLoader.iterparse_xml` after the opening
+                map tag.
+
+        Yields:
+            Each completely parsed node with a tag in ``NODE_TAGS``.
+        """
+        parents = [self._map_node]
+
+        for event, node in events:
+            if event == 'start':
+                parents.append(node)
+                continue
+
+            parents.pop()
+
+            if node.tag in self.NODE_TAGS:
+                self._task.total += self._count_steps((node,))
+                yield node
+
+                # Free the node and its children once it has been loaded
+                parents[-1].remove(node)
+
+    def _count_steps(self, nodes):
+        """Returns the expected number of steps to parse the TMX nodes.
+
+        Args:
+            nodes (iterable of :obj:`xml.etree.Element`): TMX nodes to parse.
+        """
+        steps = 0
+
+        for node in nodes:
+            if node.tag == 'tileset':
+                steps += 1
+            else:
+                steps += count_tmx_layer_steps(node)
+
+        return steps
+
+    @classmethod
+    def preload(cls, tmx_path):
+        """Reads and decodes a TMX file on a worker thread.
+
+        File I/O, XML parsing, tile decoding, and image decoding happen in the
+        background. Pass the result to the constructor from the main thread
+        to create the textures and sprites for the map, such as when entering
+        a room which was preloaded from a neighboring room.
+
+            future = TmxLoader.preload('rooms/hall.tmx')
+            ...
+            loader = TmxLoader('rooms/hall.tmx', factory, future.result())
+
+        Args:
+            tmx_path (str): Path to the TMX file, relative to the
+                :obj:`engine.disk.DiskLoader` resource path.
+
+        Returns:
+            A :obj:`concurrent.futures.Future` resolving to a
+            :obj:`engine.tiled_editor.TmxPreload` for the TMX file.
+        """
+        if cls._preload_executor is None:
+            cls._preload_executor = ThreadPoolExecutor(
+                max_workers=cls.PRELOAD_WORKERS,
+                thread_name_prefix='tmx_preload')
+
+        return cls._preload_executor.submit(load_tmx_preload, tmx_path)
 
     def _parse_node(self, node):
         """Parses a node from a TMX file into the relevant object.
@@ -62,27 +241,34 @@ class TmxLoader(object):
         Tileset elements are parsed into a map of tileset indices to graphics.
         Layer indices are parsed into :obj:`engine.room.RoomLayer` objects.
 
+        Yields once for a tileset, and once per tile or object for a layer.
+
         Args:
             node (:obj:`xml.etree.Element`): The TMX file node to parse.
         """
         if node.tag == 'tileset':
             self._parse_tileset(node)
+            yield
         elif node.tag in ('layer', 'objectgroup'):
             # Load the layer
             layer_loader = TmxLayerLoader(
                 node, self._map_node, self._tileset, self._tile_objects,
-                self._object_factory)
+                self._object_factory, tiles=self._tiles.get(node),
+                incremental=True)
 
-            # Add the layer to the collection
+            # Add the layer to the collection, preserving the layer order
             self.layers.add_layer(layer_loader.name, layer_loader.layer)
 
+            yield from layer_loader.steps
+
     def _parse_tileset(self, node):
         """Parses a tileset into an index to image mapping in `self._tileset`.
 
         Args:
             node (:obj:`xml.etree.Element`): The tileset node to parse.
         """
-        for i, image in load_tmx_tileset(self._path, node):
+        for i, image in load_tmx_tileset(
+                self._path, node, self._images, self._resources):
             self._tileset[i] = image
 
         for tileset_index, tile_object_type in load_tmx_tile_objects(node):
@@ -0,0 +1,68 @@
+from .tmx_tile_layer import load_tmx_tile_layer
+from .tmx_tileset import get_tmx_tileset_image_path
+from engine import disk
+
+
+class TmxPreload(object):
+    """Disk and decoding results for a TMX file, ready for the main thread.
+
+    Nothing in a preload requires an OpenGL context, so it can be created on a
+    worker thread. Pass it to :obj:`engine.tiled_editor.TmxLoader` to create
+    the textures and sprites for the map on the main thread.
+
+    Attributes:
+        path (str): Path to the TMX file, relative to the
+            :obj:`engine.disk.DiskLoader` resource path.
+        map_node (:obj:`xml.etree.Element`): Root map node of the TMX file.
+        images (dict of str to :obj:`pyglet.image.ImageData`):
+            Decoded tileset images, by resource path.
+        tiles (dict of :obj:`xml.etree.Element` to list of tuple):
+            Decoded (x, y, tileset_index) tuples for each tile layer node.
+    """
+
+    def __init__(self, path, map_node, images, tiles):
+        """Creates a preload from already decoded TMX data.
+
+        Args:
+            path (str): Path to the TMX file, relative to the
+                :obj:`engine.disk.DiskLoader` resource path.
+            map_node (:obj:`xml.etree.Element`): Root map node of the TMX file.
+            images (dict of str to :obj:`pyglet.image.ImageData`):
+                Decoded tileset images, by resource path.
+            tiles (dict of :obj:`xml.etree.Element` to list of tuple):
+                Decoded (x, y, tileset_index) tuples for each tile layer node.
+        """
+        super(TmxPreload, self).__init__()
+        self.path = path
+        self.map_node = map_node
+        self.images = images
+        self.tiles = tiles
+
+
+def load_tmx_preload(tmx_path):
+    """Reads, parses, and decodes a TMX file and its tileset images.
+
+    This is safe to call from a worker thread.
+
+    Args:
+        tmx_path (str): Path to the TMX file, relative to the
+            :obj:`engine.disk.DiskLoader` resource path.
+
+    Returns:
+        A :obj:`TmxPreload` for the TMX file.
+    """
+    map_node = disk.DiskLoader.load_xml(tmx_path)
+    images = {}
+    tiles = {}
+
+    for node in map_node.iter():
+        if node.tag == 'tileset':
+            image_path = get_tmx_tileset_image_path(tmx_path, node)
+
+            # Tilesets can share an image, only decode it once
+            if image_path not in images:
+                images[image_path] = disk.DiskLoader.decode_image(image_path)
+        elif node.tag == 'layer':
+            tiles[node] = list(load_tmx_tile_layer(node))
+
+    return TmxPreload(tmx_path, map_node, images, tiles)
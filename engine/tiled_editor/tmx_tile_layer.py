@@ -1,15 +1,31 @@
+from base64 import b64decode
 from io import StringIO
 import csv
+import gzip
+import struct
+import zlib
+
+# Decompresses base64 tile data by the compression attribute of its node
+_DECOMPRESSORS = {
+    None: bytes,
+    'zlib': zlib.decompress,
+    'gzip': gzip.decompress,
+}
 
 
 def load_tmx_tile_layer(layer_node):
     """Yields a tuple of (x, y, tileset_index) for each tile in the layer.
 
+    Tile data may be encoded as CSV, or as base64 which is uncompressed or
+    compressed with zlib or gzip. Data without a base64 encoding is read as
+    CSV.
+
     Args:
         layer_node (:obj:`xml.etree.Element`): Layer node to load.
 
     Raises:
         ValueError if the render order is invalid.
+        NotImplementedError if the tile data compression is not supported.
 
     Yields:
         A tuple of (x, y, tileset_index), where x and y are in tile units
@@ -19,17 +35,7 @@ def load_tmx_tile_layer(layer_node):
     layer_width = int(layer_node.attrib['width'])
     layer_height = int(layer_node.attrib['height'])
 
-    # Get the tile map as a matrix of tileset indices with whitespace
-    raw_tile_map = layer_node.find('data').text
-
-    # Strip all whitespace from the tile map
-    raw_tile_map = ''.join(raw_tile_map.split())
-
-    # Read the tile map as a CSV
-    tile_map_reader = csv.reader(StringIO(raw_tile_map))
-
-    # Call `next` to get the first line of the CSV, convert all entries to int
-    tile_map = map(int, next(tile_map_reader))
+    tile_map = _decode_tile_data(layer_node.find('data'))
 
     for tile_map_index, tileset_index in enumerate(tile_map):
         # Calculate the position of this tile in the map
@@ -40,3 +46,30 @@ def load_tmx_tile_layer(layer_node):
         y = layer_height - 1 - y
 
         yield (x, y, tileset_index)
+
+
+def _decode_tile_data(data_node):
+    """Returns the tileset index of each tile from a layer's data node."""
+    encoding = data_node.attrib.get('encoding')
+
+    if encoding == 'base64':
+        compression = data_node.attrib.get('compression')
+        if compression not in _DECOMPRESSORS:
+            raise NotImplementedError(
+                'Unsupported tile data compression {0}'.format(compression))
+
+        # Tiles are little endian unsigned 32-bit ints
+        data = _DECOMPRESSORS[compression](b64decode(data_node.text))
+        return struct.unpack('<{0}I'.format(len(data) // 4), data)
+
+    # Get the tile map as a matrix of tileset indices with whitespace
+    raw_tile_map = data_node.text
+
+    # Strip all whitespace from the tile map
+    raw_tile_map = ''.join(raw_tile_map.split())
+
+    # Read the tile map as a CSV
+    tile_map_reader = csv.reader(StringIO(raw_tile_map))
+
+    # Call `next` to get the first line of the CSV, convert all entries to int
+    return map(int, next(tile_map_reader))
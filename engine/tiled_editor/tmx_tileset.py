@@ -3,7 +3,7 @@ from os.path import dirname, join, normpath
 from engine import disk
 
 
-def load_tmx_tileset(tmx_path, tileset_node):
+def load_tmx_tileset(tmx_path, tileset_node, images=None, resources=None):
     """Yields a tuple of (tileset_index, graphic) for each tile in a tileset.
 
     Args:
@@ -11,6 +11,15 @@ def load_tmx_tileset(tmx_path, tileset_node):
             :obj:`engine.disk.DiskLoader` resource path.
         tileset_node (:obj:`xml.etree.Element`): Tileset element to load.
 
+    Kwargs:
+        images (dict of str to :obj:`pyglet.image.ImageData`, optional):
+            Images which were already decoded, by resource path. Images not in
+            this dict are loaded from disk. Defaults to None.
+        resources (list, optional): List to append the resources loaded from
+            disk to, so they can be released with
+            :fn:`engine.disk.DiskLoader.release` once the tiles are no longer
+            used. Defaults to None.
+
     Raises:
         ValueError if the render order is invalid.
 
@@ -19,12 +28,7 @@ def load_tmx_tileset(tmx_path, tileset_node):
         an int and the graphic can be used to construct a
         :obj:`engine.graphics.GraphicsObject`.
     """
-    # Get the image node for this tileset
-    image_node = tileset_node.find('image')
-
-    # Get the image source relative to resources instead of rooms directory
-    tmx_dir = dirname(tmx_path)
-    image_path = normpath(join(tmx_dir, image_node.attrib['source']))
+    image_path = get_tmx_tileset_image_path(tmx_path, tileset_node)
 
     # Get the starting index for the tiles in the set
     first_index = int(tileset_node.attrib['firstgid'])
@@ -34,8 +38,15 @@ def load_tmx_tileset(tmx_path, tileset_node):
     columns = int(tileset_node.attrib['columns'])
     rows = tile_count // columns
 
-    # Load the image source into an image grid
-    image_grid = disk.DiskLoader.load_image_grid(image_path, rows, columns)
+    # Load the image source into an image grid, uploading decoded images
+    if images and image_path in images:
+        image_grid = disk.DiskLoader.create_image_grid(
+            images[image_path], rows, columns)
+    else:
+        image_grid = disk.DiskLoader.load_image_grid(image_path, rows, columns)
+
+        if resources is not None:
+            resources.append(image_grid)
 
     # Add each tile from this image source to the tile map
     for i in range(0, tile_count):
@@ -46,6 +57,25 @@ def load_tmx_tileset(tmx_path, tileset_node):
         yield (first_index + i, image_grid[grid_index])
 
 
+def get_tmx_tileset_image_path(tmx_path, tileset_node):
+    """Returns the resource path of a tileset's image.
+
+    Args:
+        tmx_path (str): Path to the TMX file, relative to the
+            :obj:`engine.disk.DiskLoader` resource path.
+        tileset_node (:obj:`xml.etree.Element`): Tileset element to use.
+
+    Returns:
+        The path to the tileset image, relative to the resource path.
+    """
+    # Get the image node for this tileset
+    image_node = tileset_node.find('image')
+
+    # Get the image source relative to resources instead of rooms directory
+    tmx_dir = dirname(tmx_path)
+    return normpath(join(tmx_dir, image_node.attrib['source']))
+
+
 def load_tmx_tile_objects(tileset_node):
     """Yields a tuple of (type, tileset_index) for tile objects in a tileset.
 
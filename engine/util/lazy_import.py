@@ -0,0 +1,48 @@
+from importlib import import_module
+
+
+def lazy_import(package, exports):
+    """Creates module level hooks which import a package's exports on use.
+
+    Assign the returned functions to ``__getattr__`` and ``__dir__`` in a
+    package's ``__init__`` to defer importing its modules, and whatever they
+    import, until one of its exports is first accessed. Imported exports are
+    stored on the package, so later accesses do not go through the hooks.
+
+    For example:
+
+        __getattr__, __dir__ = lazy_import(__name__, {
+            'Camera': '.camera',
+        })
+
+    Args:
+        package (str): The name of the package, usually ``__name__``.
+        exports (dict of str to str): Relative module name to import each
+            exported name from, by exported name. Modules named the same as
+            their export, such as subpackages, are imported themselves.
+
+    Returns:
+        A tuple of (__getattr__, __dir__) functions for the package.
+    """
+    def __getattr__(name):
+        """Imports and returns an export of the package."""
+        if name not in exports:
+            raise AttributeError(
+                'module {0!r} has no attribute {1!r}'.format(package, name))
+
+        module = import_module(exports[name], package)
+
+        # Subpackages are exported as themselves rather than as an attribute
+        if exports[name] == '.' + name:
+            value = module
+        else:
+            value = getattr(module, name)
+
+        setattr(import_module(package), name, value)
+        return value
+
+    def __dir__():
+        """Lists the package's attributes, including unimported exports."""
+        return sorted(set(vars(import_module(package))) | set(exports))
+
+    return (__getattr__, __dir__)
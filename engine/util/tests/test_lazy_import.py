@@ -0,0 +1,40 @@
+from ..lazy_import import lazy_import
+from engine.util.math import divide_toward_zero
+import engine.util
+import unittest
+
+
+class TestLazyImport(unittest.TestCase):
+    """Test deferring imports of package exports until they are used."""
+
+    def setUp(self):
+        """Provides each test with lazy hooks for the util package."""
+        self.getattr, self.dir = lazy_import('engine.util', {
+            'divide_toward_zero': '.math',
+            'tests': '.tests',
+        })
+
+        self.addCleanup(vars(engine.util).pop, 'divide_toward_zero', None)
+
+    def test_getattr_imports_export(self):
+        """Exports are imported from their module and stored on the package."""
+        self.assertEqual(
+            divide_toward_zero, self.getattr('divide_toward_zero'))
+        self.assertEqual(
+            divide_toward_zero, vars(engine.util)['divide_toward_zero'])
+
+    def test_getattr_imports_subpackage(self):
+        """Exports named after their module are the module itself."""
+        self.assertEqual(engine.util.tests, self.getattr('tests'))
+
+    def test_getattr_missing_export(self):
+        """Names which are not exported raise an attribute error."""
+        with self.assertRaises(AttributeError):
+            self.getattr('missing')
+
+    def test_dir_includes_exports(self):
+        """Exports are listed before they have been imported."""
+        names = self.dir()
+
+        self.assertIn('divide_toward_zero', names)
+        self.assertIn('math', names)
@@ -0,0 +1,59 @@
+from ..time_sliced_task import TimeSlicedTask
+from unittest.mock import patch
+import unittest
+
+
+class TestTimeSlicedTask(unittest.TestCase):
+    """Test running generators across multiple time slices."""
+
+    def test_runs_to_completion_without_budget(self):
+        """Tasks run to completion when no budget is given."""
+        task = TimeSlicedTask(iter(range(5)), total=5)
+
+        self.assertTrue(task.run())
+        self.assertTrue(task.is_done())
+        self.assertEqual(5, task.completed)
+        self.assertEqual(1.0, task.progress)
+
+    @patch('engine.util.time_sliced_task.perf_counter')
+    def test_stops_when_budget_is_spent(self, mock_perf_counter):
+        """Tasks stop once the time budget has been spent."""
+        # Each step takes 1ms
+        mock_perf_counter.side_effect = (x / 1000 for x in range(100))
+
+        task = TimeSlicedTask(iter(range(10)), total=10)
+
+        self.assertFalse(task.run(budget_ms=3))
+        self.assertFalse(task.is_done())
+        self.assertEqual(3, task.completed)
+        self.assertEqual(0.3, task.progress)
+
+        # Subsequent runs continue where the last left off
+        self.assertFalse(task.run(budget_ms=3))
+        self.assertEqual(6, task.completed)
+
+    @patch('engine.util.time_sliced_task.perf_counter')
+    def test_performs_at_least_one_step(self, mock_perf_counter):
+        """A unit of work is performed even if the budget is already spent."""
+        mock_perf_counter.side_effect = (x for x in range(100))
+
+        task = TimeSlicedTask(iter(range(10)), total=10)
+        task.run(budget_ms=0)
+
+        self.assertEqual(1, task.completed)
+
+    def test_progress_without_total(self):
+        """Progress is 0 until completion when there is no expected total."""
+        task = TimeSlicedTask(iter(range(2)))
+        self.assertEqual(0.0, task.progress)
+
+        task.run()
+        self.assertEqual(1.0, task.progress)
+
+    def test_progress_is_limited_to_one(self):
+        """Progress does not exceed 1 when the total is underestimated."""
+        task = TimeSlicedTask(iter(range(10)), total=1)
+        task.run(budget_ms=0)
+        task.run(budget_ms=0)
+
+        self.assertEqual(1.0, task.progress)
@@ -0,0 +1,49 @@
+from ..varint import read_varint, write_varint, zigzag_decode, zigzag_encode
+import unittest
+
+
+class TestVarint(unittest.TestCase):
+    """Test variable length encoding of integers."""
+
+    def test_small_values_take_one_byte(self):
+        """Values below 128 are encoded as a single byte."""
+        buffer = bytearray()
+        write_varint(buffer, 0)
+        write_varint(buffer, 127)
+
+        self.assertEqual(b'\x00\x7f', buffer)
+
+    def test_large_values_round_trip(self):
+        """Values of any size are read back from where they were written."""
+        values = [128, 300, 65361, 2 ** 40]
+        buffer = bytearray()
+
+        for value in values:
+            write_varint(buffer, value)
+
+        self.assertEqual(b'\x80\x01', buffer[:2])
+
+        offset = 0
+        for value in values:
+            decoded, offset = read_varint(buffer, offset)
+            self.assertEqual(value, decoded)
+
+        self.assertEqual(len(buffer), offset)
+
+    def test_negative_values_are_rejected(self):
+        """Negative values can't be written without zigzag encoding."""
+        with self.assertRaises(ValueError):
+            write_varint(bytearray(), -1)
+
+    def test_truncated_varint(self):
+        """Reading a varint past the end of the data raises an error."""
+        with self.assertRaises(ValueError):
+            read_varint(b'\x80', 0)
+
+    def test_zigzag(self):
+        """Signed values alternate between positive and negative encodings."""
+        self.assertEqual(
+            [0, 1, 2, 3, 4], [zigzag_encode(x) for x in (0, -1, 1, -2, 2)])
+
+        for value in (0, -1, 1, -1000, 1000, -2 ** 40):
+            self.assertEqual(value, zigzag_decode(zigzag_encode(value)))
@@ -0,0 +1,71 @@
+from time import perf_counter
+
+
+class TimeSlicedTask(object):
+    """Runs a generator a bounded amount at a time, such as once per frame.
+
+    Each value yielded by the generator counts as one unit of work. Running
+    the task with a time budget performs units of work until the budget is
+    spent, allowing long-running work to be spread across several frames.
+
+    Attributes:
+        completed (int): Number of units of work completed so far.
+        total (int): Expected number of units of work for the task.
+    """
+
+    def __init__(self, steps, total=0):
+        """Creates a task from a generator of work.
+
+        Args:
+            steps (generator): Generator yielding once per unit of work.
+
+        Kwargs:
+            total (int, optional): Expected number of units of work, used to
+                report progress. Defaults to 0.
+        """
+        super(TimeSlicedTask, self).__init__()
+        self.completed = 0
+        self.total = total
+
+        self._steps = steps
+        self._is_done = False
+
+    def run(self, budget_ms=None):
+        """Performs units of work until the time budget is spent.
+
+        At least one unit of work is always performed, so the task will finish
+        even if each unit takes longer than the budget.
+
+        Kwargs:
+            budget_ms (float, optional): Milliseconds to run the task for.
+                The task is run to completion if None. Defaults to None.
+
+        Returns:
+            True if the task has completed, False otherwise.
+        """
+        if budget_ms is not None:
+            deadline = perf_counter() + budget_ms / 1000
+
+        for _ in self._steps:
+            self.completed += 1
+
+            if budget_ms is not None and perf_counter() >= deadline:
+                return False
+
+        self._is_done = True
+        return True
+
+    def is_done(self):
+        """Returns true if all work for the task has completed."""
+        return self._is_done
+
+    @property
+    def progress(self):
+        """Returns the completed fraction of work as a float from 0 to 1."""
+        if self._is_done:
+            return 1.0
+
+        if not self.total:
+            return 0.0
+
+        return min(1.0, self.completed / self.total)
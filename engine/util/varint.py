@@ -0,0 +1,82 @@
+def write_varint(buffer, value):
+    """Appends a non-negative int to a buffer as a LEB128 varint.
+
+    Each byte holds 7 bits of the value, least significant first, with the
+    high bit set on every byte but the last. Small values take a single byte.
+
+    Args:
+        buffer (bytearray): The buffer to append to.
+        value (int): The non-negative value to encode.
+
+    Raises:
+        ValueError: If the value is negative.
+    """
+    if value < 0:
+        raise ValueError('Varints must not be negative, got {0}'.format(value))
+
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    """Reads a LEB128 varint written by :fn:`write_varint`.
+
+    Args:
+        data (bytes-like): The data to read from.
+        offset (int): The offset of the varint's first byte.
+
+    Returns:
+        A tuple of (value, offset), where offset is just past the varint.
+
+    Raises:
+        ValueError: If the data ends partway through the varint.
+    """
+    value = 0
+    shift = 0
+
+    while True:
+        if offset >= len(data):
+            raise ValueError('Truncated varint')
+
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+
+        if not byte & 0x80:
+            return (value, offset)
+
+        shift += 7
+
+
+def zigzag_encode(value):
+    """Maps a signed int to a non-negative int, keeping small values small.
+
+    For example:
+
+        zigzag_encode(0) == 0
+        zigzag_encode(-1) == 1
+        zigzag_encode(1) == 2
+        zigzag_encode(-2) == 3
+
+    Args:
+        value (int): The signed value.
+
+    Returns:
+        The non-negative int encoding of the value.
+    """
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def zigzag_decode(value):
+    """Maps an int encoded by :fn:`zigzag_encode` back to its signed value.
+
+    Args:
+        value (int): The non-negative encoded value.
+
+    Returns:
+        The signed int.
+    """
+    return value // 2 if not value & 1 else -(value + 1) // 2
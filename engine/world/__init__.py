@@ -1,4 +1,19 @@
-from .world_2d import World2d
-from .world_2d_debug import World2dDebug
+from engine.util.lazy_import import lazy_import
 
-__all__ = ['World2d', 'World2dDebug']
+__all__ = [
+    'World2d',
+    'World2dDebug',
+    'WorldProcess',
+    'WorldSnapshot',
+    'WorldStats',
+    'WorldStatsHistogram',
+]
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'World2d': '.world_2d',
+    'World2dDebug': '.world_2d_debug',
+    'WorldProcess': '.world_process',
+    'WorldSnapshot': '.world_snapshot',
+    'WorldStats': '.world_stats',
+    'WorldStatsHistogram': '.world_stats_histogram',
+})
@@ -1,4 +1,7 @@
 from ..world_2d import World2d
+from engine.game_object import GameObject, PhysicalGameObject
+from engine.game_object import ImmovableGameObject
+from engine.profiler import get_profiler
 from unittest.mock import call, Mock, patch
 import unittest
 
@@ -7,7 +10,7 @@ class TestWorld2d(unittest.TestCase):
     """Test functionality of the ``World2d`` class."""
 
     module = 'engine.world.world_2d'
-    resolve_physical_collision_fn = module+'.resolve_physical_collision'
+    resolve_physical_overlap_fn = module+'.resolve_physical_overlap'
 
     def test_adding_trigger_dispatches_event(self):
         """An on_trigger_add event is dispatched when a trigger is added."""
@@ -33,7 +36,7 @@ class TestWorld2d(unittest.TestCase):
 
     @patch('engine.world.world_2d.PositionalCollisionCache')
     @patch('engine.world.world_2d.CollisionCache')
-    @patch('engine.world.world_2d.detect_overlap_2d')
+    @patch('engine.world.world_2d.detect_overlap_1d')
     def test_update_start_fires_event(self, detect_mock, *args):
         """An on_update_enter event is dispatched when an update starts."""
         a = Mock(name='a', x=1, width=2, y=2, height=2)
@@ -53,15 +56,15 @@ class TestWorld2d(unittest.TestCase):
 
     @patch('engine.world.world_2d.PositionalCollisionCache')
     @patch('engine.world.world_2d.CollisionCache')
-    @patch('engine.world.world_2d.detect_overlap_2d')
+    @patch('engine.world.world_2d.detect_overlap_1d')
     def test_update_end_fires_event(self, detect_mock, *args):
         """An on_update_exit event is dispatched when an update ends."""
         a = Mock(name='a', x=1, width=2, y=2, height=2)
         b = Mock(name='b', x=1, width=2, y=2, height=2)
 
         # The listener will check that resolution was attempted
-        listener = Mock(
-            side_effect=lambda w: detect_mock.assert_called_once_with(a, b))
+        listener = Mock(side_effect=lambda w:
+                        detect_mock.assert_called_once_with(1, 2, 1, 2))
 
         world = World2d()
         world.add_trigger(a)
@@ -72,7 +75,7 @@ class TestWorld2d(unittest.TestCase):
 
         listener.assert_called_once_with(world)
 
-    @patch(resolve_physical_collision_fn)
+    @patch(resolve_physical_overlap_fn)
     @patch('engine.world.world_2d.PositionalCollisionCache')
     def test_3_nonoverlapping_colliders(self, CacheMock, resolve_mock):
         """Resolving 3 non-overlapping colliders performs no resolution."""
@@ -94,7 +97,7 @@ class TestWorld2d(unittest.TestCase):
         resolve_mock.assert_not_called()
         CacheMock().add_collision.assert_not_called()
 
-    @patch(resolve_physical_collision_fn)
+    @patch(resolve_physical_overlap_fn)
     @patch('engine.world.world_2d.PositionalCollisionCache')
     def test_3_stacked_overlapping_colliders(self, CacheMock, resolve_mock):
         """Resolving 3 stacked overlapping colliders resolves each pair."""
@@ -126,7 +129,7 @@ class TestWorld2d(unittest.TestCase):
             call(b, c, resolve_mock.return_value),
         ])
 
-    @patch(resolve_physical_collision_fn)
+    @patch(resolve_physical_overlap_fn)
     @patch('engine.world.world_2d.PositionalCollisionCache')
     def test_3_staggered_overlapping_colliders(self, CacheMock, resolve_mock):
         """Resolving staggered overlapping colliders resolves overlaps."""
@@ -159,7 +162,7 @@ class TestWorld2d(unittest.TestCase):
             call(b, c, resolve_mock.return_value),
         ])
 
-    @patch('engine.world.world_2d.detect_overlap_2d')
+    @patch('engine.world.world_2d.detect_overlap_1d')
     @patch('engine.world.world_2d.CollisionCache')
     def test_3_nonoverlapping_triggers(self, CacheMock, detect_mock):
         """Resolving 3 non-overlapping triggers performs no detection."""
@@ -181,7 +184,29 @@ class TestWorld2d(unittest.TestCase):
         detect_mock.assert_not_called()
         CacheMock().add_collision.assert_not_called()
 
-    @patch('engine.world.world_2d.detect_overlap_2d')
+    @patch('engine.world.world_2d.detect_overlap_1d')
+    @patch('engine.world.world_2d.CollisionCache')
+    def test_vertically_apart_triggers(self, CacheMock, detect_mock):
+        """Triggers apart on the y axis are pruned before detection."""
+        # 3|aa
+        # 2|..
+        # 1|bb
+        #   --
+        #   12
+        world = World2d()
+        a = Mock(name='a', x=1, width=2, y=3, height=1)
+        b = Mock(name='b', x=1, width=2, y=1, height=1)
+        world.add_trigger(a)
+        world.add_trigger(b)
+
+        world.update(1)
+
+        detect_mock.assert_not_called()
+        CacheMock().add_collision.assert_not_called()
+        self.assertEqual(1, world.stats.candidate_pairs)
+        self.assertEqual(0, world.stats.narrow_phase_calls)
+
+    @patch('engine.world.world_2d.detect_overlap_1d')
     @patch('engine.world.world_2d.CollisionCache')
     def test_3_stacked_overlapping_triggers(self, CacheMock, detect_mock):
         """Resolving 3 stacked overlapping triggers detects each pair."""
@@ -201,9 +226,9 @@ class TestWorld2d(unittest.TestCase):
 
         self.assertEqual(3, detect_mock.call_count)
         detect_mock.assert_has_calls([
-            call(a, b),
-            call(a, c),
-            call(b, c),
+            call(1, 2, 1, 2),
+            call(1, 2, 1, 2),
+            call(1, 2, 1, 2),
         ])
 
         self.assertEqual(3, CacheMock().add_collision.call_count)
@@ -213,7 +238,7 @@ class TestWorld2d(unittest.TestCase):
             call(b, c)
         ])
 
-    @patch('engine.world.world_2d.detect_overlap_2d')
+    @patch('engine.world.world_2d.detect_overlap_1d')
     @patch('engine.world.world_2d.CollisionCache')
     def test_3_staggered_overlapping_triggers(self, CacheMock, detect_mock):
         """Resolving staggered overlapping triggers detects overlaps."""
@@ -236,16 +261,16 @@ class TestWorld2d(unittest.TestCase):
 
         self.assertEqual(2, detect_mock.call_count)
         detect_mock.assert_has_calls([
-            call(a, b),
-            call(b, c),
+            call(1, 2, 2, 2),
+            call(2, 2, 3, 2),
         ])
 
         self.assertEqual(2, CacheMock().add_collision.call_count)
         CacheMock().add_collision.assert_has_calls([call(a, b), call(b, c)])
 
-    @patch(resolve_physical_collision_fn)
+    @patch(resolve_physical_overlap_fn)
     @patch('engine.world.world_2d.PositionalCollisionCache')
-    @patch('engine.world.world_2d.detect_overlap_2d')
+    @patch('engine.world.world_2d.detect_overlap_1d')
     @patch('engine.world.world_2d.CollisionCache')
     def test_collider_against_trigger_resolves_as_trigger(self, CacheMock,
                                                           detect_mock,
@@ -268,12 +293,12 @@ class TestWorld2d(unittest.TestCase):
         resolve_mock.assert_not_called()
         PositionalCacheMock().add_collision.assert_not_called()
 
-        detect_mock.assert_called_once_with(a, b)
+        detect_mock.assert_called_once_with(1, 2, 2, 2)
         CacheMock().add_collision.assert_called_once_with(a, b)
 
-    @patch(resolve_physical_collision_fn)
+    @patch(resolve_physical_overlap_fn)
     @patch('engine.world.world_2d.PositionalCollisionCache')
-    @patch('engine.world.world_2d.detect_overlap_2d')
+    @patch('engine.world.world_2d.detect_overlap_1d')
     @patch('engine.world.world_2d.CollisionCache')
     def test_trigger_against_collider_resolves_as_trigger(self, CacheMock,
                                                           detect_mock,
@@ -297,10 +322,10 @@ class TestWorld2d(unittest.TestCase):
         resolve_mock.assert_not_called()
         PositionalCacheMock().add_collision.assert_not_called()
 
-        detect_mock.assert_called_once_with(a, b)
+        detect_mock.assert_called_once_with(1, 2, 2, 2)
         CacheMock().add_collision.assert_called_once_with(a, b)
 
-    @patch(resolve_physical_collision_fn)
+    @patch(resolve_physical_overlap_fn)
     @patch('engine.world.world_2d.PositionalCollisionCache')
     def test_colliders_dispatch_event_on_enter(self, CacheMock, resolve_mock):
         """New collider collisions dispatch an event."""
@@ -317,7 +342,7 @@ class TestWorld2d(unittest.TestCase):
         a.dispatch_event.assert_called_once_with('on_collider_enter', b)
         b.dispatch_event.assert_called_once_with('on_collider_enter', a)
 
-    @patch(resolve_physical_collision_fn)
+    @patch(resolve_physical_overlap_fn)
     @patch('engine.world.world_2d.PositionalCollisionCache')
     def test_colliders_dispatch_event_on_exit(self, CacheMock, resolve_mock):
         """Removed collider collisions dispatch an event."""
@@ -334,7 +359,7 @@ class TestWorld2d(unittest.TestCase):
         a.dispatch_event.assert_called_once_with('on_collider_exit', b)
         b.dispatch_event.assert_called_once_with('on_collider_exit', a)
 
-    @patch('engine.world.world_2d.detect_overlap_2d')
+    @patch('engine.world.world_2d.detect_overlap_1d')
     @patch('engine.world.world_2d.CollisionCache')
     def test_triggers_dispatch_event_on_enter(self, CacheMock, detect_mock):
         """New trigger collisions dispatch an event."""
@@ -351,7 +376,7 @@ class TestWorld2d(unittest.TestCase):
         a.dispatch_event.assert_called_once_with('on_trigger_enter', b)
         b.dispatch_event.assert_called_once_with('on_trigger_enter', a)
 
-    @patch('engine.world.world_2d.detect_overlap_2d')
+    @patch('engine.world.world_2d.detect_overlap_1d')
     @patch('engine.world.world_2d.CollisionCache')
     def test_triggers_dispatch_event_on_exit(self, CacheMock, detect_mock):
         """Removed trigger collisions dispatch an event."""
@@ -367,3 +392,149 @@ class TestWorld2d(unittest.TestCase):
         world.update(1)
         a.dispatch_event.assert_called_once_with('on_trigger_exit', b)
         b.dispatch_event.assert_called_once_with('on_trigger_exit', a)
+
+    def create_falling_world(self):
+        """Returns a world with a box falling onto a floor and a trigger."""
+        world = World2d()
+        self.box = PhysicalGameObject(0, 20, 4, 4)
+        self.floor = ImmovableGameObject(-10, 0, 40, 4)
+        self.trigger = GameObject(0, 0, 8, 8)
+
+        world.add_collider(self.box)
+        world.add_collider(self.floor)
+        world.add_trigger(self.trigger)
+
+        return world
+
+    def step(self, world, updates):
+        """Updates the world and its objects, returning the box states."""
+        states = []
+
+        for _ in range(updates):
+            self.box.update(16)
+            world.update(16)
+            states.append((self.box.x, self.box.y,
+                           self.box.get_physics_state()))
+
+        return states
+
+    def test_snapshot_packs_object_state(self):
+        """Snapshots pack each object's position and physics."""
+        world = self.create_falling_world()
+        self.box.acceleration.set((2, 0))
+        self.step(world, 1)
+
+        snapshot = world.snapshot()
+
+        self.assertEqual(3, len(snapshot))
+        self.assertEqual(3 * 64, len(snapshot.data))
+        self.assertIsInstance(snapshot.data, bytes)
+
+    def test_restore_replays_identically(self):
+        """Simulating after a restore matches simulating after the snapshot."""
+        world = self.create_falling_world()
+        self.step(world, 5)
+
+        snapshot = world.snapshot()
+        expected = self.step(world, 30)
+
+        world.restore(snapshot)
+        self.assertEqual(expected, self.step(world, 30))
+
+    def test_restore_dispatches_same_collisions(self):
+        """Collision caches are restored, so events repeat identically."""
+        world = self.create_falling_world()
+        snapshot = world.snapshot()
+
+        listener = Mock()
+        self.box.add_listeners(
+            on_collider_enter=listener, on_trigger_enter=listener)
+        self.step(world, 30)
+        expected = listener.call_args_list
+
+        listener.reset_mock()
+        world.restore(snapshot)
+        self.step(world, 30)
+
+        self.assertTrue(expected)
+        self.assertEqual(expected, listener.call_args_list)
+
+    def test_restore_moves_attachments_and_removes_new_objects(self):
+        """Restored objects move their attachments and new objects leave."""
+        world = self.create_falling_world()
+        attachment = GameObject(0, 0, 1, 1)
+        self.box.attach(attachment, (1, 1))
+        snapshot = world.snapshot()
+
+        self.step(world, 10)
+        world.add_collider(PhysicalGameObject(100, 100, 4, 4))
+
+        world.restore(snapshot)
+
+        self.assertEqual((0, 20), (self.box.x, self.box.y))
+        self.assertEqual((1, 21), (attachment.x, attachment.y))
+        self.assertEqual(3, len(world.snapshot()))
+
+    def test_update_times_phases_in_profiler(self):
+        """Updates time each phase of the world in the engine's profiler."""
+        world = self.create_falling_world()
+        profiler = get_profiler()
+        profiler.reset()
+
+        with patch.object(profiler, 'enabled', True):
+            self.step(world, 30)
+            profiler.end_frame()
+
+        self.assertEqual(
+            ['world.broad_phase', 'world.collision_cache', 'world.dispatch',
+             'world.narrow_phase'],
+            profiler.get_span_names())
+        profiler.reset()
+
+    def test_update_records_narrow_phase_once(self):
+        """The narrow phase time of every pair is recorded together."""
+        world = self.create_falling_world()
+        world.add_collider(PhysicalGameObject(2, 2, 4, 4))
+        profiler = get_profiler()
+
+        with patch.object(profiler, 'enabled', True), \
+                patch.object(profiler, 'record') as mock_record:
+            world.update(16)
+
+        self.assertGreater(world.stats.narrow_phase_calls, 1)
+        self.assertEqual(
+            1, [args[0] for args, _ in mock_record.call_args_list]
+            .count('world.narrow_phase'))
+        profiler.reset()
+
+    def test_update_counts_stats(self):
+        """Updates count the pairs, overlaps, and events of the update."""
+        world = self.create_falling_world()
+        listener = Mock()
+        world.add_listeners(on_update_stats=listener)
+
+        # Only the trigger and floor overlap, while the box is still falling
+        # above both, so its pairs are pruned before the narrow phase
+        self.step(world, 1)
+        stats = world.stats
+
+        listener.assert_called_once_with(stats)
+        self.assertEqual(3, stats.objects_swept)
+        self.assertEqual(3, stats.candidate_pairs)
+        self.assertEqual(1, stats.narrow_phase_calls)
+        self.assertEqual(1, stats.overlaps)
+        self.assertEqual(0, stats.resolutions)
+        self.assertEqual(1, stats.trigger_enters)
+
+    def test_update_counts_resolutions(self):
+        """Collider overlaps which move an object count as resolutions."""
+        world = self.create_falling_world()
+        entered = []
+        world.add_listeners(on_update_stats=lambda stats: entered.append(
+            (stats.resolutions, stats.collider_enters)))
+
+        # Step until the box lands on the floor
+        self.step(world, 30)
+
+        self.assertIn((1, 1), entered)
+        self.assertEqual((0, 0), entered[0])
@@ -1,6 +1,7 @@
 from ..world_2d_debug import World2dDebug
 from ..world_object import WorldObject, COLLIDER, TRIGGER
-from unittest.mock import call, Mock, patch, ANY
+from engine.game_object import GameObject
+from unittest.mock import call, Mock, patch
 import unittest
 
 
@@ -14,154 +15,117 @@ class TestWorld2dDebug(unittest.TestCase):
         * ``self.trigger``: Object for a trigger.
         * ``self.world``: World with the collider and trigger, in that order.
         """
-        self.collider = Mock()
-        self.trigger = Mock()
+        self.collider = GameObject(0, 0, 8, 8)
+        self.trigger = GameObject(16, 0, 8, 8)
         self.world = Mock(_objects=[
             WorldObject(self.collider, COLLIDER),
             WorldObject(self.trigger, TRIGGER)])
 
-    @patch('engine.world.world_2d_debug.CrossBox')
-    @patch('engine.world.world_2d_debug.GraphicsBatch')
-    def test_existing_objects_create_shapes(self, MockBatch, MockBox):
-        """Existing objects in the world have debug shapes created for them."""
-        World2dDebug(self.world)
+    def get_listener(self, event):
+        """Returns the listener the debugger registered on the world."""
+        return [listener_call.kwargs[event] for listener_call
+                in self.world.add_listeners.mock_calls
+                if event in listener_call.kwargs][0]
 
-        MockBox.assert_has_calls([
-            call(self.collider, ANY, ANY),
-            call(self.trigger, ANY, ANY)])
-
-    @patch('engine.world.world_2d_debug.CrossBox')
-    @patch('engine.world.world_2d_debug.GraphicsBatch')
-    def test_existing_objects_use_color_for_type(self, MockBatch, MockBox):
-        """Existing objects use the given color for their type."""
+    @patch('engine.world.world_2d_debug.CrossBoxBuffer')
+    def test_buffers_use_color_for_type(self, MockBuffer):
+        """A buffer is created for each type with the given color."""
         World2dDebug(
             self.world, collider_color=(1, 2, 3), trigger_color=(4, 5, 6))
 
-        MockBox.assert_has_calls([
-            call(self.collider, (1, 2, 3), ANY),
-            call(self.trigger, (4, 5, 6), ANY)])
+        self.assertEqual((1, 2, 3), MockBuffer.call_args_list[0].args[0])
+        self.assertEqual((4, 5, 6), MockBuffer.call_args_list[1].args[0])
 
-    @patch('engine.world.world_2d_debug.CrossBox')
-    @patch('engine.world.world_2d_debug.GraphicsBatch')
-    def test_existing_objects_are_batched_by_type(self, MockBatch, MockBox):
-        """Existing objects are added to the graphics batch for their type."""
-        batch_1, batch_2 = Mock(), Mock()
-        MockBatch.side_effect = [batch_1, batch_2]
+    @patch('engine.world.world_2d_debug.CrossBoxBuffer')
+    def test_existing_objects_are_buffered_by_type(self, MockBuffer):
+        """Existing objects are added to the buffer for their type."""
+        collider_buffer, trigger_buffer = Mock(), Mock()
+        MockBuffer.side_effect = [collider_buffer, trigger_buffer]
 
         World2dDebug(self.world)
 
-        collider_batch = MockBox.mock_calls[0].args[2]
-        trigger_batch = MockBox.mock_calls[1].args[2]
-
-        self.assertNotEqual(trigger_batch, collider_batch)
-        self.assertIn(collider_batch, (batch_1, batch_2))
-        self.assertIn(trigger_batch, (batch_1, batch_2))
+        collider_buffer.add.assert_called_once_with(
+            self.collider, self.collider)
+        trigger_buffer.add.assert_called_once_with(
+            self.trigger, self.trigger)
 
-    @patch('engine.world.world_2d_debug.CrossBox')
-    @patch('engine.world.world_2d_debug.GraphicsBatch')
-    def test_new_triggers_added_to_trigger_batch(self, MockBatch, MockBox):
-        """New triggers are added to the trigger graphics batch."""
-        mock_trigger = Mock()
-        batch_1, batch_2 = Mock(), Mock()
-        MockBatch.side_effect = [batch_1, batch_2]
+    @patch('engine.world.world_2d_debug.CrossBoxBuffer')
+    def test_new_objects_are_buffered_by_type(self, MockBuffer):
+        """New objects are added to the buffer for their type."""
+        collider_buffer, trigger_buffer = Mock(), Mock()
+        MockBuffer.side_effect = [collider_buffer, trigger_buffer]
+        new_collider = GameObject(0, 0, 8, 8)
+        new_trigger = GameObject(0, 0, 8, 8)
 
         World2dDebug(self.world)
+        self.get_listener('on_collider_add')(new_collider)
+        self.get_listener('on_trigger_add')(new_trigger)
 
-        # Get the registered on_trigger_add listener
-        trigger_listener = list(filter(
-            lambda call: 'on_trigger_add' in call.kwargs,
-            self.world.add_listeners.mock_calls
-        ))[0].kwargs['on_trigger_add']
+        collider_buffer.add.assert_called_with(new_collider, new_collider)
+        trigger_buffer.add.assert_called_with(new_trigger, new_trigger)
 
-        # Call the listener that fires when on_trigger_add occurs
-        trigger_listener(mock_trigger)
+    @patch('engine.world.world_2d_debug.CrossBoxBuffer')
+    def test_only_moved_objects_are_updated(self, MockBuffer):
+        """Only objects which moved since the last draw are updated."""
+        collider_buffer, trigger_buffer = Mock(), Mock()
+        MockBuffer.side_effect = [collider_buffer, trigger_buffer]
 
-        trigger_batch = MockBox.mock_calls[1].args[2]
-
-        MockBox.assert_any_call(mock_trigger, ANY, trigger_batch)
+        world_debug = World2dDebug(self.world)
+        self.collider.set_position((4, 4))
+        self.collider.set_position((5, 5))
+        world_debug.draw()
 
-    @patch('engine.world.world_2d_debug.CrossBox')
-    @patch('engine.world.world_2d_debug.GraphicsBatch')
-    def test_new_colliders_added_to_collider_batch(self, MockBatch, MockBox):
-        """New colliders are added to the collider graphics batch."""
-        mock_collider = Mock()
-        batch_1, batch_2 = Mock(), Mock()
-        MockBatch.side_effect = [batch_1, batch_2]
+        collider_buffer.update.assert_called_once_with(
+            self.collider, self.collider)
+        trigger_buffer.update.assert_not_called()
 
-        World2dDebug(self.world)
+        # Nothing has moved since the previous draw
+        world_debug.draw()
 
-        # Get the registered on_collider_add listener
-        collider_listener = list(filter(
-            lambda call: 'on_collider_add' in call.kwargs,
-            self.world.add_listeners.mock_calls
-        ))[0].kwargs['on_collider_add']
+        collider_buffer.update.assert_called_once()
 
-        # Call the listener that fires when on_collider_add occurs
-        collider_listener(mock_collider)
+    @patch('engine.world.world_2d_debug.CrossBoxBuffer')
+    def test_draws_buffers_with_view(self, MockBuffer):
+        """Both buffers are drawn with the view to cull by."""
+        collider_buffer, trigger_buffer = Mock(), Mock()
+        MockBuffer.side_effect = [collider_buffer, trigger_buffer]
+        view = Mock()
 
-        collider_batch = MockBox.mock_calls[0].args[2]
+        world_debug = World2dDebug(self.world)
+        world_debug.draw(view)
 
-        MockBox.assert_any_call(mock_collider, ANY, collider_batch)
+        collider_buffer.draw.assert_called_once_with(view)
+        trigger_buffer.draw.assert_called_once_with(view)
 
-    @patch('engine.world.world_2d_debug.CrossBox')
     @patch('engine.world.world_2d_debug.GraphicsBatch')
-    def test_updates_objects_after_world_update(self, MockBatch, MockBox):
-        """The world debugger updates when the world has finished updating."""
-        mock_collider, mock_trigger = Mock(), Mock()
-
+    @patch('engine.world.world_2d_debug.CrossBoxBuffer')
+    def test_triggers_are_dashed(self, MockBuffer, MockBatch):
+        """Colliders are drawn with solid lines and triggers dashed."""
         World2dDebug(self.world)
 
-        trigger_listener = list(filter(
-            lambda call: 'on_trigger_add' in call.kwargs,
-            self.world.add_listeners.mock_calls
-        ))[0].kwargs['on_trigger_add']
-
-        collider_listener = list(filter(
-            lambda call: 'on_collider_add' in call.kwargs,
-            self.world.add_listeners.mock_calls
-        ))[0].kwargs['on_collider_add']
-
-        update_listener = list(filter(
-            lambda call: 'on_update_exit' in call.kwargs,
-            self.world.add_listeners.mock_calls
-        ))[0].kwargs['on_update_exit']
+        self.assertEqual(
+            [call((0, 255, 128)),
+             call((0, 255, 255), style=MockBatch.DASHED_LINES)],
+            MockBuffer.call_args_list)
 
-        trigger_listener(mock_trigger)
-        collider_listener(mock_collider)
+    @patch('engine.world.world_2d_debug.CrossBoxBuffer')
+    def test_stats_histogram(self, MockBuffer):
+        """World stats are added to the histogram, which draws on request."""
+        histogram = Mock()
 
-        # Call the listener that fires when on_update_exit occurs
-        update_listener(self.world)
+        world_debug = World2dDebug(self.world, stats_histogram=histogram)
+        self.get_listener('on_update_stats')('stats')
+        world_debug.draw_stats()
 
-        MockBox.return_value.set_position.assert_has_calls([
-            call(self.collider.coordinates),
-            call(mock_collider.coordinates),
-            call(self.trigger.coordinates),
-            call(mock_trigger.coordinates),
-        ], any_order=True)
-
-    @patch('engine.world.world_2d_debug.CrossBox')
-    @patch('engine.world.world_2d_debug.GraphicsBatch')
-    def test_collider_batch_is_drawn_normally(self, MockBatch, MockBox):
-        """The collider batch is drawn normally during a debug draw."""
-        batch_1, batch_2 = Mock(), Mock()
-        MockBatch.side_effect = [batch_1, batch_2]
+        histogram.add.assert_called_once_with('stats')
+        histogram.draw.assert_called_once_with()
 
+    @patch('engine.world.world_2d_debug.CrossBoxBuffer')
+    def test_draw_stats_without_histogram(self, MockBuffer):
+        """Drawing stats does nothing without a histogram."""
         world_debug = World2dDebug(self.world)
-        world_debug.draw()
-
-        collider_batch = MockBox.mock_calls[0].args[2]
-        collider_batch.draw.assert_called_once_with()
-
-    @patch('engine.world.world_2d_debug.CrossBox')
-    @patch('engine.world.world_2d_debug.GraphicsBatch')
-    def test_trigger_batch_is_drawn_with_dashed_line(self, MockBatch, MockBox):
-        """The trigger batch is drawn with dashed lines during a debug draw."""
-        batch_1, batch_2 = Mock(), Mock()
-        MockBatch.side_effect = [batch_1, batch_2]
-
-        world_debug = World2dDebug(self.world)
-        world_debug.draw()
+        world_debug.draw_stats()
 
-        trigger_batch = MockBox.mock_calls[1].args[2]
-        trigger_batch.draw_special.assert_called_once_with(
-            MockBatch.DASHED_LINES)
+        self.assertFalse(any(
+            'on_update_stats' in listener_call.kwargs
+            for listener_call in self.world.add_listeners.mock_calls))
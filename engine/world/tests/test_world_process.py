@@ -0,0 +1,162 @@
+from ..world_2d import World2d
+from ..world_process import WorldProcess
+from ..world_snapshot import OBJECT_STATE
+from engine.game_object import ImmovableGameObject, PhysicalGameObject
+from multiprocessing import shared_memory
+from time import perf_counter, sleep
+from unittest.mock import Mock, patch
+import unittest
+
+
+def build_falling_world():
+    """Builds a world with a box falling onto a floor, in the child."""
+    world = World2d()
+    world.add_collider(PhysicalGameObject(0, 40, 4, 4))
+    world.add_collider(ImmovableGameObject(-10, 0, 40, 4))
+
+    return world
+
+
+def build_broken_world():
+    """Fails to build a world, in the child."""
+    raise ValueError('broken world')
+
+
+def teleport_box(world, objects, coordinates):
+    """Moves the box to the coordinates of a message, in the child."""
+    objects[0].set_position(coordinates)
+
+
+def break_world(world, objects, message):
+    """Fails to handle a message, in the child."""
+    raise ValueError('broken message')
+
+
+class TestWorldProcess(unittest.TestCase):
+    """Test simulating a world in a child process with ``WorldProcess``."""
+
+    def setUp(self):
+        """Creates the main process' copies of the falling world's objects.
+
+        * ``self.box``: Copy of the falling box.
+        * ``self.floor``: Copy of the floor.
+        """
+        self.box = PhysicalGameObject(0, 40, 4, 4)
+        self.floor = ImmovableGameObject(-10, 0, 40, 4)
+
+    def start(self, **kwargs):
+        """Starts a world process for the falling world, stopped after."""
+        world_process = WorldProcess(build_falling_world, **kwargs)
+        world_process.start()
+        self.addCleanup(world_process.stop)
+
+        return world_process
+
+    def wait_for(self, world_process, condition, timeout=5):
+        """Applies published state until the condition holds."""
+        end = perf_counter() + timeout
+
+        while perf_counter() < end:
+            world_process.apply([self.box, self.floor])
+            if condition():
+                return
+
+            sleep(0.005)
+
+        self.fail('Timed out waiting for the world process')
+
+    def test_state_is_applied_to_objects(self):
+        """Objects in the main process move to the published state."""
+        world_process = self.start()
+
+        self.assertEqual(2, world_process.object_count)
+
+        # Velocity is applied as the box falls, until it lands on the floor
+        self.wait_for(world_process, lambda: self.box.velocity.y < 0)
+        self.wait_for(world_process, lambda: self.box.y == 4)
+
+        self.assertEqual((-10, 0), (self.floor.x, self.floor.y))
+        self.assertGreater(world_process.sequence, 0)
+
+    def test_apply_skips_state_already_applied(self):
+        """Applying again without a newer update changes nothing."""
+        world_process = self.start(update_rate=1)
+        self.wait_for(world_process, lambda: world_process.sequence)
+
+        self.assertFalse(world_process.apply([self.box, self.floor]))
+
+    def test_apply_only_touches_changed_objects(self):
+        """Objects whose published state is unchanged are not moved again."""
+        world_process = WorldProcess(build_falling_world)
+        first, second = Mock(), Mock()
+
+        states = [
+            (1, OBJECT_STATE.pack(1, 2, *[0] * 6) +
+             OBJECT_STATE.pack(3, 4, *[0] * 6)),
+            (2, OBJECT_STATE.pack(1, 2, *[0] * 6) +
+             OBJECT_STATE.pack(5, 6, *[0] * 6)),
+        ]
+
+        with patch.object(world_process, 'read', side_effect=states):
+            self.assertTrue(world_process.apply([first, second]))
+            self.assertTrue(world_process.apply([first, second]))
+
+        first.set_position.assert_called_once_with((1, 2))
+        self.assertEqual(2, second.set_position.call_count)
+        second.set_position.assert_called_with((5, 6))
+
+    def test_messages_are_sent_to_child(self):
+        """Messages are handled by the child's message function."""
+        world_process = self.start(on_message=teleport_box)
+
+        # Wait for the first update, so the world has sorted its objects
+        self.wait_for(world_process, lambda: world_process.sequence)
+        world_process.send((100, 100))
+
+        self.wait_for(world_process, lambda: self.box.x == 100)
+        self.assertEqual((-10, 0), (self.floor.x, self.floor.y))
+
+    def test_build_errors_raise(self):
+        """Errors building the world in the child are raised on start."""
+        world_process = WorldProcess(build_broken_world)
+
+        with self.assertRaises(RuntimeError) as context:
+            world_process.start()
+
+        self.assertIn('broken world', str(context.exception))
+
+    def test_simulation_errors_raise(self):
+        """Errors in the child's simulation are raised on apply."""
+        world_process = self.start(on_message=break_world)
+        world_process.send(None)
+
+        with self.assertRaises(RuntimeError) as context:
+            self.wait_for(world_process, lambda: False)
+
+        self.assertIn('broken message', str(context.exception))
+
+        # The error is raised again rather than applying stale state
+        with self.assertRaises(RuntimeError):
+            world_process.apply([self.box, self.floor])
+
+    def test_exited_child_raises(self):
+        """A child which exited without stopping is raised on read."""
+        world_process = self.start()
+        world_process._process.terminate()
+        world_process._process.join()
+
+        with self.assertRaises(RuntimeError) as context:
+            world_process.read()
+
+        self.assertIn('exited', str(context.exception))
+
+    def test_stop_releases_shared_memory(self):
+        """Stopping ends the child and unlinks the shared memory."""
+        world_process = self.start()
+        name = world_process._memory.name
+
+        world_process.stop()
+
+        self.assertFalse(world_process.is_alive())
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
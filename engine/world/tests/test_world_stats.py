@@ -0,0 +1,40 @@
+from ..world_stats import WorldStats
+import unittest
+
+
+class TestWorldStats(unittest.TestCase):
+    """Test the counters and ratios of the ``WorldStats`` class."""
+
+    def test_counters_default_to_zero(self):
+        """Counters which aren't given start at zero."""
+        stats = WorldStats(overlaps=3)
+
+        self.assertEqual(3, stats.overlaps)
+        self.assertEqual(0, stats.candidate_pairs)
+        self.assertEqual(
+            set(WorldStats.COUNTERS), set(stats.as_dict().keys()))
+
+    def test_unknown_counters_raise(self):
+        """Giving a counter which doesn't exist raises a TypeError."""
+        with self.assertRaises(TypeError):
+            WorldStats(overlap=3)
+
+    def test_pruning_ratio(self):
+        """The pruning ratio is the fraction of possible pairs kept."""
+        stats = WorldStats(objects_swept=5, candidate_pairs=4)
+
+        self.assertEqual(10, stats.possible_pairs)
+        self.assertAlmostEqual(0.4, stats.pruning_ratio)
+
+    def test_hit_ratio(self):
+        """The hit ratio is the fraction of candidate pairs overlapping."""
+        stats = WorldStats(candidate_pairs=4, overlaps=1)
+
+        self.assertAlmostEqual(0.25, stats.hit_ratio)
+
+    def test_ratios_without_pairs(self):
+        """Ratios are zero when there are no pairs to divide by."""
+        stats = WorldStats(objects_swept=1)
+
+        self.assertEqual(0, stats.pruning_ratio)
+        self.assertEqual(0, stats.hit_ratio)
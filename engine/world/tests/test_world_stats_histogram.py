@@ -0,0 +1,100 @@
+from ..world_stats import WorldStats
+from ..world_stats_histogram import WorldStatsHistogram
+from unittest.mock import patch
+from pyglet.gl import GL_LINES
+import unittest
+
+
+@patch('engine.world.world_stats_histogram.Label')
+class TestWorldStatsHistogram(unittest.TestCase):
+    """Test drawing recent world stats with ``WorldStatsHistogram``."""
+
+    def create_histogram(self, **kwargs):
+        """Returns a histogram of overlaps and resolutions at (0, 100)."""
+        return WorldStatsHistogram(
+            x=0, y=100, row_height=12,
+            counters=('overlaps', 'resolutions'), **kwargs)
+
+    def test_labels_for_each_counter_and_ratios(self, MockLabel):
+        """A label is created for each counter row and the ratios."""
+        self.create_histogram()
+
+        self.assertEqual(3, MockLabel.call_count)
+        self.assertEqual(
+            [100, 88, 76],
+            [label_call.kwargs['y'] for label_call in MockLabel.mock_calls
+             if label_call.kwargs])
+
+    def test_text_shows_latest_stats(self, MockLabel):
+        """The text lists the latest value of each counter, then ratios."""
+        histogram = self.create_histogram()
+        histogram.add(WorldStats(overlaps=1))
+        histogram.add(WorldStats(
+            objects_swept=5, candidate_pairs=4, overlaps=2, resolutions=1))
+
+        lines = histogram.get_text()
+
+        self.assertEqual(['overlaps', '2'], lines[0].split())
+        self.assertEqual(['resolutions', '1'], lines[1].split())
+        self.assertEqual('pruning 40.0%  hits 50.0%', lines[2])
+
+    def test_text_refreshes_after_updates(self, MockLabel):
+        """Labels are only laid out again after the refresh interval."""
+        histogram = self.create_histogram(refresh_updates=2)
+        label = MockLabel.return_value
+
+        # Every row shares the mock label, so it has the last row's text
+        histogram.add(WorldStats(overlaps=1))
+        self.assertTrue(label.text.startswith('pruning'))
+
+        label.text = None
+        histogram.add(WorldStats(overlaps=2))
+        self.assertIsNone(label.text)
+
+        histogram.add(WorldStats(overlaps=3))
+        self.assertIsNotNone(label.text)
+
+    def test_bars_scale_to_largest_value(self, MockLabel):
+        """Each row's bars are scaled to the largest value in the row."""
+        histogram = self.create_histogram()
+        histogram.add(WorldStats(overlaps=10))
+        histogram.add(WorldStats(overlaps=5))
+        histogram.add(WorldStats(overlaps=0))
+
+        # Bars start after the text and sit on the bottom of their row
+        self.assertEqual([
+            100, 88, 100, 98,
+            101, 88, 101, 93,
+        ], list(histogram.get_vertices()))
+
+    def test_history_is_limited(self, MockLabel):
+        """Only the most recent updates are kept."""
+        histogram = self.create_histogram(history=2)
+
+        for overlaps in (1, 2, 3):
+            histogram.add(WorldStats(overlaps=overlaps))
+
+        # Bars for 2 and 3 overlaps, scaled to 3
+        self.assertEqual([
+            100, 88, 100, 94,
+            101, 88, 101, 98,
+        ], list(histogram.get_vertices()))
+
+    @patch('engine.world.world_stats_histogram.pyglet.graphics.draw')
+    def test_draw(self, mock_draw, MockLabel):
+        """Drawing draws the bars as lines and every label."""
+        histogram = self.create_histogram()
+        histogram.add(WorldStats(overlaps=1, resolutions=1))
+
+        histogram.draw()
+
+        self.assertEqual(4, mock_draw.call_args.args[0])
+        self.assertEqual(GL_LINES, mock_draw.call_args.args[1])
+        self.assertEqual(3, MockLabel.return_value.draw.call_count)
+
+    @patch('engine.world.world_stats_histogram.pyglet.graphics.draw')
+    def test_draw_without_bars(self, mock_draw, MockLabel):
+        """No lines are drawn before any stats are added."""
+        self.create_histogram().draw()
+
+        mock_draw.assert_not_called()
@@ -1,8 +1,18 @@
 from engine.collision import CollisionCache, PositionalCollisionCache
-from engine.collision import resolve_physical_collision
+from engine.collision import resolve_physical_overlap
 from engine.event_dispatcher import EventDispatcher
-from engine.geometry import detect_overlap_2d
+from engine.geometry import detect_overlap_1d
+from engine.physics import Physics2d
+from engine.profiler import get_profiler
+from time import perf_counter
 from .world_object import WorldObject, COLLIDER, TRIGGER
+from .world_snapshot import OBJECT_STATE, WorldSnapshot
+from .world_stats import WorldStats
+
+# Physics state packed for objects without physics
+_NO_PHYSICS = (0,) * 6
+
+_profiler = get_profiler()
 
 
 class World2d(EventDispatcher):
@@ -17,9 +27,16 @@ class World2d(EventDispatcher):
         :mod:`collision` module. An on_collision event is dispatched to botch
         objects upon resolution.
 
+    Attributes:
+        stats (:obj:`engine.world.WorldStats`): Counts of the work done by
+            the most recent update, such as candidate pairs and overlaps.
+
     Events:
         on_update_enter: A world update has just begun.
             The world will be passed to the listeners.
+        on_update_stats: A world update has counted its work.
+            The :obj:`engine.world.WorldStats` will be passed to the
+            listeners.
         on_update_exit: A world update has just completed.
             The world will be passed to the listeners.
         on_collider_add: A collider was added to the world.
@@ -34,8 +51,13 @@ class World2d(EventDispatcher):
         self._colliders = PositionalCollisionCache()
         self._triggers = CollisionCache()
         self._objects = []
+        self.stats = WorldStats()
+
+        # Counts for the update in progress
+        self._stats = WorldStats()
 
         self.register_event_type('on_update_enter')
+        self.register_event_type('on_update_stats')
         self.register_event_type('on_update_exit')
         self.register_event_type('on_collider_add')
         self.register_event_type('on_trigger_add')
@@ -67,58 +89,152 @@ class World2d(EventDispatcher):
             ms (int): The time since last update, in milliseconds.
         """
         self.dispatch_event('on_update_enter', self)
-
-        # Sort objects by their x coordinate
-        self._objects.sort(key=lambda world_object: world_object.object.x)
-
-        sweep_list = []
-        for obj in self._objects:
-            # Run narrow phase on sweep entries, removing swept-past objects
-            sweep_list = [self._narrow_phase(x, obj) for x in sweep_list
-                          if not self._is_swept_past(x, obj)]
-            # Add the current object to the sweep list
-            sweep_list.append(obj)
+        stats = self._stats = WorldStats(objects_swept=len(self._objects))
+
+        # The narrow phase runs for each pair, so it is timed inline and
+        # recorded once, excluding it from the broad phase
+        timing = _profiler.enabled
+        narrow_phase_seconds = 0
+
+        with _profiler.span('world.broad_phase'):
+            # Sort objects by their x coordinate
+            self._objects.sort(key=lambda world_object: world_object.object.x)
+
+            sweep_list = []
+            candidate_pairs = 0
+            for obj in self._objects:
+                # Remove swept-past entries, running the narrow phase on the
+                # rest unless they're apart on the y axis
+                kept = []
+                for entry in sweep_list:
+                    if self._is_swept_past(entry, obj):
+                        continue
+
+                    kept.append(entry)
+                    if self._is_apart_vertically(entry, obj):
+                        continue
+
+                    if timing:
+                        start = perf_counter()
+                        self._narrow_phase(entry, obj)
+                        narrow_phase_seconds += perf_counter() - start
+                    else:
+                        self._narrow_phase(entry, obj)
+
+                sweep_list = kept
+                candidate_pairs += len(sweep_list)
+                # Add the current object to the sweep list
+                sweep_list.append(obj)
+
+            stats.candidate_pairs = candidate_pairs
+
+            if timing:
+                _profiler.record('world.narrow_phase', narrow_phase_seconds)
 
         # Update the colliders and triggers
-        self._colliders.update(ms)
-        self._triggers.update(ms)
+        with _profiler.span('world.collision_cache'):
+            self._colliders.update(ms)
+            self._triggers.update(ms)
 
         # Notify of objects entering and leaving collisions
-        self._dispatch(
-            'on_collider_enter', self._colliders.get_new_collisions())
-        self._dispatch(
-            'on_collider_exit', self._colliders.get_removed_collisions())
-        self._dispatch(
-            'on_trigger_enter', self._triggers.get_new_collisions())
-        self._dispatch(
-            'on_trigger_exit', self._triggers.get_removed_collisions())
-
+        with _profiler.span('world.dispatch'):
+            stats.collider_enters = self._dispatch(
+                'on_collider_enter', self._colliders.get_new_collisions())
+            stats.collider_exits = self._dispatch(
+                'on_collider_exit', self._colliders.get_removed_collisions())
+            stats.trigger_enters = self._dispatch(
+                'on_trigger_enter', self._triggers.get_new_collisions())
+            stats.trigger_exits = self._dispatch(
+                'on_trigger_exit', self._triggers.get_removed_collisions())
+
+        self.stats = stats
+        self.dispatch_event('on_update_stats', stats)
         self.dispatch_event('on_update_exit', self)
 
+    def snapshot(self):
+        """Saves the state of every object in the world.
+
+        The position of each object is saved, as well as the velocity,
+        acceleration, and high resolution velocity of objects with physics.
+        The contents of the collision caches are saved too, so restoring the
+        snapshot dispatches the same collision events as the original.
+
+        Event listeners, sprites, and anything else attached to the objects
+        are not saved. Positions and physics must be ints.
+
+        Returns:
+            A :obj:`engine.world.WorldSnapshot` of the world's state.
+        """
+        objects = tuple(self._objects)
+        data = bytearray(len(objects) * OBJECT_STATE.size)
+        pack_into = OBJECT_STATE.pack_into
+
+        for index, world_object in enumerate(objects):
+            obj = world_object.object
+            physics = obj.get_physics_state() \
+                if isinstance(obj, Physics2d) else _NO_PHYSICS
+
+            pack_into(data, index * OBJECT_STATE.size, obj.x, obj.y, *physics)
+
+        return WorldSnapshot(objects, bytes(data), self._colliders.get_state(),
+                             self._triggers.get_state())
+
+    def restore(self, snapshot):
+        """Restores the state of every object from a snapshot.
+
+        Objects added since the snapshot are removed from the world. Objects
+        move to their saved positions through ``set_position``, so objects
+        attached to them move as well.
+
+        Args:
+            snapshot (:obj:`engine.world.WorldSnapshot`): The snapshot to
+                restore, from :fn:`snapshot` on this world.
+        """
+        self._objects = list(snapshot.objects)
+        unpack_from = OBJECT_STATE.unpack_from
+
+        for index, world_object in enumerate(snapshot.objects):
+            obj = world_object.object
+            state = unpack_from(snapshot.data, index * OBJECT_STATE.size)
+
+            obj.set_position(state[:2])
+            if isinstance(obj, Physics2d):
+                obj.set_physics_state(state[2:])
+
+        self._colliders.set_state(snapshot.colliders)
+        self._triggers.set_state(snapshot.triggers)
+
     def _narrow_phase(self, first, second):
         """Detects and processes a collision between two game objects.
 
-        If both objects are colliders, the lighter object will be moved.
+        The broad phase only calls this for objects which overlap on the y
+        axis. If both objects are colliders, the lighter object will be moved.
 
         Args:
             first (:obj:`world_object.WorldObject`):
                 The first potential collision object.
             second (:obj:`world_object.WorldObject`):
                 The second potential collision object.
-
-        Returns:
-            The first object passed into the narrow phase.
         """
+        self._stats.narrow_phase_calls += 1
+        first_object, second_object = first.object, second.object
+
+        # Resolving earlier pairs may have moved objects out of their sorted
+        # order, so the sweep alone doesn't guarantee overlap on the x axis
+        if not detect_overlap_1d(first_object.x, first_object.width,
+                                 second_object.x, second_object.width):
+            return
+
+        self._stats.overlaps += 1
+
         # Process as a collider collision if neither object is a trigger
         if TRIGGER not in (first.type, second.type):
-            self._resolve_colliders(first.object, second.object)
+            self._resolve_colliders(first_object, second_object)
         else:
-            self._resolve_triggers(first.object, second.object)
-
-        return first
+            self._triggers.add_collision(first_object, second_object)
 
     def _resolve_colliders(self, first, second):
-        """Resolves a collision between colliders.
+        """Resolves a collision between overlapping colliders.
 
         Args:
             first (:obj:`game_object.GameObject`):
@@ -126,20 +242,13 @@ class World2d(EventDispatcher):
             second (:obj:`game_object.GameObject`):
                 The second collider in the collision.
         """
-        velocity_delta = resolve_physical_collision(first, second)
-        self._colliders.add_collision(first, second, velocity_delta)
+        positions = (first.x, first.y, second.x, second.y)
 
-    def _resolve_triggers(self, first, second):
-        """Resolves a collision between one trigger and any other object.
+        velocity_delta = resolve_physical_overlap(first, second)
+        self._colliders.add_collision(first, second, velocity_delta)
 
-        Args:
-            first (:obj:`game_object.GameObject`):
-                The first trigger or collider in the collision.
-            second (:obj:`game_object.GameObject`):
-                The second trigger or collider in the collision.
-        """
-        if detect_overlap_2d(first, second):
-            self._triggers.add_collision(first, second)
+        if positions != (first.x, first.y, second.x, second.y):
+            self._stats.resolutions += 1
 
     def _dispatch(self, event, collisions):
         """Dispatches a collision event to all collisions.
@@ -148,11 +257,16 @@ class World2d(EventDispatcher):
             event (str): Name of the event to fire.
             collisions (list of tuple of :obj:`game_object.GameObject`):
                 A list with pairs of objects which have collided.
+
+        Returns:
+            The number of pairs the event was dispatched to.
         """
         for first, second in collisions:
             first.dispatch_event(event, second)
             second.dispatch_event(event, first)
 
+        return len(collisions)
+
     def _is_swept_past(self, old_entry, new_entry):
         """Determines if the new entry has swept past the prior entry.
 
@@ -167,3 +281,19 @@ class World2d(EventDispatcher):
         """
         prior_endpoint = old_entry.object.x + old_entry.object.width
         return prior_endpoint <= new_entry.object.x
+
+    def _is_apart_vertically(self, old_entry, new_entry):
+        """Determines if two entries in the sweep list are apart on the y axis.
+
+        Args:
+            old_entry (:obj:`world_object.WorldObject`):
+                The prior entry in the sweep list.
+            new_entry (:obj:`world_object.WorldObject`):
+                The new entry into the sweep list.
+
+        Returns:
+            True if the entries don't overlap on the y axis, false otherwise.
+        """
+        old_object, new_object = old_entry.object, new_entry.object
+        return old_object.y + old_object.height <= new_object.y or \
+            new_object.y + new_object.height <= old_object.y
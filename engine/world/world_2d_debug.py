@@ -1,12 +1,24 @@
-from engine.graphics import CrossBox, GraphicsBatch
+from engine.graphics import CrossBoxBuffer, GraphicsBatch
 from .world_object import TRIGGER
 
 
 class World2dDebug(object):
-    """Debug properties for a :obj:`world_2d.World2d` instance."""
+    """Debug properties for a :obj:`world_2d.World2d` instance.
+
+    Colliders and triggers are each drawn from a single shared buffer. Only
+    the shapes of objects which moved since the last draw are updated, and
+    shapes outside the view being drawn are culled.
+
+    The world's :obj:`engine.world.WorldStats` can also be drawn as a
+    histogram of recent updates.
+
+    Attributes:
+        stats_histogram (:obj:`engine.world.WorldStatsHistogram` or None):
+            Histogram the stats of each world update are added to.
+    """
 
     def __init__(self, world, collider_color=(0, 255, 128),
-                 trigger_color=(0, 255, 255)):
+                 trigger_color=(0, 255, 255), stats_histogram=None):
         """Creates a new visual debugger for a :obj:`world_2d.World2d`.
 
         Args:
@@ -18,15 +30,19 @@ class World2dDebug(object):
                 RGB color tuple to draw colliders with. Default is green.
             trigger_color (tuple of 3 int):
                 RGB color tuple to draw triggers with. Default is cyan.
+            stats_histogram (:obj:`engine.world.WorldStatsHistogram`):
+                Histogram to add the stats of each world update to. Default
+                is None, for no histogram.
         """
         super(World2dDebug, self).__init__()
-        self._collider_batch = GraphicsBatch()
-        self._collider_color = collider_color
+        self._collider_buffer = CrossBoxBuffer(collider_color)
+        self._trigger_buffer = CrossBoxBuffer(
+            trigger_color, style=GraphicsBatch.DASHED_LINES)
 
-        self._trigger_batch = GraphicsBatch()
-        self._trigger_color = trigger_color
+        self.stats_histogram = stats_histogram
 
-        self._debug_objects = {}
+        # Objects which have moved since the last draw, by their buffer
+        self._moved = {}
 
         # Create debug shapes for all objects in the world
         for obj in world._objects:
@@ -35,31 +51,55 @@ class World2dDebug(object):
             else:
                 self._add_collider(obj.object)
 
-        # Update our debug shapes when the world is updated
-        world.add_listeners(on_update_exit=self._update)
-
         # Create debug shapes for colliders and triggers as they're added
         world.add_listeners(on_collider_add=self._add_collider)
         world.add_listeners(on_trigger_add=self._add_trigger)
 
-    def draw(self):
-        """Draws a solid cross box for colliders and dashed for triggers."""
-        self._collider_batch.draw()
-        self._trigger_batch.draw_special(GraphicsBatch.DASHED_LINES)
+        if stats_histogram is not None:
+            world.add_listeners(on_update_stats=stats_histogram.add)
+
+    def draw(self, view=None):
+        """Draws a solid cross box for colliders and dashed for triggers.
+
+        Kwargs:
+            view (:obj:`engine.geometry.Rectangle`, optional): Area being
+                drawn, such as a :obj:`engine.camera.Camera`. Shapes outside
+                of it are skipped. Defaults to None, drawing all shapes.
+        """
+        self._update()
+        self._collider_buffer.draw(view)
+        self._trigger_buffer.draw(view)
+
+    def draw_stats(self):
+        """Draws the histogram of world stats, if there is one.
+
+        The histogram is positioned in window coordinates, so this should be
+        called without camera transformations applied.
+        """
+        if self.stats_histogram is not None:
+            self.stats_histogram.draw()
 
-    def _update(self, world):
-        """Update debug shapes to match their corresponding world objects."""
-        for obj, debug_shape in self._debug_objects.items():
-            debug_shape.set_position(obj.coordinates)
+    def _update(self):
+        """Update debug shapes of objects which have moved."""
+        for obj, debug_buffer in self._moved.items():
+            debug_buffer.update(obj, obj)
+
+        self._moved.clear()
 
     def _add_collider(self, collider):
         """Adds a collider to this debug instance."""
-        self._add_object(collider, self._collider_color, self._collider_batch)
+        self._add_object(collider, self._collider_buffer)
 
     def _add_trigger(self, trigger):
         """Adds a trigger to this debug instance."""
-        self._add_object(trigger, self._trigger_color, self._trigger_batch)
+        self._add_object(trigger, self._trigger_buffer)
 
-    def _add_object(self, obj, color, batch):
+    def _add_object(self, obj, debug_buffer):
         """Adds an object to this debug instance."""
-        self._debug_objects[obj] = CrossBox(obj, color, batch)
+        debug_buffer.add(obj, obj)
+
+        def on_move(coordinates):
+            """Marks the object's debug shape to update before drawing."""
+            self._moved[obj] = debug_buffer
+
+        obj.add_listeners(on_move=on_move)
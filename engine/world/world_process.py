@@ -0,0 +1,313 @@
+from engine.physics import Physics2d
+from multiprocessing import shared_memory
+from multiprocessing import resource_tracker
+from time import perf_counter
+from .world_snapshot import OBJECT_STATE
+import multiprocessing
+import struct
+import traceback
+
+# Sequence number of the most recently published buffer, 0 before any
+_HEADER = struct.Struct('<q')
+
+# Physics state packed for objects without physics
+_NO_PHYSICS = (0,) * 6
+
+
+class WorldProcess(object):
+    """Runs a :obj:`engine.world.World2d` simulation in a child process.
+
+    The child builds its own world, then updates every object and the world
+    at a fixed rate. After each update it publishes the state of every
+    object into one of two buffers in shared memory, alternating between
+    them, so the main process can read the latest complete state without
+    waiting on the simulation.
+
+    The main process keeps its own copies of the objects for drawing, and
+    applies the published state to them with :fn:`apply`. Input for the
+    simulation is sent to the child with :fn:`send`. If the simulation fails
+    in the child, reading or applying its state raises the error.
+
+    Objects are published in the order they were added to the child's world
+    while building it. Objects added later are not published. Each record is
+    packed as :data:`engine.world.world_snapshot.OBJECT_STATE`, like
+    :fn:`engine.world.World2d.snapshot`.
+
+    Attributes:
+        update_rate (int): Updates per second of the simulation.
+        object_count (int): Number of objects published by the child, or
+            None before starting.
+        sequence (int): Number of the most recently applied update, or 0.
+    """
+
+    def __init__(self, build, on_message=None, update_rate=120,
+                 context=None):
+        """Creates a world process, which is not started until :fn:`start`.
+
+        Args:
+            build (fn): Called in the child process to build and return the
+                :obj:`engine.world.World2d` to simulate. It must be picklable
+                on platforms which spawn processes, such as a module level
+                function.
+
+        Kwargs:
+            on_message (fn, optional): Called in the child process with the
+                world, the list of published objects in order, and each
+                message sent with :fn:`send`, before the next update. Must
+                be picklable like ``build``. Defaults to None.
+            update_rate (int, optional): Updates per second of the
+                simulation. Defaults to 120.
+            context (:obj:`multiprocessing.context.BaseContext`, optional):
+                Multiprocessing context to start the process with. Defaults
+                to the platform's default context.
+        """
+        super(WorldProcess, self).__init__()
+        self.update_rate = update_rate
+        self.object_count = None
+        self.sequence = 0
+
+        self._build = build
+        self._on_message = on_message
+        self._context = context or multiprocessing.get_context()
+
+        self._process = None
+        self._connection = None
+        self._memory = None
+
+        # Most recently applied state, and why the child stopped if it failed
+        self._data = None
+        self._error = None
+
+    def start(self):
+        """Starts the child process, waiting until its world is built.
+
+        Raises:
+            RuntimeError: If building the world failed in the child.
+        """
+        # Share this process' resource tracker with the child, so the child
+        # attaching to the shared memory doesn't unlink it when it exits
+        resource_tracker.ensure_running()
+
+        self._connection, child_connection = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_run_world, daemon=True, args=(
+                child_connection, self._build, self._on_message,
+                self.update_rate))
+        self._process.start()
+        child_connection.close()
+
+        status, value = self._connection.recv()
+        if status == 'error':
+            self._process.join()
+            raise RuntimeError(
+                'Building the world failed in the child process:\n' + value)
+
+        # The child publishes into memory owned by this process
+        self.object_count = value
+        self.sequence = 0
+        self._data = None
+        self._error = None
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=get_shared_size(value))
+
+        self._connection.send(('memory', self._memory.name))
+
+    def stop(self):
+        """Stops the child process and releases the shared memory."""
+        if self._process is None:
+            return
+
+        try:
+            self._connection.send(('stop', None))
+        except (BrokenPipeError, OSError):
+            pass
+
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+
+        self._connection.close()
+        self._process = self._connection = None
+
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def send(self, message):
+        """Sends a message to the ``on_message`` function in the child.
+
+        Args:
+            message (object): A picklable message, such as a key press.
+        """
+        self._connection.send(('message', message))
+
+    def read(self):
+        """Returns the latest state published by the child.
+
+        Returns:
+            A tuple of the update's sequence number and the packed state of
+            every object as bytes, or None if nothing is published yet.
+
+        Raises:
+            RuntimeError: If the simulation failed or the child exited.
+        """
+        self._check_child()
+        buffer = self._memory.buf
+        record_size = self.object_count * OBJECT_STATE.size
+
+        while True:
+            sequence = _HEADER.unpack_from(buffer)[0]
+            if not sequence:
+                return None
+
+            start = _HEADER.size + sequence % 2 * record_size
+            data = bytes(buffer[start:start + record_size])
+
+            # The child may have started overwriting the buffer during the
+            # copy if it published again, so copy the newer one instead
+            if _HEADER.unpack_from(buffer)[0] == sequence:
+                return (sequence, data)
+
+    def apply(self, objects):
+        """Applies the latest published state to the main process' objects.
+
+        Objects move with ``set_position``, so objects attached to them, such
+        as graphics, move as well. Only objects whose state changed since the
+        last applied update are touched.
+
+        Args:
+            objects (list of :obj:`engine.game_object.GameObject`): The main
+                process' copies of the objects, in the order they were added
+                to the child's world.
+
+        Returns:
+            True if newer state was applied, otherwise False.
+
+        Raises:
+            RuntimeError: If the simulation failed or the child exited.
+        """
+        state = self.read()
+        if state is None or state[0] == self.sequence:
+            return False
+
+        self.sequence, data = state
+        previous, self._data = self._data, data
+        size = OBJECT_STATE.size
+
+        for index, obj in enumerate(objects):
+            start = index * size
+
+            # Objects at rest, such as floors, are published unchanged
+            if previous is not None and \
+                    data[start:start + size] == previous[start:start + size]:
+                continue
+
+            record = OBJECT_STATE.unpack_from(data, start)
+
+            obj.set_position(record[:2])
+            if isinstance(obj, Physics2d):
+                obj.set_physics_state(record[2:])
+
+        return True
+
+    def is_alive(self):
+        """Returns whether the child process is running."""
+        return self._process is not None and self._process.is_alive()
+
+    def _check_child(self):
+        """Raises the child's error if the simulation has stopped."""
+        if self._error is None:
+            message = None
+
+            # The child only sends again to report an error
+            if self._connection.poll():
+                try:
+                    message = self._connection.recv()[1]
+                except (EOFError, OSError):
+                    pass
+
+            if message is not None:
+                self._error = 'The simulation failed in the child ' \
+                    'process:\n' + message
+            elif not self._process.is_alive():
+                self._error = 'The child process exited with code {0}' \
+                    .format(self._process.exitcode)
+
+        if self._error is not None:
+            raise RuntimeError(self._error)
+
+
+def get_shared_size(object_count):
+    """Returns the bytes of shared memory for publishing objects' state."""
+    return _HEADER.size + 2 * object_count * OBJECT_STATE.size
+
+
+def _run_world(connection, build, on_message, update_rate):
+    """Builds and simulates a world in the child process until stopped."""
+    try:
+        world = build()
+        objects = [world_object.object for world_object in world._objects]
+    except Exception:
+        connection.send(('error', traceback.format_exc()))
+        return
+
+    connection.send(('ready', len(objects)))
+    memory = shared_memory.SharedMemory(name=connection.recv()[1])
+
+    try:
+        _simulate(connection, world, objects, on_message, update_rate,
+                  memory.buf)
+    except EOFError:
+        # The main process exited without stopping the simulation
+        pass
+    except Exception:
+        try:
+            connection.send(('error', traceback.format_exc()))
+        except OSError:
+            pass
+    finally:
+        memory.close()
+
+
+def _simulate(connection, world, objects, on_message, update_rate, buffer):
+    """Updates the world at a fixed rate, publishing each update."""
+    interval = 1.0 / update_rate
+    record_size = len(objects) * OBJECT_STATE.size
+    pack_into = OBJECT_STATE.pack_into
+    sequence = 0
+
+    previous = next_update = perf_counter()
+
+    while True:
+        # Wait for the next update, handling any messages in the meantime
+        while connection.poll(max(0, next_update - perf_counter())):
+            command, message = connection.recv()
+            if command == 'stop':
+                return
+            if on_message is not None:
+                on_message(world, objects, message)
+
+        now = perf_counter()
+        ms = int((now - previous) * 1000)
+        previous = now
+
+        # Skip missed updates rather than running them back to back
+        next_update = max(next_update + interval, now)
+
+        for obj in objects:
+            obj.update(ms)
+        world.update(ms)
+
+        # Write the buffer the main process is not reading, then publish it
+        sequence += 1
+        offset = _HEADER.size + sequence % 2 * record_size
+
+        for index, obj in enumerate(objects):
+            physics = obj.get_physics_state() \
+                if isinstance(obj, Physics2d) else _NO_PHYSICS
+            pack_into(buffer, offset + index * OBJECT_STATE.size,
+                      obj.x, obj.y, *physics)
+
+        _HEADER.pack_into(buffer, 0, sequence)
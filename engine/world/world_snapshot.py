@@ -0,0 +1,43 @@
+import struct
+
+# Position, velocity, acceleration, and high resolution velocity
+OBJECT_STATE = struct.Struct('<8q')
+
+
+class WorldSnapshot(object):
+    """Saved state of every object in a :obj:`engine.world.World2d`.
+
+    The state of each object is packed into one fixed size record of a
+    single buffer, rather than copying the objects themselves. See
+    :fn:`engine.world.World2d.snapshot`.
+
+    Attributes:
+        objects (tuple of :obj:`engine.world.WorldObject`): The objects in
+            the world, in the order of their records.
+        data (bytes): The packed state of each object. Each record holds
+            the position, velocity, acceleration, and high resolution
+            velocity as little-endian 64-bit ints, in that order. Objects
+            without physics have zeros for everything but their position.
+        colliders (object): Contents of the world's collider cache.
+        triggers (object): Contents of the world's trigger cache.
+    """
+
+    def __init__(self, objects, data, colliders, triggers):
+        """Creates a snapshot of a world's state.
+
+        Args:
+            objects (tuple of :obj:`engine.world.WorldObject`): The objects in
+                the world, in the order of their records.
+            data (bytes): The packed state of each object.
+            colliders (object): Contents of the world's collider cache.
+            triggers (object): Contents of the world's trigger cache.
+        """
+        super(WorldSnapshot, self).__init__()
+        self.objects = objects
+        self.data = data
+        self.colliders = colliders
+        self.triggers = triggers
+
+    def __len__(self):
+        """Returns the number of objects in the snapshot."""
+        return len(self.objects)
@@ -0,0 +1,77 @@
+class WorldStats(object):
+    """Counts of the work done by a single :obj:`engine.world.World2d` update.
+
+    The broad phase sweeps the objects along the x axis, producing candidate
+    pairs of objects whose x extents overlap, and prunes candidates which are
+    apart on the y axis. The narrow phase then checks each remaining pair for
+    an actual overlap and resolves it.
+
+    Attributes:
+        objects_swept (int): Objects sorted and swept by the broad phase.
+        candidate_pairs (int): Pairs produced by the broad phase.
+        narrow_phase_calls (int): Candidate pairs which overlap on the y
+            axis, run through the narrow phase.
+        overlaps (int): Pairs which actually overlapped.
+        resolutions (int): Collider overlaps whose resolution moved an
+            object.
+        collider_enters (int): Collider pairs which started colliding.
+        collider_exits (int): Collider pairs which stopped colliding.
+        trigger_enters (int): Trigger pairs which started overlapping.
+        trigger_exits (int): Trigger pairs which stopped overlapping.
+    """
+
+    COUNTERS = (
+        'objects_swept', 'candidate_pairs', 'narrow_phase_calls', 'overlaps',
+        'resolutions', 'collider_enters', 'collider_exits', 'trigger_enters',
+        'trigger_exits')
+
+    def __init__(self, **counters):
+        """Creates stats with every counter at zero unless given.
+
+        Kwargs:
+            **counters (dict of str: int): Initial values of counters, by
+                their attribute name.
+        """
+        super(WorldStats, self).__init__()
+
+        for name in self.COUNTERS:
+            setattr(self, name, counters.pop(name, 0))
+
+        if counters:
+            raise TypeError('Unknown counters {0}'.format(
+                ', '.join(sorted(counters))))
+
+    def __repr__(self):
+        """Returns the counters as a readable string."""
+        return 'WorldStats({0})'.format(', '.join(
+            '{0}={1}'.format(name, getattr(self, name))
+            for name in self.COUNTERS))
+
+    @property
+    def possible_pairs(self):
+        """Returns the pairs a brute force check of every object would make."""
+        return self.objects_swept * (self.objects_swept - 1) // 2
+
+    @property
+    def pruning_ratio(self):
+        """Returns the fraction of possible pairs the broad phase kept.
+
+        Lower is better. Near 1 means objects are bunched along the x axis,
+        so the sweep is no better than checking every pair.
+        """
+        possible_pairs = self.possible_pairs
+        return self.candidate_pairs / possible_pairs if possible_pairs else 0
+
+    @property
+    def hit_ratio(self):
+        """Returns the fraction of candidate pairs which overlapped.
+
+        Higher is better. Near 0 means the sweep mostly pairs objects which
+        are apart on the y axis, which the broad phase then has to prune.
+        """
+        return self.overlaps / self.candidate_pairs \
+            if self.candidate_pairs else 0
+
+    def as_dict(self):
+        """Returns the counters as a dict by attribute name."""
+        return {name: getattr(self, name) for name in self.COUNTERS}
@@ -0,0 +1,133 @@
+from .world_stats import WorldStats
+from array import array
+from collections import deque
+from pyglet.gl import GL_LINES
+from pyglet.text import Label
+import pyglet.graphics
+
+
+class WorldStatsHistogram(object):
+    """Draws recent :obj:`engine.world.WorldStats` as rows of bar graphs.
+
+    Each counter gets a row, with its name and latest value followed by one
+    bar per recent update. Bars are scaled to the largest value of their row,
+    so spikes stand out. The broad phase pruning and hit ratios are listed
+    below the rows.
+
+    The text is only laid out again after a number of updates, since laying
+    out text every frame is slow.
+
+    Attributes:
+        counters (tuple of str): Names of the counters drawn, in order.
+        refresh_updates (int): Updates between laying out the text.
+    """
+
+    def __init__(self, x=0, y=0, history=120, row_height=12,
+                 counters=WorldStats.COUNTERS, refresh_updates=15,
+                 color=(255, 255, 255), font_name='Verdana', font_size=6):
+        """Creates an empty histogram.
+
+        Kwargs:
+            x (int, optional): Window x coordinate of the left edge.
+                Defaults to 0.
+            y (int, optional): Window y coordinate of the top edge.
+                Defaults to 0.
+            history (int, optional): Number of updates to keep, which is also
+                the width of the bars in pixels. Defaults to 120.
+            row_height (int, optional): Height of each row in pixels.
+                Defaults to 12.
+            counters (tuple of str, optional): Names of the
+                :obj:`engine.world.WorldStats` counters to draw. Defaults to
+                every counter.
+            refresh_updates (int, optional): Updates between laying out the
+                text. Defaults to 15.
+            color (tuple of 3 int, optional): RGB color of the bars and text.
+                Defaults to white.
+            font_name (str, optional): Font of the text. Defaults to Verdana.
+            font_size (int, optional): Font size of the text. Defaults to 6.
+        """
+        super(WorldStatsHistogram, self).__init__()
+        self.counters = tuple(counters)
+        self.refresh_updates = refresh_updates
+
+        self._x, self._y = x, y
+        self._row_height = row_height
+        self._color = tuple(color)
+        self._history = deque(maxlen=history)
+        self._updates = refresh_updates
+
+        # Text takes up the left of each row, and bars the right
+        self._bar_x = x + 100
+        label_color = self._color + (255,)
+
+        self._labels = [
+            Label('', x=x, y=y - row * row_height, anchor_y='top',
+                  color=label_color, font_name=font_name, font_size=font_size)
+            for row in range(len(self.counters) + 1)]
+
+    def add(self, stats):
+        """Adds the stats of an update to the histogram.
+
+        Args:
+            stats (:obj:`engine.world.WorldStats`): The stats to add.
+        """
+        self._history.append(stats)
+        self._updates += 1
+
+        if self._updates >= self.refresh_updates:
+            self._updates = 0
+
+            for label, text in zip(self._labels, self.get_text()):
+                label.text = text
+
+    def draw(self):
+        """Draws the bars and text of the histogram."""
+        vertices = self.get_vertices()
+        vertex_count = len(vertices) // 2
+
+        if vertex_count:
+            pyglet.graphics.draw(
+                vertex_count, GL_LINES,
+                ('v2i', vertices),
+                ('c3B', self._color * vertex_count))
+
+        for label in self._labels:
+            label.draw()
+
+    def get_text(self):
+        """Returns the text of each row, followed by the ratios."""
+        if not self._history:
+            return [''] * (len(self.counters) + 1)
+
+        latest = self._history[-1]
+        lines = ['{0:<20}{1:>7}'.format(name, getattr(latest, name))
+                 for name in self.counters]
+        lines.append('pruning {0:.1%}  hits {1:.1%}'.format(
+            latest.pruning_ratio, latest.hit_ratio))
+
+        return lines
+
+    def get_vertices(self):
+        """Returns GL_LINES vertices of one vertical bar per update and row.
+
+        Bars of zero height are left out.
+        """
+        vertices = array('i')
+        bar_space = self._row_height - 2
+
+        for row, name in enumerate(self.counters):
+            values = [getattr(stats, name) for stats in self._history]
+            largest = max(values, default=0)
+
+            if not largest:
+                continue
+
+            bottom = self._y - (row + 1) * self._row_height
+
+            for offset, value in enumerate(values):
+                if value:
+                    x = self._bar_x + offset
+                    height = max(1, value * bar_space // largest)
+                    vertices.extend((x, bottom, x, bottom + height))
+
+        return vertices
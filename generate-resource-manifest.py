@@ -0,0 +1,17 @@
+import pyglet
+
+# Generating a manifest does not require a window
+pyglet.options['shadow_window'] = False
+
+from engine.disk import ResourceManifest  # noqa: E402
+from engine.disk.resource_manifest import MANIFEST_FILENAME  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+
+
+for resource_dir in sys.argv[1:] or ['resources/']:
+    manifest_path = os.path.join(resource_dir, MANIFEST_FILENAME)
+    manifest = ResourceManifest.build(resource_dir)
+    manifest.save(manifest_path)
+
+    print('Wrote {0} resources to {1}'.format(len(manifest), manifest_path))
@@ -0,0 +1,21 @@
+import pyglet
+
+# Generating a pack does not require a window
+pyglet.options['shadow_window'] = False
+
+from engine.disk import write_resource_pack  # noqa: E402
+import argparse  # noqa: E402
+
+
+parser = argparse.ArgumentParser(
+    description='Packs a resource directory into a single resource pack.')
+parser.add_argument('resource_dir', nargs='?', default='resources/')
+parser.add_argument('pack_path', nargs='?', default='resources.pack')
+parser.add_argument('--decode-images', action='store_true',
+                    help='store decoded pixel data to skip decoding PNGs')
+args = parser.parse_args()
+
+write_resource_pack(
+    args.pack_path, args.resource_dir, decode_images=args.decode_images)
+
+print('Wrote {0} to {1}'.format(args.resource_dir, args.pack_path))
@@ -1,11 +1,27 @@
 from engine import audio, camera, disk, easing, factory, geometry, game_object
-from engine import graphics, key_handler, room, tiled_editor, world
+from engine import graphics, key_handler, profiler, room, tiled_editor
+from engine import world
 import pyglet.app
 import pyglet.gl
 import player
+import argparse
+import os
+import tempfile
 
 
-disk.DiskLoader.set_resource_paths(['resources/'])
+disk.DiskLoader.set_resource_paths(['resources/'], use_manifests=True)
+
+# Prefer the packed resources when they have been generated
+resource_pack_path = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'resources.pack')
+if os.path.isfile(resource_pack_path):
+    disk.DiskLoader.set_resource_pack(disk.ResourcePack(resource_pack_path))
+
+# Decode sound effects once, sharing the decoded audio between game instances
+disk.DiskLoader.set_pcm_cache(disk.PcmCache(
+    os.path.join(tempfile.gettempdir(), 'pickles-fetch-quest', 'pcm')))
+
+disk.DiskLoader.set_texture_atlas(graphics.TextureAtlas())
 
 game_width = 160
 game_height = 140
@@ -18,7 +34,9 @@ graphics_director = graphics.GraphicsController(
 key_handler = key_handler.KeyHandler(graphics_director)
 game_world = world.World2d()
 
-game_world_debugger = world.World2dDebug(game_world)
+game_world_debugger = world.World2dDebug(
+    game_world, stats_histogram=world.WorldStatsHistogram(
+        x=game_width * game_scale - 230, y=game_height * game_scale - 40))
 fps_display = pyglet.window.FPSDisplay(window=graphics_director._window)
 fps_display.label.color = (255, 255, 255, 255)
 fps_display.label.y = game_height * game_scale - 20
@@ -26,23 +44,43 @@ fps_display.label.bold = False
 fps_display.label.font_size = 10
 fps_display.label.font_name = 'Verdana'
 
+# Time each phase of a frame while debugging, to find what makes frames slow
+frame_profiler = profiler.get_profiler()
+profiler_overlay = profiler.ProfilerOverlay(
+    frame_profiler, x=10, y=game_height * game_scale - 40)
+
 audio_director.attenuation_distance = 40
+audio_director.audible_gain = 0.05
+audio_director.prebuffer = 2
+
+# Mix overlapping sound effects in software when NumPy is installed
+if audio.SoftwareMixer.available:
+    audio_director.mixer = audio.SoftwareMixer()
+    audio_director.mixer.start()
 
 collision_sound = audio_director.load(
     'audio/sfx/bass-drum-hit.wav', streaming=False)
 
+# Landing on several floor tiles at once plays a single collision sound
+collision_sound.coalesce = True
+collision_sound.min_interval = 0.05
+
 (pickle, pickle_graphics_idle) = player.create_player(key_handler)
 
-graphics_director.add_listeners(on_update=pickle.update)
 game_world.add_collider(pickle)
 
+# Objects updated before the world each frame, timed in a single span
+game_objects = [pickle]
+
 
 def toggle_debug_state():
     global debug_state
     debug_state = not debug_state
+    frame_profiler.enabled = debug_state
 
 
 debug_state = True
+frame_profiler.enabled = debug_state
 key_handler.on_key_press(pyglet.window.key.D, toggle_debug_state)
 
 
@@ -52,11 +90,11 @@ def create_floor_physics(**kwargs):
     tile = game_object.ImmovableGameObject(x, y, width, height)
 
     def play_collision_audio(other):
-        collision_sound.play()
+        audio_director.play_effect(collision_sound)
         # instance.position = (20, 0)
 
     tile.add_listeners(on_collider_enter=play_collision_audio)
-    graphics_director.add_listeners(on_update=tile.update)
+    game_objects.append(tile)
     game_world.add_collider(tile)
 
     return tile
@@ -88,12 +126,37 @@ camera.follow_deadzone = geometry.Rectangle(
 camera.follow_easing = easing.LinearInterpolation(0.08)
 
 
+def get_scene_state():
+    return (camera.x, camera.y, pickle.x, pickle.y,
+            pickle_graphics_idle.frame_index, debug_state)
+
+
+scene_state = None
+
+
 def on_update(dt):
+    global scene_state
+    with frame_profiler.span('physics.step'):
+        for obj in game_objects:
+            obj.update(dt)
+
     game_world.update(dt)
     key_handler.update(dt)
     entry_room.update(dt)
     camera.update(dt)
 
+    # Sounds are heard from the player
+    audio_director.position = pickle.center
+    audio_director.update(dt)
+    overlay_refreshed = profiler_overlay.update(dt)
+
+    # Only draw again when something on screen has changed, refreshing the
+    # debug overlays at the profiler overlay's slower rate
+    state = get_scene_state()
+    if state != scene_state or (debug_state and overlay_refreshed):
+        scene_state = state
+        graphics_director.invalidate()
+
 
 graphics_director.add_listeners(on_update=on_update)
 
@@ -104,12 +167,22 @@ def on_draw():
     camera.attach()
     entry_room.draw()
     if debug_state:
-        game_world_debugger.draw()
+        game_world_debugger.draw(camera)
         fps_display.draw()
     camera.detach()
+    if debug_state:
+        profiler_overlay.draw()
+        game_world_debugger.draw_stats()
+    frame_profiler.end_frame()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Pickle's Fetch Quest.")
+    parser.add_argument(
+        '--record', metavar='PATH',
+        help='record keyboard input to a file, to replay it later')
+    args = parser.parse_args()
+
     # Enable alpha transparency in OpenGL
     pyglet.gl.glEnable(pyglet.gl.GL_BLEND)
     pyglet.gl.glBlendFunc(
@@ -121,4 +194,10 @@ if __name__ == "__main__":
         pyglet.gl.GL_TEXTURE_MAG_FILTER,
         pyglet.gl.GL_NEAREST)
 
-    pyglet.app.run()
+    if args.record:
+        key_handler.start_recording()
+
+    graphics_director.run()
+
+    if args.record:
+        key_handler.stop_recording().save(args.record)